@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.route_groups import api_autodraft
+from backend.route_groups.api_autodraft import (
+    _build_prepare_text_fallback_markups_from_lines,
+    _sample_rendered_line_color,
+    _sample_rendered_line_colors,
+)
+
+# Ink colors seen on flattened markups: pen black, Bluebeam red/green/blue,
+# highlighter yellow, plus grey hatching.
+_INK_COLORS = [
+    (20, 20, 20),
+    (220, 30, 40),
+    (30, 160, 60),
+    (40, 70, 210),
+    (240, 220, 40),
+    (150, 150, 150),
+]
+
+
+def generate_page(
+    line_count: int,
+    *,
+    seed: int,
+    width: int = 2550,
+    height: int = 1650,
+) -> Tuple[Any, List[Optional[Dict[str, int]]]]:
+    """A 150 DPI 17x11 page with text-like strokes and one pixel box per line."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    pixel_bounds: List[Optional[Dict[str, int]]] = []
+    for _ in range(max(0, int(line_count))):
+        box_width = rng.randint(20, 420)
+        box_height = rng.randint(10, 48)
+        left = rng.randint(0, width - 1)
+        top = rng.randint(0, height - 1)
+        color = rng.choice(_INK_COLORS)
+        for stroke in range(rng.randint(2, 12)):
+            x = left + rng.randint(0, box_width)
+            y = top + rng.randint(0, box_height)
+            shade = tuple(max(0, min(255, channel + rng.randint(-25, 25))) for channel in color)
+            draw.line((x, y, x + rng.randint(2, 30), y + rng.randint(-4, 4)), fill=shade, width=rng.randint(1, 3))
+        pixel_bounds.append(
+            {"left": left - 3, "top": top - 3, "width": box_width + 6, "height": box_height + 6}
+            if rng.random() > 0.02
+            else None
+        )
+    return image, pixel_bounds
+
+
+def _fallback_lines(pixel_bounds: Sequence[Optional[Dict[str, int]]], *, image_height: int) -> List[Dict[str, Any]]:
+    # Text fallback lines at 1 px = 1 pt, so the builder samples the same boxes.
+    lines: List[Dict[str, Any]] = []
+    for index, bounds in enumerate(pixel_bounds):
+        if bounds is None:
+            continue
+        lines.append(
+            {
+                "text": f"Install new feeder {index}",
+                "bounds": {
+                    "x": float(bounds["left"]),
+                    "y": float(image_height - bounds["top"] - bounds["height"]),
+                    "width": float(bounds["width"]),
+                    "height": float(bounds["height"]),
+                },
+                "pixel_bounds": bounds,
+            }
+        )
+    return lines
+
+
+def _per_line_colors(image: Any, pixel_bounds_list: Sequence[Optional[Dict[str, int]]]) -> List[Any]:
+    # How the text fallback sampled colors before the batched stage.
+    return [_sample_rendered_line_color(image, pixel_bounds) for pixel_bounds in pixel_bounds_list]
+
+
+def _time_prepare_fallback(image: Any, fallback_lines: List[Dict[str, Any]]) -> Tuple[float, Dict[str, Any]]:
+    started_at = time.perf_counter()
+    result = _build_prepare_text_fallback_markups_from_lines(
+        lines=fallback_lines,
+        source="ocr",
+        page_index=0,
+        page_width=float(image.width),
+        page_height=float(image.height),
+        bluebeam_detected=True,
+        image=image,
+        image_width=image.width,
+        image_height=image.height,
+    )
+    return (time.perf_counter() - started_at) * 1000.0, result
+
+
+def run_autodraft_color_sampling_benchmark(*, lines: int, iterations: int, seed: int) -> Dict[str, Any]:
+    """Compare per-line and batched render-sample color classification on one page."""
+    image, pixel_bounds = generate_page(lines, seed=seed)
+    per_line_durations: List[float] = []
+    batched_durations: List[float] = []
+    prepare_per_line_durations: List[float] = []
+    prepare_batched_durations: List[float] = []
+    per_line: List[Any] = []
+    batched: List[Any] = []
+    prepare_per_line: Dict[str, Any] = {}
+    prepare_batched: Dict[str, Any] = {}
+    fallback_lines = _fallback_lines(pixel_bounds, image_height=image.height)
+    for _ in range(max(1, int(iterations))):
+        started_at = time.perf_counter()
+        per_line = _per_line_colors(image, pixel_bounds)
+        per_line_durations.append((time.perf_counter() - started_at) * 1000.0)
+
+        started_at = time.perf_counter()
+        batched = _sample_rendered_line_colors(image, pixel_bounds)
+        batched_durations.append((time.perf_counter() - started_at) * 1000.0)
+
+        with mock.patch.object(api_autodraft, "_sample_rendered_line_colors", _per_line_colors):
+            duration_ms, prepare_per_line = _time_prepare_fallback(image, fallback_lines)
+        prepare_per_line_durations.append(duration_ms)
+        duration_ms, prepare_batched = _time_prepare_fallback(image, fallback_lines)
+        prepare_batched_durations.append(duration_ms)
+
+    per_line_stats = _summarize_durations(per_line_durations)
+    batched_stats = _summarize_durations(batched_durations)
+    prepare_per_line_stats = _summarize_durations(prepare_per_line_durations)
+    prepare_batched_stats = _summarize_durations(prepare_batched_durations)
+    colors: Dict[str, int] = {}
+    for color_name, _rgb, _hex, _source in batched:
+        colors[color_name] = colors.get(color_name, 0) + 1
+    return {
+        "name": f"autodraft_color_sampling.lines_{len(pixel_bounds)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "lineCount": len(pixel_bounds),
+        "iterations": max(1, int(iterations)),
+        "perLine": per_line_stats,
+        "batched": batched_stats,
+        "prepareFallbackPerLine": prepare_per_line_stats,
+        "prepareFallbackBatched": prepare_batched_stats,
+        "speedup": round(per_line_stats["meanMs"] / batched_stats["meanMs"], 2) if batched_stats["meanMs"] else 0.0,
+        "prepareSpeedup": (
+            round(prepare_per_line_stats["meanMs"] / prepare_batched_stats["meanMs"], 2)
+            if prepare_batched_stats["meanMs"]
+            else 0.0
+        ),
+        "colors": colors,
+        "resultsMatch": per_line == batched and prepare_per_line == prepare_batched,
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark for AutoDraft text-fallback render-sample color classification.",
+    )
+    parser.add_argument("--lines", type=int, default=400, help="Candidate line boxes on the page.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed iterations per sampler.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for the generated page.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_autodraft_color_sampling_benchmark(lines=args.lines, iterations=args.iterations, seed=args.seed)
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    return 0 if report["resultsMatch"] else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
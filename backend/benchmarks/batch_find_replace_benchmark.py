@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.route_groups.api_batch_find_replace_engine import CompiledRuleSet, run_batch_files
+
+_WORDS = ["PANEL", "FEEDER", "CKT", "BKR", "XFMR", "MCC", "LOAD", "SPARE", "GND", "CONDUIT", "WIRE", "RACK"]
+
+
+def generate_files(file_count: int, lines_per_file: int, *, seed: int) -> List[Tuple[str, bytes]]:
+    """(fileName, rawBytes) pairs shaped like exported schedules and notes."""
+    rng = random.Random(seed)
+    files: List[Tuple[str, bytes]] = []
+    for index in range(max(0, int(file_count))):
+        lines = []
+        for _ in range(max(1, int(lines_per_file))):
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(3, 9))]
+            words.append(f"{rng.choice(['PNL', 'MCC', 'LP'])}-{rng.randint(1, 60)}")
+            words.append(f"CKT-{rng.randint(1, 84)}")
+            rng.shuffle(words)
+            lines.append(" ".join(words))
+        line_break = "\r\n" if index % 2 else "\n"
+        files.append((f"schedule-{index:04d}.txt", line_break.join(lines).encode("utf-8")))
+    return files
+
+
+def generate_rules(rule_count: int, *, seed: int, regex_ratio: float = 0.2) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rules: List[Dict[str, Any]] = []
+    for index in range(max(1, int(rule_count))):
+        if rng.random() < regex_ratio:
+            number = rng.randint(1, 84)
+            rules.append(
+                {
+                    "id": f"rule-{index + 1}",
+                    "find": rf"\bCKT-{number}\b",
+                    "replace": f"CKT-{number + 100}",
+                    "use_regex": True,
+                    "match_case": True,
+                }
+            )
+            continue
+        prefix = rng.choice(["PNL", "MCC", "LP"])
+        number = rng.randint(1, 60)
+        rules.append(
+            {
+                "id": f"rule-{index + 1}",
+                "find": f"{prefix}-{number}",
+                "replace": f"{prefix}-{rng.randint(1, 60)}R",
+                "use_regex": False,
+                "match_case": rng.random() < 0.5,
+            }
+        )
+    return rules
+
+
+def _sequential_file(raw_bytes: bytes, rules: Sequence[Dict[str, Any]], file_name: str, match_limit: int) -> Dict[str, Any]:
+    # Whole-file decode, then a recompile and a full line pass per rule, as the
+    # route worked before CompiledRuleSet.
+    for encoding in ("utf-8", "utf-16", "latin-1"):
+        try:
+            content = raw_bytes.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    line_break = "\r\n" if "\r\n" in content else "\n"
+    lines = content.splitlines()
+    matches: List[Dict[str, Any]] = []
+    replacements = 0
+    for rule in rules:
+        flags = 0 if rule["match_case"] else re.IGNORECASE
+        pattern = re.compile(rule["find"] if rule["use_regex"] else re.escape(rule["find"]), flags)
+        next_lines: List[str] = []
+        for line_number, line in enumerate(lines, start=1):
+            updated_line, replaced = pattern.subn(rule["replace"], line)
+            if replaced > 0:
+                replacements += replaced
+                if len(matches) < match_limit:
+                    matches.append(
+                        {
+                            "file": file_name,
+                            "line": line_number,
+                            "before": line[:500],
+                            "after": updated_line[:500],
+                            "ruleId": rule["id"],
+                        }
+                    )
+            next_lines.append(updated_line)
+        lines = next_lines
+    return {"matches": matches, "replacements": replacements, "content": line_break.join(lines)}
+
+
+def _run_sequential(files: Sequence[Tuple[str, bytes]], rules: Sequence[Dict[str, Any]], match_limit: int) -> List[Any]:
+    outputs: List[Any] = []
+    for file_name, raw_bytes in files:
+        remaining = match_limit - sum(len(output["matches"]) for output in outputs)
+        outputs.append(_sequential_file(raw_bytes, rules, file_name, remaining))
+    return outputs
+
+
+def _run_compiled(files: Sequence[Tuple[str, bytes]], rules: Sequence[Dict[str, Any]], match_limit: int) -> List[Any]:
+    rule_set = CompiledRuleSet(rules)
+    outputs: List[Any] = []
+    for file_name, raw_bytes in files:
+        remaining = match_limit - sum(len(output["matches"]) for output in outputs)
+        outputs.append(
+            rule_set.process_stream(
+                io.BytesIO(raw_bytes),
+                file_name=file_name,
+                keep_content=True,
+                match_limit=remaining,
+            )
+        )
+    return outputs
+
+
+def _run_parallel(files: Sequence[Tuple[str, bytes]], rules: Sequence[Dict[str, Any]], match_limit: int) -> List[Any]:
+    run = run_batch_files(
+        CompiledRuleSet(rules),
+        [(file_name, io.BytesIO(raw_bytes)) for file_name, raw_bytes in files],
+        keep_content=True,
+        match_limit=match_limit,
+        stop_at_match_limit=False,
+    )
+    return [
+        {key: value for key, value in item.items() if key not in {"file", "durationMs"}}
+        for item in run["files"]
+    ]
+
+
+def _time_runs(run: Any, iterations: int) -> Tuple[List[float], List[Any]]:
+    durations: List[float] = []
+    outputs: List[Any] = []
+    for _ in range(max(1, int(iterations))):
+        started_at = time.perf_counter()
+        outputs = run()
+        durations.append((time.perf_counter() - started_at) * 1000.0)
+    return durations, outputs
+
+
+def run_batch_find_replace_benchmark(
+    *,
+    file_count: int,
+    rule_count: int,
+    lines_per_file: int,
+    iterations: int,
+    seed: int,
+    match_limit: int = 5000,
+    workers: int = 0,
+) -> Dict[str, Any]:
+    """Time the per-rule sequential pass against the compiled single-pass rule set.
+
+    With ``workers`` > 1 the compiled engine is also timed through the
+    process pool (``run_batch_files``).
+    """
+    files = generate_files(file_count, lines_per_file, seed=seed)
+    rules = generate_rules(rule_count, seed=seed + 1)
+
+    sequential_durations, sequential_outputs = _time_runs(
+        lambda: _run_sequential(files, rules, match_limit), iterations
+    )
+    compiled_durations, compiled_outputs = _time_runs(lambda: _run_compiled(files, rules, match_limit), iterations)
+    parallel_report: Optional[Dict[str, Any]] = None
+    results_match = sequential_outputs == compiled_outputs
+    if workers > 1:
+        previous_workers = os.environ.get("BATCH_FIND_REPLACE_MAX_WORKERS")
+        os.environ["BATCH_FIND_REPLACE_MAX_WORKERS"] = str(workers)
+        try:
+            parallel_durations, parallel_outputs = _time_runs(
+                lambda: _run_parallel(files, rules, match_limit), iterations
+            )
+        finally:
+            if previous_workers is None:
+                os.environ.pop("BATCH_FIND_REPLACE_MAX_WORKERS", None)
+            else:
+                os.environ["BATCH_FIND_REPLACE_MAX_WORKERS"] = previous_workers
+        parallel_report = {"stats": _summarize_durations(parallel_durations), "workers": workers}
+        results_match = results_match and parallel_outputs == compiled_outputs
+    sequential_summary = _summarize_durations(sequential_durations)
+    compiled_summary = _summarize_durations(compiled_durations)
+    speedup = (
+        sequential_summary["meanMs"] / compiled_summary["meanMs"] if compiled_summary["meanMs"] > 0 else 0.0
+    )
+    return {
+        "name": f"batch_find_replace.files_{len(files)}.rules_{len(rules)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "fileCount": len(files),
+        "ruleCount": len(rules),
+        "linesPerFile": int(lines_per_file),
+        "iterations": len(compiled_durations),
+        "sequential": {"stats": sequential_summary},
+        "compiled": {"stats": compiled_summary},
+        "replacements": sum(int(output["replacements"]) for output in compiled_outputs),
+        "speedup": round(speedup, 2),
+        "resultsMatch": results_match,
+        **({"parallel": parallel_report} if parallel_report else {}),
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark for the batch find & replace rule engine.",
+    )
+    parser.add_argument("--files", type=int, default=500, help="Synthetic text files per iteration.")
+    parser.add_argument("--rules", type=int, default=50, help="Rules applied to every file.")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per synthetic file.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed iterations per engine.")
+    parser.add_argument("--workers", type=int, default=0, help="Also time the process pool with this many workers.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated files and rules.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_batch_find_replace_benchmark(
+        file_count=args.files,
+        rule_count=args.rules,
+        lines_per_file=args.lines,
+        iterations=args.iterations,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    return 0 if report["resultsMatch"] else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -5,16 +5,25 @@ import json
 import random
 import statistics
 import time
+import tracemalloc
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from backend.route_groups.api_autocad_terminal_scan import scan_terminal_strips
-from backend.route_groups.api_conduit_route_compute import compute_conduit_route
+from backend.route_groups.api_conduit_route_compute import (
+    clear_cost_grid_cache,
+    compute_conduit_route,
+    get_cost_grid_cache_stats,
+)
 from backend.route_groups.api_conduit_route_obstacle_scan import scan_conduit_obstacles
 
 OBSTACLE_TYPES = ["foundation", "building", "equipment_pad", "trench", "fence", "road"]
+ROUTE_ENGINES = ["python", "numpy"]
+ROUTE_SEARCH_MODES = ["astar", "bidirectional", "hierarchical"]
+ROUTE_SEARCH_CANVAS_WIDTH = 6000.0
+ROUTE_SEARCH_CANVAS_HEIGHT = 4000.0
 
 
 class _Collection:
@@ -102,6 +111,7 @@ class _OperationStats:
     sample_meta: Dict[str, Any]
     sample_code: str
     sample_message: str
+    peak_memory_bytes: Optional[int] = None
 
 
 def parse_entity_counts(raw: str) -> List[int]:
@@ -166,6 +176,7 @@ def _run_timed_operation(
     fn: Callable[[], Dict[str, Any]],
     iterations: int,
     warmup: int = 1,
+    track_memory: bool = False,
 ) -> _OperationStats:
     for _ in range(max(0, int(warmup))):
         fn()
@@ -197,6 +208,18 @@ def _run_timed_operation(
             ended = time.perf_counter_ns()
             duration_ms.append((ended - started) / 1_000_000.0)
 
+    peak_memory_bytes: Optional[int] = None
+    if track_memory:
+        # Separate run: tracemalloc overhead would skew the timed iterations.
+        tracemalloc.start()
+        try:
+            fn()
+        except Exception:
+            pass
+        finally:
+            peak_memory_bytes = int(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
     return _OperationStats(
         name=name,
         iterations=max(1, int(iterations)),
@@ -207,6 +230,7 @@ def _run_timed_operation(
         sample_meta=sample_meta,
         sample_code=sample_code,
         sample_message=sample_message,
+        peak_memory_bytes=peak_memory_bytes,
     )
 
 
@@ -287,12 +311,18 @@ def _generate_terminal_entities(entity_count: int, rng: random.Random) -> List[A
     return entities
 
 
-def _generate_route_obstacles(obstacle_count: int, rng: random.Random) -> List[Dict[str, Any]]:
+def _generate_route_obstacles(
+    obstacle_count: int,
+    rng: random.Random,
+    *,
+    canvas_width: float = 980.0,
+    canvas_height: float = 560.0,
+) -> List[Dict[str, Any]]:
     count = max(1, int(obstacle_count))
     obstacles: List[Dict[str, Any]] = []
     for idx in range(count):
-        x = rng.uniform(5.0, 860.0)
-        y = rng.uniform(5.0, 460.0)
+        x = rng.uniform(5.0, canvas_width - 120.0)
+        y = rng.uniform(5.0, canvas_height - 100.0)
         w = rng.uniform(8.0, 120.0)
         h = rng.uniform(8.0, 120.0)
         obstacles.append(
@@ -350,7 +380,27 @@ def _synthetic_terminal_scan_operation(entity_count: int, seed: int) -> Callable
     return run
 
 
-def _synthetic_route_compute_operation(entity_count: int, seed: int) -> Callable[[], Dict[str, Any]]:
+def parse_route_engines(raw: str) -> List[str]:
+    engines: List[str] = []
+    for part in str(raw or "").split(","):
+        engine = part.strip().lower()
+        if not engine:
+            continue
+        if engine not in ROUTE_ENGINES:
+            raise ValueError(f"Unsupported route engine: {engine}")
+        if engine not in engines:
+            engines.append(engine)
+    if not engines:
+        raise ValueError("At least one route engine is required.")
+    return engines
+
+
+def _synthetic_route_compute_operation(
+    entity_count: int,
+    seed: int,
+    engine: str = "python",
+    grid_cache: bool = True,
+) -> Callable[[], Dict[str, Any]]:
     rng = random.Random(seed)
     obstacle_count = max(15, min(4500, entity_count // 20))
     obstacles = _generate_route_obstacles(obstacle_count, rng)
@@ -363,6 +413,43 @@ def _synthetic_route_compute_operation(entity_count: int, seed: int) -> Callable
         "canvasHeight": 560,
         "gridStep": 8,
         "obstacles": obstacles,
+        "engine": engine,
+        "gridCache": bool(grid_cache),
+    }
+
+    def run() -> Dict[str, Any]:
+        return compute_conduit_route(dict(payload))
+
+    return run
+
+
+def _synthetic_route_search_operation(
+    entity_count: int,
+    seed: int,
+    engine: str = "python",
+    search: str = "astar",
+) -> Callable[[], Dict[str, Any]]:
+    # Long diagonal across a large, sparsely obstructed sheet: the case where
+    # one-directional A* floods tied cells and the search mode matters most.
+    rng = random.Random(seed)
+    obstacle_count = max(20, min(400, entity_count // 250))
+    obstacles = _generate_route_obstacles(
+        obstacle_count,
+        rng,
+        canvas_width=ROUTE_SEARCH_CANVAS_WIDTH,
+        canvas_height=ROUTE_SEARCH_CANVAS_HEIGHT,
+    )
+    payload = {
+        "start": {"x": 20.0, "y": 20.0},
+        "end": {"x": ROUTE_SEARCH_CANVAS_WIDTH - 20.0, "y": ROUTE_SEARCH_CANVAS_HEIGHT - 20.0},
+        "mode": "plan_view",
+        "clearance": 18,
+        "canvasWidth": ROUTE_SEARCH_CANVAS_WIDTH,
+        "canvasHeight": ROUTE_SEARCH_CANVAS_HEIGHT,
+        "gridStep": 8,
+        "obstacles": obstacles,
+        "engine": engine,
+        "search": search,
     }
 
     def run() -> Dict[str, Any]:
@@ -377,8 +464,10 @@ def run_synthetic_suite(
     iterations: int,
     seed: int,
     scenario: str = "all",
+    route_engines: Sequence[str] = ("python",),
+    grid_cache: bool = True,
 ) -> Dict[str, Any]:
-    allowed_scenarios = {"all", "obstacle_scan", "terminal_scan", "route_compute"}
+    allowed_scenarios = {"all", "obstacle_scan", "terminal_scan", "route_compute", "route_search"}
     scenario_name = str(scenario or "all").strip().lower()
     if scenario_name not in allowed_scenarios:
         raise ValueError(f"Unsupported scenario: {scenario}")
@@ -386,6 +475,8 @@ def run_synthetic_suite(
     run_obstacle = scenario_name in {"all", "obstacle_scan"}
     run_terminal = scenario_name in {"all", "terminal_scan"}
     run_compute = scenario_name in {"all", "route_compute"}
+    # Large-canvas search comparison is slow with plain A*; run it on request only.
+    run_search = scenario_name == "route_search"
 
     operation_stats: List[_OperationStats] = []
     for idx, entity_count in enumerate(entity_counts):
@@ -407,13 +498,40 @@ def run_synthetic_suite(
                 )
             )
         if run_compute:
-            operation_stats.append(
-                _run_timed_operation(
-                    name=f"synthetic.route_compute.entities_{entity_count}",
-                    fn=_synthetic_route_compute_operation(entity_count, base_seed + 3),
-                    iterations=iterations,
+            for engine in route_engines:
+                operation_name = "route_compute" if engine == "python" else f"route_compute_{engine}"
+                # Start each case cold so the warmup run is the only grid build.
+                clear_cost_grid_cache()
+                operation_stats.append(
+                    _run_timed_operation(
+                        name=f"synthetic.{operation_name}.entities_{entity_count}",
+                        fn=_synthetic_route_compute_operation(
+                            entity_count,
+                            base_seed + 3,
+                            engine,
+                            grid_cache,
+                        ),
+                        iterations=iterations,
+                    )
                 )
-            )
+        if run_search:
+            for engine in route_engines:
+                for search in ROUTE_SEARCH_MODES:
+                    suffix = "" if engine == "python" else f"_{engine}"
+                    clear_cost_grid_cache()
+                    operation_stats.append(
+                        _run_timed_operation(
+                            name=f"synthetic.route_search_{search}{suffix}.entities_{entity_count}",
+                            fn=_synthetic_route_search_operation(
+                                entity_count,
+                                base_seed + 4,
+                                engine,
+                                search,
+                            ),
+                            iterations=iterations,
+                            track_memory=True,
+                        )
+                    )
 
     return _build_report(
         suite_kind="synthetic",
@@ -423,6 +541,8 @@ def run_synthetic_suite(
             "iterations": int(iterations),
             "seed": int(seed),
             "scenario": scenario_name,
+            "routeEngines": list(route_engines),
+            "gridCache": {"enabled": bool(grid_cache), **get_cost_grid_cache_stats()},
         },
     )
 
@@ -457,10 +577,15 @@ def load_replay_entries(snapshot_paths: Sequence[Path]) -> List[Dict[str, Any]]:
     return entries
 
 
-def _replay_compute_operation(entry: Dict[str, Any]) -> Callable[[], Dict[str, Any]]:
+def _replay_compute_operation(
+    entry: Dict[str, Any],
+    route_engine: Optional[str] = None,
+) -> Callable[[], Dict[str, Any]]:
     payload = entry.get("payload", entry)
     if not isinstance(payload, dict):
         raise ValueError("Replay compute entry requires an object payload.")
+    if route_engine:
+        payload = {**payload, "engine": route_engine}
 
     def run() -> Dict[str, Any]:
         return compute_conduit_route(dict(payload))
@@ -591,6 +716,7 @@ def run_replay_suite(
     entries: Sequence[Dict[str, Any]],
     iterations: int,
     strict: bool = False,
+    route_engine: Optional[str] = None,
 ) -> Dict[str, Any]:
     operation_stats: List[_OperationStats] = []
     skipped: List[str] = []
@@ -600,7 +726,7 @@ def run_replay_suite(
 
         try:
             if kind == "compute":
-                operation = _replay_compute_operation(entry)
+                operation = _replay_compute_operation(entry, route_engine)
             elif kind == "obstacle_scan":
                 operation = _replay_obstacle_scan_operation(entry)
             elif kind == "terminal_scan":
@@ -630,6 +756,8 @@ def run_replay_suite(
             "executedCount": len(operation_stats),
             "skippedCount": len(skipped),
             "skipped": skipped,
+            "routeEngine": route_engine or "",
+            "gridCache": get_cost_grid_cache_stats(),
         },
     )
     return report
@@ -655,6 +783,7 @@ def _build_report(
                 "sampleMeta": stats.sample_meta,
                 "sampleCode": stats.sample_code,
                 "sampleMessage": stats.sample_message,
+                "peakMemoryBytes": stats.peak_memory_bytes,
             }
         )
 
@@ -696,6 +825,19 @@ def _print_report(report: Dict[str, Any]) -> None:
         sample_code = str(result.get("sampleCode") or "")
         if sample_code:
             print(f"  sample_code={sample_code}")
+        peak_memory_bytes = result.get("peakMemoryBytes")
+        if isinstance(peak_memory_bytes, int):
+            print(f"  peak_memory={peak_memory_bytes / (1024 * 1024):.2f}MiB")
+        sample_meta = result.get("sampleMeta") if isinstance(result.get("sampleMeta"), dict) else {}
+        grid_cache = sample_meta.get("gridCache") if isinstance(sample_meta.get("gridCache"), dict) else {}
+        if grid_cache.get("enabled"):
+            print(
+                "  grid_cache hits={hits} misses={misses} evictions={evictions}".format(
+                    hits=grid_cache.get("hits", 0),
+                    misses=grid_cache.get("misses", 0),
+                    evictions=grid_cache.get("evictions", 0),
+                )
+            )
     print("-" * 88)
 
 
@@ -820,9 +962,19 @@ def _build_cli() -> argparse.ArgumentParser:
     synthetic.add_argument(
         "--scenario",
         default="all",
-        choices=["all", "obstacle_scan", "terminal_scan", "route_compute"],
+        choices=["all", "obstacle_scan", "terminal_scan", "route_compute", "route_search"],
         help="Benchmark scenario selection.",
     )
+    synthetic.add_argument(
+        "--route-engines",
+        default="python",
+        help="Comma-separated route compute engines to compare (python, numpy).",
+    )
+    synthetic.add_argument(
+        "--no-grid-cache",
+        action="store_true",
+        help="Rebuild the route cost grid on every compute iteration.",
+    )
     synthetic.add_argument(
         "--output",
         type=Path,
@@ -847,6 +999,12 @@ def _build_cli() -> argparse.ArgumentParser:
         action="store_true",
         help="Fail immediately if any entry is invalid.",
     )
+    replay.add_argument(
+        "--route-engine",
+        default=None,
+        choices=ROUTE_ENGINES,
+        help="Override the route compute engine for compute entries.",
+    )
     replay.add_argument(
         "--output",
         type=Path,
@@ -884,6 +1042,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             iterations=args.iterations,
             seed=args.seed,
             scenario=args.scenario,
+            route_engines=parse_route_engines(args.route_engines),
+            grid_cache=not bool(args.no_grid_cache),
         )
         _print_report(report)
         _write_report(report, args.output)
@@ -895,6 +1055,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             entries=entries,
             iterations=args.iterations,
             strict=bool(args.strict),
+            route_engine=args.route_engine,
         )
         _print_report(report)
         _write_report(report, args.output)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.route_groups.api_excel_report_writer import ExcelReportWriter
+
+_HEADERS = ["File", "Line", "Rule ID", "Before", "After"]
+_WIDTHS = [42, 10, 16, 60, 60]
+
+
+def generate_changes(count: int, *, seed: int) -> List[Dict[str, Any]]:
+    """Change rows shaped like batch find & replace apply results."""
+    rng = random.Random(seed)
+    changes: List[Dict[str, Any]] = []
+    for index in range(max(0, int(count))):
+        panel = f"PNL-{rng.randint(1, 60)}"
+        before = f"{panel} FEEDER CKT-{rng.randint(1, 84)} {'SPARE ' * rng.randint(0, 6)}".strip()
+        changes.append(
+            {
+                "file": f"schedule-{index % 400:04d}.txt",
+                "line": rng.randint(1, 5000),
+                "ruleId": f"rule-{rng.randint(1, 50)}",
+                "before": before,
+                "after": before.replace(panel, f"{panel}R"),
+            }
+        )
+    return changes
+
+
+def _row_values(change: Dict[str, Any]) -> List[Any]:
+    return [change["file"], change["line"], change["ruleId"], change["before"], change["after"]]
+
+
+def _write_in_memory(changes: Sequence[Dict[str, Any]], path: str) -> None:
+    # Regular workbook with per-cell style objects, as the change report was
+    # built before ExcelReportWriter.
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Changes"
+    side = Side(style="thin", color="B0ADA8")
+    border = Border(left=side, right=side, top=side, bottom=side)
+    fills = (PatternFill("solid", fgColor="E8E6E2"), PatternFill("solid", fgColor="D4D1CC"))
+    font = Font(size=10, color="2A2A2A", name="Arial")
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(_HEADERS))
+    ws.cell(row=1, column=1, value="Batch Find & Replace Change Report")
+    for col_idx, header in enumerate(_HEADERS, start=1):
+        ws.cell(row=2, column=col_idx, value=header)
+    for row_idx, change in enumerate(changes, start=3):
+        for col_idx, value in enumerate(_row_values(change), start=1):
+            cell = ws.cell(row=row_idx, column=col_idx, value=value)
+            cell.fill = fills[(row_idx - 3) % 2]
+            cell.border = border
+            cell.font = font
+            cell.alignment = Alignment(
+                horizontal="right" if col_idx == 2 else "left",
+                vertical="top",
+                wrap_text=col_idx != 2,
+            )
+    wb.save(path)
+
+
+def _write_streaming(changes: Sequence[Dict[str, Any]], path: str) -> None:
+    writer = ExcelReportWriter()
+    sheet = writer.add_sheet("Changes", column_widths=_WIDTHS, freeze_panes="A3")
+    sheet.title_row("Batch Find & Replace Change Report")
+    sheet.header_row(_HEADERS)
+    sheet.data_rows((_row_values(change) for change in changes), kinds=("text", "number", "text", "text", "text"))
+    writer.save(path)
+
+
+def _measure(write: Callable[[str], None], path: str, iterations: int) -> Dict[str, Any]:
+    durations: List[float] = []
+    peaks: List[int] = []
+    for _ in range(max(1, int(iterations))):
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        write(path)
+        durations.append((time.perf_counter() - started_at) * 1000.0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"stats": _summarize_durations(durations), "peakBytes": max(peaks), "sizeBytes": os.path.getsize(path)}
+
+
+def _sheet_values(path: str) -> List[Any]:
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook["Changes"].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def run_excel_report_benchmark(*, rows: int, iterations: int, seed: int) -> Dict[str, Any]:
+    """Compare peak memory and time of the in-memory and streaming report writers."""
+    changes = generate_changes(rows, seed=seed)
+    with tempfile.TemporaryDirectory(prefix="excel_report_benchmark_") as temp_dir:
+        in_memory_path = os.path.join(temp_dir, "in_memory.xlsx")
+        streaming_path = os.path.join(temp_dir, "streaming.xlsx")
+        in_memory = _measure(lambda path: _write_in_memory(changes, path), in_memory_path, iterations)
+        streaming = _measure(lambda path: _write_streaming(changes, path), streaming_path, iterations)
+        results_match = _sheet_values(in_memory_path) == _sheet_values(streaming_path)
+
+    return {
+        "name": f"excel_report.rows_{len(changes)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "rowCount": len(changes),
+        "iterations": max(1, int(iterations)),
+        "inMemory": in_memory,
+        "streaming": streaming,
+        "peakMemoryRatio": round(in_memory["peakBytes"] / streaming["peakBytes"], 2) if streaming["peakBytes"] else 0.0,
+        "resultsMatch": results_match,
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark for the streaming Excel change report writer.",
+    )
+    parser.add_argument("--rows", type=int, default=20000, help="Change rows written per iteration.")
+    parser.add_argument("--iterations", type=int, default=1, help="Timed iterations per writer.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated change rows.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_excel_report_benchmark(rows=args.rows, iterations=args.iterations, seed=args.seed)
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    return 0 if report["resultsMatch"] else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
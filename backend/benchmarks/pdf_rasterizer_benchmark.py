@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.route_groups.pdf_rasterizer import PdfRasterizer, available_pdf_rasterizers
+
+
+def _drawing_content(rng: random.Random, *, page_width: int, page_height: int) -> bytes:
+    # Line work plus a title block, roughly what a plotted sheet looks like.
+    parts: List[str] = ["0.4 w"]
+    for _ in range(400):
+        x1, y1 = rng.uniform(36, page_width - 36), rng.uniform(36, page_height - 36)
+        x2, y2 = x1 + rng.uniform(-120, 120), y1 + rng.uniform(-120, 120)
+        parts.append(f"{x1:.1f} {y1:.1f} m {x2:.1f} {y2:.1f} l S")
+    parts.append(f"1 0 0 RG 2 w {page_width * 0.3:.1f} {page_height * 0.5:.1f} 160 90 re S 0 0 0 RG")
+    parts.append(f"{page_width - 400} 36 364 150 re S")
+    for row, label in enumerate(("DRAWING NO: E1-%03d" % rng.randint(100, 999), "ONE-LINE DIAGRAM", "REV: 3")):
+        parts.append(f"BT /F1 12 Tf {page_width - 380} {160 - row * 30} Td ({label}) Tj ET")
+    return "\n".join(parts).encode("latin-1")
+
+
+def build_fixture_pdf(*, seed: int, page_width: int = 1224, page_height: int = 792) -> bytes:
+    """One-page 17x11 in. drawing-like PDF, built without a PDF library."""
+    content = _drawing_content(random.Random(seed), page_width=page_width, page_height=page_height)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>" % (page_width, page_height),
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def write_fixture_pdfs(folder: Path, count: int, *, seed: int) -> List[Path]:
+    folder.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for index in range(max(1, int(count))):
+        path = folder / f"E1-{100 + index}.pdf"
+        path.write_bytes(build_fixture_pdf(seed=seed + index))
+        paths.append(path)
+    return paths
+
+
+def _time_rasterizer(
+    rasterizer: PdfRasterizer,
+    pdf_paths: Sequence[Path],
+    *,
+    dpi: int,
+    iterations: int,
+) -> Dict[str, Any]:
+    durations: List[float] = []
+    sizes: List[Optional[List[int]]] = []
+    failures = 0
+    for iteration in range(max(1, int(iterations))):
+        for pdf_path in pdf_paths:
+            started_at = time.perf_counter()
+            image = rasterizer.render(str(pdf_path), page_index=0, dpi=dpi)
+            durations.append((time.perf_counter() - started_at) * 1000.0)
+            if image is None:
+                failures += 1
+                if iteration == 0:
+                    sizes.append(None)
+                continue
+            if iteration == 0:
+                sizes.append(list(image.size))
+            image.close()
+    return {"engine": rasterizer.engine, "stats": _summarize_durations(durations), "failures": failures, "sizes": sizes}
+
+
+def run_pdf_rasterizer_benchmark(
+    *,
+    documents: int,
+    iterations: int,
+    dpi: int,
+    seed: int,
+    fixtures_dir: Optional[Path] = None,
+    rasterizers: Optional[Sequence[PdfRasterizer]] = None,
+) -> Dict[str, Any]:
+    """Time first-page renders to in-memory images for each installed rasterizer."""
+    candidates = list(rasterizers) if rasterizers is not None else available_pdf_rasterizers()
+    with tempfile.TemporaryDirectory(prefix="pdf_rasterizer_benchmark_") as temp_dir:
+        if fixtures_dir is not None:
+            pdf_paths = sorted(Path(fixtures_dir).rglob("*.pdf"))[: max(1, int(documents))]
+        else:
+            pdf_paths = write_fixture_pdfs(Path(temp_dir), documents, seed=seed)
+        results = {
+            rasterizer.name: _time_rasterizer(rasterizer, pdf_paths, dpi=dpi, iterations=iterations)
+            for rasterizer in candidates
+        }
+
+    size_lists = [result.pop("sizes") for result in results.values()]
+    report: Dict[str, Any] = {
+        "name": f"pdf_rasterizer.documents_{len(pdf_paths)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "documentCount": len(pdf_paths),
+        "iterations": max(1, int(iterations)),
+        "dpi": int(dpi),
+        "rasterizers": results,
+        # Anti-aliasing differs between engines, so only page sizes are compared.
+        "sizesMatch": all(sizes == size_lists[0] for sizes in size_lists),
+    }
+    baseline = results.get("pdftoppm")
+    if baseline is not None:
+        for name, result in results.items():
+            if name != "pdftoppm" and result["stats"]["meanMs"] > 0:
+                report[f"{name}Speedup"] = round(baseline["stats"]["meanMs"] / result["stats"]["meanMs"], 2)
+    return report
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark for in-process vs pdftoppm PDF page rasterization.",
+    )
+    parser.add_argument("--documents", type=int, default=20, help="Fixture PDFs rendered per iteration.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed passes over the fixture set.")
+    parser.add_argument("--dpi", type=int, default=150, help="Render resolution.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated fixture PDFs.")
+    parser.add_argument("--fixtures", default=None, help="Optional folder of real PDFs to render instead.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_pdf_rasterizer_benchmark(
+        documents=args.documents,
+        iterations=args.iterations,
+        dpi=args.dpi,
+        seed=args.seed,
+        fixtures_dir=Path(args.fixtures).resolve() if args.fixtures else None,
+    )
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    failed = any(result["failures"] for result in report["rasterizers"].values())
+    return 0 if report["sizesMatch"] and not failed else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
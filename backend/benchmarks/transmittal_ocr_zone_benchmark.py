@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.benchmarks.pdf_rasterizer_benchmark import write_fixture_pdfs
+from backend.route_groups.api_transmittal_pdf_analysis import (
+    _OCR_RENDER_DPI,
+    _TITLE_BLOCK_ZONE_OCR_DPI,
+    _title_block_ocr_regions,
+)
+from backend.route_groups.pdf_rasterizer import PdfRasterizer, available_pdf_rasterizers
+from backend.route_groups.pdf_text_extraction import PDF_REGION_RENDER_DPI
+
+# The fixture sheets are 17x11 in.
+_PAGE_WIDTH = 1224.0
+_PAGE_HEIGHT = 792.0
+
+# (strategy, dpi, zones); ``None`` zones means the whole page.
+_STRATEGIES: Tuple[Tuple[str, int, Optional[Tuple[int, ...]]], ...] = (
+    ("full_page", _OCR_RENDER_DPI, None),
+    ("legacy_both_corners", PDF_REGION_RENDER_DPI, (0, 1)),
+    ("right_corner", _TITLE_BLOCK_ZONE_OCR_DPI, (0,)),
+    ("both_corners", _TITLE_BLOCK_ZONE_OCR_DPI, (0, 1)),
+)
+
+
+def _pixel_crop(region: Dict[str, float], *, dpi: int) -> Dict[str, int]:
+    # Regions are PDF points from the bottom-left; crops are pixels from the top-left.
+    scale = dpi / 72.0
+    return {
+        "left": int(round(region["x"] * scale)),
+        "top": int(round((_PAGE_HEIGHT - region["y"] - region["height"]) * scale)),
+        "width": int(round(region["width"] * scale)),
+        "height": int(round(region["height"] * scale)),
+    }
+
+
+def _time_strategy(
+    rasterizer: PdfRasterizer,
+    pdf_paths: Sequence[Path],
+    *,
+    dpi: int,
+    zones: Optional[Tuple[int, ...]],
+    iterations: int,
+) -> Dict[str, Any]:
+    regions = _title_block_ocr_regions(_PAGE_WIDTH, _PAGE_HEIGHT)
+    crops: List[Optional[Dict[str, int]]] = [None] if zones is None else [_pixel_crop(regions[i], dpi=dpi) for i in zones]
+    durations: List[float] = []
+    pixels = 0
+    failures = 0
+    for iteration in range(max(1, int(iterations))):
+        for pdf_path in pdf_paths:
+            started_at = time.perf_counter()
+            images = [rasterizer.render(str(pdf_path), page_index=0, dpi=dpi, crop=crop) for crop in crops]
+            durations.append((time.perf_counter() - started_at) * 1000.0)
+            for image in images:
+                if image is None:
+                    failures += 1
+                    continue
+                if iteration == 0:
+                    pixels += image.size[0] * image.size[1]
+                image.close()
+    return {
+        "dpi": int(dpi),
+        "renders": len(crops),
+        "pixelsPerDocument": pixels // max(1, len(pdf_paths)),
+        "stats": _summarize_durations(durations),
+        "failures": failures,
+    }
+
+
+def run_transmittal_ocr_zone_benchmark(
+    *,
+    documents: int,
+    iterations: int,
+    seed: int,
+    rasterizers: Optional[Sequence[PdfRasterizer]] = None,
+) -> Dict[str, Any]:
+    """Compare the pixels and render time of each title-block OCR pass on fixture sheets."""
+    candidates = list(rasterizers) if rasterizers is not None else available_pdf_rasterizers()
+    with tempfile.TemporaryDirectory(prefix="transmittal_ocr_zone_benchmark_") as temp_dir:
+        pdf_paths = write_fixture_pdfs(Path(temp_dir), documents, seed=seed)
+        results = {
+            rasterizer.name: {
+                strategy: _time_strategy(rasterizer, pdf_paths, dpi=dpi, zones=zones, iterations=iterations)
+                for strategy, dpi, zones in _STRATEGIES
+            }
+            for rasterizer in candidates
+        }
+
+    for strategies in results.values():
+        full_page_pixels = strategies["full_page"]["pixelsPerDocument"]
+        for result in strategies.values():
+            result["pixelRatio"] = round(result["pixelsPerDocument"] / full_page_pixels, 3) if full_page_pixels else 0.0
+    return {
+        "name": f"transmittal_ocr_zone.documents_{len(pdf_paths)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "documentCount": len(pdf_paths),
+        "iterations": max(1, int(iterations)),
+        "rasterizers": results,
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark for the pixels rendered by each transmittal title-block OCR pass.",
+    )
+    parser.add_argument("--documents", type=int, default=10, help="Fixture PDFs rendered per iteration.")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed passes over the fixture set.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated fixture PDFs.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_transmittal_ocr_zone_benchmark(documents=args.documents, iterations=args.iterations, seed=args.seed)
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    # The first zone pass has to render fewer pixels than the full page it replaces.
+    for strategies in report["rasterizers"].values():
+        if any(result["failures"] for result in strategies.values()):
+            return 1
+        if strategies["right_corner"]["pixelRatio"] >= 1.0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
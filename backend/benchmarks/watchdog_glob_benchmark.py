@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.watchdog.filesystem import GlobMatcher
+
+DEFAULT_INCLUDE_GLOBS = ["*.dwg", "*.dxf", "*.pdf", "*.xlsx", "**/Sheets/*.dwg", "E-???-*.dwg"]
+DEFAULT_EXCLUDE_GLOBS = [
+    "**/.git/**",
+    "**/node_modules/**",
+    "**/.venv/**",
+    "**/__pycache__/**",
+    "**/coverage/**",
+    "**/dist/**",
+    "*.bak",
+    "~$*",
+    "plot.log",
+]
+_EXTENSIONS = [".dwg", ".dwg", ".pdf", ".xlsx", ".dxf", ".bak", ".txt", ".log", ".sv$"]
+_FOLDERS = ["Sheets", "Xrefs", "Calcs", "Submittals", "node_modules", ".git", "dist", "Archive"]
+
+
+def generate_paths(path_count: int, *, seed: int) -> List[Tuple[str, str]]:
+    """(relativePath, name) pairs shaped like a project share."""
+    rng = random.Random(seed)
+    paths: List[Tuple[str, str]] = []
+    for index in range(max(0, int(path_count))):
+        depth = rng.randint(0, 4)
+        folders = [f"PROJ-{rng.randint(1, 40):05d}"] + [rng.choice(_FOLDERS) for _ in range(depth)]
+        stem = rng.choice(["E-", "M-", "~$", "", "plot"]) + f"{rng.randint(100, 999)}-sheet-{index % 500}"
+        name = stem + rng.choice(_EXTENSIONS)
+        paths.append(("/".join([*folders, name]), name))
+    return paths
+
+
+def _fnmatch_matches_any(patterns: Sequence[str], rel_path: str, name: str) -> bool:
+    # Per-call normalization and fnmatch, as `matches_any` worked before GlobMatcher.
+    rel = rel_path.lower()
+    filename = name.lower()
+    for pattern in patterns:
+        normalized = pattern.replace("\\", "/").lower()
+        if fnmatch.fnmatch(rel, normalized):
+            return True
+        if fnmatch.fnmatch(filename, normalized):
+            return True
+    return False
+
+
+def _time_runs(run: Any, iterations: int) -> Tuple[List[float], int]:
+    durations: List[float] = []
+    included = 0
+    for _ in range(max(1, int(iterations))):
+        started_at = time.perf_counter()
+        included = run()
+        durations.append((time.perf_counter() - started_at) * 1000.0)
+    return durations, included
+
+
+def run_glob_benchmark(
+    *,
+    path_count: int,
+    iterations: int,
+    seed: int,
+    include_globs: Sequence[str] = DEFAULT_INCLUDE_GLOBS,
+    exclude_globs: Sequence[str] = DEFAULT_EXCLUDE_GLOBS,
+) -> Dict[str, Any]:
+    """Time include/exclude filtering with fnmatch loops versus a compiled GlobMatcher."""
+    paths = generate_paths(path_count, seed=seed)
+
+    def run_fnmatch() -> int:
+        included = 0
+        for rel_path, name in paths:
+            if include_globs and not _fnmatch_matches_any(include_globs, rel_path, name):
+                continue
+            if exclude_globs and _fnmatch_matches_any(exclude_globs, rel_path, name):
+                continue
+            included += 1
+        return included
+
+    def run_compiled() -> int:
+        include_matcher = GlobMatcher(include_globs)
+        exclude_matcher = GlobMatcher(exclude_globs)
+        included = 0
+        for rel_path, name in paths:
+            if include_matcher and not include_matcher.matches(rel_path, name):
+                continue
+            if exclude_matcher and exclude_matcher.matches(rel_path, name):
+                continue
+            included += 1
+        return included
+
+    fnmatch_durations, fnmatch_included = _time_runs(run_fnmatch, iterations)
+    compiled_durations, compiled_included = _time_runs(run_compiled, iterations)
+    fnmatch_summary = _summarize_durations(fnmatch_durations)
+    compiled_summary = _summarize_durations(compiled_durations)
+    speedup = (
+        fnmatch_summary["meanMs"] / compiled_summary["meanMs"] if compiled_summary["meanMs"] > 0 else 0.0
+    )
+    return {
+        "name": f"watchdog.glob_match.paths_{len(paths)}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "pathCount": len(paths),
+        "includeGlobs": list(include_globs),
+        "excludeGlobs": list(exclude_globs),
+        "iterations": len(compiled_durations),
+        "fnmatch": {"stats": fnmatch_summary, "included": fnmatch_included},
+        "compiled": {"stats": compiled_summary, "included": compiled_included},
+        "speedup": round(speedup, 2),
+        "resultsMatch": fnmatch_included == compiled_included,
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark for Watchdog include/exclude glob matching.",
+    )
+    parser.add_argument("--paths", type=int, default=100_000, help="Synthetic relative paths per iteration.")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed iterations per matcher.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated paths.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_glob_benchmark(
+        path_count=args.paths,
+        iterations=args.iterations,
+        seed=args.seed,
+    )
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    return 0 if report["resultsMatch"] else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
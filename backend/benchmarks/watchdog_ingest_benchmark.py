@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.benchmarks.conduit_route_benchmark import _summarize_durations
+from backend.watchdog.store import WatchdogLedger
+
+EVENT_TYPES = ["file_added", "file_modified", "file_removed", "drawing_opened", "drawing_closed"]
+BENCHMARK_USER_KEY = "benchmark-user"
+BENCHMARK_COLLECTOR_ID = "benchmark-collector"
+
+
+def generate_events(
+    event_count: int,
+    *,
+    duplicate_ratio: float,
+    seed: int,
+    start_ms: int = 1_700_000_000_000,
+) -> List[Dict[str, Any]]:
+    """Collector-shaped events; `duplicate_ratio` of them repeat an earlier key."""
+    rng = random.Random(seed)
+    duplicate_ratio = max(0.0, min(0.95, float(duplicate_ratio)))
+    events: List[Dict[str, Any]] = []
+    for index in range(max(0, int(event_count))):
+        if events and rng.random() < duplicate_ratio:
+            events.append(dict(rng.choice(events)))
+            continue
+        timestamp = start_ms + index * rng.randint(50, 2000)
+        project_id = f"PROJ-{rng.randint(1, 12):05d}"
+        events.append(
+            {
+                "eventKey": f"evt-{seed}-{index}",
+                "eventType": rng.choice(EVENT_TYPES),
+                "sourceType": "filesystem",
+                "timestamp": timestamp,
+                "projectId": project_id,
+                "path": f"C:\\Users\\Dev\\Projects\\{project_id}\\sheet-{index % 400}.dwg",
+                "sizeBytes": rng.randint(1_000, 5_000_000),
+                "mtimeMs": timestamp,
+                "metadata": {"sequence": index},
+            }
+        )
+    return events
+
+
+def run_ingest_benchmark(
+    *,
+    event_count: int,
+    batch_size: int,
+    duplicate_ratio: float,
+    iterations: int,
+    seed: int,
+    max_events_retained: int,
+) -> Dict[str, Any]:
+    """Time `WatchdogLedger.insert_events` over a fresh database per iteration."""
+    events = generate_events(event_count, duplicate_ratio=duplicate_ratio, seed=seed)
+    batch_size = max(1, int(batch_size))
+    durations: List[float] = []
+    sample: Dict[str, Any] = {}
+
+    for _ in range(max(1, int(iterations))):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = WatchdogLedger(db_path=Path(temp_dir) / "watchdog.sqlite3")
+            inserted = 0
+            duplicates = 0
+            started_at = time.perf_counter()
+            for offset in range(0, len(events), batch_size):
+                result = ledger.insert_events(
+                    BENCHMARK_USER_KEY,
+                    collector_id=BENCHMARK_COLLECTOR_ID,
+                    events=events[offset : offset + batch_size],
+                    max_events_retained=max_events_retained,
+                )
+                inserted += len(result["events"])
+                duplicates += int(result["duplicates"])
+            durations.append((time.perf_counter() - started_at) * 1000.0)
+            sample = {"inserted": inserted, "duplicates": duplicates}
+
+    summary = _summarize_durations(durations)
+    events_per_second = (
+        (len(events) / (summary["meanMs"] / 1000.0)) if summary["meanMs"] > 0 else 0.0
+    )
+    return {
+        "name": f"watchdog.insert_events.events_{len(events)}.batch_{batch_size}",
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "eventCount": len(events),
+        "batchSize": batch_size,
+        "duplicateRatio": duplicate_ratio,
+        "iterations": len(durations),
+        "stats": summary,
+        "eventsPerSecond": round(events_per_second, 1),
+        "sampleMeta": sample,
+    }
+
+
+def _write_report(report: Dict[str, Any], output: Optional[Path]) -> None:
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if output is None:
+        print(rendered)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(rendered + "\n", encoding="utf-8")
+    print(f"Wrote report to {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark for Watchdog ledger event ingestion.",
+    )
+    parser.add_argument("--events", type=int, default=10000, help="Events per iteration.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Events per insert_events call.")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="Share of events repeating an earlier key.")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed iterations, each on a fresh database.")
+    parser.add_argument("--max-events-retained", type=int, default=1_000_000, help="Retention cap passed to the ledger.")
+    parser.add_argument("--seed", type=int, default=1337, help="Random seed for generated events.")
+    parser.add_argument("--output", default=None, help="Optional output report JSON path.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    report = run_ingest_benchmark(
+        event_count=args.events,
+        batch_size=args.batch_size,
+        duplicate_ratio=args.duplicate_ratio,
+        iterations=args.iterations,
+        seed=args.seed,
+        max_events_retained=args.max_events_retained,
+    )
+    _write_report(report, Path(args.output).resolve() if args.output else None)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -18,8 +18,9 @@ from .api_autocad_error_helpers import (
     log_autocad_exception as autocad_log_exception,
 )
 from .api_autocad_terminal_scan import scan_terminal_strips
-from .api_conduit_route_compute import compute_conduit_route
+from .api_conduit_route_compute import compute_conduit_route, compute_conduit_route_batch
 from .api_conduit_route_obstacle_scan import scan_conduit_obstacles
+from .api_conduit_route_spatial_index import query_obstacles_near_point
 from .api_autocad_entity_geometry import entity_bbox
 from .api_autocad_terminal_route_plot import canonicalize_route_for_sync
 
@@ -1620,42 +1621,26 @@ def create_autocad_blueprint(
                     exc=cleanup_exc,
                 )
 
-    @bp.route("/conduit-route/route/compute", methods=["POST"])
-    @require_autocad_auth
-    @limiter.limit("1800 per hour")
-    def api_conduit_route_route_compute():
-        """Compute a conduit route path for yard-routing workflow requests."""
-        remote_addr = str(request.remote_addr or "unknown")
-        auth_mode = str(getattr(g, "autocad_auth_mode", "unknown") or "unknown")
-        request_id = _request_correlation_id()
-
-        if not request.is_json:
-            return _error_response(
-                code="INVALID_REQUEST",
-                message="Expected application/json payload.",
-                status_code=400,
-                request_id=request_id,
-                meta={"stage": "route_compute.validation"},
-            )
-
-        payload = request.get_json(silent=True)
-        if not isinstance(payload, dict):
-            return _error_response(
-                code="INVALID_REQUEST",
-                message="Request payload must be a JSON object.",
-                status_code=400,
-                request_id=request_id,
-                meta={"stage": "route_compute.validation"},
-            )
+    def _resolve_route_compute_obstacles(
+        payload: Dict[str, Any],
+        *,
+        remote_addr: str,
+        auth_mode: str,
+        request_id: str,
+        stage_prefix: str,
+    ):
+        """Resolve client or AutoCAD-scanned obstacles for route compute requests.
 
+        Returns `(context, None)` on success or `(None, error_response)`.
+        """
         obstacle_source = str(payload.get("obstacleSource", "client") or "client").strip().lower()
         if obstacle_source not in {"client", "autocad"}:
-            return _error_response(
+            return None, _error_response(
                 code="INVALID_REQUEST",
                 message="obstacleSource must be 'client' or 'autocad'.",
                 status_code=400,
                 request_id=request_id,
-                meta={"stage": "route_compute.validation"},
+                meta={"stage": f"{stage_prefix}.validation"},
             )
 
         resolved_payload = dict(payload)
@@ -1685,12 +1670,12 @@ def create_autocad_blueprint(
             try:
                 max_entities = int(max_entities_raw)
             except Exception:
-                return _error_response(
+                return None, _error_response(
                     code="INVALID_REQUEST",
                     message="obstacleScan.maxEntities must be an integer.",
                     status_code=400,
                     request_id=request_id,
-                    meta={"stage": "route_compute.obstacle_scan.validation"},
+                    meta={"stage": f"{stage_prefix}.obstacle_scan.validation"},
                 )
             max_entities = max(500, min(200000, max_entities))
 
@@ -1700,12 +1685,12 @@ def create_autocad_blueprint(
                 canvas_width = max(120.0, float(canvas_width_raw))
                 canvas_height = max(120.0, float(canvas_height_raw))
             except Exception:
-                return _error_response(
+                return None, _error_response(
                     code="INVALID_REQUEST",
                     message="canvasWidth/canvasHeight must be numbers.",
                     status_code=400,
                     request_id=request_id,
-                    meta={"stage": "route_compute.obstacle_scan.validation"},
+                    meta={"stage": f"{stage_prefix}.obstacle_scan.validation"},
                 )
 
             layer_names, layer_type_overrides, layer_rules_meta = _resolve_obstacle_layer_rules(
@@ -1766,13 +1751,13 @@ def create_autocad_blueprint(
                         str(exc),
                     )
                     if not conduit_allow_com_fallback:
-                        return _error_response(
+                        return None, _error_response(
                             code="DOTNET_BRIDGE_FAILED",
                             message=".NET obstacle scan via the in-process ACADE host failed.",
                             status_code=503,
                             request_id=request_id,
                             meta={
-                                "stage": "route_compute.obstacle_scan.dotnet",
+                                "stage": f"{stage_prefix}.obstacle_scan.dotnet",
                                 "providerPath": "dotnet",
                                 "providerConfigured": conduit_provider,
                             },
@@ -1788,13 +1773,14 @@ def create_autocad_blueprint(
                         auth_mode,
                     )
                     return (
+                        None,
                         _error_response(
                             code="AUTOCAD_DRAWING_NOT_OPEN",
                             message="No drawing open in AutoCAD.",
                             status_code=503,
                             request_id=request_id,
                             meta={
-                                "stage": "route_compute.obstacle_scan.status",
+                                "stage": f"{stage_prefix}.obstacle_scan.status",
                                 "providerPath": "com",
                             },
                         )
@@ -1806,13 +1792,14 @@ def create_autocad_blueprint(
                         auth_mode,
                     )
                     return (
+                        None,
                         _error_response(
                             code="COM_UNAVAILABLE",
                             message="AutoCAD COM bridge unavailable on this platform.",
                             status_code=503,
                             request_id=request_id,
                             meta={
-                                "stage": "route_compute.obstacle_scan.status",
+                                "stage": f"{stage_prefix}.obstacle_scan.status",
                                 "providerPath": "com",
                             },
                         )
@@ -1823,13 +1810,13 @@ def create_autocad_blueprint(
                     pythoncom.CoInitialize()
                     acad = connect_autocad()
                     if acad is None:
-                        return _error_response(
+                        return None, _error_response(
                             code="AUTOCAD_CONNECT_FAILED",
                             message="Cannot connect to AutoCAD.",
                             status_code=503,
                             request_id=request_id,
                             meta={
-                                "stage": "route_compute.obstacle_scan.connect",
+                                "stage": f"{stage_prefix}.obstacle_scan.connect",
                                 "providerPath": "com",
                             },
                         )
@@ -1837,13 +1824,13 @@ def create_autocad_blueprint(
                     doc = dyn(acad.ActiveDocument)
                     modelspace = dyn(doc.ModelSpace)
                     if doc is None or modelspace is None:
-                        return _error_response(
+                        return None, _error_response(
                             code="AUTOCAD_DOCUMENT_UNAVAILABLE",
                             message="Cannot access ActiveDocument or ModelSpace.",
                             status_code=503,
                             request_id=request_id,
                             meta={
-                                "stage": "route_compute.obstacle_scan.connect",
+                                "stage": f"{stage_prefix}.obstacle_scan.connect",
                                 "providerPath": "com",
                             },
                         )
@@ -1872,50 +1859,119 @@ def create_autocad_blueprint(
                         pythoncom.CoUninitialize()
                     except Exception as cleanup_exc:
                         _log_ignored_exception(
-                            stage="route_compute_obstacle_scan_cleanup",
+                            stage=f"{stage_prefix}_obstacle_scan_cleanup",
                             reason="CoUninitialize failed",
                             exc=cleanup_exc,
                         )
 
+        return (
+            {
+                "obstacleSource": obstacle_source,
+                "resolvedPayload": resolved_payload,
+                "obstacleScanResult": obstacle_scan_result,
+                "obstacleScanMs": obstacle_scan_elapsed_ms,
+                "layerRulesMeta": layer_rules_meta,
+            },
+            None,
+        )
+
+    def _attach_route_compute_context(
+        result: Dict[str, Any],
+        *,
+        context: Dict[str, Any],
+        elapsed_ms: int,
+        request_id: str,
+    ) -> None:
+        obstacle_source = context["obstacleSource"]
+        obstacle_scan_result = context["obstacleScanResult"]
+        layer_rules_meta = context["layerRulesMeta"]
+
+        merged_warnings: list[str] = []
+        if obstacle_scan_result:
+            merged_warnings.extend(obstacle_scan_result.get("warnings", []) or [])
+            if not obstacle_scan_result.get("success"):
+                merged_warnings.append(obstacle_scan_result.get("message", "No AutoCAD obstacles found."))
+        merged_warnings.extend(result.get("warnings", []) or [])
+        if merged_warnings:
+            # Keep warning order but drop duplicates.
+            result["warnings"] = list(dict.fromkeys(str(entry) for entry in merged_warnings if str(entry).strip()))
+
+        result["meta"] = {
+            **(result.get("meta", {}) or {}),
+            "requestMs": elapsed_ms,
+            "source": "backend",
+            "obstacleSource": obstacle_source,
+            "obstacleScanMs": context["obstacleScanMs"],
+            "resolvedObstacleCount": len((context["resolvedPayload"].get("obstacles") or [])),
+            "requestId": request_id,
+        }
+        if obstacle_source == "autocad":
+            result["meta"]["obstacleLayerPreset"] = layer_rules_meta.get("appliedPreset") or ""
+            result["meta"]["obstacleLayerRuleSummary"] = layer_rules_meta
+
+        if obstacle_scan_result:
+            result["meta"]["obstacleScan"] = obstacle_scan_result.get("meta", {})
+            if isinstance(result.get("data"), dict):
+                result["data"]["resolvedObstacles"] = obstacle_scan_result.get("data", {}).get(
+                    "obstacles",
+                    [],
+                )
+                result["data"]["obstacleViewport"] = obstacle_scan_result.get("data", {}).get(
+                    "viewport",
+                    {},
+                )
+
+    @bp.route("/conduit-route/route/compute", methods=["POST"])
+    @require_autocad_auth
+    @limiter.limit("1800 per hour")
+    def api_conduit_route_route_compute():
+        """Compute a conduit route path for yard-routing workflow requests."""
+        remote_addr = str(request.remote_addr or "unknown")
+        auth_mode = str(getattr(g, "autocad_auth_mode", "unknown") or "unknown")
+        request_id = _request_correlation_id()
+
+        if not request.is_json:
+            return _error_response(
+                code="INVALID_REQUEST",
+                message="Expected application/json payload.",
+                status_code=400,
+                request_id=request_id,
+                meta={"stage": "route_compute.validation"},
+            )
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return _error_response(
+                code="INVALID_REQUEST",
+                message="Request payload must be a JSON object.",
+                status_code=400,
+                request_id=request_id,
+                meta={"stage": "route_compute.validation"},
+            )
+
+        context, error_response = _resolve_route_compute_obstacles(
+            payload,
+            remote_addr=remote_addr,
+            auth_mode=auth_mode,
+            request_id=request_id,
+            stage_prefix="route_compute",
+        )
+        if error_response is not None:
+            return error_response
+        obstacle_source = context["obstacleSource"]
+        resolved_payload = context["resolvedPayload"]
+
         started_at = time.time()
         try:
             result = compute_conduit_route(resolved_payload)
             elapsed_ms = int((time.time() - started_at) * 1000)
 
-            merged_warnings: list[str] = []
-            if obstacle_scan_result:
-                merged_warnings.extend(obstacle_scan_result.get("warnings", []) or [])
-                if not obstacle_scan_result.get("success"):
-                    merged_warnings.append(obstacle_scan_result.get("message", "No AutoCAD obstacles found."))
-            merged_warnings.extend(result.get("warnings", []) or [])
-            if merged_warnings:
-                # Keep warning order but drop duplicates.
-                result["warnings"] = list(dict.fromkeys(str(entry) for entry in merged_warnings if str(entry).strip()))
-
-            result["meta"] = {
-                **(result.get("meta", {}) or {}),
-                "requestMs": elapsed_ms,
-                "source": "backend",
-                "obstacleSource": obstacle_source,
-                "obstacleScanMs": obstacle_scan_elapsed_ms,
-                "resolvedObstacleCount": len((resolved_payload.get("obstacles") or [])),
-                "requestId": request_id,
-            }
-            if obstacle_source == "autocad":
-                result["meta"]["obstacleLayerPreset"] = layer_rules_meta.get("appliedPreset") or ""
-                result["meta"]["obstacleLayerRuleSummary"] = layer_rules_meta
-
-            if obstacle_scan_result:
-                result["meta"]["obstacleScan"] = obstacle_scan_result.get("meta", {})
-                if isinstance(result.get("data"), dict):
-                    result["data"]["resolvedObstacles"] = obstacle_scan_result.get("data", {}).get(
-                        "obstacles",
-                        [],
-                    )
-                    result["data"]["obstacleViewport"] = obstacle_scan_result.get("data", {}).get(
-                        "viewport",
-                        {},
-                    )
+            _attach_route_compute_context(
+                result,
+                context=context,
+                elapsed_ms=elapsed_ms,
+                request_id=request_id,
+            )
 
             if result.get("success"):
                 logger.info(
@@ -1959,6 +2015,99 @@ def create_autocad_blueprint(
                 meta={"stage": "route_compute", "providerConfigured": conduit_provider},
             )
 
+    @bp.route("/conduit-route/route/compute-batch", methods=["POST"])
+    @require_autocad_auth
+    @limiter.limit("600 per hour")
+    def api_conduit_route_route_compute_batch():
+        """Compute many conduit routes against one obstacle set in a single request."""
+        remote_addr = str(request.remote_addr or "unknown")
+        auth_mode = str(getattr(g, "autocad_auth_mode", "unknown") or "unknown")
+        request_id = _request_correlation_id()
+
+        if not request.is_json:
+            return _error_response(
+                code="INVALID_REQUEST",
+                message="Expected application/json payload.",
+                status_code=400,
+                request_id=request_id,
+                meta={"stage": "route_compute_batch.validation"},
+            )
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return _error_response(
+                code="INVALID_REQUEST",
+                message="Request payload must be a JSON object.",
+                status_code=400,
+                request_id=request_id,
+                meta={"stage": "route_compute_batch.validation"},
+            )
+
+        context, error_response = _resolve_route_compute_obstacles(
+            payload,
+            remote_addr=remote_addr,
+            auth_mode=auth_mode,
+            request_id=request_id,
+            stage_prefix="route_compute_batch",
+        )
+        if error_response is not None:
+            return error_response
+        obstacle_source = context["obstacleSource"]
+
+        started_at = time.time()
+        try:
+            result = compute_conduit_route_batch(context["resolvedPayload"])
+            elapsed_ms = int((time.time() - started_at) * 1000)
+
+            _attach_route_compute_context(
+                result,
+                context=context,
+                elapsed_ms=elapsed_ms,
+                request_id=request_id,
+            )
+
+            if result.get("success"):
+                logger.info(
+                    "Conduit route batch compute success (remote=%s, auth_mode=%s, obstacle_source=%s, routes=%s, routed=%s, parallel=%s, congestion=%s, elapsed_ms=%s)",
+                    remote_addr,
+                    auth_mode,
+                    obstacle_source,
+                    (result.get("meta") or {}).get("routeCount"),
+                    (result.get("data") or {}).get("routedCount"),
+                    (result.get("meta") or {}).get("parallel"),
+                    (result.get("meta") or {}).get("congestion"),
+                    elapsed_ms,
+                )
+                return jsonify(result), 200
+
+            logger.warning(
+                "Conduit route batch compute rejected (remote=%s, auth_mode=%s, code=%s, message=%s)",
+                remote_addr,
+                auth_mode,
+                result.get("code"),
+                result.get("message"),
+            )
+            status_code = 400 if result.get("code") == "INVALID_REQUEST" else 422
+            return jsonify(result), status_code
+        except Exception as exc:
+            autocad_log_exception(
+                logger=logger,
+                message="Conduit route batch compute failed",
+                request_id=request_id,
+                remote_addr=remote_addr,
+                auth_mode=auth_mode,
+                stage="route_compute_batch",
+                code="ROUTE_COMPUTE_FAILED",
+                provider=conduit_provider,
+            )
+            return _error_response(
+                code="ROUTE_COMPUTE_FAILED",
+                message=f"Conduit route batch computation failed unexpectedly: {autocad_client_exception_message(exc)}",
+                status_code=500,
+                request_id=request_id,
+                meta={"stage": "route_compute_batch", "providerConfigured": conduit_provider},
+            )
+
     @bp.route("/conduit-route/backcheck", methods=["POST"])
     @require_autocad_auth
     @limiter.limit("1800 per hour")
@@ -3232,6 +3381,57 @@ def create_autocad_blueprint(
                     exc=cleanup_exc,
                 )
 
+    @bp.route("/conduit-route/obstacles/near", methods=["POST"])
+    @require_autocad_auth
+    @limiter.limit("3600 per hour")
+    def api_conduit_route_obstacles_near():
+        """Return scanned obstacles closest to a canvas point via the spatial index."""
+        request_id = _request_correlation_id()
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return _error_response(
+                code="INVALID_REQUEST",
+                message="Request payload must be a JSON object.",
+                status_code=400,
+                request_id=request_id,
+                meta={"stage": "obstacle_near.validation"},
+            )
+
+        try:
+            result = query_obstacles_near_point(payload)
+        except Exception as exc:
+            autocad_log_exception(
+                logger=logger,
+                message="Conduit obstacle near-point query failed",
+                request_id=request_id,
+                remote_addr=str(request.remote_addr or "unknown"),
+                auth_mode=str(getattr(g, "autocad_auth_mode", "unknown") or "unknown"),
+                stage="obstacle_near",
+                code="OBSTACLE_QUERY_FAILED",
+                provider=conduit_provider,
+            )
+            return _error_response(
+                code="OBSTACLE_QUERY_FAILED",
+                message=f"Obstacle near-point query failed: {autocad_client_exception_message(exc)}",
+                status_code=500,
+                request_id=request_id,
+                meta={"stage": "obstacle_near"},
+            )
+
+        if not result.get("success"):
+            status_code = 404 if result.get("code") == "INDEX_NOT_FOUND" else 400
+            return _error_response(
+                code=str(result.get("code") or "INVALID_REQUEST"),
+                message=str(result.get("message") or "Invalid obstacle query."),
+                status_code=status_code,
+                request_id=request_id,
+                meta={"stage": "obstacle_near.validation", **(result.get("meta") or {})},
+            )
+
+        result["meta"] = {**(result.get("meta") or {}), "requestId": request_id}
+        return jsonify(result), 200
+
     @bp.route("/autocad/ws-ticket", methods=["POST"])
     @require_autocad_auth
     @limiter.limit("1200 per hour")
@@ -160,6 +160,26 @@ class AutoCADManager:
             if len(self._progress_events) > self._progress_event_max:
                 self._progress_events = self._progress_events[-self._progress_event_max :]
 
+    def publish_progress(
+        self,
+        *,
+        run_id: Optional[str],
+        stage: str,
+        progress: int,
+        current_item: Optional[str] = None,
+        message: str = "",
+        active: bool = True,
+    ) -> None:
+        """Record a progress event for work that runs outside the manager (route jobs)."""
+        self._set_progress(
+            run_id=run_id,
+            stage=stage,
+            progress=progress,
+            current_item=current_item,
+            message=message,
+            active=active,
+        )
+
     def get_progress(self) -> Dict[str, Any]:
         with self._progress_lock:
             return dict(self._progress_state)
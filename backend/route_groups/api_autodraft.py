@@ -34,6 +34,14 @@ except Exception:
     Image = None
     _PIL_AVAILABLE = False
 
+try:
+    import numpy as np
+
+    _NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    _NUMPY_AVAILABLE = False
+
 from .api_autocad_error_helpers import (
     build_error_payload as autocad_build_error_payload,
     derive_request_id as autocad_derive_request_id,
@@ -46,9 +54,11 @@ from .api_local_learning_runtime import get_local_learning_runtime
 from .pdf_text_extraction import (
     extract_embedded_text_page_lines,
     extract_ocr_page_lines_from_image,
+    extract_ocr_region_lines,
     pdf_bounds_to_pixel_bounds,
     pdf_ocr_available,
     pdf_render_available,
+    pixel_bounds_to_pdf_bounds,
     render_pdf_page_to_png,
 )
 
@@ -294,6 +304,17 @@ _DIMENSION_ONLY_PATTERN = re.compile(
     re.IGNORECASE,
 )
 _PREPARE_TEXT_FALLBACK_MAX_MARKUPS = 32
+# Markup-ink regions OCR'd before escalating to a full-page pass. Grid cells
+# are in pixels of the 150 DPI page render.
+_MARKUP_INK_MIN_SATURATION = 96
+_MARKUP_INK_CELL_PX = 30
+_MARKUP_INK_CELL_MIN_COVERAGE = 3
+_MARKUP_INK_MAX_REGIONS = 24
+_MARKUP_INK_MAX_PAGE_FRACTION = 0.4
+# Raw ink clusters allowed before merging. Merging only lowers the count, but
+# it is quadratic or worse, so a page this speckled goes straight to full-page
+# OCR.
+_MARKUP_INK_MAX_CLUSTERS = _MARKUP_INK_MAX_REGIONS * 2
 
 _ANNOT_TEXT_SUBTYPES = {
     "/Text",
@@ -3197,6 +3218,8 @@ def _extract_pdf_compare_markups(
         "ocr_available": pdf_ocr_available(),
         "embedded_line_count": 0,
         "ocr_line_count": 0,
+        "ocr_pass": "none",
+        "ocr_region_count": 0,
         "candidate_count": 0,
         "selected_line_count": 0,
         "skipped_without_bounds": 0,
@@ -3488,6 +3511,249 @@ def _sample_rendered_line_color(
     return dominant_color, average_rgb, _rgb_to_hex(average_rgb), "render_sample"
 
 
+def _merge_overlapping_pixel_boxes(boxes: List[List[int]]) -> List[List[int]]:
+    merged = [list(box) for box in boxes]
+    changed = True
+    while changed:
+        changed = False
+        for index in range(len(merged)):
+            for other_index in range(index + 1, len(merged)):
+                left, top, right, bottom = merged[index]
+                other_left, other_top, other_right, other_bottom = merged[other_index]
+                if other_left >= right or left >= other_right or other_top >= bottom or top >= other_bottom:
+                    continue
+                merged[index] = [
+                    min(left, other_left),
+                    min(top, other_top),
+                    max(right, other_right),
+                    max(bottom, other_bottom),
+                ]
+                del merged[other_index]
+                changed = True
+                break
+            if changed:
+                break
+    return merged
+
+
+def _markup_ink_regions(
+    image: Any,
+    *,
+    page_width: float,
+    page_height: float,
+) -> List[Dict[str, float]]:
+    """Page regions (PDF points) around clusters of colored markup ink.
+
+    Returns an empty list when there is no colored ink, or when it is spread
+    so widely that cropping would not save anything over a full-page OCR.
+    """
+    if image is None or not _PIL_AVAILABLE or Image is None or page_width <= 0 or page_height <= 0:
+        return []
+    try:
+        image_width, image_height = image.size
+        saturation = image.convert("RGB").convert("HSV").getchannel("S")
+        mask = saturation.point(lambda value: 255 if value >= _MARKUP_INK_MIN_SATURATION else 0)
+        grid_width = max(1, math.ceil(image_width / _MARKUP_INK_CELL_PX))
+        grid_height = max(1, math.ceil(image_height / _MARKUP_INK_CELL_PX))
+        coverage = mask.resize((grid_width, grid_height), Image.BOX).tobytes()
+    except Exception:
+        return []
+
+    inked = {
+        (index % grid_width, index // grid_width)
+        for index, value in enumerate(coverage)
+        if value >= _MARKUP_INK_CELL_MIN_COVERAGE
+    }
+    # Every merged box covers its inked cells, so too much ink already rules
+    # out cropping before any clustering work.
+    max_covered_area = image_width * image_height * _MARKUP_INK_MAX_PAGE_FRACTION
+    inked_area = sum(
+        min(_MARKUP_INK_CELL_PX, image_width - col * _MARKUP_INK_CELL_PX)
+        * min(_MARKUP_INK_CELL_PX, image_height - row * _MARKUP_INK_CELL_PX)
+        for col, row in inked
+    )
+    if inked_area > max_covered_area:
+        return []
+    boxes: List[List[int]] = []
+    while inked:
+        if len(boxes) >= _MARKUP_INK_MAX_CLUSTERS:
+            return []
+        stack = [inked.pop()]
+        min_col = max_col = stack[0][0]
+        min_row = max_row = stack[0][1]
+        while stack:
+            col, row = stack.pop()
+            min_col, max_col = min(min_col, col), max(max_col, col)
+            min_row, max_row = min(min_row, row), max(max_row, row)
+            for neighbor in (
+                (col + d_col, row + d_row)
+                for d_col in (-1, 0, 1)
+                for d_row in (-1, 0, 1)
+                if d_col or d_row
+            ):
+                if neighbor in inked:
+                    inked.remove(neighbor)
+                    stack.append(neighbor)
+        # Pad by one cell so black text written next to a colored cloud or
+        # leader is still inside the crop.
+        boxes.append(
+            [
+                max(0, (min_col - 1) * _MARKUP_INK_CELL_PX),
+                max(0, (min_row - 1) * _MARKUP_INK_CELL_PX),
+                min(image_width, (max_col + 2) * _MARKUP_INK_CELL_PX),
+                min(image_height, (max_row + 2) * _MARKUP_INK_CELL_PX),
+            ]
+        )
+
+    boxes = _merge_overlapping_pixel_boxes(boxes)
+    covered_area = sum((right - left) * (bottom - top) for left, top, right, bottom in boxes)
+    if not boxes or len(boxes) > _MARKUP_INK_MAX_REGIONS or covered_area > max_covered_area:
+        return []
+
+    regions: List[Dict[str, float]] = []
+    for left, top, right, bottom in sorted(boxes, key=lambda box: (box[1], box[0])):
+        region = pixel_bounds_to_pdf_bounds(
+            {"left": left, "top": top, "width": right - left, "height": bottom - top},
+            page_width=page_width,
+            page_height=page_height,
+            image_width=image_width,
+            image_height=image_height,
+        )
+        if region is not None:
+            regions.append(region)
+    return regions
+
+
+# Order matches the `counts` dict in _sample_rendered_line_color so argmax
+# breaks ties the same way max() does there.
+_RENDER_SAMPLE_COLORS = ("black", "red", "green", "blue", "yellow")
+_RENDER_SAMPLE_OTHER = len(_RENDER_SAMPLE_COLORS)
+
+
+def _classify_render_sample_pixels(rgb: Any) -> Any:
+    """Vectorized `_render_sample_to_color_name` over an (N, 3) float array.
+
+    Returns indexes into `_RENDER_SAMPLE_COLORS`, or `_RENDER_SAMPLE_OTHER`
+    for white and unknown pixels.
+    """
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    brightness = (red + green + blue) / 3.0
+    spread = np.maximum(np.maximum(red, green), blue) - np.minimum(np.minimum(red, green), blue)
+    return np.select(
+        [
+            (brightness < 0.38) & (spread < 0.18),
+            (brightness > 0.97) & (spread < 0.04),
+            (red > 0.62) & (green > 0.62) & (blue < 0.55),
+            (red > green + 0.12) & (red > blue + 0.12),
+            (green > red + 0.1) & (green > blue + 0.1),
+            (blue > red + 0.1) & (blue > green + 0.1),
+        ],
+        [0, _RENDER_SAMPLE_OTHER, 4, 1, 2, 3],
+        default=_RENDER_SAMPLE_OTHER,
+    )
+
+
+def _sample_rendered_line_colors(
+    image: Any,
+    pixel_bounds_list: List[Optional[Dict[str, int]]],
+) -> List[Tuple[str, Optional[Tuple[float, float, float]], Optional[str], str]]:
+    """Batched `_sample_rendered_line_color` for every line box on a page.
+
+    Boxes small enough to skip the thumbnail are sliced from one array of the
+    page, and the ink pixels of every box are classified in one pass.
+    Results are identical to calling `_sample_rendered_line_color` per box,
+    including the average RGB, which is summed in the same order.
+    """
+    unknown: Tuple[str, Optional[Tuple[float, float, float]], Optional[str], str] = (
+        "unknown",
+        None,
+        None,
+        "unknown",
+    )
+    results = [unknown] * len(pixel_bounds_list)
+    if image is None or not pixel_bounds_list:
+        return results
+    if not _NUMPY_AVAILABLE:
+        return [_sample_rendered_line_color(image, pixel_bounds) for pixel_bounds in pixel_bounds_list]
+    try:
+        image_width, image_height = image.size
+        rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+    except Exception:
+        return results
+    page_pixels = None
+
+    sample_indexes: List[int] = []
+    sample_pixels: List[Any] = []
+    for index, pixel_bounds in enumerate(pixel_bounds_list):
+        if not pixel_bounds:
+            continue
+        left = max(0, int(pixel_bounds.get("left") or 0))
+        top = max(0, int(pixel_bounds.get("top") or 0))
+        width = max(1, int(pixel_bounds.get("width") or 0))
+        height = max(1, int(pixel_bounds.get("height") or 0))
+        right = min(image_width, left + width)
+        bottom = min(image_height, top + height)
+        if right <= left or bottom <= top:
+            continue
+        if (right - left) > 64 or (bottom - top) > 32:
+            # Same PIL downsample as the per-line sampler, so the sampled
+            # pixels are bit-identical.
+            crop = rgb_image.crop((left, top, right, bottom))
+            crop.thumbnail((64, 32))
+            pixels = np.asarray(crop)
+        else:
+            if page_pixels is None:
+                page_pixels = np.asarray(rgb_image)
+            pixels = page_pixels[top:bottom, left:right]
+        sample_indexes.append(index)
+        sample_pixels.append(pixels.reshape(-1, 3))
+    if not sample_pixels:
+        return results
+
+    raw = np.concatenate(sample_pixels)
+    segments = np.repeat(np.arange(len(sample_pixels)), [len(pixels) for pixels in sample_pixels])
+    # Drop near-white paper on the integer pixels before any float work;
+    # most of each box is background. Per-channel maximum/minimum beat
+    # axis=1 reductions over 3 columns by a wide margin.
+    raw_min = np.minimum(np.minimum(raw[:, 0], raw[:, 1]), raw[:, 2])
+    candidate = raw_min < 245
+    rgb = raw[candidate] / 255.0
+    channel_max = np.maximum(np.maximum(rgb[:, 0], rgb[:, 1]), rgb[:, 2])
+    channel_min = np.minimum(np.minimum(rgb[:, 0], rgb[:, 1]), rgb[:, 2])
+    is_ink = ~((channel_max > 0.98) & ((channel_max - channel_min) < 0.04))
+    ink_rgb = rgb[is_ink]
+    ink_segments = segments[candidate][is_ink]
+    codes = _classify_render_sample_pixels(ink_rgb)
+    bucket_count = _RENDER_SAMPLE_OTHER + 1
+    counts = np.bincount(
+        ink_segments * bucket_count + codes,
+        minlength=len(sample_pixels) * bucket_count,
+    ).reshape(len(sample_pixels), bucket_count)
+    ink_totals = counts.sum(axis=1)
+    offsets = np.concatenate(([0], np.cumsum(ink_totals)))
+
+    for sample, index in enumerate(sample_indexes):
+        ink_count = int(ink_totals[sample])
+        if ink_count <= 0:
+            continue
+        segment_rgb = ink_rgb[offsets[sample] : offsets[sample + 1]]
+        # Python's sum() over the same values in the same order keeps the
+        # average bit-identical to the per-line sampler.
+        average_rgb = (
+            sum(segment_rgb[:, 0].tolist()) / ink_count,
+            sum(segment_rgb[:, 1].tolist()) / ink_count,
+            sum(segment_rgb[:, 2].tolist()) / ink_count,
+        )
+        color_counts = counts[sample, :_RENDER_SAMPLE_OTHER]
+        dominant_index = int(np.argmax(color_counts))
+        if color_counts[dominant_index] > 0:
+            dominant_color = _RENDER_SAMPLE_COLORS[dominant_index]
+        else:
+            dominant_color = _render_sample_to_color_name(average_rgb)
+        results[index] = (dominant_color, average_rgb, _rgb_to_hex(average_rgb), "render_sample")
+    return results
+
+
 def _score_prepare_text_fallback_line(
     *,
     text: str,
@@ -3581,6 +3847,7 @@ def _build_prepare_text_fallback_markups_from_lines(
     selected_black_text_count = 0
     candidate_count = 0
 
+    sampled_lines: List[Tuple[int, str, Dict[str, float], Optional[Dict[str, int]]]] = []
     for index, line in enumerate(lines, start=1):
         text_value = str(line.get("text") or "").strip()
         bounds = _normalize_bounds(line.get("bounds"))
@@ -3602,11 +3869,14 @@ def _build_prepare_text_fallback_markups_from_lines(
                 image_height=image_height,
                 padding=3,
             )
+        sampled_lines.append((index, text_value, bounds, pixel_bounds))
 
-        color_name, rgb, color_hex, color_source = _sample_rendered_line_color(
-            image,
-            pixel_bounds,
-        )
+    line_colors = _sample_rendered_line_colors(
+        image,
+        [pixel_bounds for _index, _text, _bounds, pixel_bounds in sampled_lines],
+    )
+    for (index, text_value, bounds, _pixel_bounds), line_color in zip(sampled_lines, line_colors):
+        color_name, rgb, color_hex, color_source = line_color
         score, threshold, score_reasons = _score_prepare_text_fallback_line(
             text=text_value,
             bounds=bounds,
@@ -3701,6 +3971,8 @@ def _extract_prepare_text_fallback_markups(
         "ocr_available": pdf_ocr_available(),
         "embedded_line_count": 0,
         "ocr_line_count": 0,
+        "ocr_pass": "none",
+        "ocr_region_count": 0,
         "candidate_count": 0,
         "selected_line_count": 0,
         "skipped_without_bounds": 0,
@@ -3792,31 +4064,56 @@ def _extract_prepare_text_fallback_markups(
                     "diagnostics": diagnostics,
                 }
 
-            ocr_payload = (
-                extract_ocr_page_lines_from_image(
-                    image_path,
+            # OCR the crops around colored markup ink at a higher DPI first;
+            # the full page is only read when those crops yield nothing.
+            ocr_passes: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+            ink_regions = _markup_ink_regions(image, page_width=page_width, page_height=page_height)
+            if ink_regions and diagnostics["ocr_available"]:
+                diagnostics["ocr_region_count"] = len(ink_regions)
+                ocr_passes.append(
+                    (
+                        "markup_regions",
+                        lambda: extract_ocr_region_lines(
+                            pdf_path,
+                            page_index=page_index,
+                            page_height=page_height,
+                            regions=ink_regions,
+                            output_dir=temp_dir,
+                        ),
+                    )
+                )
+            ocr_passes.append(
+                (
+                    "full_page",
+                    lambda: extract_ocr_page_lines_from_image(
+                        image_path,
+                        page_width=page_width,
+                        page_height=page_height,
+                    )
+                    if image_path
+                    else {"lines": [], "source": "ocr_unavailable"},
+                )
+            )
+            for ocr_pass, run_ocr_pass in ocr_passes:
+                ocr_payload = run_ocr_pass()
+                ocr_lines = (
+                    ocr_payload.get("lines") if isinstance(ocr_payload.get("lines"), list) else []
+                )
+                diagnostics["ocr_line_count"] = len(ocr_lines)
+                diagnostics["ocr_pass"] = ocr_pass
+                ocr_result = _build_prepare_text_fallback_markups_from_lines(
+                    lines=list(ocr_lines),
+                    source="ocr",
+                    page_index=page_index,
                     page_width=page_width,
                     page_height=page_height,
+                    bluebeam_detected=bluebeam_detected,
+                    image=image,
+                    image_width=image_width,
+                    image_height=image_height,
                 )
-                if image_path
-                else {"lines": [], "source": "ocr_unavailable"}
-            )
-            ocr_lines = (
-                ocr_payload.get("lines") if isinstance(ocr_payload.get("lines"), list) else []
-            )
-            diagnostics["ocr_line_count"] = len(ocr_lines)
-            ocr_result = _build_prepare_text_fallback_markups_from_lines(
-                lines=list(ocr_lines),
-                source="ocr",
-                page_index=page_index,
-                page_width=page_width,
-                page_height=page_height,
-                bluebeam_detected=bluebeam_detected,
-                image=image,
-                image_width=image_width,
-                image_height=image_height,
-            )
-            if ocr_result["markups"]:
+                if not ocr_result["markups"]:
+                    continue
                 diagnostics.update(
                     {
                         "used": True,
@@ -17,7 +17,6 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 from flask import Blueprint, jsonify, request, send_file
 from ..response_helpers import make_error_response
 from flask_limiter import Limiter
-from openpyxl import Workbook
 from werkzeug.utils import safe_join, secure_filename
 
 from backend.runtime_paths import (
@@ -26,6 +25,8 @@ from backend.runtime_paths import (
     resolve_runtime_path,
 )
 
+from .api_excel_report_writer import ExcelReportWriter
+
 MAX_DRAWINGS = 75
 MAX_RULES = 100
 MAX_OPERATIONS = 8000
@@ -1019,14 +1020,13 @@ def create_automation_recipe_blueprint(
         workbook_path = os.path.join(out_dir, f"suite_automation_recipe_{timestamp}.xlsx")
         manifest_path = os.path.join(out_dir, f"suite_automation_recipe_{timestamp}.json")
 
-        workbook = Workbook()
-        operations_ws = workbook.active
-        operations_ws.title = "Operations"
-        drawings_ws = workbook.create_sheet("Summary")
-        warnings_ws = workbook.create_sheet("Warnings")
-        artifacts_ws = workbook.create_sheet("Artifacts")
-
-        operations_ws.append(
+        writer = ExcelReportWriter()
+        operations_ws = writer.add_sheet(
+            "Operations",
+            column_widths=[16, 32, 40, 22, 40, 40, 12, 40, 48],
+            freeze_panes="A2",
+        )
+        operations_ws.header_row(
             [
                 "Source",
                 "Drawing",
@@ -1039,8 +1039,8 @@ def create_automation_recipe_blueprint(
                 "Detail",
             ]
         )
-        for operation in operations:
-            operations_ws.append(
+        operations_ws.data_rows(
+            (
                 [
                     _normalize_text(operation.get("source")),
                     _normalize_text(operation.get("drawingName") or operation.get("drawingPath")),
@@ -1052,24 +1052,34 @@ def create_automation_recipe_blueprint(
                     " | ".join(_normalize_string_array(operation.get("warnings"))),
                     _normalize_text(operation.get("detail")),
                 ]
-            )
+                for operation in operations
+            ),
+            kinds=("text",) * 9,
+        )
 
-        drawings_ws.append(["Metric", "Value"])
-        drawings_ws.append(["Project", _normalize_text(work_package.get("projectId"))])
-        drawings_ws.append(["Issue Set", _normalize_text(work_package.get("issueSetId"))])
-        drawings_ws.append(["Recipe", _normalize_text(recipe.get("name"))])
-        drawings_ws.append(["Changed drawings", changed_drawing_count])
-        drawings_ws.append(["Changed items", changed_item_count])
-        drawings_ws.append(["Simulate on copy", "yes" if recipe.get("simulateOnCopy") is not False else "no"])
-        drawings_ws.append(["Workspace", workspace_root or "source drawings"])
-
-        warnings_ws.append(["Warning"])
-        for warning in warnings or ["No warnings."]:
-            warnings_ws.append([warning])
-
-        artifacts_ws.append(["Kind", "Label", "Download URL", "Path", "Description"])
-        for artifact in artifacts:
-            artifacts_ws.append(
+        drawings_ws = writer.add_sheet("Summary", column_widths=[24, 48], freeze_panes="A2")
+        drawings_ws.header_row(["Metric", "Value"])
+        drawings_ws.data_rows(
+            [
+                ["Project", _normalize_text(work_package.get("projectId"))],
+                ["Issue Set", _normalize_text(work_package.get("issueSetId"))],
+                ["Recipe", _normalize_text(recipe.get("name"))],
+                ["Changed drawings", changed_drawing_count],
+                ["Changed items", changed_item_count],
+                ["Simulate on copy", "yes" if recipe.get("simulateOnCopy") is not False else "no"],
+                ["Workspace", workspace_root or "source drawings"],
+            ],
+            kinds=("label", "label"),
+        )
+
+        warnings_ws = writer.add_sheet("Warnings", column_widths=[100], freeze_panes="A2")
+        warnings_ws.header_row(["Warning"])
+        warnings_ws.data_rows(([warning] for warning in warnings or ["No warnings."]), kinds=("text",))
+
+        artifacts_ws = writer.add_sheet("Artifacts", column_widths=[18, 32, 40, 60, 48], freeze_panes="A2")
+        artifacts_ws.header_row(["Kind", "Label", "Download URL", "Path", "Description"])
+        artifacts_ws.data_rows(
+            (
                 [
                     _normalize_text(artifact.get("kind")),
                     _normalize_text(artifact.get("label")),
@@ -1077,9 +1087,12 @@ def create_automation_recipe_blueprint(
                     _normalize_text(artifact.get("path")),
                     _normalize_text(artifact.get("description")),
                 ]
-            )
+                for artifact in artifacts
+            ),
+            kinds=("text",) * 5,
+        )
 
-        workbook.save(workbook_path)
+        writer.save(workbook_path)
         with open(manifest_path, "w", encoding="utf-8") as manifest_file:
             json.dump(
                 {
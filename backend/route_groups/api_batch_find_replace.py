@@ -6,20 +6,22 @@ import json
 import os
 import re
 import tempfile
+import threading
 import time
 import uuid
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from flask import Blueprint, jsonify, request, send_file
 from ..response_helpers import make_error_response, make_response
 from flask_limiter import Limiter
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
 from werkzeug.utils import secure_filename
 
+from .api_batch_find_replace_engine import CompiledRuleSet, run_batch_files
+from .api_batch_find_replace_jobs import DrawingJobRunner, JobCapacityError, drawing_concurrency_from_env
+from .api_excel_report_writer import ExcelReportWriter
+
 MAX_BATCH_FILES = 50
 MAX_BATCH_RULES = 100
 MAX_PREVIEW_MATCHES = 500
@@ -37,11 +39,22 @@ def create_batch_find_replace_blueprint(
     batch_session_ttl_seconds: int,
     send_autocad_dotnet_command: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
     send_autocad_acade_command: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+    get_manager: Optional[Callable[[], Any]] = None,
 ) -> Blueprint:
     """Create /api/batch-find-replace route group blueprint."""
     bp = Blueprint("batch_find_replace_api", __name__, url_prefix="/api/batch-find-replace")
     generated_reports: Dict[str, Dict[str, str]] = {}
 
+    def _publish_job_progress(event: Dict[str, Any]) -> None:
+        # Shows up on the AutoCAD status websocket as "progress" messages.
+        if get_manager is not None:
+            get_manager().publish_progress(**event)
+
+    project_jobs = DrawingJobRunner(logger=logger, publish_progress=_publish_job_progress)
+    # The ACADE host pipe accepts one client at a time and answers a second
+    # one with "pipe busy", so job workers and request threads take turns.
+    acade_host_lock = threading.Lock()
+
     def _create_batch_session_token() -> str:
         timestamp = int(time.time())
         ts_bytes = str(timestamp).encode("utf-8")
@@ -127,58 +140,6 @@ def create_batch_find_replace_blueprint(
 
         return rules
 
-    def _decode_uploaded_text(raw_bytes: bytes) -> str:
-        if b"\x00" in raw_bytes:
-            raise ValueError("Binary files are not supported")
-
-        for encoding in ("utf-8", "utf-16", "latin-1"):
-            try:
-                return raw_bytes.decode(encoding)
-            except Exception:
-                continue
-
-        raise ValueError("Unable to decode file as text")
-
-    def _build_batch_pattern(rule: Dict[str, Any]) -> re.Pattern[str]:
-        flags = 0 if rule["match_case"] else re.IGNORECASE
-        if rule["use_regex"]:
-            try:
-                return re.compile(rule["find"], flags)
-            except re.error as exc:
-                raise ValueError(f"Invalid regex for rule '{rule['id']}': {exc}")
-
-        return re.compile(re.escape(rule["find"]), flags)
-
-    def _apply_rule_to_lines(
-        lines: List[str],
-        pattern: re.Pattern[str],
-        replacement: str,
-        rule_id: str,
-        file_name: str,
-        preview_matches: List[Dict[str, Any]],
-        max_matches: int,
-    ) -> Tuple[List[str], int]:
-        changed_count = 0
-        next_lines: List[str] = []
-
-        for line_number, line in enumerate(lines, start=1):
-            updated_line, replaced = pattern.subn(replacement, line)
-            if replaced > 0:
-                changed_count += replaced
-                if len(preview_matches) < max_matches:
-                    preview_matches.append(
-                        {
-                            "file": file_name,
-                            "line": line_number,
-                            "before": line[:500],
-                            "after": updated_line[:500],
-                            "ruleId": rule_id,
-                        }
-                    )
-            next_lines.append(updated_line)
-
-        return next_lines, changed_count
-
     def _process_batch_files(preview_only: bool) -> Dict[str, Any]:
         uploaded_files = request.files.getlist("files")
         if not uploaded_files:
@@ -186,61 +147,64 @@ def create_batch_find_replace_blueprint(
         if len(uploaded_files) > MAX_BATCH_FILES:
             raise ValueError(f"Too many files. Maximum is {MAX_BATCH_FILES}")
 
-        rules = _parse_batch_rules()
+        rule_set = CompiledRuleSet(_parse_batch_rules())
         max_matches = MAX_PREVIEW_MATCHES if preview_only else MAX_APPLY_CHANGE_ROWS
-        preview_matches: List[Dict[str, Any]] = []
-        updated_files: List[Dict[str, str]] = []
-        files_changed = 0
-        replacements_total = 0
-
+        parallel = str(request.form.get("parallel", "true")).strip().lower() not in {"false", "0", "no", "off"}
+        named_files = []
         for file_storage in uploaded_files:
             file_name = secure_filename(file_storage.filename or "upload.txt")
-            if not file_name:
-                file_name = "upload.txt"
+            named_files.append((file_name or "upload.txt", file_storage.stream))
 
-            try:
-                raw_bytes = file_storage.read()
-            finally:
+        try:
+            run = run_batch_files(
+                rule_set,
+                named_files,
+                keep_content=not preview_only,
+                match_limit=max_matches,
+                stop_at_match_limit=preview_only,
+                parallel=parallel,
+                logger=logger,
+            )
+        finally:
+            for file_storage in uploaded_files:
                 try:
                     file_storage.close()
                 except Exception:
                     pass  # Best-effort cleanup of uploaded file handle
-            content = _decode_uploaded_text(raw_bytes)
-
-            line_break = "\r\n" if "\r\n" in content else "\n"
-            lines = content.splitlines()
-            file_replacements = 0
-
-            for rule in rules:
-                pattern = _build_batch_pattern(rule)
-                lines, changed = _apply_rule_to_lines(
-                    lines,
-                    pattern,
-                    rule["replace"],
-                    rule["id"],
-                    file_name,
-                    preview_matches,
-                    max_matches,
-                )
-                file_replacements += changed
 
-            if file_replacements > 0:
+        updated_files: List[Dict[str, str]] = []
+        file_timings: List[Dict[str, Any]] = []
+        files_changed = 0
+        replacements_total = 0
+        for file_result in run["files"]:
+            if file_result["replacements"] > 0:
                 files_changed += 1
-                replacements_total += file_replacements
-
+                replacements_total += file_result["replacements"]
+            file_timings.append(
+                {
+                    "file": file_result["file"],
+                    "duration_ms": file_result["durationMs"],
+                    "replacements": file_result["replacements"],
+                }
+            )
             if not preview_only:
                 updated_files.append(
                     {
-                        "file": file_name,
-                        "content": line_break.join(lines),
+                        "file": file_result["file"],
+                        "content": file_result["content"],
                     }
                 )
 
         return {
-            "matches": preview_matches,
+            "matches": run["matches"],
             "files_changed": files_changed,
             "replacements": replacements_total,
-            "files_processed": len(uploaded_files),
+            "files_processed": len(run["files"]),
+            "files_uploaded": len(uploaded_files),
+            "truncated": run["truncated"],
+            "parallel": run["parallel"],
+            "workers": run["workers"],
+            "file_timings": file_timings,
             "updated_files": updated_files,
         }
 
@@ -281,13 +245,14 @@ def create_batch_find_replace_blueprint(
             raise RuntimeError("AutoCAD in-process ACADE host is not configured.")
 
         request_id = str(payload.get("requestId") or _next_request_id()).strip() or _next_request_id()
-        response = send_autocad_acade_command(
-            action,
-            {
-                **payload,
-                "requestId": request_id,
-            },
-        )
+        with acade_host_lock:
+            response = send_autocad_acade_command(
+                action,
+                {
+                    **payload,
+                    "requestId": request_id,
+                },
+            )
         if not isinstance(response, dict):
             raise RuntimeError("Malformed response from the AutoCAD in-process ACADE host.")
         if not response.get("ok"):
@@ -365,6 +330,7 @@ def create_batch_find_replace_blueprint(
             "matches must contain at least one project preview row.": (
                 "matches must contain at least one project preview row."
             ),
+            "concurrency must be an integer.": "concurrency must be an integer.",
         }
         if message in canonical_messages:
             return canonical_messages[message]
@@ -572,6 +538,205 @@ def create_batch_find_replace_blueprint(
 
         return normalized
 
+    def _project_preview_payload(
+        *,
+        drawings: List[Dict[str, str]],
+        raw_matches: List[Any],
+        warnings: List[Any],
+        request_id: Any,
+        message: Optional[str],
+    ) -> Dict[str, Any]:
+        matches = _normalize_project_preview_matches(raw_matches, drawings)
+        drawing_summaries = _build_project_preview_drawings(drawings, matches)
+        affected_drawings = sum(
+            1 for summary in drawing_summaries if int(summary.get("matchCount") or 0) > 0
+        )
+        return {
+            "success": True,
+            "requestId": request_id,
+            "matches": matches,
+            "matchCount": len(matches),
+            "drawings": drawing_summaries,
+            "warnings": warnings,
+            "message": message
+            or (
+                f"Project CAD preview completed: {len(matches)} replacement(s) "
+                f"across {affected_drawings} drawing(s)."
+            ),
+        }
+
+    def _project_apply_payload(
+        *,
+        data: Dict[str, Any],
+        warnings: List[Any],
+        request_id: Any,
+        message: Optional[str],
+    ) -> Dict[str, Any]:
+        change_rows = data.get("changes") or []
+        report_path, report_dir = export_batch_changes_to_excel(change_rows)
+        schedule_cleanup(report_dir)
+        report_id, report_filename = _register_generated_report(report_path, report_dir)
+        return {
+            "success": True,
+            "requestId": request_id,
+            "updated": int(data.get("updated") or 0),
+            "changedDrawingCount": int(data.get("changedDrawingCount") or 0),
+            "changedItemCount": int(
+                data.get("changedItemCount") or data.get("updated") or 0
+            ),
+            "drawings": data.get("drawings") or [],
+            "warnings": warnings,
+            "reportId": report_id,
+            "reportFilename": report_filename,
+            "downloadUrl": f"/api/batch-find-replace/reports/{report_id}",
+            "message": message or "Project CAD apply completed.",
+        }
+
+    def _call_project_host_for_drawing(
+        action: str,
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        try:
+            host_result = _call_acade_host_action(action, payload)
+        except Exception:
+            logger.exception("Project CAD job host call failed (action=%s)", action)
+            raise RuntimeError("AutoCAD host request failed.")
+        if not host_result.get("success", False):
+            raise RuntimeError(str(host_result.get("message") or "AutoCAD host reported a failure."))
+        return host_result
+
+    def _project_job_concurrency(payload: Dict[str, Any]) -> int:
+        raw = payload.get("concurrency")
+        if raw is None or raw == "":
+            return drawing_concurrency_from_env()
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            raise ValueError("concurrency must be an integer.")
+
+    def _project_job_accepted(job: Dict[str, Any]):
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "jobId": job["jobId"],
+                    "status": job["status"],
+                    "totalDrawings": job["totalDrawings"],
+                    "statusUrl": f"/api/batch-find-replace/cad/project-jobs/{job['jobId']}",
+                    "message": f"Project CAD job queued for {job['totalDrawings']} drawing(s).",
+                }
+            ),
+            202,
+        )
+
+    def _submit_project_preview_job(
+        payload: Dict[str, Any],
+        rules: List[Dict[str, Any]],
+        drawings: List[Dict[str, str]],
+    ):
+        block_name_hint = str(payload.get("blockNameHint") or "").strip()
+
+        def process_unit(job_id: str, index: int, unit: Dict[str, Any]) -> Dict[str, Any]:
+            host_result = _call_project_host_for_drawing(
+                "suite_batch_find_replace_project_preview",
+                {
+                    "rules": rules,
+                    "drawings": [unit["drawing"]],
+                    "blockNameHint": block_name_hint,
+                    "requestId": f"{job_id}-{index + 1}",
+                },
+            )
+            data = host_result.get("data") or {}
+            return {
+                "matches": list(data.get("matches") or []),
+                "warnings": list(host_result.get("warnings") or []),
+            }
+
+        def finalize(job_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+            return _project_preview_payload(
+                drawings=drawings,
+                raw_matches=[match for result in results for match in result["matches"]],
+                warnings=[warning for result in results for warning in result["warnings"]],
+                request_id=job_id,
+                message=None,
+            )
+
+        job = project_jobs.submit(
+            kind="project-preview",
+            units=[
+                {"key": drawing["path"], "label": drawing["drawingName"], "drawing": drawing}
+                for drawing in drawings
+            ],
+            process_unit=process_unit,
+            finalize=finalize,
+            concurrency=_project_job_concurrency(payload),
+        )
+        return _project_job_accepted(job)
+
+    def _submit_project_apply_job(payload: Dict[str, Any], matches: List[Any]):
+        block_name_hint = str(payload.get("blockNameHint") or "").strip()
+        units_by_key: Dict[str, Dict[str, Any]] = {}
+        for match in matches:
+            if not isinstance(match, dict):
+                continue
+            drawing_path = str(match.get("drawingPath") or "").strip()
+            label = str(match.get("drawingName") or match.get("file") or "").strip()
+            unit_key = drawing_path.lower() or label.lower()
+            unit = units_by_key.setdefault(
+                unit_key,
+                {"key": drawing_path or label, "label": label or drawing_path or "Drawing", "matches": []},
+            )
+            unit["matches"].append(match)
+        if not units_by_key:
+            raise ValueError("matches must contain at least one project preview row.")
+
+        def process_unit(job_id: str, index: int, unit: Dict[str, Any]) -> Dict[str, Any]:
+            host_result = _call_project_host_for_drawing(
+                "suite_batch_find_replace_project_apply",
+                {
+                    "matches": unit["matches"],
+                    "blockNameHint": block_name_hint,
+                    "requestId": f"{job_id}-{index + 1}",
+                },
+            )
+            return {
+                "data": host_result.get("data") or {},
+                "warnings": list(host_result.get("warnings") or []),
+            }
+
+        def finalize(job_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+            merged: Dict[str, Any] = {
+                "updated": 0,
+                "changedDrawingCount": 0,
+                "changedItemCount": 0,
+                "drawings": [],
+                "changes": [],
+            }
+            for result in results:
+                data = result["data"]
+                merged["updated"] += int(data.get("updated") or 0)
+                merged["changedDrawingCount"] += int(data.get("changedDrawingCount") or 0)
+                merged["changedItemCount"] += int(
+                    data.get("changedItemCount") or data.get("updated") or 0
+                )
+                merged["drawings"].extend(data.get("drawings") or [])
+                merged["changes"].extend(data.get("changes") or [])
+            return _project_apply_payload(
+                data=merged,
+                warnings=[warning for result in results for warning in result["warnings"]],
+                request_id=job_id,
+                message=None,
+            )
+
+        job = project_jobs.submit(
+            kind="project-apply",
+            units=list(units_by_key.values()),
+            process_unit=process_unit,
+            finalize=finalize,
+            concurrency=_project_job_concurrency(payload),
+        )
+        return _project_job_accepted(job)
+
     def _register_generated_report(report_path: str, report_dir: str) -> Tuple[str, str]:
         report_id = uuid.uuid4().hex
         report_filename = os.path.basename(report_path)
@@ -582,189 +747,63 @@ def create_batch_find_replace_blueprint(
         }
         return report_id, report_filename
 
-    def export_batch_changes_to_excel(changes: List[Dict[str, Any]]) -> Tuple[str, str]:
-        """Export batch find/replace changes to a styled Excel report."""
+    def export_batch_changes_to_excel(changes: Iterable[Dict[str, Any]]) -> Tuple[str, str]:
+        """Export batch find/replace changes to a styled Excel report.
+
+        Change rows are streamed through a write-only workbook, so large
+        apply runs do not hold a styled cell object per change in memory.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_dir = tempfile.mkdtemp(prefix="batch_find_replace_")
         out_path = os.path.join(out_dir, f"batch_find_replace_changes_{timestamp}.xlsx")
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Changes"
-        summary_ws = wb.create_sheet("Summary")
-
-        headers = ["File", "Line", "Rule ID", "Before", "After"]
-
-        title_fill = PatternFill("solid", fgColor="2B6CB5")
-        title_font = Font(bold=True, color="FFFFFF", size=14, name="Arial")
-        header_fill = PatternFill("solid", fgColor="3A3F47")
-        header_font = Font(bold=True, color="F0F0F0", size=11, name="Arial")
-        alt_fill_even = PatternFill("solid", fgColor="E8E6E2")
-        alt_fill_odd = PatternFill("solid", fgColor="D4D1CC")
-        data_font = Font(size=10, color="2A2A2A", name="Arial")
-        border_side = Side(style="thin", color="B0ADA8")
-        all_border = Border(left=border_side, right=border_side, top=border_side, bottom=border_side)
-        header_border = Border(
-            left=border_side,
-            right=border_side,
-            top=border_side,
-            bottom=Side(style="medium", color="3A3F47"),
-        )
-
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
-        title_cell = ws.cell(row=1, column=1, value="Batch Find & Replace Change Report")
-        title_cell.font = title_font
-        title_cell.fill = title_fill
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-        title_cell.border = all_border
-        for col_idx in range(2, len(headers) + 1):
-            c = ws.cell(row=1, column=col_idx)
-            c.fill = title_fill
-            c.border = all_border
-
-        for col_idx, h in enumerate(headers, start=1):
-            c = ws.cell(row=2, column=col_idx, value=h)
-            c.font = header_font
-            c.fill = header_fill
-            c.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            c.border = header_border
-
-        for row_idx, change in enumerate(changes, start=3):
-            row_fill = alt_fill_even if (row_idx - 3) % 2 == 0 else alt_fill_odd
-            row_values = [
-                str(change.get("file", "")),
-                int(change.get("line", 0) or 0),
-                str(change.get("ruleId", "")),
-                str(change.get("before", "")),
-                str(change.get("after", "")),
-            ]
-
-            for col_idx, value in enumerate(row_values, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.fill = row_fill
-                cell.border = all_border
-                cell.font = data_font
-                if col_idx == 2:
-                    cell.alignment = Alignment(horizontal="right", vertical="top")
-                else:
-                    cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-
-        ws.column_dimensions[get_column_letter(1)].width = 42
-        ws.column_dimensions[get_column_letter(2)].width = 10
-        ws.column_dimensions[get_column_letter(3)].width = 16
-        ws.column_dimensions[get_column_letter(4)].width = 60
-        ws.column_dimensions[get_column_letter(5)].width = 60
-
-        ws.row_dimensions[1].height = 28
-        ws.row_dimensions[2].height = 22
-        ws.freeze_panes = "A3"
-
-        summary_headers = ["Metric", "Value"]
-        summary_title_fill = PatternFill("solid", fgColor="2B6CB5")
-        summary_title_font = Font(bold=True, color="FFFFFF", size=14, name="Arial")
-        summary_header_fill = PatternFill("solid", fgColor="3A3F47")
-        summary_header_font = Font(bold=True, color="F0F0F0", size=11, name="Arial")
-        summary_data_font = Font(size=10, color="2A2A2A", name="Arial")
-
-        summary_ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
-        summary_title_cell = summary_ws.cell(row=1, column=1, value="Batch Find & Replace Summary")
-        summary_title_cell.font = summary_title_font
-        summary_title_cell.fill = summary_title_fill
-        summary_title_cell.alignment = Alignment(horizontal="center", vertical="center")
-        summary_title_cell.border = all_border
-        summary_ws.cell(row=1, column=2).fill = summary_title_fill
-        summary_ws.cell(row=1, column=2).border = all_border
-
-        for col_idx, header in enumerate(summary_headers, start=1):
-            c = summary_ws.cell(row=2, column=col_idx, value=header)
-            c.font = summary_header_font
-            c.fill = summary_header_fill
-            c.alignment = Alignment(horizontal="center", vertical="center")
-            c.border = header_border
+        writer = ExcelReportWriter()
+        ws = writer.add_sheet("Changes", column_widths=[42, 10, 16, 60, 60], freeze_panes="A3")
+        ws.title_row("Batch Find & Replace Change Report")
+        ws.header_row(["File", "Line", "Rule ID", "Before", "After"])
 
+        total_changes = 0
         file_counts: Dict[str, int] = {}
         rule_counts: Dict[str, int] = {}
         for change in changes:
-            file_name = str(change.get("file", "")) or "(unknown)"
-            rule_id = str(change.get("ruleId", "")) or "(unknown)"
-            file_counts[file_name] = file_counts.get(file_name, 0) + 1
-            rule_counts[rule_id] = rule_counts.get(rule_id, 0) + 1
-
-        summary_rows: List[Tuple[str, Any]] = [
-            ("Total changes", len(changes)),
-            ("Files with changes", len(file_counts)),
-            ("Rules with changes", len(rule_counts)),
-        ]
-
-        current_row = 3
-        for idx, (metric, value) in enumerate(summary_rows):
-            row_fill = alt_fill_even if idx % 2 == 0 else alt_fill_odd
-            metric_cell = summary_ws.cell(row=current_row, column=1, value=metric)
-            value_cell = summary_ws.cell(row=current_row, column=2, value=value)
-            for c in (metric_cell, value_cell):
-                c.fill = row_fill
-                c.border = all_border
-                c.font = summary_data_font
-                c.alignment = Alignment(horizontal="left", vertical="center")
-            current_row += 1
-
-        current_row += 1
-        section_header = summary_ws.cell(row=current_row, column=1, value="By File")
-        section_header.font = summary_header_font
-        section_header.fill = summary_header_fill
-        section_header.alignment = Alignment(horizontal="left", vertical="center")
-        section_header.border = header_border
-        summary_ws.cell(row=current_row, column=2, value="Changes")
-        summary_ws.cell(row=current_row, column=2).font = summary_header_font
-        summary_ws.cell(row=current_row, column=2).fill = summary_header_fill
-        summary_ws.cell(row=current_row, column=2).alignment = Alignment(horizontal="center", vertical="center")
-        summary_ws.cell(row=current_row, column=2).border = header_border
-        current_row += 1
-
-        for idx, (file_name, count) in enumerate(sorted(file_counts.items(), key=lambda item: item[0].lower())):
-            row_fill = alt_fill_even if idx % 2 == 0 else alt_fill_odd
-            file_cell = summary_ws.cell(row=current_row, column=1, value=file_name)
-            count_cell = summary_ws.cell(row=current_row, column=2, value=count)
-            for c in (file_cell, count_cell):
-                c.fill = row_fill
-                c.border = all_border
-                c.font = summary_data_font
-            file_cell.alignment = Alignment(horizontal="left", vertical="center")
-            count_cell.alignment = Alignment(horizontal="right", vertical="center")
-            current_row += 1
-
-        current_row += 1
-        section_header = summary_ws.cell(row=current_row, column=1, value="By Rule")
-        section_header.font = summary_header_font
-        section_header.fill = summary_header_fill
-        section_header.alignment = Alignment(horizontal="left", vertical="center")
-        section_header.border = header_border
-        summary_ws.cell(row=current_row, column=2, value="Changes")
-        summary_ws.cell(row=current_row, column=2).font = summary_header_font
-        summary_ws.cell(row=current_row, column=2).fill = summary_header_fill
-        summary_ws.cell(row=current_row, column=2).alignment = Alignment(horizontal="center", vertical="center")
-        summary_ws.cell(row=current_row, column=2).border = header_border
-        current_row += 1
-
-        for idx, (rule_id, count) in enumerate(sorted(rule_counts.items(), key=lambda item: item[0].lower())):
-            row_fill = alt_fill_even if idx % 2 == 0 else alt_fill_odd
-            rule_cell = summary_ws.cell(row=current_row, column=1, value=rule_id)
-            count_cell = summary_ws.cell(row=current_row, column=2, value=count)
-            for c in (rule_cell, count_cell):
-                c.fill = row_fill
-                c.border = all_border
-                c.font = summary_data_font
-            rule_cell.alignment = Alignment(horizontal="left", vertical="center")
-            count_cell.alignment = Alignment(horizontal="right", vertical="center")
-            current_row += 1
-
-        summary_ws.column_dimensions[get_column_letter(1)].width = 52
-        summary_ws.column_dimensions[get_column_letter(2)].width = 16
-        summary_ws.row_dimensions[1].height = 28
-        summary_ws.row_dimensions[2].height = 22
-        summary_ws.freeze_panes = "A3"
-
-        wb.save(out_path)
+            file_name = str(change.get("file", ""))
+            rule_id = str(change.get("ruleId", ""))
+            ws.data_row(
+                [
+                    file_name,
+                    int(change.get("line", 0) or 0),
+                    rule_id,
+                    str(change.get("before", "")),
+                    str(change.get("after", "")),
+                ],
+                kinds=("text", "number", "text", "text", "text"),
+                stripe=total_changes,
+            )
+            total_changes += 1
+            file_counts[file_name or "(unknown)"] = file_counts.get(file_name or "(unknown)", 0) + 1
+            rule_counts[rule_id or "(unknown)"] = rule_counts.get(rule_id or "(unknown)", 0) + 1
+
+        summary_ws = writer.add_sheet("Summary", column_widths=[52, 16], freeze_panes="A3")
+        summary_ws.title_row("Batch Find & Replace Summary")
+        summary_ws.header_row(["Metric", "Value"])
+        summary_ws.data_rows(
+            [
+                ("Total changes", total_changes),
+                ("Files with changes", len(file_counts)),
+                ("Rules with changes", len(rule_counts)),
+            ],
+            kinds=("label", "label"),
+        )
+
+        for section, counts in (("By File", file_counts), ("By Rule", rule_counts)):
+            summary_ws.blank_rows()
+            summary_ws.header_row([section, "Changes"], height=None, first_left=True)
+            summary_ws.data_rows(
+                sorted(counts.items(), key=lambda item: item[0].lower()),
+                kinds=("label", "value"),
+            )
+
+        writer.save(out_path)
         return out_path, out_dir
 
     @bp.route("/session", methods=["POST"])
@@ -796,9 +835,19 @@ def create_batch_find_replace_blueprint(
                     "files_processed": result["files_processed"],
                     "files_changed": result["files_changed"],
                     "replacements": result["replacements"],
+                    "truncated": result["truncated"],
+                    "parallel": result["parallel"],
+                    "workers": result["workers"],
+                    "file_timings": result["file_timings"],
                     "message": (
                         f"Preview completed: {result['replacements']} replacement(s) "
                         f"across {result['files_changed']} file(s)."
+                        + (
+                            f" Stopped after {result['files_processed']} of {result['files_uploaded']} "
+                            f"file(s) at the {MAX_PREVIEW_MATCHES}-match preview limit."
+                            if result["truncated"]
+                            else ""
+                        )
                     ),
                 }
             )
@@ -1064,6 +1113,8 @@ def create_batch_find_replace_blueprint(
             payload = request.get_json(silent=True) or {}
             rules = _parse_batch_rules_from_json(payload)
             drawings = _resolve_project_drawings(payload)
+            if payload.get("async") is True:
+                return _submit_project_preview_job(payload, rules, drawings)
             host_result = _call_acade_host_action(
                 "suite_batch_find_replace_project_preview",
                 {
@@ -1077,25 +1128,14 @@ def create_batch_find_replace_blueprint(
                 return jsonify(host_result), status_code
 
             data = host_result.get("data") or {}
-            matches = _normalize_project_preview_matches(data.get("matches") or [], drawings)
-            drawing_summaries = _build_project_preview_drawings(drawings, matches)
-            affected_drawings = sum(
-                1 for summary in drawing_summaries if int(summary.get("matchCount") or 0) > 0
-            )
             return jsonify(
-                {
-                    "success": True,
-                    "requestId": host_result.get("meta", {}).get("requestId"),
-                    "matches": matches,
-                    "matchCount": len(matches),
-                    "drawings": drawing_summaries,
-                    "warnings": host_result.get("warnings") or [],
-                    "message": host_result.get("message")
-                    or (
-                        f"Project CAD preview completed: {len(matches)} replacement(s) "
-                        f"across {affected_drawings} drawing(s)."
-                    ),
-                }
+                _project_preview_payload(
+                    drawings=drawings,
+                    raw_matches=data.get("matches") or [],
+                    warnings=host_result.get("warnings") or [],
+                    request_id=host_result.get("meta", {}).get("requestId"),
+                    message=host_result.get("message"),
+                )
             )
         except ValueError as exc:
             return _batch_error_response(
@@ -1105,6 +1145,8 @@ def create_batch_find_replace_blueprint(
                 ),
                 status_code=400,
             )
+        except JobCapacityError as exc:
+            return _batch_error_response(message=str(exc), status_code=429)
         except Exception:
             logger.exception("Project CAD batch preview failed")
             return _batch_error_response(
@@ -1125,6 +1167,8 @@ def create_batch_find_replace_blueprint(
                 raise ValueError(
                     f"Too many project CAD apply rows. Maximum is {MAX_APPLY_CHANGE_ROWS}"
                 )
+            if payload.get("async") is True:
+                return _submit_project_apply_job(payload, matches)
 
             host_result = _call_acade_host_action(
                 "suite_batch_find_replace_project_apply",
@@ -1137,29 +1181,13 @@ def create_batch_find_replace_blueprint(
                 status_code = 400 if host_result.get("code") == "INVALID_REQUEST" else 503
                 return jsonify(host_result), status_code
 
-            data = host_result.get("data") or {}
-            change_rows = data.get("changes") or []
-            report_path, report_dir = export_batch_changes_to_excel(change_rows)
-            schedule_cleanup(report_dir)
-            report_id, report_filename = _register_generated_report(report_path, report_dir)
-
             return jsonify(
-                {
-                    "success": True,
-                    "requestId": host_result.get("meta", {}).get("requestId"),
-                    "updated": int(data.get("updated") or 0),
-                    "changedDrawingCount": int(data.get("changedDrawingCount") or 0),
-                    "changedItemCount": int(
-                        data.get("changedItemCount") or data.get("updated") or 0
-                    ),
-                    "drawings": data.get("drawings") or [],
-                    "warnings": host_result.get("warnings") or [],
-                    "reportId": report_id,
-                    "reportFilename": report_filename,
-                    "downloadUrl": f"/api/batch-find-replace/reports/{report_id}",
-                    "message": host_result.get("message")
-                    or "Project CAD apply completed.",
-                }
+                _project_apply_payload(
+                    data=host_result.get("data") or {},
+                    warnings=host_result.get("warnings") or [],
+                    request_id=host_result.get("meta", {}).get("requestId"),
+                    message=host_result.get("message"),
+                )
             )
         except ValueError as exc:
             return _batch_error_response(
@@ -1169,6 +1197,8 @@ def create_batch_find_replace_blueprint(
                 ),
                 status_code=400,
             )
+        except JobCapacityError as exc:
+            return _batch_error_response(message=str(exc), status_code=429)
         except Exception:
             logger.exception("Project CAD batch apply failed")
             return _batch_error_response(
@@ -1176,6 +1206,36 @@ def create_batch_find_replace_blueprint(
                 status_code=500,
             )
 
+    @bp.route("/cad/project-jobs/<job_id>", methods=["GET"])
+    @require_batch_session_or_api_key
+    @limiter.limit("1200 per hour")
+    def api_batch_find_replace_cad_project_job_status(job_id: str):
+        job = project_jobs.get(job_id)
+        if not job:
+            return make_error_response("Project CAD job not found.", status=404)
+        return jsonify({"success": True, **job})
+
+    @bp.route("/cad/project-jobs/<job_id>/cancel", methods=["POST"])
+    @require_batch_session_or_api_key
+    @limiter.limit("60 per hour")
+    def api_batch_find_replace_cad_project_job_cancel(job_id: str):
+        job = project_jobs.cancel(job_id)
+        if not job:
+            return make_error_response("Project CAD job not found.", status=404)
+        return jsonify({"success": True, **job})
+
+    @bp.route("/cad/project-jobs/<job_id>/resume", methods=["POST"])
+    @require_batch_session_or_api_key
+    @limiter.limit("30 per hour")
+    def api_batch_find_replace_cad_project_job_resume(job_id: str):
+        try:
+            job = project_jobs.resume(job_id)
+        except ValueError as exc:
+            return make_error_response(str(exc), status=409)
+        if not job:
+            return make_error_response("Project CAD job not found.", status=404)
+        return jsonify({"success": True, **job}), 202
+
     @bp.route("/reports/<report_id>", methods=["GET"])
     @require_batch_session_or_api_key
     @limiter.limit("40 per hour")
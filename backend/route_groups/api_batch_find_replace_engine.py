@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import codecs
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .api_process_pool import PersistentProcessPool
+
+READ_CHUNK_BYTES = 64 * 1024
+MAX_MATCH_TEXT_CHARS = 500
+# Tried in order, as a whole-file decode would; latin-1 accepts any input.
+TEXT_ENCODINGS = ("utf-8", "utf-16", "latin-1")
+# Everything str.splitlines() treats as a line boundary ("\r\n" counts once).
+_LINE_BOUNDARIES = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+# Below these, pickling uploads to worker processes costs more than it saves.
+MIN_PARALLEL_BATCH_FILES = 2
+MIN_PARALLEL_BATCH_BYTES = 256 * 1024
+# Uploads up to this size are pickled to workers as bytes; larger ones are
+# spooled to a temp file and workers stream them from disk.
+MAX_INLINE_WORKER_BYTES = 256 * 1024
+
+_BATCH_POOL = PersistentProcessPool("BATCH_FIND_REPLACE_MAX_WORKERS", default_cap=4, max_workers_cap=32)
+
+
+def build_rule_pattern(rule: Dict[str, Any]) -> re.Pattern[str]:
+    flags = 0 if rule["match_case"] else re.IGNORECASE
+    if rule["use_regex"]:
+        try:
+            return re.compile(rule["find"], flags)
+        except re.error as exc:
+            raise ValueError(f"Invalid regex for rule '{rule['id']}': {exc}")
+
+    return re.compile(re.escape(rule["find"]), flags)
+
+
+def _literal_alternation(literals: Sequence[str]) -> str:
+    """Regex source matching any of ``literals``, factored on shared prefixes."""
+    trie: Dict[str, Any] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        # Walk single-child runs without recursing so long literals stay shallow.
+        prefix: List[str] = []
+        while len(node) == 1 and "" not in node:
+            char, node = next(iter(node.items()))
+            prefix.append(re.escape(char))
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append("")
+        if not branches:
+            return "".join(prefix)
+        if len(branches) == 1:
+            return "".join(prefix) + branches[0]
+        return "".join(prefix) + "(?:" + "|".join(branches) + ")"
+
+    return render(trie)
+
+
+def _compiles_in_group(source: str) -> bool:
+    # Global inline flags such as "(?x)" are rejected once wrapped in a group.
+    try:
+        re.compile("(?:" + source + ")")
+    except re.error:
+        return False
+    return True
+
+
+class CompiledRuleSet:
+    """Batch find/replace rules compiled once and applied to streamed files.
+
+    Rules keep their sequential meaning: rule N sees each line as rules
+    1..N-1 left it. A line only goes through that per-rule pass when the
+    prefilter (literal rules merged into one prefix-factored alternation,
+    plus the regex rules that can be embedded) or one of the remaining
+    regex rules finds something in it; if no rule matches the original
+    line, no rule can change it.
+    """
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]) -> None:
+        self.rules = list(rules)
+        self.patterns = [build_rule_pattern(rule) for rule in self.rules]
+        literal_groups: Dict[bool, List[str]] = {True: [], False: []}
+        regex_alternatives: List[str] = []
+        self._regex_patterns: List[re.Pattern[str]] = []
+        for rule, pattern in zip(self.rules, self.patterns):
+            if not rule["use_regex"]:
+                literal_groups[bool(rule["match_case"])].append(rule["find"])
+            elif pattern.groups == 0 and _compiles_in_group(rule["find"]):
+                # No groups means no backreferences to renumber, so the rule
+                # can join the shared prefilter as-is.
+                regex_alternatives.append(("(?:" if rule["match_case"] else "(?i:") + rule["find"] + ")")
+            else:
+                self._regex_patterns.append(pattern)
+        # Substring checks let the per-rule pass skip literal rules that are
+        # absent from the line without going through the regex engine.
+        # Case-insensitive ones are only checked this way for ASCII text,
+        # where lower() and IGNORECASE agree.
+        self._needles: List[Optional[str]] = []
+        for rule in self.rules:
+            find_text = str(rule["find"])
+            if rule["use_regex"]:
+                self._needles.append(None)
+            elif rule["match_case"]:
+                self._needles.append(find_text)
+            elif find_text.isascii():
+                self._needles.append(find_text.lower())
+            else:
+                self._needles.append(None)
+        alternatives = []
+        if literal_groups[True]:
+            alternatives.append(_literal_alternation(literal_groups[True]))
+        if literal_groups[False]:
+            alternatives.append("(?i:" + _literal_alternation(literal_groups[False]) + ")")
+        alternatives.extend(regex_alternatives)
+        self._prefilter: Optional[re.Pattern[str]] = (
+            re.compile("|".join(alternatives)) if alternatives else None
+        )
+
+    def may_change(self, line: str) -> bool:
+        if self._prefilter is not None and self._prefilter.search(line):
+            return True
+        return any(pattern.search(line) for pattern in self._regex_patterns)
+
+    def process_stream(
+        self,
+        stream: BinaryIO,
+        *,
+        file_name: str,
+        keep_content: bool,
+        match_limit: int,
+        chunk_size: int = READ_CHUNK_BYTES,
+    ) -> Dict[str, Any]:
+        """Apply the rules to one uploaded file, reading it in chunks.
+
+        Returns ``matches`` (rule-major, at most ``match_limit`` rows),
+        ``replacements`` and, with ``keep_content``, the rewritten ``content``.
+        """
+        for encoding in TEXT_ENCODINGS:
+            stream.seek(0)
+            try:
+                return self._process_decoded(
+                    stream,
+                    encoding=encoding,
+                    file_name=file_name,
+                    keep_content=keep_content,
+                    match_limit=max(0, int(match_limit)),
+                    chunk_size=max(1, int(chunk_size)),
+                )
+            except UnicodeDecodeError:
+                continue
+
+        raise ValueError("Unable to decode file as text")
+
+    def _process_decoded(
+        self,
+        stream: BinaryIO,
+        *,
+        encoding: str,
+        file_name: str,
+        keep_content: bool,
+        match_limit: int,
+        chunk_size: int,
+    ) -> Dict[str, Any]:
+        matches_by_rule: List[List[Dict[str, Any]]] = [[] for _ in self.rules]
+        output_lines: List[str] = []
+        replacements = 0
+        saw_crlf = False
+
+        for line_number, line in enumerate(_iter_lines(stream, encoding, chunk_size), start=1):
+            if line.endswith("\r\n"):
+                saw_crlf = True
+                line = line[:-2]
+            elif line and line[-1] in _LINE_BOUNDARIES:
+                line = line[:-1]
+
+            if self.may_change(line):
+                lowered: Optional[str] = None
+                for rule_index, (rule, pattern) in enumerate(zip(self.rules, self.patterns)):
+                    needle = self._needles[rule_index]
+                    if needle is not None:
+                        if rule["match_case"]:
+                            if needle not in line:
+                                continue
+                        elif line.isascii():
+                            if lowered is None:
+                                lowered = line.lower()
+                            if needle not in lowered:
+                                continue
+                    updated_line, replaced = pattern.subn(rule["replace"], line)
+                    if replaced > 0:
+                        replacements += replaced
+                        rule_matches = matches_by_rule[rule_index]
+                        if len(rule_matches) < match_limit:
+                            rule_matches.append(
+                                {
+                                    "file": file_name,
+                                    "line": line_number,
+                                    "before": line[:MAX_MATCH_TEXT_CHARS],
+                                    "after": updated_line[:MAX_MATCH_TEXT_CHARS],
+                                    "ruleId": rule["id"],
+                                }
+                            )
+                        line = updated_line
+                        lowered = None
+
+            if keep_content:
+                output_lines.append(line)
+
+        matches = [match for rule_matches in matches_by_rule for match in rule_matches]
+        return {
+            "matches": matches[:match_limit],
+            "replacements": replacements,
+            "content": ("\r\n" if saw_crlf else "\n").join(output_lines) if keep_content else None,
+        }
+
+
+def _iter_lines(stream: BinaryIO, encoding: str, chunk_size: int) -> Iterator[str]:
+    """Yield decoded lines with their terminators, matching ``str.splitlines``.
+
+    The last piece of each chunk is held back so a line (or a ``\\r\\n``
+    pair) split across chunks comes out whole.
+    """
+    if encoding == "utf-16":
+        # bytes.decode("utf-16") falls back to native order without a BOM;
+        # the incremental decoder refuses such input instead.
+        head = stream.read(2)
+        stream.seek(0)
+        if head not in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            encoding = "utf-16-le" if sys.byteorder == "little" else "utf-16-be"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    carry = ""
+    while True:
+        raw = stream.read(chunk_size)
+        if raw and b"\x00" in raw:
+            raise ValueError("Binary files are not supported")
+        text = carry + decoder.decode(raw or b"", final=not raw)
+        lines = text.splitlines(keepends=True)
+        if not raw:
+            yield from lines
+            return
+        carry = lines.pop() if lines else ""
+        yield from lines
+
+
+@lru_cache(maxsize=8)
+def _worker_rule_set(rules_key: str) -> CompiledRuleSet:
+    # Workers outlive requests; each compiles a given rule set once.
+    return CompiledRuleSet(json.loads(rules_key))
+
+
+def _process_file_timed(
+    rule_set: CompiledRuleSet,
+    stream: BinaryIO,
+    *,
+    file_name: str,
+    keep_content: bool,
+    match_limit: int,
+) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    result = rule_set.process_stream(
+        stream,
+        file_name=file_name,
+        keep_content=keep_content,
+        match_limit=match_limit,
+    )
+    result["durationMs"] = round((time.perf_counter() - started_at) * 1000.0, 3)
+    return result
+
+
+def _process_file_in_worker(
+    rules_key: str,
+    file_name: str,
+    source: Any,
+    keep_content: bool,
+    match_limit: int,
+) -> Dict[str, Any]:
+    """Apply a rule set to one uploaded file (runs inside pool workers).
+
+    ``source`` is the upload's bytes, or the path of its spooled copy.
+    """
+    rule_set = _worker_rule_set(rules_key)
+    if isinstance(source, bytes):
+        return _process_file_timed(
+            rule_set,
+            io.BytesIO(source),
+            file_name=file_name,
+            keep_content=keep_content,
+            match_limit=match_limit,
+        )
+    with open(source, "rb") as stream:
+        return _process_file_timed(
+            rule_set,
+            stream,
+            file_name=file_name,
+            keep_content=keep_content,
+            match_limit=match_limit,
+        )
+
+
+def _remaining_size(stream: BinaryIO) -> Optional[int]:
+    try:
+        position = stream.tell()
+        end = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+    except Exception:
+        return None
+    return max(0, end - position)
+
+
+def _worker_sources(files: Sequence[Tuple[str, BinaryIO]], sizes: Sequence[int], spool_dir: str) -> List[Any]:
+    sources: List[Any] = []
+    for index, ((_file_name, stream), size) in enumerate(zip(files, sizes)):
+        stream.seek(0)
+        if size <= MAX_INLINE_WORKER_BYTES:
+            sources.append(stream.read())
+            continue
+        path = os.path.join(spool_dir, f"upload-{index}")
+        with open(path, "wb") as spooled:
+            shutil.copyfileobj(stream, spooled, READ_CHUNK_BYTES)
+        sources.append(path)
+    return sources
+
+
+def run_batch_files(
+    rule_set: CompiledRuleSet,
+    files: Sequence[Tuple[str, BinaryIO]],
+    *,
+    keep_content: bool,
+    match_limit: int,
+    stop_at_match_limit: bool,
+    parallel: bool = True,
+    logger: Any = None,
+) -> Dict[str, Any]:
+    """Apply ``rule_set`` to every uploaded file, across worker processes when it pays off.
+
+    ``files`` must be seekable. Small uploads go to workers as bytes and
+    large ones are spooled to temp files, so a run never holds every
+    upload in memory. Per-file results come back in upload order whichever
+    way they ran, so merged match rows are identical to a sequential run. With
+    ``stop_at_match_limit`` the run ends after the file that fills
+    ``match_limit``; later files are left unprocessed and ``truncated`` is set.
+    """
+    match_limit = max(0, int(match_limit))
+    results: List[Dict[str, Any]] = []
+    matches: List[Dict[str, Any]] = []
+    truncated = False
+
+    def merge(file_name: str, result: Dict[str, Any]) -> bool:
+        nonlocal truncated
+        # Workers don't know how many rows earlier files used; trim to what's left.
+        result["matches"] = result["matches"][: max(0, match_limit - len(matches))]
+        matches.extend(result["matches"])
+        results.append({"file": file_name, **result})
+        if stop_at_match_limit and len(matches) >= match_limit and len(results) < len(files):
+            truncated = True
+            return False
+        return True
+
+    max_workers = _BATCH_POOL.max_workers()
+    workers_used = 1
+    used_pool = False
+    sizes: List[Optional[int]] = []
+    if parallel and max_workers > 1 and len(files) >= MIN_PARALLEL_BATCH_FILES:
+        sizes = [_remaining_size(stream) for _, stream in files]
+    if sizes and None not in sizes and sum(sizes) >= MIN_PARALLEL_BATCH_BYTES:
+        workers_used = min(max_workers, len(files))
+        rules_key = json.dumps(rule_set.rules, sort_keys=True)
+        futures: List[Future] = []
+        # Workers still reading a spooled file after an early stop keep it
+        # open; on Windows that blocks removal, which is harmless here.
+        with tempfile.TemporaryDirectory(prefix="batch_find_replace_spool_", ignore_cleanup_errors=True) as spool_dir:
+            try:
+                sources = _worker_sources(files, sizes, spool_dir)
+                pool = _BATCH_POOL.get(max_workers)
+                futures = [
+                    pool.submit(
+                        _process_file_in_worker,
+                        rules_key,
+                        file_name,
+                        source,
+                        keep_content,
+                        match_limit,
+                    )
+                    for (file_name, _), source in zip(files, sources)
+                ]
+                for (file_name, _), future in zip(files, futures):
+                    if not merge(file_name, future.result()):
+                        break
+                used_pool = True
+            except ValueError:
+                raise
+            except Exception:
+                _BATCH_POOL.discard()
+                if logger is not None:
+                    logger.warning("Parallel batch find/replace was unavailable; files were processed sequentially.")
+                results.clear()
+                matches.clear()
+                truncated = False
+                workers_used = 1
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    if not used_pool:
+        for file_name, stream in files:
+            result = _process_file_timed(
+                rule_set,
+                stream,
+                file_name=file_name,
+                keep_content=keep_content,
+                match_limit=match_limit - len(matches),
+            )
+            if not merge(file_name, result):
+                break
+
+    return {
+        "files": results,
+        "matches": matches,
+        "truncated": truncated,
+        "parallel": used_pool,
+        "workers": workers_used,
+    }
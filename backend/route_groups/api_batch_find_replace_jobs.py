@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+JOB_TTL_SECONDS = 60 * 60
+MAX_TRACKED_JOBS = 50
+# The in-process ACADE host serves a single pipe instance, so drawings go
+# through it one at a time unless BATCH_FIND_REPLACE_PROJECT_CONCURRENCY
+# is raised for a host that accepts more.
+DEFAULT_DRAWING_CONCURRENCY = 1
+MAX_DRAWING_CONCURRENCY = 8
+
+# Job states; only "failed" and "cancelled" jobs can be resumed.
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_CANCELLING = "cancelling"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+_FINISHED_STATES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+_RESUMABLE_STATES = {JOB_FAILED, JOB_CANCELLED}
+
+
+class JobCapacityError(RuntimeError):
+    """Raised by ``DrawingJobRunner.submit`` when every job slot is taken."""
+
+
+def drawing_concurrency_from_env() -> int:
+    raw = str(os.environ.get("BATCH_FIND_REPLACE_PROJECT_CONCURRENCY", "") or "").strip()
+    if not raw:
+        return DEFAULT_DRAWING_CONCURRENCY
+    try:
+        return max(1, min(MAX_DRAWING_CONCURRENCY, int(raw)))
+    except ValueError:
+        return DEFAULT_DRAWING_CONCURRENCY
+
+
+class DrawingJobRunner:
+    """Background jobs that push project drawings through the CAD host one by one.
+
+    Each job holds a list of drawing units. A worker thread runs them with
+    at most ``concurrency`` in flight, records each unit's outcome, and
+    calls ``finalize`` with the unit results (in unit order) once every
+    unit has completed. A failed unit stops new units from starting;
+    ``resume`` reruns only the units that have not completed. ``cancel``
+    lets in-flight units finish and skips the rest.
+    """
+
+    def __init__(
+        self,
+        *,
+        logger: Any,
+        publish_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        time_module: Any = time,
+        ttl_seconds: int = JOB_TTL_SECONDS,
+        max_jobs: int = MAX_TRACKED_JOBS,
+    ) -> None:
+        self.logger = logger
+        self.publish_progress = publish_progress
+        self.time = time_module
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def _prune_locked(self) -> None:
+        now = self.time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job["status"] in _FINISHED_STATES and now - job["updatedAt"] > self.ttl_seconds:
+                self._jobs.pop(job_id, None)
+        finished = sorted(
+            (job for job in self._jobs.values() if job["status"] in _FINISHED_STATES),
+            key=lambda job: job["updatedAt"],
+        )
+        while len(self._jobs) >= self.max_jobs and finished:
+            self._jobs.pop(finished.pop(0)["jobId"], None)
+
+    def submit(
+        self,
+        *,
+        kind: str,
+        units: List[Dict[str, Any]],
+        process_unit: Callable[[str, int, Dict[str, Any]], Dict[str, Any]],
+        finalize: Callable[[str, List[Dict[str, Any]]], Dict[str, Any]],
+        concurrency: int,
+    ) -> Dict[str, Any]:
+        """Register a job and start it. ``units`` need ``key`` and ``label``."""
+        now = self.time.time()
+        job_id = f"bfr-job-{secrets.token_urlsafe(9)}"
+        job = {
+            "jobId": job_id,
+            "kind": kind,
+            "status": JOB_QUEUED,
+            "concurrency": max(1, min(MAX_DRAWING_CONCURRENCY, int(concurrency))),
+            "units": [
+                {**unit, "status": "pending", "error": None, "result": None, "durationMs": None}
+                for unit in units
+            ],
+            "processUnit": process_unit,
+            "finalize": finalize,
+            "cancelRequested": False,
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        with self._lock:
+            self._prune_locked()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobCapacityError("Too many batch find/replace jobs are active.")
+            self._jobs[job_id] = job
+        self._start(job)
+        return self.get(job_id) or {}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot_locked(job) if job else None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            if job["status"] in (JOB_QUEUED, JOB_RUNNING):
+                job["cancelRequested"] = True
+                job["status"] = JOB_CANCELLING
+                job["updatedAt"] = self.time.time()
+            return self._snapshot_locked(job)
+
+    def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            if job["status"] not in _RESUMABLE_STATES:
+                raise ValueError(f"Only failed or cancelled jobs can be resumed (status is {job['status']}).")
+            job["status"] = JOB_QUEUED
+            job["cancelRequested"] = False
+            job["error"] = None
+            job["updatedAt"] = self.time.time()
+            for unit in job["units"]:
+                if unit["status"] != "completed":
+                    unit.update({"status": "pending", "error": None, "result": None, "durationMs": None})
+        self._start(job)
+        return self.get(job_id)
+
+    def _start(self, job: Dict[str, Any]) -> None:
+        worker = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"batch-find-replace-{job['jobId']}",
+            daemon=True,
+        )
+        worker.start()
+
+    def _snapshot_locked(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        units = job["units"]
+        completed = sum(1 for unit in units if unit["status"] == "completed")
+        snapshot = {
+            "jobId": job["jobId"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": int(round(100 * completed / len(units))) if units else 100,
+            "completedDrawings": completed,
+            "totalDrawings": len(units),
+            "attempts": job["attempts"],
+            "drawings": [
+                {
+                    "drawingPath": unit["key"],
+                    "drawingName": unit["label"],
+                    "status": unit["status"],
+                    "error": unit["error"],
+                    "durationMs": unit["durationMs"],
+                }
+                for unit in units
+            ],
+        }
+        if job["error"]:
+            snapshot["error"] = job["error"]
+        if job["status"] == JOB_COMPLETED and job["result"] is not None:
+            snapshot["result"] = job["result"]
+        return snapshot
+
+    def _publish(self, job: Dict[str, Any], *, stage: str, current_item: Optional[str], message: str) -> None:
+        if self.publish_progress is None:
+            return
+        with self._lock:
+            snapshot = self._snapshot_locked(job)
+        try:
+            self.publish_progress(
+                {
+                    "run_id": job["jobId"],
+                    "stage": stage,
+                    "progress": snapshot["progress"],
+                    "current_item": current_item,
+                    "message": message,
+                    "active": stage not in _FINISHED_STATES,
+                }
+            )
+        except Exception:
+            self.logger.warning("Could not publish progress for batch job %s", job["jobId"])
+
+    def _run_unit(self, job: Dict[str, Any], index: int) -> None:
+        unit = job["units"][index]
+        started_at = time.perf_counter()
+        try:
+            result = job["processUnit"](job["jobId"], index, unit)
+            status, error = "completed", None
+        except Exception as exc:
+            result, status, error = None, "failed", str(exc) or exc.__class__.__name__
+        finished_at = time.perf_counter()
+        with self._lock:
+            unit["status"] = status
+            unit["error"] = error
+            unit["result"] = result
+            unit["durationMs"] = round((finished_at - started_at) * 1000.0, 3)
+            job["updatedAt"] = self.time.time()
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            if not job["cancelRequested"]:
+                job["status"] = JOB_RUNNING
+            job["attempts"] += 1
+            pending = [index for index, unit in enumerate(job["units"]) if unit["status"] != "completed"]
+        self._publish(job, stage="processing", current_item=None, message="Batch job started.")
+
+        in_flight: Dict[Future, int] = {}
+        failed = False
+        with ThreadPoolExecutor(
+            max_workers=job["concurrency"],
+            thread_name_prefix=f"bfr-{job['jobId'][-6:]}",
+        ) as pool:
+            while pending or in_flight:
+                while pending and len(in_flight) < job["concurrency"] and not failed and not job["cancelRequested"]:
+                    index = pending.pop(0)
+                    with self._lock:
+                        job["units"][index]["status"] = "running"
+                    in_flight[pool.submit(self._run_unit, job, index)] = index
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    unit = job["units"][in_flight.pop(future)]
+                    failed = failed or unit["status"] == "failed"
+                    self._publish(
+                        job,
+                        stage="processing",
+                        current_item=unit["label"],
+                        message=(
+                            f"{unit['label']} failed: {unit['error']}"
+                            if unit["status"] == "failed"
+                            else f"{unit['label']} done."
+                        ),
+                    )
+
+        if failed or job["cancelRequested"]:
+            with self._lock:
+                for index in pending:
+                    job["units"][index]["status"] = "pending"
+                job["status"] = JOB_FAILED if failed else JOB_CANCELLED
+                if failed:
+                    job["error"] = "One or more drawings failed; resume the job to retry them."
+                job["updatedAt"] = self.time.time()
+            self._publish(
+                job,
+                stage=job["status"],
+                current_item=None,
+                message=job["error"] or "Batch job cancelled.",
+            )
+            return
+
+        try:
+            results = [unit["result"] for unit in job["units"]]
+            final = job["finalize"](job["jobId"], results)
+        except Exception as exc:
+            self.logger.exception("Batch job %s could not be finalized", job["jobId"])
+            with self._lock:
+                job["status"] = JOB_FAILED
+                job["error"] = str(exc) or "Batch job could not be finalized."
+                job["updatedAt"] = self.time.time()
+            self._publish(job, stage=JOB_FAILED, current_item=None, message=job["error"])
+            return
+
+        with self._lock:
+            job["result"] = final
+            job["status"] = JOB_COMPLETED
+            job["updatedAt"] = self.time.time()
+        self._publish(job, stage=JOB_COMPLETED, current_item=None, message="Batch job completed.")
@@ -1,9 +1,29 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
 import heapq
 import math
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .api_conduit_route_spatial_index import obstacle_index_for
+from .api_process_pool import PersistentProcessPool
+
+try:
+    import numpy as np
+
+    _NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    _NUMPY_AVAILABLE = False
 
 VALID_ROUTING_MODES = {"plan_view", "cable_tag", "schematic"}
 VALID_OBSTACLE_TYPES = {
@@ -14,11 +34,20 @@ VALID_OBSTACLE_TYPES = {
     "fence",
     "road",
 }
+VALID_ROUTE_ENGINES = {"python", "numpy"}
+VALID_SEARCH_MODES = {"astar", "bidirectional", "hierarchical"}
 
 DEFAULT_CANVAS_WIDTH = 980.0
 DEFAULT_CANVAS_HEIGHT = 560.0
 DEFAULT_GRID_STEP = 8.0
 DEFAULT_CLEARANCE = 18.0
+DEFAULT_ROUTE_ENGINE = "python"
+DEFAULT_SEARCH_MODE = "astar"
+# Hierarchical search keeps the coarse grid near this many cells per side.
+HIERARCHICAL_COARSE_TARGET_CELLS = 192
+HIERARCHICAL_MAX_COARSE_FACTOR = 16
+HIERARCHICAL_CORRIDOR_RADIUS = 2
+DEFAULT_GRID_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 
 def _safe_str(value: Any) -> str:
@@ -220,6 +249,239 @@ def _build_cost_grid(
     return (grid, cols, rows)
 
 
+def _cell_span(start: float, end: float, *, step: float, limit: int) -> Tuple[int, int]:
+    low = _clamp_int(int(math.floor(start / step)), 0, limit - 1)
+    high = _clamp_int(int(math.ceil(end / step)), 0, limit - 1)
+    return (low, high)
+
+
+def _build_cost_grid_numpy(
+    *,
+    obstacles: Sequence[Dict[str, Any]],
+    clearance: float,
+    mode: str,
+    canvas_width: float,
+    canvas_height: float,
+    grid_step: float,
+) -> Tuple[Any, int, int]:
+    """Rasterize obstacles into a contiguous float64 array.
+
+    Cell values match `_build_cost_grid` exactly; obstacles are still applied in
+    payload order because trench/soft writes depend on earlier hard keepouts.
+    """
+    cols = max(4, int(math.ceil(canvas_width / grid_step)))
+    rows = max(4, int(math.ceil(canvas_height / grid_step)))
+    grid = np.zeros((rows, cols), dtype=np.float64)
+    world_x = [col * grid_step for col in range(cols)]
+    world_y = [row * grid_step for row in range(rows)]
+
+    for obstacle in obstacles:
+        obstacle_type = str(obstacle.get("type", "foundation")).lower()
+
+        if obstacle_type == "fence":
+            continue
+        if mode == "schematic" and obstacle_type != "building":
+            continue
+
+        if obstacle_type == "trench":
+            x0, x1 = _cell_span(
+                float(obstacle["x"]),
+                float(obstacle["x"]) + float(obstacle["w"]),
+                step=grid_step,
+                limit=cols,
+            )
+            y0, y1 = _cell_span(
+                float(obstacle["y"]),
+                float(obstacle["y"]) + float(obstacle["h"]),
+                step=grid_step,
+                limit=rows,
+            )
+            block = grid[y0 : y1 + 1, x0 : x1 + 1]
+            np.minimum(block, -0.55, out=block, where=block < 999)
+            continue
+
+        effective_clearance = 8.0 if mode == "schematic" else clearance
+        hard = _inflate_rect(obstacle, effective_clearance)
+        soft = _inflate_rect(obstacle, effective_clearance * 1.75)
+
+        hard_x0, hard_x1 = _cell_span(hard["x"], hard["x"] + hard["w"], step=grid_step, limit=cols)
+        hard_y0, hard_y1 = _cell_span(hard["y"], hard["y"] + hard["h"], step=grid_step, limit=rows)
+        grid[hard_y0 : hard_y1 + 1, hard_x0 : hard_x1 + 1] = 999.0
+
+        # Soft cost only lands on cell centres inside the soft rect; cells inside
+        # the hard rect are already 999 from the slice assignment above.
+        soft_x0 = bisect.bisect_left(world_x, soft["x"])
+        soft_x1 = bisect.bisect_right(world_x, soft["x"] + soft["w"])
+        soft_y0 = bisect.bisect_left(world_y, soft["y"])
+        soft_y1 = bisect.bisect_right(world_y, soft["y"] + soft["h"])
+        if soft_x0 >= soft_x1 or soft_y0 >= soft_y1:
+            continue
+        block = grid[soft_y0:soft_y1, soft_x0:soft_x1]
+        np.maximum(block, 1.8, out=block, where=block < 999)
+
+    return (grid, cols, rows)
+
+
+def _cost_grid_fingerprint(
+    *,
+    obstacles: Sequence[Dict[str, Any]],
+    clearance: float,
+    mode: str,
+    canvas_width: float,
+    canvas_height: float,
+    grid_step: float,
+    engine: str,
+) -> str:
+    """Stable key for a built grid; ids/labels are excluded since they never affect cost."""
+    digest = hashlib.sha256()
+    digest.update(
+        repr((engine, mode, float(clearance), float(canvas_width), float(canvas_height), float(grid_step))).encode(
+            "utf-8"
+        )
+    )
+    for obstacle in obstacles:
+        digest.update(
+            repr(
+                (
+                    str(obstacle.get("type", "foundation")).lower(),
+                    float(obstacle["x"]),
+                    float(obstacle["y"]),
+                    float(obstacle["w"]),
+                    float(obstacle["h"]),
+                )
+            ).encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def _estimate_grid_bytes(grid: Any, cols: int, rows: int) -> int:
+    nbytes = getattr(grid, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    # List grids hold one pointer per cell plus a list header per row.
+    return rows * (56 + cols * 8)
+
+
+class _CostGridCache:
+    """Thread-safe LRU of built cost grids, bounded by estimated memory size."""
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, Tuple[Any, int, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, int, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return (entry[0], entry[1], entry[2])
+
+    def put(self, key: str, grid: Any, cols: int, rows: int) -> None:
+        size = _estimate_grid_bytes(grid, cols, rows)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._entries[key] = (grid, cols, rows, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+            }
+
+
+def _grid_cache_max_bytes_from_env() -> int:
+    raw = os.environ.get("CONDUIT_ROUTE_GRID_CACHE_BYTES", "")
+    try:
+        return max(0, int(str(raw).strip())) if str(raw).strip() else DEFAULT_GRID_CACHE_MAX_BYTES
+    except ValueError:
+        return DEFAULT_GRID_CACHE_MAX_BYTES
+
+
+_COST_GRID_CACHE = _CostGridCache(max_bytes=_grid_cache_max_bytes_from_env())
+
+
+def get_cost_grid_cache_stats() -> Dict[str, int]:
+    return _COST_GRID_CACHE.stats()
+
+
+def clear_cost_grid_cache() -> None:
+    _COST_GRID_CACHE.clear()
+
+
+def _resolve_cost_grid(
+    *,
+    obstacles: Sequence[Dict[str, Any]],
+    clearance: float,
+    mode: str,
+    canvas_width: float,
+    canvas_height: float,
+    grid_step: float,
+    engine: str,
+    use_cache: bool = True,
+) -> Tuple[Any, int, int, Dict[str, Any]]:
+    """Return a cost grid for the request, reusing a cached build when possible.
+
+    Cached grids are shared between requests and must be treated as read-only.
+    """
+    build_grid = _build_cost_grid_numpy if engine == "numpy" else _build_cost_grid
+    grid_kwargs = {
+        "obstacles": obstacles,
+        "clearance": clearance,
+        "mode": mode,
+        "canvas_width": canvas_width,
+        "canvas_height": canvas_height,
+        "grid_step": grid_step,
+    }
+    if not use_cache:
+        grid, cols, rows = build_grid(**grid_kwargs)
+        return (grid, cols, rows, {"enabled": False, "hit": False})
+
+    key = _cost_grid_fingerprint(engine=engine, **grid_kwargs)
+    cached = _COST_GRID_CACHE.get(key)
+    hit = cached is not None
+    if cached is None:
+        grid, cols, rows = build_grid(**grid_kwargs)
+        _COST_GRID_CACHE.put(key, grid, cols, rows)
+    else:
+        grid, cols, rows = cached
+    return (
+        grid,
+        cols,
+        rows,
+        {"enabled": True, "hit": hit, "key": key[:16], **_COST_GRID_CACHE.stats()},
+    )
+
+
 def _simplify_path(path: Sequence[Dict[str, float]]) -> List[Dict[str, float]]:
     if len(path) <= 2:
         return [{"x": float(point["x"]), "y": float(point["y"])} for point in path]
@@ -248,6 +510,8 @@ def _route_path(
     rows: int,
     grid_step: float,
     mode: str,
+    allowed_cells: Optional[set[Tuple[int, int]]] = None,
+    cell_factor: int = 1,
 ) -> Dict[str, Any]:
     start_cell = _to_grid_point(start, step=grid_step, cols=cols, rows=rows)
     end_cell = _to_grid_point(end, step=grid_step, cols=cols, rows=rows)
@@ -255,6 +519,7 @@ def _route_path(
     turn_penalty = 2.4 if mode == "schematic" else 4.8
     max_iterations = cols * rows * 3
     directions = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    cell_offset = cell_factor // 2
 
     open_heap: List[Tuple[float, int, int, int, float, int, int]] = []
     heap_counter = 0
@@ -304,6 +569,10 @@ def _route_path(
             neighbor = (nx, ny)
             if neighbor in closed:
                 continue
+            if allowed_cells is not None and (
+                ((nx + cell_offset) // cell_factor, (ny + cell_offset) // cell_factor) not in allowed_cells
+            ):
+                continue
 
             movement_cost = 1.0 + max(0.0, float(grid[ny][nx]) * 2.2)
             if grid[ny][nx] < 0:
@@ -339,6 +608,425 @@ def _route_path(
     }
 
 
+def _movement_cost(value: float) -> float:
+    movement_cost = 1.0 + max(0.0, value * 2.2)
+    if value < 0:
+        movement_cost = max(0.1, movement_cost - abs(value))
+    return movement_cost
+
+
+def _flat_move_costs(grid: Any) -> Tuple[List[float], List[bool]]:
+    """Per-cell entry cost and blocked flags in flat (`row * cols + col`) order."""
+    if isinstance(grid, list):
+        flat_values = [float(value) for row in grid for value in row]
+        return (
+            [_movement_cost(value) for value in flat_values],
+            [value >= 999 for value in flat_values],
+        )
+    flat = np.ascontiguousarray(grid, dtype=np.float64).reshape(-1)
+    step_costs = 1.0 + np.maximum(0.0, flat * 2.2)
+    step_costs = np.where(flat < 0, np.maximum(0.1, step_costs - np.abs(flat)), step_costs)
+    return (step_costs.tolist(), (flat >= 999).tolist())
+
+
+def _route_path_flat(
+    *,
+    start: Dict[str, float],
+    end: Dict[str, float],
+    grid: Any,
+    cols: int,
+    rows: int,
+    grid_step: float,
+    mode: str,
+) -> Dict[str, Any]:
+    """A* over flat cell indices (`row * cols + col`) for a NumPy cost grid.
+
+    Expansion order, tie-breaking and cost arithmetic mirror `_route_path`, so
+    both engines return the same path, iteration count and visited-node count.
+    """
+    start_x, start_y = _to_grid_point(start, step=grid_step, cols=cols, rows=rows)
+    end_x, end_y = _to_grid_point(end, step=grid_step, cols=cols, rows=rows)
+    start_index = start_y * cols + start_x
+    end_index = end_y * cols + end_x
+
+    turn_penalty = 2.4 if mode == "schematic" else 4.8
+    max_iterations = cols * rows * 3
+    cell_count = cols * rows
+
+    move_costs, blocked = _flat_move_costs(grid)
+    heuristic = (
+        np.abs(np.arange(rows, dtype=np.float64) - end_y)[:, None]
+        + np.abs(np.arange(cols, dtype=np.float64) - end_x)[None, :]
+    ).reshape(-1).tolist()
+
+    g_scores = [math.inf] * cell_count
+    parents = [-1] * cell_count
+    closed = bytearray(cell_count)
+    g_scores[start_index] = 0.0
+
+    open_heap: List[Tuple[float, int, int, float, int]] = [(0.0, 0, start_index, 0.0, -1)]
+    heap_counter = 0
+    visited = 0
+    iterations = 0
+    while open_heap and iterations < max_iterations:
+        iterations += 1
+        _, _, current, g_cost, parent = heapq.heappop(open_heap)
+
+        if g_cost > (g_scores[current] + 1e-9):
+            continue
+        if closed[current]:
+            continue
+        closed[current] = 1
+        visited += 1
+
+        if current == end_index:
+            cells = [current]
+            while parents[cells[-1]] >= 0:
+                cells.append(parents[cells[-1]])
+            cells.reverse()
+            path = [_from_grid_point((cell % cols, cell // cols), step=grid_step) for cell in cells]
+            path[0] = dict(start)
+            path[-1] = dict(end)
+            return {
+                "path": _simplify_path(path),
+                "iterations": iterations,
+                "visitedNodes": visited,
+                "fallbackUsed": False,
+                "routeValid": True,
+            }
+
+        cy, cx = divmod(current, cols)
+        prev_delta = current - parent if parent >= 0 else 0
+        for delta, in_bounds in (
+            (1, cx + 1 < cols),
+            (-1, cx > 0),
+            (cols, cy + 1 < rows),
+            (-cols, cy > 0),
+        ):
+            if not in_bounds:
+                continue
+            neighbor = current + delta
+            if blocked[neighbor] or closed[neighbor]:
+                continue
+
+            movement_cost = move_costs[neighbor]
+            if prev_delta and prev_delta != delta:
+                movement_cost += turn_penalty
+
+            tentative_g = g_cost + movement_cost
+            if tentative_g >= g_scores[neighbor]:
+                continue
+
+            g_scores[neighbor] = tentative_g
+            parents[neighbor] = current
+
+            heap_counter += 1
+            heapq.heappush(
+                open_heap,
+                (tentative_g + heuristic[neighbor], heap_counter, neighbor, tentative_g, current),
+            )
+
+    return {
+        "path": [],
+        "iterations": iterations,
+        "visitedNodes": visited,
+        "fallbackUsed": False,
+        "routeValid": False,
+    }
+
+
+def _route_path_bidirectional(
+    *,
+    start: Dict[str, float],
+    end: Dict[str, float],
+    grid: Any,
+    cols: int,
+    rows: int,
+    grid_step: float,
+    mode: str,
+) -> Dict[str, Any]:
+    """Bidirectional A* over flat cell indices using the same cost model as `_route_path`.
+
+    Forward and backward frontiers grow from the start and end cells and stop
+    once the best meeting cost is no worse than either frontier's lowest f.
+    Equal-f ties prefer the deeper node, so long open runs stay on one lane
+    instead of flooding every tied cell. The turn penalty is charged at the
+    meeting cell when the two halves arrive from different directions.
+    """
+    start_x, start_y = _to_grid_point(start, step=grid_step, cols=cols, rows=rows)
+    end_x, end_y = _to_grid_point(end, step=grid_step, cols=cols, rows=rows)
+    start_index = start_y * cols + start_x
+    end_index = end_y * cols + end_x
+
+    turn_penalty = 2.4 if mode == "schematic" else 4.8
+    max_iterations = cols * rows * 3
+    cell_count = cols * rows
+    move_costs, blocked = _flat_move_costs(grid)
+
+    # Forward links point toward the start; backward links point toward the end.
+    g_forward = [math.inf] * cell_count
+    g_backward = [math.inf] * cell_count
+    link_forward = [-1] * cell_count
+    link_backward = [-1] * cell_count
+    closed_forward = bytearray(cell_count)
+    closed_backward = bytearray(cell_count)
+    g_forward[start_index] = 0.0
+    g_backward[end_index] = 0.0
+
+    heap_counter = 0
+    open_forward: List[Tuple[float, float, int, int]] = [(0.0, -0.0, 0, start_index)]
+    open_backward: List[Tuple[float, float, int, int]] = [(0.0, -0.0, 0, end_index)]
+
+    best_cost = math.inf
+    meet_index = -1
+
+    def _meeting_cost(cell: int) -> float:
+        total = g_forward[cell] + g_backward[cell]
+        before = link_forward[cell]
+        after = link_backward[cell]
+        if before >= 0 and after >= 0 and (cell - before) != (after - cell):
+            total += turn_penalty
+        return total
+
+    if start_index == end_index:
+        best_cost = 0.0
+        meet_index = start_index
+
+    iterations = 0
+    while open_forward and open_backward and iterations < max_iterations:
+        if best_cost <= max(open_forward[0][0], open_backward[0][0]):
+            break
+        iterations += 1
+
+        forward = len(open_forward) <= len(open_backward)
+        heap = open_forward if forward else open_backward
+        _, _, _, current = heapq.heappop(heap)
+        if forward:
+            if closed_forward[current]:
+                continue
+            closed_forward[current] = 1
+            g_cost = g_forward[current]
+            link = link_forward[current]
+        else:
+            if closed_backward[current]:
+                continue
+            closed_backward[current] = 1
+            g_cost = g_backward[current]
+            link = link_backward[current]
+
+        cy, cx = divmod(current, cols)
+        # Direction of travel through `current`, expressed as a forward delta.
+        prev_delta = (current - link if forward else link - current) if link >= 0 else 0
+        for delta, in_bounds in (
+            (1, cx + 1 < cols),
+            (-1, cx > 0),
+            (cols, cy + 1 < rows),
+            (-cols, cy > 0),
+        ):
+            if not in_bounds:
+                continue
+            neighbor = current + delta
+            if blocked[neighbor]:
+                continue
+
+            if forward:
+                if closed_forward[neighbor]:
+                    continue
+                movement_cost = move_costs[neighbor]
+                if prev_delta and prev_delta != delta:
+                    movement_cost += turn_penalty
+                tentative_g = g_cost + movement_cost
+                if tentative_g >= g_forward[neighbor]:
+                    continue
+                g_forward[neighbor] = tentative_g
+                link_forward[neighbor] = current
+                ny, nx = divmod(neighbor, cols)
+                h = abs(nx - end_x) + abs(ny - end_y)
+                if g_backward[neighbor] < math.inf:
+                    candidate = _meeting_cost(neighbor)
+                    if candidate < best_cost:
+                        best_cost = candidate
+                        meet_index = neighbor
+            else:
+                if closed_backward[neighbor]:
+                    continue
+                # Travelling backward: the forward move is neighbor -> current.
+                movement_cost = move_costs[current]
+                if prev_delta and prev_delta != -delta:
+                    movement_cost += turn_penalty
+                tentative_g = g_cost + movement_cost
+                if tentative_g >= g_backward[neighbor]:
+                    continue
+                g_backward[neighbor] = tentative_g
+                link_backward[neighbor] = current
+                ny, nx = divmod(neighbor, cols)
+                h = abs(nx - start_x) + abs(ny - start_y)
+                if g_forward[neighbor] < math.inf:
+                    candidate = _meeting_cost(neighbor)
+                    if candidate < best_cost:
+                        best_cost = candidate
+                        meet_index = neighbor
+
+            heap_counter += 1
+            heapq.heappush(heap, (tentative_g + float(h), -tentative_g, heap_counter, neighbor))
+
+    visited = sum(closed_forward) + sum(closed_backward)
+    if meet_index < 0:
+        return {
+            "path": [],
+            "iterations": iterations,
+            "visitedNodes": visited,
+            "fallbackUsed": False,
+            "routeValid": False,
+        }
+
+    cells = [meet_index]
+    while link_forward[cells[-1]] >= 0:
+        cells.append(link_forward[cells[-1]])
+    cells.reverse()
+    while link_backward[cells[-1]] >= 0:
+        cells.append(link_backward[cells[-1]])
+    path = [_from_grid_point((cell % cols, cell // cols), step=grid_step) for cell in cells]
+    path[0] = dict(start)
+    path[-1] = dict(end)
+    return {
+        "path": _simplify_path(path),
+        "iterations": iterations,
+        "visitedNodes": visited,
+        "fallbackUsed": False,
+        "routeValid": True,
+    }
+
+
+def _hierarchical_coarse_factor(cols: int, rows: int) -> int:
+    factor = math.ceil(max(cols, rows) / HIERARCHICAL_COARSE_TARGET_CELLS)
+    return _clamp_int(factor, 2, HIERARCHICAL_MAX_COARSE_FACTOR)
+
+
+def _pool_cost_grid(grid: Any, cols: int, rows: int, factor: int) -> Tuple[List[List[float]], int, int]:
+    """Max-pool open cell costs into `factor`-sized blocks aligned with `_to_grid_point` rounding.
+
+    A coarse cell is blocked only when every fine cell under it is blocked, so
+    the coarse route is optimistic and the full-resolution corridor pass does
+    the real clearance check.
+    """
+    offset = factor // 2
+    coarse_cols = (cols - 1 + offset) // factor + 1
+    coarse_rows = (rows - 1 + offset) // factor + 1
+    if not isinstance(grid, list):
+        padded = np.full((coarse_rows * factor, coarse_cols * factor), 999.0)
+        padded[offset : offset + rows, offset : offset + cols] = grid
+        padded[padded >= 999] = -np.inf
+        pooled = padded.reshape(coarse_rows, factor, coarse_cols, factor).max(axis=(1, 3))
+        pooled[np.isneginf(pooled)] = 999.0
+        return pooled.tolist(), coarse_cols, coarse_rows
+
+    pooled_rows = [[-math.inf] * coarse_cols for _ in range(coarse_rows)]
+    for y, row in enumerate(grid):
+        pooled_row = pooled_rows[(y + offset) // factor]
+        for x, value in enumerate(row):
+            if value >= 999:
+                continue
+            coarse_x = (x + offset) // factor
+            if value > pooled_row[coarse_x]:
+                pooled_row[coarse_x] = float(value)
+    for pooled_row in pooled_rows:
+        for x, value in enumerate(pooled_row):
+            if value == -math.inf:
+                pooled_row[x] = 999.0
+    return pooled_rows, coarse_cols, coarse_rows
+
+
+def _route_path_hierarchical(
+    *,
+    start: Dict[str, float],
+    end: Dict[str, float],
+    grid: Any,
+    cols: int,
+    rows: int,
+    grid_step: float,
+    mode: str,
+) -> Dict[str, Any]:
+    """Coarse-to-fine route: solve on a pooled grid, then refine inside a corridor.
+
+    If either the coarse solve or the corridor refinement fails, the route is
+    solved on the full grid and `hierarchical.fullGridFallback` is set.
+    """
+    factor = _hierarchical_coarse_factor(cols, rows)
+    coarse_grid, coarse_cols, coarse_rows = _pool_cost_grid(grid, cols, rows, factor)
+    coarse_step = grid_step * factor
+    # Endpoints may sit inside a keepout; the full-resolution search tolerates that.
+    for point in (start, end):
+        coarse_x, coarse_y = _to_grid_point(point, step=coarse_step, cols=coarse_cols, rows=coarse_rows)
+        if coarse_grid[coarse_y][coarse_x] >= 999:
+            coarse_grid[coarse_y][coarse_x] = 0.0
+
+    coarse_route = _route_path(
+        start=start,
+        end=end,
+        grid=coarse_grid,
+        cols=coarse_cols,
+        rows=coarse_rows,
+        grid_step=coarse_step,
+        mode=mode,
+    )
+    iterations = int(coarse_route["iterations"])
+    visited = int(coarse_route["visitedNodes"])
+
+    corridor: set[Tuple[int, int]] = set()
+    route: Optional[Dict[str, Any]] = None
+    if coarse_route["routeValid"]:
+        radius = HIERARCHICAL_CORRIDOR_RADIUS
+        for cx, cy in _path_cells(coarse_route["path"], grid_step=coarse_step, cols=coarse_cols, rows=coarse_rows):
+            for y in range(max(0, cy - radius), min(coarse_rows, cy + radius + 1)):
+                for x in range(max(0, cx - radius), min(coarse_cols, cx + radius + 1)):
+                    corridor.add((x, y))
+        route = _route_path(
+            start=start,
+            end=end,
+            grid=grid,
+            cols=cols,
+            rows=rows,
+            grid_step=grid_step,
+            mode=mode,
+            allowed_cells=corridor,
+            cell_factor=factor,
+        )
+        iterations += int(route["iterations"])
+        visited += int(route["visitedNodes"])
+
+    full_grid_fallback = route is None or not route["routeValid"]
+    if full_grid_fallback:
+        full_route_path = _route_path if isinstance(grid, list) else _route_path_flat
+        route = full_route_path(
+            start=start,
+            end=end,
+            grid=grid,
+            cols=cols,
+            rows=rows,
+            grid_step=grid_step,
+            mode=mode,
+        )
+        iterations += int(route["iterations"])
+        visited += int(route["visitedNodes"])
+
+    assert route is not None
+    return {
+        **route,
+        "iterations": iterations,
+        "visitedNodes": visited,
+        "hierarchical": {
+            "coarseFactor": factor,
+            "coarseCols": coarse_cols,
+            "coarseRows": coarse_rows,
+            "coarseIterations": int(coarse_route["iterations"]),
+            "coarseRouteValid": bool(coarse_route["routeValid"]),
+            "corridorCells": len(corridor),
+            "fullGridFallback": full_grid_fallback,
+        },
+    }
+
+
 def _path_length(path: Sequence[Dict[str, float]]) -> float:
     total = 0.0
     for index in range(1, len(path)):
@@ -394,13 +1082,13 @@ def _route_tag(path: Sequence[Dict[str, float]], text: str) -> Dict[str, Any]:
     }
 
 
-def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
-    errors: List[str] = []
-    warnings: List[str] = []
-
-    start = _parse_point(payload.get("start"), field_name="start", errors=errors)
-    end = _parse_point(payload.get("end"), field_name="end", errors=errors)
-
+def _parse_route_settings(
+    payload: Dict[str, Any],
+    *,
+    errors: List[str],
+    warnings: List[str],
+) -> Dict[str, Any]:
+    """Parse the grid/search settings shared by single and batch route requests."""
     mode = _safe_str(payload.get("mode")).lower() or "plan_view"
     if mode not in VALID_ROUTING_MODES:
         errors.append("mode must be one of: plan_view, cable_tag, schematic.")
@@ -425,6 +1113,189 @@ def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
         grid_step = DEFAULT_GRID_STEP
     grid_step = _clamp(grid_step, 2.0, 128.0)
 
+    engine = _safe_str(payload.get("engine")).lower() or DEFAULT_ROUTE_ENGINE
+    if engine not in VALID_ROUTE_ENGINES:
+        errors.append("engine must be one of: python, numpy.")
+    requested_engine = engine
+    if engine == "numpy" and not _NUMPY_AVAILABLE:
+        warnings.append("numpy route engine is unavailable; using python engine.")
+        engine = "python"
+
+    search = _safe_str(payload.get("search")).lower() or DEFAULT_SEARCH_MODE
+    if search not in VALID_SEARCH_MODES:
+        errors.append("search must be one of: astar, bidirectional, hierarchical.")
+
+    search_margin = _safe_float(payload.get("searchMargin"))
+    if search_margin is not None:
+        search_margin = _clamp(search_margin, grid_step * 4, 12000.0)
+
+    return {
+        "mode": mode,
+        "clearance": clearance,
+        "canvas_width": canvas_width,
+        "canvas_height": canvas_height,
+        "grid_step": grid_step,
+        "engine": engine,
+        "requested_engine": requested_engine,
+        "search": search,
+        "search_margin": search_margin,
+        "use_grid_cache": payload.get("gridCache", True) is not False,
+    }
+
+
+def _obstacle_cell_extent(
+    obstacle: Dict[str, Any],
+    *,
+    clearance: float,
+    mode: str,
+) -> Optional[Tuple[float, float, float, float]]:
+    """Widest world rect an obstacle can write into the cost grid, or None if it writes nothing."""
+    obstacle_type = str(obstacle.get("type", "foundation")).lower()
+    if obstacle_type == "fence":
+        return None
+    if mode == "schematic" and obstacle_type != "building":
+        return None
+    if obstacle_type == "trench":
+        rect = {key: float(obstacle[key]) for key in ("x", "y", "w", "h")}
+    else:
+        effective_clearance = 8.0 if mode == "schematic" else clearance
+        rect = _inflate_rect(obstacle, effective_clearance * 1.75)
+    return (rect["x"], rect["y"], rect["x"] + rect["w"], rect["y"] + rect["h"])
+
+
+def _search_window(
+    obstacles: Sequence[Dict[str, Any]],
+    *,
+    points: Sequence[Dict[str, float]],
+    settings: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Cell-aligned window around the route endpoints with obstacles culled to it.
+
+    Returns None when the window would cover the whole canvas. Obstacles are
+    looked up through the shared spatial index and shifted into window
+    coordinates; the origin is a whole number of cells so cells line up with
+    the full-canvas grid.
+    """
+    step = settings["grid_step"]
+    margin = settings["search_margin"]
+    cols = max(4, int(math.ceil(settings["canvas_width"] / step)))
+    rows = max(4, int(math.ceil(settings["canvas_height"] / step)))
+    min_col, min_row = _to_grid_point(
+        {"x": min(point["x"] for point in points) - margin, "y": min(point["y"] for point in points) - margin},
+        step=step,
+        cols=cols,
+        rows=rows,
+    )
+    max_col, max_row = _to_grid_point(
+        {"x": max(point["x"] for point in points) + margin, "y": max(point["y"] for point in points) + margin},
+        step=step,
+        cols=cols,
+        rows=rows,
+    )
+    if min_col == 0 and min_row == 0 and max_col == cols - 1 and max_row == rows - 1:
+        return None
+
+    origin_x = min_col * step
+    origin_y = min_row * step
+    index, index_key, index_hit = obstacle_index_for(obstacles)
+    reach = (8.0 if settings["mode"] == "schematic" else settings["clearance"]) * 1.75 + step
+    candidates = index.query_rect(origin_x - reach, origin_y - reach, max_col * step + reach, max_row * step + reach)
+
+    culled: List[Dict[str, Any]] = []
+    for position in candidates:
+        obstacle = obstacles[position]
+        extent = _obstacle_cell_extent(obstacle, clearance=settings["clearance"], mode=settings["mode"])
+        if extent is None:
+            continue
+        # Keep only obstacles whose unclamped cell span overlaps the window;
+        # anything else would be clamped onto the window edge.
+        if (
+            math.ceil(extent[2] / step) < min_col
+            or math.floor(extent[0] / step) > max_col
+            or math.ceil(extent[3] / step) < min_row
+            or math.floor(extent[1] / step) > max_row
+        ):
+            continue
+        culled.append({**obstacle, "x": float(obstacle["x"]) - origin_x, "y": float(obstacle["y"]) - origin_y})
+
+    return {
+        "obstacles": culled,
+        "min_col": min_col,
+        "min_row": min_row,
+        "origin_x": origin_x,
+        "origin_y": origin_y,
+        # Half-cell slack keeps ceil(width / step) at the intended column count.
+        "width": (max_col - min_col + 0.5) * step,
+        "height": (max_row - min_row + 0.5) * step,
+        "meta": {
+            "x": origin_x,
+            "y": origin_y,
+            "cols": max_col - min_col + 1,
+            "rows": max_row - min_row + 1,
+            "obstacleCount": len(culled),
+            "culledObstacleCount": len(obstacles) - len(culled),
+            "indexKey": index_key,
+            "indexHit": index_hit,
+            "fullCanvasFallback": False,
+        },
+    }
+
+
+def _shift_point(point: Dict[str, float], window: Dict[str, Any]) -> Dict[str, float]:
+    return {"x": point["x"] - window["origin_x"], "y": point["y"] - window["origin_y"]}
+
+
+def _unshift_path(
+    path: List[Dict[str, float]],
+    *,
+    window: Dict[str, Any],
+    start: Dict[str, float],
+    end: Dict[str, float],
+    grid_step: float,
+) -> List[Dict[str, float]]:
+    # Interior points are cell centres; rebuild them from cell indices so they
+    # match the full-canvas grid exactly.
+    unshifted = [
+        _from_grid_point(
+            (
+                int(round(point["x"] / grid_step)) + window["min_col"],
+                int(round(point["y"] / grid_step)) + window["min_row"],
+            ),
+            step=grid_step,
+        )
+        for point in path
+    ]
+    unshifted[0] = dict(start)
+    unshifted[-1] = dict(end)
+    return unshifted
+
+
+def _route_solver(engine: str, search: str) -> Any:
+    if search == "bidirectional":
+        return _route_path_bidirectional
+    if search == "hierarchical":
+        return _route_path_hierarchical
+    return _route_path_flat if engine == "numpy" else _route_path
+
+
+def _route_data(path: List[Dict[str, float]], *, mode: str, tag_text: str) -> Dict[str, Any]:
+    bends = _bend_count(path)
+    return {
+        "path": path,
+        "length": _path_length(path),
+        "bendCount": bends,
+        "bendDegrees": bends * 90,
+        "tag": _route_tag(path, tag_text) if mode == "cable_tag" and tag_text else None,
+    }
+
+
+def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    start = _parse_point(payload.get("start"), field_name="start", errors=errors)
+    end = _parse_point(payload.get("end"), field_name="end", errors=errors)
+    settings = _parse_route_settings(payload, errors=errors, warnings=warnings)
     obstacles = _parse_obstacles(payload.get("obstacles"), warnings)
 
     if errors:
@@ -438,25 +1309,78 @@ def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
     assert start is not None
     assert end is not None
 
+    mode = settings["mode"]
+    grid_step = settings["grid_step"]
+    engine = settings["engine"]
+    route_path = _route_solver(engine, settings["search"])
+
     started_at = time.time()
-    grid, cols, rows = _build_cost_grid(
-        obstacles=obstacles,
-        clearance=clearance,
-        mode=mode,
-        canvas_width=canvas_width,
-        canvas_height=canvas_height,
-        grid_step=grid_step,
-    )
-    route = _route_path(
-        start=start,
-        end=end,
-        grid=grid,
-        cols=cols,
-        rows=rows,
-        grid_step=grid_step,
-        mode=mode,
-    )
+    window = None
+    if settings["search_margin"] is not None:
+        window = _search_window(obstacles, points=(start, end), settings=settings)
+
+    route: Optional[Dict[str, Any]] = None
+    grid_seconds = 0.0
+    if window is not None:
+        grid_started_at = time.time()
+        grid, cols, rows, grid_cache_meta = _resolve_cost_grid(
+            obstacles=window["obstacles"],
+            clearance=settings["clearance"],
+            mode=mode,
+            canvas_width=window["width"],
+            canvas_height=window["height"],
+            grid_step=grid_step,
+            engine=engine,
+            use_cache=settings["use_grid_cache"],
+        )
+        grid_seconds += time.time() - grid_started_at
+        route = route_path(
+            start=_shift_point(start, window),
+            end=_shift_point(end, window),
+            grid=grid,
+            cols=cols,
+            rows=rows,
+            grid_step=grid_step,
+            mode=mode,
+        )
+        if route["routeValid"]:
+            route["path"] = _unshift_path(route["path"], window=window, start=start, end=end, grid_step=grid_step)
+        else:
+            window["meta"]["fullCanvasFallback"] = True
+            warnings.append("Route did not fit the search window; route was solved on the full canvas.")
+
+    if route is None or not route["routeValid"]:
+        grid_started_at = time.time()
+        grid, cols, rows, grid_cache_meta = _resolve_cost_grid(
+            obstacles=obstacles,
+            clearance=settings["clearance"],
+            mode=mode,
+            canvas_width=settings["canvas_width"],
+            canvas_height=settings["canvas_height"],
+            grid_step=grid_step,
+            engine=engine,
+            use_cache=settings["use_grid_cache"],
+        )
+        grid_seconds += time.time() - grid_started_at
+        window_route = route
+        route = route_path(
+            start=start,
+            end=end,
+            grid=grid,
+            cols=cols,
+            rows=rows,
+            grid_step=grid_step,
+            mode=mode,
+        )
+        if window_route is not None:
+            route["iterations"] += window_route["iterations"]
+            route["visitedNodes"] += window_route["visitedNodes"]
+    grid_ms = int(grid_seconds * 1000)
     elapsed_ms = int((time.time() - started_at) * 1000)
+    search_window_meta = window["meta"] if window is not None else None
+    hierarchical_meta = route.get("hierarchical")
+    if hierarchical_meta and hierarchical_meta["fullGridFallback"]:
+        warnings.append("Coarse corridor route failed; route was solved on the full grid.")
 
     path = route["path"]
     route_valid = bool(route.get("routeValid", len(path) >= 2))
@@ -472,26 +1396,23 @@ def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
                 "visitedNodes": route.get("visitedNodes", 0),
                 "fallbackUsed": bool(route.get("fallbackUsed")),
                 "routeValid": False,
+                "engine": engine,
+                "engineRequested": settings["requested_engine"],
+                "searchMode": settings["search"],
+                "hierarchical": hierarchical_meta,
+                "searchWindow": search_window_meta,
+                "gridMs": grid_ms,
+                "gridCache": grid_cache_meta,
             },
         }
 
-    length = _path_length(path)
-    bends = _bend_count(path)
-
     tag_text = _safe_str(payload.get("tagText"))[:120]
-    tag = _route_tag(path, tag_text) if mode == "cable_tag" and tag_text else None
 
     return {
         "success": True,
         "code": "",
         "message": "Route computed.",
-        "data": {
-            "path": path,
-            "length": length,
-            "bendCount": bends,
-            "bendDegrees": bends * 90,
-            "tag": tag,
-        },
+        "data": _route_data(path, mode=mode, tag_text=tag_text),
         "meta": {
             "computeMs": elapsed_ms,
             "iterations": route.get("iterations", 0),
@@ -503,7 +1424,384 @@ def compute_conduit_route(payload: Dict[str, Any]) -> Dict[str, Any]:
             "gridStep": grid_step,
             "obstacleCount": len(obstacles),
             "mode": mode,
-            "clearance": clearance,
+            "clearance": settings["clearance"],
+            "engine": engine,
+            "engineRequested": settings["requested_engine"],
+            "searchMode": settings["search"],
+            "hierarchical": hierarchical_meta,
+            "searchWindow": search_window_meta,
+            "gridMs": grid_ms,
+            "gridCache": grid_cache_meta,
+        },
+        "warnings": warnings,
+    }
+
+
+MAX_BATCH_ROUTES = 200
+MIN_PARALLEL_BATCH_ROUTES = 4
+DEFAULT_CONGESTION_COST = 0.9
+
+_BATCH_POOL = PersistentProcessPool("CONDUIT_ROUTE_BATCH_MAX_WORKERS", default_cap=4, max_workers_cap=32)
+
+
+def _solve_route_chunk(
+    grid: Any,
+    cols: int,
+    rows: int,
+    grid_step: float,
+    mode: str,
+    engine: str,
+    routes: Sequence[Tuple[int, Dict[str, float], Dict[str, float]]],
+    search: str = DEFAULT_SEARCH_MODE,
+) -> List[Tuple[int, Dict[str, Any], float]]:
+    """Solve a slice of batch routes against one grid (runs inside pool workers)."""
+    route_path = _route_solver(engine, search)
+    solved: List[Tuple[int, Dict[str, Any], float]] = []
+    for index, start, end in routes:
+        started_at = time.perf_counter()
+        route = route_path(
+            start=start,
+            end=end,
+            grid=grid,
+            cols=cols,
+            rows=rows,
+            grid_step=grid_step,
+            mode=mode,
+        )
+        solved.append((index, route, (time.perf_counter() - started_at) * 1000.0))
+    return solved
+
+
+class _SharedGrid(NamedTuple):
+    """Picklable handle to a cost grid published in shared memory."""
+
+    name: str
+    cols: int
+    rows: int
+    as_array: bool
+
+
+@contextmanager
+def _publish_grid(grid: Any, cols: int, rows: int) -> Iterator[_SharedGrid]:
+    """Copy ``grid`` into shared memory once, so pool tasks only carry its name.
+
+    Cells are stored row-major as float64. The segment is unlinked on exit;
+    workers still attached keep their mapping until they close it.
+    """
+    cell_count = cols * rows
+    block = SharedMemory(create=True, size=max(8, cell_count * 8))
+    try:
+        if isinstance(grid, list):
+            cells = block.buf.cast("d")
+            try:
+                cells[:cell_count] = array("d", chain.from_iterable(grid))
+            finally:
+                cells.release()
+        else:
+            np.ndarray((rows, cols), dtype=np.float64, buffer=block.buf)[...] = grid
+        yield _SharedGrid(block.name, cols, rows, not isinstance(grid, list))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _attach_shared_grid(name: str) -> SharedMemory:
+    try:
+        # The creating process owns the segment; workers must not unlink it.
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no ``track``.
+        return SharedMemory(name=name)
+
+
+def _solve_shared_route_chunk(
+    shared: _SharedGrid,
+    grid_step: float,
+    mode: str,
+    engine: str,
+    routes: Sequence[Tuple[int, Dict[str, float], Dict[str, float]]],
+    search: str = DEFAULT_SEARCH_MODE,
+) -> List[Tuple[int, Dict[str, Any], float]]:
+    """Pool entry point: solve a slice of routes against a published grid.
+
+    numpy grids are read in place; the python engine rebuilds its row lists
+    from the shared cells.
+    """
+    block = _attach_shared_grid(shared.name)
+    try:
+        if shared.as_array:
+            grid: Any = np.ndarray((shared.rows, shared.cols), dtype=np.float64, buffer=block.buf)
+        else:
+            cells = block.buf.cast("d")
+            try:
+                flat = cells[: shared.cols * shared.rows].tolist()
+            finally:
+                cells.release()
+            grid = [flat[row * shared.cols : (row + 1) * shared.cols] for row in range(shared.rows)]
+        solved = _solve_route_chunk(grid, shared.cols, shared.rows, grid_step, mode, engine, routes, search)
+        # Drop the view before closing, or the buffer is still exported.
+        del grid
+        return solved
+    finally:
+        block.close()
+
+
+def _path_cells(
+    path: Sequence[Dict[str, float]],
+    *,
+    grid_step: float,
+    cols: int,
+    rows: int,
+) -> List[Tuple[int, int]]:
+    cells: List[Tuple[int, int]] = []
+    if not path:
+        return cells
+    current = _to_grid_point(path[0], step=grid_step, cols=cols, rows=rows)
+    cells.append(current)
+    for point in path[1:]:
+        target = _to_grid_point(point, step=grid_step, cols=cols, rows=rows)
+        while current != target:
+            if current[0] != target[0]:
+                current = (current[0] + _sign(target[0] - current[0]), current[1])
+            else:
+                current = (current[0], current[1] + _sign(target[1] - current[1]))
+            cells.append(current)
+    return cells
+
+
+def _apply_congestion_cost(
+    grid: Any,
+    path: Sequence[Dict[str, float]],
+    *,
+    grid_step: float,
+    cols: int,
+    rows: int,
+    cost: float,
+) -> None:
+    """Raise soft cost along a committed route so the next route prefers parallel lanes."""
+    for col, row in _path_cells(path, grid_step=grid_step, cols=cols, rows=rows):
+        value = float(grid[row][col])
+        if value >= 999:
+            continue
+        grid[row][col] = min(998.0, value + cost)
+
+
+def _copy_grid(grid: Any) -> Any:
+    if isinstance(grid, list):
+        return [list(row) for row in grid]
+    return grid.copy()
+
+
+def _parse_batch_routes(raw: Any, *, errors: List[str]) -> List[Dict[str, Any]]:
+    if not isinstance(raw, list) or not raw:
+        errors.append("routes must be a non-empty array of {start, end} objects.")
+        return []
+    if len(raw) > MAX_BATCH_ROUTES:
+        errors.append(f"routes supports at most {MAX_BATCH_ROUTES} entries per batch.")
+        return []
+
+    routes: List[Dict[str, Any]] = []
+    for index, candidate in enumerate(raw):
+        field_name = f"routes[{index}]"
+        if not isinstance(candidate, dict):
+            errors.append(f"{field_name} must be an object.")
+            continue
+        start = _parse_point(candidate.get("start"), field_name=f"{field_name}.start", errors=errors)
+        end = _parse_point(candidate.get("end"), field_name=f"{field_name}.end", errors=errors)
+        if start is None or end is None:
+            continue
+        routes.append(
+            {
+                "index": index,
+                "id": _safe_str(candidate.get("id")) or f"route_{index + 1}",
+                "start": start,
+                "end": end,
+                "tagText": _safe_str(candidate.get("tagText"))[:120],
+            }
+        )
+    return routes
+
+
+def compute_conduit_route_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Route many start/end pairs against one obstacle set.
+
+    The cost grid is built (or fetched from the grid cache) once. Independent
+    routes are solved on a shared process pool; `congestion` mode instead
+    solves in request order and adds soft cost along each committed route.
+    """
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    routes = _parse_batch_routes(payload.get("routes"), errors=errors)
+    settings = _parse_route_settings(payload, errors=errors, warnings=warnings)
+    obstacles = _parse_obstacles(payload.get("obstacles"), warnings)
+    congestion = bool(payload.get("congestion", False))
+    congestion_cost = _safe_float(payload.get("congestionCost"))
+    if congestion_cost is None:
+        congestion_cost = DEFAULT_CONGESTION_COST
+    congestion_cost = _clamp(congestion_cost, 0.0, 20.0)
+
+    if errors:
+        return {
+            "success": False,
+            "code": "INVALID_REQUEST",
+            "message": " ".join(errors),
+            "warnings": warnings,
+        }
+
+    mode = settings["mode"]
+    grid_step = settings["grid_step"]
+    engine = settings["engine"]
+    search = settings["search"]
+
+    started_at = time.perf_counter()
+    grid, cols, rows, grid_cache_meta = _resolve_cost_grid(
+        obstacles=obstacles,
+        clearance=settings["clearance"],
+        mode=mode,
+        canvas_width=settings["canvas_width"],
+        canvas_height=settings["canvas_height"],
+        grid_step=grid_step,
+        engine=engine,
+        use_cache=settings["use_grid_cache"],
+    )
+    grid_ms = (time.perf_counter() - started_at) * 1000.0
+
+    solve_started_at = time.perf_counter()
+    solved: Dict[int, Tuple[Dict[str, Any], float]] = {}
+    workers_used = 1
+    parallel = False
+    if congestion:
+        # Cached grids are shared; congestion writes go to a private copy.
+        working_grid = _copy_grid(grid)
+        for route in routes:
+            ((_, result, route_ms),) = _solve_route_chunk(
+                working_grid,
+                cols,
+                rows,
+                grid_step,
+                mode,
+                engine,
+                [(route["index"], route["start"], route["end"])],
+                search,
+            )
+            solved[route["index"]] = (result, route_ms)
+            if result.get("routeValid") and congestion_cost > 0:
+                _apply_congestion_cost(
+                    working_grid,
+                    result["path"],
+                    grid_step=grid_step,
+                    cols=cols,
+                    rows=rows,
+                    cost=congestion_cost,
+                )
+    else:
+        tasks = [(route["index"], route["start"], route["end"]) for route in routes]
+        max_workers = _BATCH_POOL.max_workers()
+        if payload.get("parallel", True) is not False and max_workers > 1 and len(tasks) >= MIN_PARALLEL_BATCH_ROUTES:
+            workers_used = min(max_workers, len(tasks))
+            chunks = [tasks[offset::workers_used] for offset in range(workers_used)]
+            try:
+                pool = _BATCH_POOL.get(max_workers)
+                # The grid crosses the process boundary once, not once per chunk.
+                with _publish_grid(grid, cols, rows) as shared:
+                    futures = [
+                        pool.submit(_solve_shared_route_chunk, shared, grid_step, mode, engine, chunk, search)
+                        for chunk in chunks
+                    ]
+                    for future in futures:
+                        for index, result, route_ms in future.result():
+                            solved[index] = (result, route_ms)
+                parallel = True
+            except Exception:
+                _BATCH_POOL.discard()
+                warnings.append("Parallel route solve was unavailable; routes were solved sequentially.")
+                solved.clear()
+                workers_used = 1
+        if not parallel:
+            for index, result, route_ms in _solve_route_chunk(
+                grid, cols, rows, grid_step, mode, engine, tasks, search
+            ):
+                solved[index] = (result, route_ms)
+    solve_ms = (time.perf_counter() - solve_started_at) * 1000.0
+
+    route_results: List[Dict[str, Any]] = []
+    routed_count = 0
+    total_iterations = 0
+    total_visited = 0
+    for route in routes:
+        result, route_ms = solved[route["index"]]
+        path = result.get("path") or []
+        total_iterations += int(result.get("iterations", 0))
+        total_visited += int(result.get("visitedNodes", 0))
+        route_meta = {
+            "computeMs": round(route_ms, 3),
+            "iterations": result.get("iterations", 0),
+            "visitedNodes": result.get("visitedNodes", 0),
+            "fallbackUsed": bool(result.get("fallbackUsed")),
+        }
+        if result.get("hierarchical"):
+            route_meta["hierarchical"] = result["hierarchical"]
+        if not result.get("routeValid") or len(path) < 2:
+            route_results.append(
+                {
+                    "id": route["id"],
+                    "success": False,
+                    "code": "ROUTE_BLOCKED",
+                    "message": "No valid route was found for the requested points and obstacle constraints.",
+                    "meta": {**route_meta, "routeValid": False},
+                }
+            )
+            continue
+        routed_count += 1
+        route_results.append(
+            {
+                "id": route["id"],
+                "success": True,
+                "code": "",
+                "message": "Route computed.",
+                "data": _route_data(path, mode=mode, tag_text=route["tagText"]),
+                "meta": {**route_meta, "routeValid": True},
+            }
+        )
+
+    failed_count = len(routes) - routed_count
+    if routed_count == 0:
+        code, message = "ROUTE_BLOCKED", "No valid route was found for any requested conduit."
+    elif failed_count:
+        code, message = "PARTIAL_ROUTE_BLOCKED", f"Routed {routed_count} of {len(routes)} conduits."
+    else:
+        code, message = "", f"Routed {routed_count} conduits."
+
+    return {
+        "success": routed_count > 0,
+        "code": code,
+        "message": message,
+        "data": {
+            "routes": route_results,
+            "routedCount": routed_count,
+            "failedCount": failed_count,
+        },
+        "meta": {
+            "computeMs": int((time.perf_counter() - started_at) * 1000),
+            "gridMs": int(grid_ms),
+            "solveMs": int(solve_ms),
+            "routeCount": len(routes),
+            "iterations": total_iterations,
+            "visitedNodes": total_visited,
+            "parallel": parallel,
+            "workers": workers_used,
+            "congestion": congestion,
+            "congestionCost": congestion_cost if congestion else 0.0,
+            "gridCols": cols,
+            "gridRows": rows,
+            "gridStep": grid_step,
+            "obstacleCount": len(obstacles),
+            "mode": mode,
+            "clearance": settings["clearance"],
+            "engine": engine,
+            "engineRequested": settings["requested_engine"],
+            "searchMode": search,
+            "gridCache": grid_cache_meta,
         },
         "warnings": warnings,
     }
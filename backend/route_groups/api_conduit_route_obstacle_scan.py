@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .api_conduit_route_spatial_index import obstacle_index_for
+
 INSUNITS_MAP = {
     0: "Unitless",
     1: "Inches",
@@ -390,6 +392,12 @@ def scan_conduit_obstacles(
     )
 
     total_obstacles = len(normalized["obstacles"])
+    spatial_index_meta: Optional[Dict[str, Any]] = None
+    if total_obstacles:
+        # Registered by obstacle fingerprint so route compute and near-point
+        # queries on the same obstacle set reuse it.
+        spatial_index, spatial_index_key, _ = obstacle_index_for(normalized["obstacles"])
+        spatial_index_meta = {"key": spatial_index_key, **spatial_index.stats()}
     scanned_layers_preview = ", ".join(
         item["layer"] for item in _top_layer_counts(scanned_layer_counts, limit=6)
     )
@@ -461,6 +469,7 @@ def scan_conduit_obstacles(
             "topMatchedLayers": _top_layer_counts(matched_layer_counts, limit=20),
             "topFilteredOutLayers": _top_layer_counts(filtered_layer_counts, limit=20),
             "topUnclassifiedLayers": _top_layer_counts(unclassified_layer_counts, limit=20),
+            "spatialIndex": spatial_index_meta,
         },
         "warnings": warnings,
     }
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Each obstacle should land in only a handful of buckets; very large cells
+# degrade to a linear scan, very small ones blow up the bucket map.
+MIN_INDEX_CELL_SIZE = 4.0
+MAX_BUCKETS_PER_OBSTACLE = 4096
+MAX_REGISTERED_INDEXES = 8
+DEFAULT_NEAR_POINT_RADIUS = 40.0
+MAX_NEAR_POINT_RADIUS = 12000.0
+DEFAULT_NEAR_POINT_LIMIT = 20
+MAX_NEAR_POINT_LIMIT = 500
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    try:
+        parsed = float(value)
+    except Exception:
+        return None
+    if not math.isfinite(parsed):
+        return None
+    return parsed
+
+
+def _obstacle_bounds(obstacle: Dict[str, Any]) -> Optional[Tuple[float, float, float, float]]:
+    x = _safe_float(obstacle.get("x"))
+    y = _safe_float(obstacle.get("y"))
+    w = _safe_float(obstacle.get("w"))
+    h = _safe_float(obstacle.get("h"))
+    if x is None or y is None or w is None or h is None or w < 0 or h < 0:
+        return None
+    return (x, y, x + w, y + h)
+
+
+def obstacle_fingerprint(obstacles: Sequence[Dict[str, Any]]) -> str:
+    """Stable key over obstacle type and geometry; ids and labels are ignored."""
+    digest = hashlib.sha256()
+    for obstacle in obstacles:
+        digest.update(
+            repr(
+                (
+                    str(obstacle.get("type", "")),
+                    obstacle.get("x"),
+                    obstacle.get("y"),
+                    obstacle.get("w"),
+                    obstacle.get("h"),
+                )
+            ).encode("utf-8")
+        )
+        digest.update(b"\n")
+    return digest.hexdigest()[:32]
+
+
+class ObstacleSpatialIndex:
+    """Uniform-grid bucket index over canvas-space obstacle rectangles.
+
+    Queries return obstacle positions in the original sequence order so
+    callers that rasterize in payload order keep their overlap semantics.
+    """
+
+    def __init__(self, obstacles: Sequence[Dict[str, Any]], *, cell_size: Optional[float] = None) -> None:
+        started_at = time.perf_counter()
+        self.obstacles: List[Dict[str, Any]] = list(obstacles)
+        self._bounds: List[Optional[Tuple[float, float, float, float]]] = [
+            _obstacle_bounds(obstacle) for obstacle in self.obstacles
+        ]
+        self.cell_size = float(cell_size) if cell_size else self._default_cell_size()
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        # Obstacles too large for bucketing are checked on every query.
+        self._oversized: List[int] = []
+
+        for index, bounds in enumerate(self._bounds):
+            if bounds is None:
+                continue
+            x0, y0, x1, y1 = self._cell_range(*bounds)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_BUCKETS_PER_OBSTACLE:
+                self._oversized.append(index)
+                continue
+            for cell_y in range(y0, y1 + 1):
+                for cell_x in range(x0, x1 + 1):
+                    self._buckets.setdefault((cell_x, cell_y), []).append(index)
+        self.build_ms = (time.perf_counter() - started_at) * 1000.0
+
+    def _default_cell_size(self) -> float:
+        extents = [
+            max(bounds[2] - bounds[0], bounds[3] - bounds[1])
+            for bounds in self._bounds
+            if bounds is not None
+        ]
+        if not extents:
+            return 64.0
+        extents.sort()
+        # Twice the median extent keeps typical obstacles in one to four buckets.
+        return max(MIN_INDEX_CELL_SIZE, extents[len(extents) // 2] * 2.0)
+
+    def _cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            int(math.floor(min_x / size)),
+            int(math.floor(min_y / size)),
+            int(math.floor(max_x / size)),
+            int(math.floor(max_y / size)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.obstacles)
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[int]:
+        """Indices of obstacles whose bounds intersect the rectangle, in sequence order."""
+        x0, y0, x1, y1 = self._cell_range(min_x, min_y, max_x, max_y)
+        candidates: set[int] = set(self._oversized)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._buckets):
+            for (cell_x, cell_y), members in self._buckets.items():
+                if x0 <= cell_x <= x1 and y0 <= cell_y <= y1:
+                    candidates.update(members)
+        else:
+            for cell_y in range(y0, y1 + 1):
+                for cell_x in range(x0, x1 + 1):
+                    members = self._buckets.get((cell_x, cell_y))
+                    if members:
+                        candidates.update(members)
+
+        hits: List[int] = []
+        for index in sorted(candidates):
+            bounds = self._bounds[index]
+            if bounds is None:
+                continue
+            if bounds[0] <= max_x and bounds[2] >= min_x and bounds[1] <= max_y and bounds[3] >= min_y:
+                hits.append(index)
+        return hits
+
+    def query_near_point(self, x: float, y: float, *, radius: float, limit: int) -> List[Tuple[int, float]]:
+        """`(index, distance)` pairs within `radius` of the point, nearest first."""
+        matches: List[Tuple[int, float]] = []
+        for index in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            bounds = self._bounds[index]
+            assert bounds is not None
+            dx = max(bounds[0] - x, 0.0, x - bounds[2])
+            dy = max(bounds[1] - y, 0.0, y - bounds[3])
+            distance = math.hypot(dx, dy)
+            if distance <= radius:
+                matches.append((index, distance))
+        matches.sort(key=lambda item: (item[1], item[0]))
+        return matches[: max(0, int(limit))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "obstacleCount": len(self.obstacles),
+            "cellSize": round(self.cell_size, 3),
+            "bucketCount": len(self._buckets),
+            "oversizedCount": len(self._oversized),
+            "buildMs": round(self.build_ms, 3),
+        }
+
+
+_INDEX_REGISTRY: "OrderedDict[str, ObstacleSpatialIndex]" = OrderedDict()
+_INDEX_REGISTRY_LOCK = threading.Lock()
+
+
+def obstacle_index_for(obstacles: Sequence[Dict[str, Any]]) -> Tuple[ObstacleSpatialIndex, str, bool]:
+    """Return `(index, key, hit)`, reusing an index built for the same obstacle set.
+
+    Obstacle scans register their index here, so a route compute that sends
+    the scanned obstacles back finds it without rebuilding.
+    """
+    key = obstacle_fingerprint(obstacles)
+    with _INDEX_REGISTRY_LOCK:
+        index = _INDEX_REGISTRY.get(key)
+        if index is not None:
+            _INDEX_REGISTRY.move_to_end(key)
+            return index, key, True
+
+    index = ObstacleSpatialIndex(obstacles)
+    with _INDEX_REGISTRY_LOCK:
+        _INDEX_REGISTRY[key] = index
+        _INDEX_REGISTRY.move_to_end(key)
+        while len(_INDEX_REGISTRY) > MAX_REGISTERED_INDEXES:
+            _INDEX_REGISTRY.popitem(last=False)
+    return index, key, False
+
+
+def get_obstacle_index(key: str) -> Optional[ObstacleSpatialIndex]:
+    with _INDEX_REGISTRY_LOCK:
+        index = _INDEX_REGISTRY.get(str(key or ""))
+        if index is not None:
+            _INDEX_REGISTRY.move_to_end(str(key))
+        return index
+
+
+def clear_obstacle_indexes() -> None:
+    with _INDEX_REGISTRY_LOCK:
+        _INDEX_REGISTRY.clear()
+
+
+def query_obstacles_near_point(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer "which obstacles are near this point" for the route UI.
+
+    The payload names a registered index (`indexKey`, returned by obstacle
+    scans) or carries its own `obstacles` array.
+    """
+    errors: List[str] = []
+    x = _safe_float(payload.get("x"))
+    y = _safe_float(payload.get("y"))
+    if x is None or y is None:
+        errors.append("x and y must be finite numbers.")
+
+    radius = _safe_float(payload.get("radius"))
+    if radius is None:
+        radius = DEFAULT_NEAR_POINT_RADIUS
+    radius = min(max(radius, 0.0), MAX_NEAR_POINT_RADIUS)
+
+    limit_raw = _safe_float(payload.get("limit"))
+    limit = DEFAULT_NEAR_POINT_LIMIT if limit_raw is None else int(limit_raw)
+    limit = min(max(limit, 1), MAX_NEAR_POINT_LIMIT)
+
+    index_key = str(payload.get("indexKey") or "").strip()
+    raw_obstacles = payload.get("obstacles")
+    if raw_obstacles is not None and not isinstance(raw_obstacles, list):
+        errors.append("obstacles must be an array when provided.")
+    elif not index_key and raw_obstacles is None:
+        errors.append("Provide indexKey or obstacles.")
+
+    if errors:
+        return {
+            "success": False,
+            "code": "INVALID_REQUEST",
+            "message": " ".join(errors),
+        }
+    assert x is not None and y is not None
+
+    started_at = time.perf_counter()
+    index = get_obstacle_index(index_key) if index_key else None
+    index_hit = index is not None
+    if index is None:
+        if raw_obstacles is None:
+            return {
+                "success": False,
+                "code": "INDEX_NOT_FOUND",
+                "message": "Obstacle index expired; rescan obstacles or send them with the request.",
+                "meta": {"indexKey": index_key},
+            }
+        obstacles = [item for item in raw_obstacles if isinstance(item, dict)]
+        index, index_key, index_hit = obstacle_index_for(obstacles)
+
+    matches = index.query_near_point(x, y, radius=radius, limit=limit)
+    return {
+        "success": True,
+        "code": "",
+        "message": f"Found {len(matches)} obstacles near point.",
+        "data": {
+            "point": {"x": x, "y": y},
+            "radius": radius,
+            "obstacles": [
+                {**index.obstacles[position], "distance": round(distance, 3)}
+                for position, distance in matches
+            ],
+        },
+        "meta": {
+            "indexKey": index_key,
+            "indexHit": index_hit,
+            "queryMs": round((time.perf_counter() - started_at) * 1000.0, 3),
+            **index.stats(),
+        },
+    }
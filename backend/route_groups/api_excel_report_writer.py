@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+# Suite report palette shared by the Excel exports.
+_TITLE_FILL = "2B6CB5"
+_SECTION_FILL = "5B9BD5"
+_HEADER_FILL = "3A3F47"
+_ROW_FILLS = ("E8E6E2", "D4D1CC")
+_BORDER_COLOR = "B0ADA8"
+
+# Data cell kinds: (horizontal, vertical, wrap_text, bold).
+DATA_KINDS: Dict[str, tuple] = {
+    "text": ("left", "top", True, False),
+    "number": ("right", "top", False, False),
+    "label": ("left", "center", False, False),
+    "value": ("right", "center", False, False),
+    "key": ("left", "center", False, True),
+}
+
+
+def _data_style_name(kind: str, stripe: int) -> str:
+    return f"Report Data {kind.title()} {'Odd' if stripe % 2 else 'Even'}"
+
+
+def _build_named_styles() -> List[NamedStyle]:
+    side = Side(style="thin", color=_BORDER_COLOR)
+    all_border = Border(left=side, right=side, top=side, bottom=side)
+    header_border = Border(left=side, right=side, top=side, bottom=Side(style="medium", color=_HEADER_FILL))
+    header_font = Font(bold=True, color="F0F0F0", size=11, name="Arial")
+    header_fill = PatternFill("solid", fgColor=_HEADER_FILL)
+
+    styles = [
+        NamedStyle(
+            name="Report Title",
+            font=Font(bold=True, color="FFFFFF", size=14, name="Arial"),
+            fill=PatternFill("solid", fgColor=_TITLE_FILL),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=all_border,
+        ),
+        NamedStyle(
+            name="Report Section",
+            font=Font(bold=True, color="FFFFFF", size=12, name="Arial"),
+            fill=PatternFill("solid", fgColor=_SECTION_FILL),
+            alignment=Alignment(horizontal="left", vertical="center"),
+            border=all_border,
+        ),
+        NamedStyle(
+            name="Report Header",
+            font=header_font,
+            fill=header_fill,
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=header_border,
+        ),
+        NamedStyle(
+            name="Report Header Left",
+            font=header_font,
+            fill=header_fill,
+            alignment=Alignment(horizontal="left", vertical="center"),
+            border=header_border,
+        ),
+    ]
+    for kind, (horizontal, vertical, wrap_text, bold) in DATA_KINDS.items():
+        for stripe, fill in enumerate(_ROW_FILLS):
+            styles.append(
+                NamedStyle(
+                    name=_data_style_name(kind, stripe),
+                    font=Font(bold=bold, size=10, color="2A2A2A", name="Arial"),
+                    fill=PatternFill("solid", fgColor=fill),
+                    alignment=Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text),
+                    border=all_border,
+                )
+            )
+    return styles
+
+
+class ReportSheet:
+    """One write-only worksheet; rows are streamed to disk as they are added.
+
+    Column widths and freeze panes are fixed when the sheet is created
+    because write-only sheets emit them before the first row.
+    """
+
+    def __init__(self, worksheet: Any, column_count: int) -> None:
+        self.worksheet = worksheet
+        self.column_count = column_count
+        self.rows_written = 0
+
+    def _cell(self, value: Any, style: str, number_format: Optional[str] = None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self.worksheet, value=value)
+        cell.style = style
+        if number_format:
+            cell.number_format = number_format
+        return cell
+
+    def _append(self, cells: Sequence[Any], height: Optional[float] = None) -> None:
+        self.rows_written += 1
+        if height is not None:
+            self.worksheet.row_dimensions[self.rows_written].height = height
+        self.worksheet.append(cells)
+
+    def _band(self, text: str, style: str, height: float) -> None:
+        cells = [self._cell(text, style)] + [self._cell(None, style) for _ in range(self.column_count - 1)]
+        self._append(cells, height)
+        if self.column_count > 1:
+            last_column = get_column_letter(self.column_count)
+            self.worksheet.merged_cells.add(f"A{self.rows_written}:{last_column}{self.rows_written}")
+
+    def title_row(self, text: str, *, height: float = 28) -> None:
+        """Merged title band across every column."""
+        self._band(text, "Report Title", height)
+
+    def section_row(self, text: str, *, height: float = 24) -> None:
+        """Merged section band, e.g. one per layer."""
+        self._band(text, "Report Section", height)
+
+    def header_row(self, values: Sequence[Any], *, height: Optional[float] = 22, first_left: bool = False) -> None:
+        cells = [
+            self._cell(value, "Report Header Left" if first_left and index == 0 else "Report Header")
+            for index, value in enumerate(values)
+        ]
+        self._append(cells, height)
+
+    def data_row(
+        self,
+        values: Sequence[Any],
+        *,
+        kinds: Sequence[str],
+        stripe: int,
+        number_formats: Optional[Mapping[int, str]] = None,
+    ) -> None:
+        """Striped data row; ``kinds`` names a ``DATA_KINDS`` entry per column."""
+        formats = number_formats or {}
+        cells = [
+            self._cell(
+                value,
+                _data_style_name(kinds[index], stripe),
+                formats.get(index) if isinstance(value, (int, float)) else None,
+            )
+            for index, value in enumerate(values)
+        ]
+        self._append(cells)
+
+    def data_rows(self, rows: Iterable[Sequence[Any]], *, kinds: Sequence[str]) -> int:
+        count = 0
+        for count, values in enumerate(rows, start=1):
+            self.data_row(values, kinds=kinds, stripe=count - 1)
+        return count
+
+    def blank_rows(self, count: int = 1) -> None:
+        for _ in range(count):
+            self._append([])
+
+
+class ExcelReportWriter:
+    """Write-only workbook with the shared Suite report styles registered once.
+
+    Cells reference named styles instead of carrying their own font, fill
+    and border objects, and rows go straight to a temporary file, so
+    memory stays flat no matter how many rows a report has.
+    """
+
+    def __init__(self) -> None:
+        self.workbook = Workbook(write_only=True)
+        for style in _build_named_styles():
+            self.workbook.add_named_style(style)
+
+    def add_sheet(
+        self,
+        title: str,
+        *,
+        column_widths: Sequence[float],
+        freeze_panes: Optional[str] = None,
+    ) -> ReportSheet:
+        worksheet = self.workbook.create_sheet(title)
+        for index, width in enumerate(column_widths, start=1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+        if freeze_panes:
+            worksheet.freeze_panes = freeze_panes
+        return ReportSheet(worksheet, len(column_widths))
+
+    def save(self, path: str) -> str:
+        self.workbook.save(path)
+        return path
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+class PersistentProcessPool:
+    """A process pool created on first use and shared by every request.
+
+    The worker count comes from ``env_var``; when that is unset or invalid
+    it is the CPU count capped at ``default_cap``. The pool is rebuilt when
+    the worker count changes. Call ``discard`` after a ``BrokenProcessPool``
+    so the next call starts fresh.
+    """
+
+    def __init__(self, env_var: str, *, default_cap: int = 4, max_workers_cap: int = 32) -> None:
+        self.env_var = env_var
+        self.default_cap = default_cap
+        self.max_workers_cap = max_workers_cap
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def max_workers(self) -> int:
+        raw = str(os.environ.get(self.env_var, "") or "").strip()
+        default_workers = max(1, min(self.default_cap, os.cpu_count() or 1))
+        if not raw:
+            return default_workers
+        try:
+            return max(1, min(self.max_workers_cap, int(raw)))
+        except ValueError:
+            return default_workers
+
+    def get(self, max_workers: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or self._workers != max_workers:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = ProcessPoolExecutor(max_workers=max_workers)
+                self._workers = max_workers
+            return self._pool
+
+    def discard(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._workers = 0
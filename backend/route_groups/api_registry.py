@@ -107,6 +107,7 @@ def register_route_groups(
             batch_session_ttl_seconds=batch_session_ttl_seconds,
             send_autocad_dotnet_command=send_autocad_dotnet_command,
             send_autocad_acade_command=send_autocad_acade_command,
+            get_manager=get_manager,
         )
     )
     app.register_blueprint(
@@ -1,15 +1,55 @@
 from __future__ import annotations
 
 import tempfile
+import time
 from pathlib import Path
 from typing import Any, Callable
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, current_app, jsonify, request, send_file
 from flask_limiter import Limiter
 
+from .api_transmittal_analysis_pool import analyze_title_blocks
 from .api_transmittal_pdf_analysis import analyze_pdf_title_block
 
 
+def _remove_temp_pdf(path: str) -> None:
+    # Windows refuses to delete a file a timed-out worker still has open;
+    # the deferred cleanup from the analysis pool retries once it is done.
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _failed_document(filename: str, outcome: dict[str, Any]) -> dict[str, Any]:
+    timed_out = outcome.get("error") == "timeout"
+    source = "analysis_timeout" if timed_out else "analysis_failed"
+    return {
+        "file_name": filename,
+        "drawing_number": "",
+        "title": "",
+        "revision": "",
+        "confidence": 0.0,
+        "source": source,
+        "extraction_source": None,
+        "duration_ms": outcome.get("durationMs", 0.0),
+        "needs_review": True,
+        "accepted": False,
+        "override_reason": None,
+        "recognition": {
+            "model_version": "deterministic-v1",
+            "confidence": 0.0,
+            "source": source,
+            "feature_source": "titleblock_lines",
+            "reason_codes": [source],
+            "needs_review": True,
+            "accepted": False,
+            "override_reason": None,
+        },
+        "error": "Document analysis timed out." if timed_out else "Document analysis failed.",
+    }
+
+
 def create_transmittal_blueprint(
     *,
     require_api_key: Callable,
@@ -73,46 +113,47 @@ def create_transmittal_blueprint(
                 400,
             )
 
-        documents = []
         warnings = []
-        for file_storage in files:
-            filename = str(getattr(file_storage, "filename", "") or "").strip() or "document.pdf"
-            if not filename.lower().endswith(".pdf"):
-                warnings.append(f"Skipped non-PDF file '{filename}'.")
-                continue
-            try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                    temp_path = Path(temp_file.name)
-                    file_storage.save(temp_file)
+        uploads: list[tuple[str, Path | None]] = []
+        saved_paths: list[Path] = []
+        try:
+            for file_storage in files:
+                filename = str(getattr(file_storage, "filename", "") or "").strip() or "document.pdf"
+                if not filename.lower().endswith(".pdf"):
+                    warnings.append(f"Skipped non-PDF file '{filename}'.")
+                    continue
                 try:
-                    analysis = analyze_pdf_title_block(str(temp_path))
-                finally:
-                    temp_path.unlink(missing_ok=True)
-            except Exception as exc:
-                documents.append(
-                    {
-                        "file_name": filename,
-                        "drawing_number": "",
-                        "title": "",
-                        "revision": "",
-                        "confidence": 0.0,
-                        "source": "analysis_failed",
-                        "needs_review": True,
-                        "accepted": False,
-                        "override_reason": None,
-                        "recognition": {
-                            "model_version": "deterministic-v1",
-                            "confidence": 0.0,
-                            "source": "analysis_failed",
-                            "feature_source": "titleblock_lines",
-                            "reason_codes": ["analysis_failed"],
-                            "needs_review": True,
-                            "accepted": False,
-                            "override_reason": None,
-                        },
-                        "error": "Document analysis failed.",
-                    }
-                )
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+                        temp_path = Path(temp_file.name)
+                        saved_paths.append(temp_path)
+                        file_storage.save(temp_file)
+                except Exception:
+                    uploads.append((filename, None))
+                    continue
+                uploads.append((filename, temp_path))
+
+            started_at = time.perf_counter()
+            run = analyze_title_blocks(
+                [str(temp_path) for _filename, temp_path in uploads if temp_path is not None],
+                analyze=analyze_pdf_title_block,
+                parallel=str(request.form.get("parallel", "true")).strip().lower() != "false",
+                cleanup=_remove_temp_pdf,
+                logger=current_app.logger,
+            )
+            total_duration_ms = round((time.perf_counter() - started_at) * 1000.0, 3)
+        finally:
+            # Timed-out documents may still be open in a worker; those are
+            # removed by ``cleanup`` when the worker lets go of them.
+            for temp_path in saved_paths:
+                _remove_temp_pdf(str(temp_path))
+
+        documents = []
+        outcomes = iter(run["outcomes"])
+        for filename, temp_path in uploads:
+            outcome = next(outcomes) if temp_path is not None else {"analysis": None, "error": "failed", "durationMs": 0.0}
+            analysis = outcome["analysis"]
+            if analysis is None:
+                documents.append(_failed_document(filename, outcome))
                 continue
 
             documents.append(
@@ -123,6 +164,8 @@ def create_transmittal_blueprint(
                     "revision": analysis.get("revision", ""),
                     "confidence": analysis.get("confidence", 0.0),
                     "source": analysis.get("source", "embedded_text"),
+                    "extraction_source": analysis.get("source", "embedded_text"),
+                    "duration_ms": outcome["durationMs"],
                     "needs_review": bool(analysis.get("needs_review")),
                     "accepted": bool(analysis.get("accepted")),
                     "override_reason": analysis.get("override_reason"),
@@ -136,6 +179,11 @@ def create_transmittal_blueprint(
                 "success": True,
                 "documents": documents,
                 "warnings": warnings,
+                "analysis": {
+                    "parallel": run["parallel"],
+                    "workers": run["workers"],
+                    "duration_ms": total_duration_ms,
+                },
             }
         )
 
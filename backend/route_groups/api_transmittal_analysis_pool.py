@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .api_process_pool import PersistentProcessPool
+
+DEFAULT_DOCUMENT_TIMEOUT_SECONDS = 120.0
+MIN_PARALLEL_DOCUMENTS = 2
+
+_ANALYSIS_POOL = PersistentProcessPool("TRANSMITTAL_ANALYSIS_MAX_WORKERS", default_cap=4, max_workers_cap=16)
+_ANALYSIS_SLOTS: Optional[threading.BoundedSemaphore] = None
+_ANALYSIS_SLOTS_SIZE = 0
+_ANALYSIS_SLOTS_LOCK = threading.Lock()
+
+
+def _document_timeout_from_env() -> float:
+    raw = str(os.environ.get("TRANSMITTAL_ANALYSIS_TIMEOUT_SECONDS", "") or "").strip()
+    if not raw:
+        return DEFAULT_DOCUMENT_TIMEOUT_SECONDS
+    try:
+        return max(1.0, float(raw))
+    except ValueError:
+        return DEFAULT_DOCUMENT_TIMEOUT_SECONDS
+
+
+def _analysis_slots(max_workers: int) -> threading.BoundedSemaphore:
+    # One set of slots per process caps OCR work across concurrent requests,
+    # whether a document runs in the pool or in the request thread.
+    global _ANALYSIS_SLOTS, _ANALYSIS_SLOTS_SIZE
+    with _ANALYSIS_SLOTS_LOCK:
+        if _ANALYSIS_SLOTS is None or _ANALYSIS_SLOTS_SIZE != max_workers:
+            _ANALYSIS_SLOTS = threading.BoundedSemaphore(max_workers)
+            _ANALYSIS_SLOTS_SIZE = max_workers
+        return _ANALYSIS_SLOTS
+
+
+def _analyze_timed(analyze: Callable[[str], Dict[str, Any]], pdf_path: str) -> Tuple[Dict[str, Any], float]:
+    """Run one analysis and time it (also the pool worker entry point)."""
+    started_at = time.perf_counter()
+    analysis = analyze(pdf_path)
+    return analysis, round((time.perf_counter() - started_at) * 1000.0, 3)
+
+
+def _outcome(
+    *,
+    analysis: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+    duration_ms: float = 0.0,
+) -> Dict[str, Any]:
+    return {"analysis": analysis, "error": error, "durationMs": duration_ms}
+
+
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000.0, 3)
+
+
+def _release_when_done(
+    future: Future,
+    pdf_path: str,
+    cleanup: Optional[Callable[[str], None]],
+) -> None:
+    """Hand ``pdf_path`` to ``cleanup`` once nothing is reading it any more.
+
+    A timed-out document is still open in its worker, and Windows refuses
+    to delete an open file, so removal waits for the work itself to end.
+    Documents from a broken pool are rerun in-process and cleaned up there.
+    """
+    if cleanup is None:
+        return
+
+    def done(finished: Future) -> None:
+        if not finished.cancelled() and isinstance(finished.exception(), BrokenProcessPool):
+            return
+        _cleanup_quietly(cleanup, pdf_path)
+
+    future.add_done_callback(done)
+
+
+def _cleanup_quietly(cleanup: Optional[Callable[[str], None]], pdf_path: str) -> None:
+    if cleanup is None:
+        return
+    try:
+        cleanup(pdf_path)
+    except Exception:
+        pass
+
+
+def _run_in_thread(analyze: Callable[[str], Dict[str, Any]], pdf_path: str, slots: threading.BoundedSemaphore) -> Future:
+    # The caller holds a slot; the thread gives it back when the analysis
+    # really ends, which may be after the caller stopped waiting.
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(_analyze_timed(analyze, pdf_path))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            slots.release()
+
+    threading.Thread(target=run, name="transmittal-analysis", daemon=True).start()
+    return future
+
+
+def _wait_for_outcome(future: Future, started_at: float, timeout_seconds: float) -> Dict[str, Any]:
+    """Outcome of ``future`` within ``timeout_seconds`` of ``started_at``.
+
+    ``BrokenProcessPool`` is left to the caller.
+    """
+    remaining = max(0.0, started_at + timeout_seconds - time.perf_counter())
+    try:
+        analysis, duration_ms = future.result(timeout=remaining)
+        return _outcome(analysis=analysis, duration_ms=duration_ms)
+    except FutureTimeoutError:
+        future.cancel()
+        return _outcome(error="timeout", duration_ms=_elapsed_ms(started_at))
+    except BrokenProcessPool:
+        raise
+    except Exception:
+        return _outcome(error="failed", duration_ms=_elapsed_ms(started_at))
+
+
+def _analyze_in_process(
+    analyze: Callable[[str], Dict[str, Any]],
+    pdf_path: str,
+    slots: threading.BoundedSemaphore,
+    timeout_seconds: float,
+    cleanup: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    waited_at = time.perf_counter()
+    if not slots.acquire(timeout=timeout_seconds):
+        _cleanup_quietly(cleanup, pdf_path)
+        return _outcome(error="timeout", duration_ms=_elapsed_ms(waited_at))
+    started_at = time.perf_counter()
+    future = _run_in_thread(analyze, pdf_path, slots)
+    _release_when_done(future, pdf_path, cleanup)
+    return _wait_for_outcome(future, started_at, timeout_seconds)
+
+
+def analyze_title_blocks(
+    pdf_paths: Sequence[str],
+    *,
+    analyze: Callable[[str], Dict[str, Any]],
+    parallel: bool = True,
+    timeout_seconds: Optional[float] = None,
+    cleanup: Optional[Callable[[str], None]] = None,
+    logger: Any = None,
+) -> Dict[str, Any]:
+    """Analyze PDFs on the shared process pool, one outcome per path in input order.
+
+    Each outcome has ``analysis`` (or None), ``error`` (None, ``"failed"``
+    or ``"timeout"``) and ``durationMs``. ``analyze`` must be a module-level
+    function so pool workers can import it. Every document, in the pool or
+    on a thread of this process, gets ``timeout_seconds`` from the moment it
+    starts; time spent waiting for a free slot does not count against it,
+    but a document that never gets a slot within that time also times out.
+    A timed-out document keeps its slot until it actually finishes, so the
+    cross-request cap stays honest. ``cleanup`` is called with each path
+    once no worker is reading it, which can be after this returns.
+    """
+    max_workers = _ANALYSIS_POOL.max_workers()
+    slots = _analysis_slots(max_workers)
+    timeout = float(timeout_seconds) if timeout_seconds is not None else _document_timeout_from_env()
+    use_pool = parallel and max_workers > 1 and len(pdf_paths) >= MIN_PARALLEL_DOCUMENTS
+
+    if not use_pool:
+        return {
+            "outcomes": [_analyze_in_process(analyze, path, slots, timeout, cleanup) for path in pdf_paths],
+            "parallel": False,
+            "workers": 1,
+        }
+
+    try:
+        pool = _ANALYSIS_POOL.get(max_workers)
+    except Exception:
+        if logger is not None:
+            logger.warning("Title-block analysis pool was unavailable; documents were analyzed sequentially.")
+        return analyze_title_blocks(
+            pdf_paths,
+            analyze=analyze,
+            parallel=False,
+            timeout_seconds=timeout,
+            cleanup=cleanup,
+            logger=logger,
+        )
+
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(pdf_paths)
+    submitted: List[Tuple[int, Future, float]] = []
+    for index, path in enumerate(pdf_paths):
+        waited_at = time.perf_counter()
+        if not slots.acquire(timeout=timeout):
+            _cleanup_quietly(cleanup, path)
+            outcomes[index] = _outcome(error="timeout", duration_ms=_elapsed_ms(waited_at))
+            continue
+        try:
+            future = pool.submit(_analyze_timed, analyze, path)
+        except Exception:
+            slots.release()
+            outcomes[index] = _analyze_in_process(analyze, path, slots, timeout, cleanup)
+            continue
+        # The document's own clock starts once it is handed to a worker.
+        started_at = time.perf_counter()
+        future.add_done_callback(lambda _future: slots.release())
+        _release_when_done(future, path, cleanup)
+        submitted.append((index, future, started_at))
+
+    broken = False
+    for index, future, started_at in submitted:
+        try:
+            outcomes[index] = _wait_for_outcome(future, started_at, timeout)
+        except BrokenProcessPool:
+            broken = True
+            outcomes[index] = _analyze_in_process(analyze, pdf_paths[index], slots, timeout, cleanup)
+
+    if broken:
+        _ANALYSIS_POOL.discard()
+        if logger is not None:
+            logger.warning("Title-block analysis pool broke; affected documents were analyzed in-process.")
+
+    return {"outcomes": outcomes, "parallel": True, "workers": max_workers}
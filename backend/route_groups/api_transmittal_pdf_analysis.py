@@ -4,7 +4,6 @@ import math
 import os
 import re
 import shutil
-import subprocess
 import tempfile
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
@@ -19,10 +18,12 @@ except Exception:
 
 try:
     from pypdf import PdfReader
+    from pypdf import __version__ as _PYPDF_VERSION
 
     _PYPDF_AVAILABLE = True
 except Exception:
     PdfReader = None
+    _PYPDF_VERSION = ""
     _PYPDF_AVAILABLE = False
 
 try:
@@ -42,6 +43,9 @@ except Exception:
     _PYTESSERACT_AVAILABLE = False
 
 from .api_local_learning_runtime import get_local_learning_runtime
+from .pdf_analysis_cache import cached_page_payload
+from .pdf_rasterizer import get_pdf_rasterizer
+from .pdf_text_extraction import OCR_ENGINE, extract_ocr_region_lines, render_pdf_page_image
 
 _DRAWING_NUMBER_PATTERN = re.compile(
     r"\b(?:R3P[-_]\d+[-_])?E\d+[-_]\d{3,5}\b|\b[A-Z0-9]{1,6}[-_][A-Z0-9]{2,10}\b",
@@ -52,6 +56,21 @@ _LABEL_DRAWING_NUMBER = ("drawing no", "dwg no", "document no", "doc no", "sheet
 _LABEL_REVISION = ("revision", "rev")
 _LABEL_TITLE = ("drawing title", "sheet title", "title", "description")
 _LOCAL_LEARNING_RUNTIME = get_local_learning_runtime()
+_OCR_RENDER_DPI = 150
+# Bump when the line output changes so old cache entries miss.
+_TITLEBLOCK_LINES_ENGINE = f"pypdf-{_PYPDF_VERSION}/transmittal-lines-v1"
+# Prefixed with the rasterizer engine at call time.
+_TITLEBLOCK_OCR_ENGINE = "tesseract/transmittal-ocr-v1"
+_TITLEBLOCK_ZONE_OCR_ENGINE = f"tesseract/{OCR_ENGINE}/transmittal-zone-v2"
+# Page fractions of the bottom corners a title block sits in.
+_TITLE_BLOCK_RIGHT_ZONE_START = 0.55
+_TITLE_BLOCK_LEFT_ZONE_END = 0.45
+_TITLE_BLOCK_ZONE_HEIGHT = 0.28
+# Lines a corner needs before zone selection will call it the title block.
+_TITLE_BLOCK_MIN_ZONE_LINES = 3
+# One corner at 200 DPI is about 0.22x the pixels of the 150 DPI full-page
+# pass; both corners at 300 DPI cost as much as the full page itself.
+_TITLE_BLOCK_ZONE_OCR_DPI = 200
 
 
 def _safe_float(value: Any) -> Optional[float]:
@@ -77,7 +96,7 @@ def _ocr_available() -> bool:
         _PYTESSERACT_AVAILABLE
         and _PIL_AVAILABLE
         and shutil.which("tesseract")
-        and shutil.which("pdftoppm")
+        and get_pdf_rasterizer() is not None
     )
 
 
@@ -146,6 +165,18 @@ def _group_text_fragments(fragments: Sequence[Dict[str, Any]]) -> List[Dict[str,
 
 
 def _extract_embedded_text_lines(pdf_path: str) -> Dict[str, Any]:
+    if not _PYPDF_AVAILABLE or PdfReader is None:
+        return _extract_embedded_text_lines_uncached(pdf_path)
+    return cached_page_payload(
+        "transmittal_lines",
+        pdf_path,
+        compute=lambda: _extract_embedded_text_lines_uncached(pdf_path),
+        engine=_TITLEBLOCK_LINES_ENGINE,
+        should_store=lambda payload: payload.get("source") == "embedded_text",
+    )
+
+
+def _extract_embedded_text_lines_uncached(pdf_path: str) -> Dict[str, Any]:
     if not _PYPDF_AVAILABLE or PdfReader is None:
         return {
             "page_width": 0.0,
@@ -208,36 +239,98 @@ def _extract_embedded_text_lines(pdf_path: str) -> Dict[str, Any]:
         }
 
 
-def _ocr_first_page_lines(pdf_path: str) -> Dict[str, Any]:
-    if not _ocr_available():
+def _title_block_ocr_regions(page_width: float, page_height: float) -> List[Dict[str, float]]:
+    # Same corners _select_title_block_zone keeps, so the zone pass never
+    # reads text that zone selection would throw away.
+    band_height = page_height * _TITLE_BLOCK_ZONE_HEIGHT
+    return [
+        {
+            "x": page_width * _TITLE_BLOCK_RIGHT_ZONE_START,
+            "y": 0.0,
+            "width": page_width * (1.0 - _TITLE_BLOCK_RIGHT_ZONE_START),
+            "height": band_height,
+        },
+        {"x": 0.0, "y": 0.0, "width": page_width * _TITLE_BLOCK_LEFT_ZONE_END, "height": band_height},
+    ]
+
+
+def _ocr_first_page_lines(pdf_path: str, *, page_width: float = 0.0, page_height: float = 0.0) -> Dict[str, Any]:
+    """OCR the title-block corner(s) first; fall back to the whole page only if they are empty."""
+    rasterizer = get_pdf_rasterizer()
+    if rasterizer is None or not _ocr_available():
         return {"lines": [], "source": "ocr_unavailable"}
-    with tempfile.TemporaryDirectory(prefix="transmittal_ocr_") as temp_dir:
-        output_prefix = os.path.join(temp_dir, "page")
-        subprocess.run(
-            [
-                shutil.which("pdftoppm") or "pdftoppm",
-                "-f",
-                "1",
-                "-singlefile",
-                "-png",
-                pdf_path,
-                output_prefix,
-            ],
-            capture_output=True,
-            check=False,
-            text=True,
+    if page_width > 0 and page_height > 0:
+        zone_payload = cached_page_payload(
+            "transmittal_ocr_zone",
+            pdf_path,
+            compute=lambda: _ocr_title_block_zone_lines(pdf_path, page_width=page_width, page_height=page_height),
+            dpi=_TITLE_BLOCK_ZONE_OCR_DPI,
+            engine=f"{rasterizer.engine}+{_TITLEBLOCK_ZONE_OCR_ENGINE}",
+            should_store=lambda payload: payload.get("source") == "ocr",
         )
-        image_path = f"{output_prefix}.png"
-        if not os.path.isfile(image_path) or not _PYTESSERACT_AVAILABLE or pytesseract is None:
-            return {"lines": [], "source": "ocr_unavailable"}
-        image = Image.open(image_path)
+        if zone_payload.get("lines"):
+            return zone_payload
+    payload = cached_page_payload(
+        "transmittal_ocr",
+        pdf_path,
+        compute=lambda: _ocr_first_page_lines_uncached(pdf_path),
+        dpi=_OCR_RENDER_DPI,
+        engine=f"{rasterizer.engine}+{_TITLEBLOCK_OCR_ENGINE}",
+        should_store=lambda payload: payload.get("source") == "ocr",
+    )
+    return {**payload, "ocr_pass": "full_page"}
+
+
+def _ocr_title_block_zone_lines(pdf_path: str, *, page_width: float, page_height: float) -> Dict[str, Any]:
+    """OCR the bottom-right corner, then the bottom-left only if the right cannot be the title block."""
+    lines: List[Dict[str, Any]] = []
+    zones: List[str] = []
+    source = "ocr"
+    right_zone, left_zone = _title_block_ocr_regions(page_width, page_height)
+    with tempfile.TemporaryDirectory(prefix="transmittal_ocr_zone_") as temp_dir:
+        for zone_name, region in (("bottom_right", right_zone), ("bottom_left", left_zone)):
+            payload = extract_ocr_region_lines(
+                pdf_path,
+                page_index=0,
+                page_height=page_height,
+                regions=[region],
+                output_dir=temp_dir,
+                dpi=_TITLE_BLOCK_ZONE_OCR_DPI,
+            )
+            source = str(payload.get("source") or "ocr")
+            zone_lines = [
+                {
+                    "text": line["text"],
+                    "x": float(line.get("x") or 0.0),
+                    "y": float(line.get("y") or 0.0),
+                    "font_size": 0.0,
+                }
+                for line in payload.get("lines") or []
+                if _normalize_text(line.get("text"))
+            ]
+            lines.extend(zone_lines)
+            zones.append(zone_name)
+            if source != "ocr" or len(zone_lines) >= _TITLE_BLOCK_MIN_ZONE_LINES:
+                break
+    return {"lines": lines, "source": source, "ocr_pass": "title_block_zone", "ocr_zones": zones}
+
+
+def _ocr_first_page_lines_uncached(pdf_path: str) -> Dict[str, Any]:
+    if not _PYTESSERACT_AVAILABLE or pytesseract is None:
+        return {"lines": [], "source": "ocr_unavailable"}
+    image = render_pdf_page_image(pdf_path, page_index=0, dpi=_OCR_RENDER_DPI)
+    if image is None:
+        return {"lines": [], "source": "ocr_unavailable"}
+    try:
         text_value = _normalize_text(pytesseract.image_to_string(image) or "")
-        lines = [
-            {"text": line.strip(), "x": 0.0, "y": 0.0, "font_size": 0.0}
-            for line in str(text_value).splitlines()
-            if line.strip()
-        ]
-        return {"lines": lines, "source": "ocr"}
+    finally:
+        image.close()
+    lines = [
+        {"text": line.strip(), "x": 0.0, "y": 0.0, "font_size": 0.0}
+        for line in str(text_value).splitlines()
+        if line.strip()
+    ]
+    return {"lines": lines, "source": "ocr"}
 
 
 def _select_title_block_zone(
@@ -251,14 +344,14 @@ def _select_title_block_zone(
 
     def in_bottom_right(line: Dict[str, Any]) -> bool:
         return (
-            (_safe_float(line.get("x")) or 0.0) >= page_width * 0.55
-            and (_safe_float(line.get("y")) or 0.0) <= page_height * 0.28
+            (_safe_float(line.get("x")) or 0.0) >= page_width * _TITLE_BLOCK_RIGHT_ZONE_START
+            and (_safe_float(line.get("y")) or 0.0) <= page_height * _TITLE_BLOCK_ZONE_HEIGHT
         )
 
     def in_bottom_left(line: Dict[str, Any]) -> bool:
         return (
-            (_safe_float(line.get("x")) or 0.0) <= page_width * 0.45
-            and (_safe_float(line.get("y")) or 0.0) <= page_height * 0.28
+            (_safe_float(line.get("x")) or 0.0) <= page_width * _TITLE_BLOCK_LEFT_ZONE_END
+            and (_safe_float(line.get("y")) or 0.0) <= page_height * _TITLE_BLOCK_ZONE_HEIGHT
         )
 
     bottom_right = [line for line in lines if in_bottom_right(line)]
@@ -269,11 +362,11 @@ def _select_title_block_zone(
         if (_safe_float(line.get("y")) or 0.0) <= page_height * 0.22
     ]
 
-    if len(bottom_right) >= len(bottom_left) and len(bottom_right) >= 3:
+    if len(bottom_right) >= len(bottom_left) and len(bottom_right) >= _TITLE_BLOCK_MIN_ZONE_LINES:
         return "bottom_right", bottom_right
-    if len(bottom_left) >= 3:
+    if len(bottom_left) >= _TITLE_BLOCK_MIN_ZONE_LINES:
         return "bottom_left", bottom_left
-    if len(bottom_band) >= 3:
+    if len(bottom_band) >= _TITLE_BLOCK_MIN_ZONE_LINES:
         return "bottom_band", bottom_band
     return "whole_page", list(lines)
 
@@ -418,15 +511,17 @@ def analyze_pdf_title_block(pdf_path: str) -> Dict[str, Any]:
     embedded = _extract_embedded_text_lines(pdf_path)
     lines = embedded.get("lines") if isinstance(embedded.get("lines"), list) else []
     extraction_source = str(embedded.get("source") or "embedded_text")
+    page_width = float(embedded.get("page_width") or 0.0)
+    page_height = float(embedded.get("page_height") or 0.0)
+    ocr_pass = ""
     if sum(len(_normalize_text(line.get("text"))) for line in lines if isinstance(line, dict)) < 24:
-        ocr_payload = _ocr_first_page_lines(pdf_path)
+        ocr_payload = _ocr_first_page_lines(pdf_path, page_width=page_width, page_height=page_height)
         ocr_lines = ocr_payload.get("lines") if isinstance(ocr_payload.get("lines"), list) else []
         if ocr_lines:
             lines = ocr_lines
             extraction_source = str(ocr_payload.get("source") or "ocr")
+            ocr_pass = str(ocr_payload.get("ocr_pass") or "")
 
-    page_width = float(embedded.get("page_width") or 0.0)
-    page_height = float(embedded.get("page_height") or 0.0)
     zone, scoped_lines = _select_title_block_zone(
         lines,
         page_width=page_width,
@@ -499,6 +594,7 @@ def analyze_pdf_title_block(pdf_path: str) -> Dict[str, Any]:
             "reason_codes": [
                 f"zone:{zone}",
                 f"extraction:{extraction_source}",
+                *([f"ocr_pass:{ocr_pass}"] if ocr_pass else []),
                 "titleblock_analysis",
             ],
             "needs_review": needs_review,
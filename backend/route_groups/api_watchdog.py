@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import time
+import zlib
 from typing import Any, Callable, Dict
 
 import requests
@@ -15,6 +17,22 @@ from .api_watchdog_service import WatchdogMonitorService
 
 Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
 
+# Collector event batches are small JSON documents; anything that inflates
+# past this is rejected rather than decoded into memory.
+MAX_COLLECTOR_EVENTS_DECOMPRESSED_BYTES = 16 * 1024 * 1024
+
+
+def _decode_gzip_json(body: bytes, *, max_bytes: int | None = None) -> Any:
+    if max_bytes is None:
+        max_bytes = MAX_COLLECTOR_EVENTS_DECOMPRESSED_BYTES
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    raw = decompressor.decompress(body, max_bytes + 1)
+    if len(raw) > max_bytes or decompressor.unconsumed_tail:
+        raise ValueError("Decompressed payload too large")
+    if not decompressor.eof:
+        raise ValueError("Truncated gzip payload")
+    return json.loads(raw.decode("utf-8"))
+
 
 def create_watchdog_blueprint(
     *,
@@ -223,7 +241,24 @@ def create_watchdog_blueprint(
         if not request.is_json:
             return make_error_response("Expected JSON payload", code="WATCHDOG_COLLECTOR_EVENTS_INVALID", status=400)
 
-        payload = request.get_json(silent=True) or {}
+        content_encoding = str(request.headers.get("Content-Encoding") or "").strip().lower()
+        if content_encoding == "gzip":
+            try:
+                payload = _decode_gzip_json(request.get_data(cache=False)) or {}
+            except (ValueError, zlib.error, UnicodeDecodeError):
+                return make_error_response(
+                    "Invalid gzip JSON payload",
+                    code="WATCHDOG_COLLECTOR_EVENTS_INVALID",
+                    status=400,
+                )
+        elif content_encoding not in {"", "identity"}:
+            return make_error_response(
+                "Unsupported Content-Encoding",
+                code="WATCHDOG_COLLECTOR_EVENTS_INVALID",
+                status=415,
+            )
+        else:
+            payload = request.get_json(silent=True) or {}
         user_key = _watchdog_user_key()
         try:
             result = service.ingest_collector_events(user_key, payload)
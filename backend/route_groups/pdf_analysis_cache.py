@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+_HASH_CHUNK_BYTES = 1024 * 1024
+# Hit/miss counters and last-use times are written in one transaction every
+# USAGE_FLUSH_LOOKUPS lookups or USAGE_FLUSH_SECONDS, whichever comes first.
+USAGE_FLUSH_LOOKUPS = 64
+USAGE_FLUSH_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    meta TEXT,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    kind TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def resolve_cache_root() -> Path:
+    configured = str(os.environ.get("SUITE_PDF_ANALYSIS_CACHE_DIR") or "").strip()
+    if configured:
+        return Path(configured).expanduser().resolve()
+    local_appdata = str(os.environ.get("LOCALAPPDATA") or "").strip()
+    if local_appdata:
+        return (Path(local_appdata) / "Suite" / "pdf-analysis-cache").resolve()
+    return (Path.home() / "AppData" / "Local" / "Suite" / "pdf-analysis-cache").resolve()
+
+
+def _cache_max_bytes_from_env() -> int:
+    raw = str(os.environ.get("SUITE_PDF_ANALYSIS_CACHE_MAX_MB", "") or "").strip()
+    if not raw:
+        return DEFAULT_CACHE_MAX_BYTES
+    try:
+        return max(1, int(float(raw) * 1024 * 1024))
+    except ValueError:
+        return DEFAULT_CACHE_MAX_BYTES
+
+
+def _cache_enabled_from_env() -> bool:
+    raw = str(os.environ.get("SUITE_PDF_ANALYSIS_CACHE", "") or "").strip().lower()
+    return raw not in {"0", "false", "off", "no", "disabled"}
+
+
+class PdfAnalysisCache:
+    """On-disk cache for per-page PDF extraction, render and OCR results.
+
+    Entries are keyed by a SHA-256 of the source file bytes plus the kind
+    of result, page index, DPI and engine version, so an edited file or an
+    engine upgrade simply misses. Payloads live as files under
+    ``objects/``; a small SQLite index tracks sizes and last use for LRU
+    eviction once ``max_bytes`` is exceeded, plus hit/miss counters per
+    kind. Several processes (e.g. analysis pool workers) can share one
+    cache directory; the index runs in WAL mode so their reads do not
+    block each other. Usage bookkeeping is batched in memory, so a process
+    that dies hard loses at most one batch of counts and LRU touches.
+    """
+
+    def __init__(self, root_dir: Path, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max(1, int(max_bytes))
+        self.objects_dir = self.root_dir / "objects"
+        self.index_path = self.root_dir / "index.sqlite3"
+        self._lock = threading.Lock()
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
+        self._pending_touches: Dict[str, float] = {}
+        self._pending_counts: Dict[str, Tuple[int, int]] = {}
+        self._pending_lookups = 0
+        self._last_flush = time.monotonic()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            conn = self._connection_locked()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connection_locked(self) -> sqlite3.Connection:
+        # One connection per process; a forked pool worker opens its own.
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(
+                str(self.index_path), timeout=10.0, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction on the shared connection; callers hold ``_lock``."""
+        conn = self._connection_locked()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Write pending usage and close the index connection."""
+        with self._lock:
+            try:
+                self._flush_usage_locked()
+            finally:
+                if self._conn is not None and self._conn_pid == os.getpid():
+                    self._conn.close()
+                self._conn = None
+
+    def file_digest(self, path: str) -> str:
+        """SHA-256 of a file, memoized per (path, size, mtime) within the process."""
+        stat = os.stat(path)
+        memo_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(memo_key)
+        if digest is None:
+            hasher = hashlib.sha256()
+            with open(path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            if len(self._digests) > 4096:
+                self._digests.clear()
+            self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def entry_key(digest: str, *, kind: str, page_index: int = 0, dpi: int = 0, engine: str = "") -> str:
+        raw = f"v{CACHE_FORMAT_VERSION}|{kind}|{digest}|page={int(page_index)}|dpi={int(dpi)}|{engine}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _object_path(self, key: str, suffix: str) -> Path:
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    def _record_usage_locked(self, kind: str, *, hit_key: Optional[str]) -> None:
+        hits, misses = self._pending_counts.get(kind, (0, 0))
+        if hit_key is not None:
+            self._pending_counts[kind] = (hits + 1, misses)
+            self._pending_touches[hit_key] = time.time()
+        else:
+            self._pending_counts[kind] = (hits, misses + 1)
+        self._pending_lookups += 1
+        if (
+            self._pending_lookups >= USAGE_FLUSH_LOOKUPS
+            or time.monotonic() - self._last_flush >= USAGE_FLUSH_SECONDS
+        ):
+            try:
+                self._flush_usage_locked()
+            except sqlite3.Error:
+                # A busy index costs one batch of bookkeeping, never the hit.
+                pass
+
+    def _flush_usage_locked(self, conn: Optional[sqlite3.Connection] = None) -> None:
+        if not self._pending_counts and not self._pending_touches:
+            return
+        touches = [(last_used, key) for key, last_used in self._pending_touches.items()]
+        counts = [(kind, hits, misses) for kind, (hits, misses) in self._pending_counts.items()]
+        self._pending_touches = {}
+        self._pending_counts = {}
+        self._pending_lookups = 0
+        self._last_flush = time.monotonic()
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", touches)
+            conn.executemany(
+                """
+                INSERT INTO counters (kind, hits, misses) VALUES (?, ?, ?)
+                ON CONFLICT(kind) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses
+                """,
+                counts,
+            )
+
+        if conn is not None:
+            write(conn)
+            return
+        with self._transaction() as conn:
+            write(conn)
+
+    def _lookup(self, key: str, kind: str, suffix: str) -> Optional[Tuple[Path, Optional[str]]]:
+        path = self._object_path(key, suffix)
+        with self._lock:
+            conn = self._connection_locked()
+            row = conn.execute("SELECT meta FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or not path.is_file():
+                if row is not None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._record_usage_locked(kind, hit_key=None)
+                return None
+            self._record_usage_locked(kind, hit_key=key)
+            return path, row[0]
+
+    def _store(self, key: str, kind: str, suffix: str, write: Callable[[Path], None], meta: Optional[str]) -> None:
+        path = self._object_path(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        os.close(fd)
+        try:
+            write(Path(temp_name))
+            os.replace(temp_name, path)
+        finally:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+        size = path.stat().st_size
+        with self._lock, self._transaction() as conn:
+            # Pending touches go in first so eviction sees current LRU order.
+            self._flush_usage_locked(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, size, meta, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, size, meta, time.time()),
+            )
+            self._evict_locked(conn)
+
+    def _evict_locked(self, conn: sqlite3.Connection) -> None:
+        total = int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        for key, kind, size in conn.execute(
+            "SELECT key, kind, size FROM entries ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            for suffix in (".json", ".png"):
+                self._object_path(key, suffix).unlink(missing_ok=True)
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= int(size)
+
+    def get_json(self, key: str, kind: str) -> Optional[Dict[str, Any]]:
+        found = self._lookup(key, kind, ".json")
+        if found is None:
+            return None
+        try:
+            return json.loads(found[0].read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, key: str, kind: str, payload: Dict[str, Any]) -> None:
+        rendered = json.dumps(payload, separators=(",", ":"))
+        self._store(key, kind, ".json", lambda path: path.write_text(rendered, encoding="utf-8"), None)
+
+    def get_file(self, key: str, kind: str, destination: str) -> Optional[Dict[str, Any]]:
+        """Copy a cached file to ``destination`` and return its stored metadata."""
+        found = self._lookup(key, kind, ".png")
+        if found is None:
+            return None
+        shutil.copyfile(found[0], destination)
+        return json.loads(found[1]) if found[1] else {}
+
+    def put_file(self, key: str, kind: str, source: str, meta: Dict[str, Any]) -> None:
+        self._store(key, kind, ".png", lambda path: shutil.copyfile(source, path), json.dumps(meta))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._flush_usage_locked()
+            conn = self._connection_locked()
+            entries = conn.execute("SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY kind").fetchall()
+            counters = conn.execute("SELECT kind, hits, misses FROM counters").fetchall()
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for kind, count, size in entries:
+            by_kind.setdefault(kind, {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}).update(
+                {"entries": int(count), "bytes": int(size)}
+            )
+        for kind, hits, misses in counters:
+            by_kind.setdefault(kind, {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}).update(
+                {"hits": int(hits), "misses": int(misses)}
+            )
+        hits = sum(item["hits"] for item in by_kind.values())
+        misses = sum(item["misses"] for item in by_kind.values())
+        return {
+            "root": str(self.root_dir),
+            "maxBytes": self.max_bytes,
+            "entries": sum(item["entries"] for item in by_kind.values()),
+            "bytes": sum(item["bytes"] for item in by_kind.values()),
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "byKind": by_kind,
+        }
+
+    def clear(self) -> None:
+        with self._lock, self._transaction() as conn:
+            self._pending_touches = {}
+            self._pending_counts = {}
+            self._pending_lookups = 0
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+
+_CACHE: Optional[PdfAnalysisCache] = None
+_CACHE_CONFIG: Optional[Tuple[str, int]] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_pdf_analysis_cache() -> Optional[PdfAnalysisCache]:
+    """Process-wide cache for the configured directory, or None when disabled."""
+    global _CACHE, _CACHE_CONFIG
+    if not _cache_enabled_from_env():
+        return None
+    config = (str(resolve_cache_root()), _cache_max_bytes_from_env())
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE_CONFIG != config:
+            if _CACHE is not None:
+                try:
+                    _CACHE.close()
+                except (OSError, sqlite3.Error):
+                    pass
+                _CACHE = None
+            try:
+                _CACHE = PdfAnalysisCache(Path(config[0]), max_bytes=config[1])
+            except (OSError, sqlite3.Error):
+                return None
+            _CACHE_CONFIG = config
+        return _CACHE
+
+
+def cached_page_payload(
+    kind: str,
+    source_path: str,
+    *,
+    compute: Callable[[], Dict[str, Any]],
+    page_index: int = 0,
+    dpi: int = 0,
+    engine: str = "",
+    should_store: Callable[[Dict[str, Any]], bool] = lambda _payload: True,
+) -> Dict[str, Any]:
+    """Return a cached JSON payload for one page of ``source_path`` or compute and store it.
+
+    Cache problems never fail the caller; they fall back to ``compute``.
+    """
+    cache = get_pdf_analysis_cache()
+    key = None
+    if cache is not None:
+        try:
+            key = cache.entry_key(cache.file_digest(source_path), kind=kind, page_index=page_index, dpi=dpi, engine=engine)
+            cached = cache.get_json(key, kind)
+            if cached is not None:
+                return cached
+        except (OSError, sqlite3.Error):
+            key = None
+    payload = compute()
+    if cache is not None and key is not None and should_store(payload):
+        try:
+            cache.put_json(key, kind, payload)
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+    return payload
+
+
+def _iter_pdfs(folder: Path) -> Iterator[Path]:
+    for root, _dirs, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield Path(root) / name
+
+
+def warm_folder(folder: Path, *, pages: int = 1, render: bool = False, ocr: bool = False) -> Dict[str, Any]:
+    """Run the cached extraction steps over every PDF under ``folder``."""
+    from .pdf_text_extraction import (
+        extract_embedded_text_page_lines,
+        extract_ocr_page_lines_from_image,
+        render_pdf_page_to_png,
+    )
+
+    started_at = time.perf_counter()
+    documents = 0
+    failures = 0
+    for pdf_path in _iter_pdfs(folder):
+        documents += 1
+        try:
+            for page_index in range(max(1, int(pages))):
+                embedded = extract_embedded_text_page_lines(str(pdf_path), page_index=page_index)
+                if embedded.get("source") == "embedded_text_out_of_range":
+                    break
+                if not (render or ocr):
+                    continue
+                with tempfile.TemporaryDirectory(prefix="pdf_cache_warm_") as temp_dir:
+                    rendered = render_pdf_page_to_png(str(pdf_path), page_index=page_index, output_dir=temp_dir)
+                    if ocr and rendered.get("path"):
+                        extract_ocr_page_lines_from_image(
+                            str(rendered["path"]),
+                            page_width=float(embedded.get("page_width") or 0.0),
+                            page_height=float(embedded.get("page_height") or 0.0),
+                        )
+        except Exception:
+            failures += 1
+    return {
+        "folder": str(folder),
+        "documents": documents,
+        "failures": failures,
+        "durationMs": round((time.perf_counter() - started_at) * 1000.0, 3),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the on-disk PDF analysis cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    warm_parser = subparsers.add_parser("warm", help="Pre-compute cached results for every PDF under a folder.")
+    warm_parser.add_argument("folder", help="Project folder to scan recursively for PDFs.")
+    warm_parser.add_argument("--pages", type=int, default=1, help="Pages per PDF to warm, starting at the first.")
+    warm_parser.add_argument("--render", action="store_true", help="Also cache page renders.")
+    warm_parser.add_argument("--ocr", action="store_true", help="Also cache OCR word data (implies --render).")
+    subparsers.add_parser("stats", help="Print cache size and hit/miss counters.")
+    subparsers.add_parser("clear", help="Delete every cache entry and reset counters.")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    cache = get_pdf_analysis_cache()
+    if cache is None:
+        print("PDF analysis cache is disabled (SUITE_PDF_ANALYSIS_CACHE).")
+        return 1
+    if args.command == "warm":
+        folder = Path(args.folder).expanduser().resolve()
+        if not folder.is_dir():
+            print(f"Folder not found: {folder}")
+            return 1
+        report = {**warm_folder(folder, pages=args.pages, render=args.render, ocr=args.ocr), "cache": cache.stats()}
+    elif args.command == "clear":
+        cache.clear()
+        report = cache.stats()
+    else:
+        report = cache.stats()
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
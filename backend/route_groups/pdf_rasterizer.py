@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+try:
+    from PIL import Image
+
+    _PIL_AVAILABLE = True
+except Exception:
+    Image = None
+    _PIL_AVAILABLE = False
+
+try:
+    from importlib.metadata import version as _package_version
+
+    import pypdfium2 as _pdfium
+
+    _PDFIUM_VERSION = _package_version("pypdfium2")
+    _PDFIUM_AVAILABLE = True
+except Exception:
+    _pdfium = None
+    _PDFIUM_VERSION = ""
+    _PDFIUM_AVAILABLE = False
+
+RASTERIZER_ENV = "SUITE_PDF_RASTERIZER"
+RASTERIZER_AUTO = "auto"
+
+
+def _pixel_extent(points: float, scale: float) -> int:
+    return max(1, int(math.ceil(points * scale - 1e-6)))
+
+
+def _trim_points(pixels: int, scale: float) -> float:
+    # Half a pixel short, so rounding up lands exactly on ``pixels``.
+    return (pixels - 0.5) / scale if pixels > 0 else 0.0
+
+
+class PdfRasterizer(ABC):
+    """Renders one PDF page, or a pixel crop of it, to an RGB PIL image.
+
+    ``crop`` uses pdftoppm's convention: ``left``/``top``/``width``/``height``
+    in pixels of the full page rendered at ``dpi``. ``engine`` goes into
+    cache keys, so it must change whenever the pixels could.
+    """
+
+    name = ""
+    engine = ""
+
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the backend's dependencies are installed."""
+
+    @abstractmethod
+    def render(
+        self,
+        pdf_path: str,
+        *,
+        page_index: int,
+        dpi: int,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> Optional[Any]:
+        """The rendered RGB image, or None when the page cannot be rendered."""
+
+    def render_to_file(
+        self,
+        pdf_path: str,
+        *,
+        page_index: int,
+        dpi: int,
+        output_path: str,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> bool:
+        image = self.render(pdf_path, page_index=page_index, dpi=dpi, crop=crop)
+        if image is None:
+            return False
+        try:
+            image.save(output_path, format="PNG")
+        finally:
+            image.close()
+        return True
+
+
+class PdftoppmRasterizer(PdfRasterizer):
+    """Poppler's ``pdftoppm`` in a subprocess; the fallback when nothing in-process is installed."""
+
+    name = "pdftoppm"
+    engine = "pdftoppm-v1"
+
+    def available(self) -> bool:
+        return bool(_PIL_AVAILABLE and shutil.which("pdftoppm"))
+
+    def _run(self, pdf_path: str, *, page_index: int, dpi: int, output_prefix: str, crop: Optional[Dict[str, int]]) -> str:
+        page_number = page_index + 1
+        crop_args: List[str] = []
+        if crop is not None:
+            crop_args = [
+                "-x",
+                str(crop["left"]),
+                "-y",
+                str(crop["top"]),
+                "-W",
+                str(crop["width"]),
+                "-H",
+                str(crop["height"]),
+            ]
+        subprocess.run(
+            [
+                shutil.which("pdftoppm") or "pdftoppm",
+                "-f",
+                str(page_number),
+                "-l",
+                str(page_number),
+                "-r",
+                str(dpi),
+                *crop_args,
+                "-singlefile",
+                "-png",
+                pdf_path,
+                output_prefix,
+            ],
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+        return f"{output_prefix}.png"
+
+    def render(
+        self,
+        pdf_path: str,
+        *,
+        page_index: int,
+        dpi: int,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> Optional[Any]:
+        if not _PIL_AVAILABLE or Image is None:
+            return None
+        with tempfile.TemporaryDirectory(prefix="pdftoppm_") as temp_dir:
+            image_path = self._run(
+                pdf_path,
+                page_index=page_index,
+                dpi=dpi,
+                output_prefix=os.path.join(temp_dir, "page"),
+                crop=crop,
+            )
+            if not os.path.isfile(image_path):
+                return None
+            with Image.open(image_path) as image:
+                return image.convert("RGB")
+
+    def render_to_file(
+        self,
+        pdf_path: str,
+        *,
+        page_index: int,
+        dpi: int,
+        output_path: str,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> bool:
+        # pdftoppm already writes PNG; let it write straight to the destination.
+        output_prefix = output_path[:-4] if output_path.lower().endswith(".png") else output_path
+        image_path = self._run(pdf_path, page_index=page_index, dpi=dpi, output_prefix=output_prefix, crop=crop)
+        if image_path != output_path and os.path.isfile(image_path):
+            os.replace(image_path, output_path)
+        return os.path.isfile(output_path)
+
+
+class PdfiumRasterizer(PdfRasterizer):
+    """In-process rendering with pypdfium2: no subprocess and no PNG round-trip."""
+
+    name = "pdfium"
+    engine = f"pdfium-{_PDFIUM_VERSION}-v1"
+
+    # PDFium is not thread-safe; request threads share one lock. Pool
+    # workers are separate processes with their own copy.
+    _lock = threading.Lock()
+
+    def available(self) -> bool:
+        return bool(_PDFIUM_AVAILABLE and _PIL_AVAILABLE)
+
+    def render(
+        self,
+        pdf_path: str,
+        *,
+        page_index: int,
+        dpi: int,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> Optional[Any]:
+        if not self.available():
+            return None
+        scale = dpi / 72.0
+        with self._lock:
+            document = _pdfium.PdfDocument(pdf_path)
+            try:
+                if page_index < 0 or page_index >= len(document):
+                    return None
+                page = document[page_index]
+                try:
+                    page_width, page_height = page.get_size()
+                    # pypdfium2 sizes the canvas with ceil(), so float error can
+                    # add a pixel; trim back to the size pdftoppm would produce.
+                    width = _pixel_extent(page_width, scale)
+                    height = _pixel_extent(page_height, scale)
+                    trim = (0.0, 0.0, 0.0, 0.0)
+                    if crop is not None:
+                        left = min(crop["left"], width)
+                        top = min(crop["top"], height)
+                        width = max(0, min(crop["width"], width - left))
+                        height = max(0, min(crop["height"], height - top))
+                        if width <= 0 or height <= 0:
+                            return None
+                        # pypdfium2 takes the points to cut off each edge
+                        # (left, bottom, right, top) and rounds them up to
+                        # whole pixels of its own ceil()'d canvas.
+                        canvas_width = math.ceil(page_width * scale)
+                        canvas_height = math.ceil(page_height * scale)
+                        trim = (
+                            _trim_points(left, scale),
+                            _trim_points(canvas_height - top - height, scale),
+                            _trim_points(canvas_width - left - width, scale),
+                            _trim_points(top, scale),
+                        )
+                    bitmap = page.render(scale=scale, crop=trim)
+                    try:
+                        image = bitmap.to_pil()
+                        # crop() copies, so the image outlives the bitmap buffer.
+                        return image.crop((0, 0, min(width, image.width), min(height, image.height))).convert("RGB")
+                    finally:
+                        bitmap.close()
+                finally:
+                    page.close()
+            finally:
+                document.close()
+
+
+_RASTERIZERS: Dict[str, PdfRasterizer] = {
+    PdfiumRasterizer.name: PdfiumRasterizer(),
+    PdftoppmRasterizer.name: PdftoppmRasterizer(),
+}
+
+
+def available_pdf_rasterizers() -> List[PdfRasterizer]:
+    """Installed backends, in-process first."""
+    return [rasterizer for rasterizer in _RASTERIZERS.values() if rasterizer.available()]
+
+
+def get_pdf_rasterizer() -> Optional[PdfRasterizer]:
+    """The backend named by ``SUITE_PDF_RASTERIZER``, else the first available one.
+
+    An unavailable named backend falls back to auto-selection rather than
+    turning rendering off.
+    """
+    requested = str(os.environ.get(RASTERIZER_ENV, "") or "").strip().lower() or RASTERIZER_AUTO
+    named = _RASTERIZERS.get(requested)
+    if named is not None and named.available():
+        return named
+    available = available_pdf_rasterizers()
+    return available[0] if available else None
+
+
+def fallback_pdf_rasterizer(failed: PdfRasterizer) -> Optional[PdfRasterizer]:
+    """Another installed backend to retry a document that made ``failed`` raise.
+
+    PDFium rejects some malformed files that Poppler still renders, so one
+    bad document should not cost the whole render.
+    """
+    for rasterizer in available_pdf_rasterizers():
+        if rasterizer.name != failed.name:
+            return rasterizer
+    return None
@@ -3,15 +3,18 @@ from __future__ import annotations
 import math
 import os
 import shutil
-import subprocess
+import sqlite3
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     from pypdf import PdfReader
+    from pypdf import __version__ as _PYPDF_VERSION
 
     _PYPDF_AVAILABLE = True
 except Exception:
     PdfReader = None
+    _PYPDF_VERSION = ""
     _PYPDF_AVAILABLE = False
 
 try:
@@ -32,6 +35,16 @@ except Exception:
     _TESSERACT_OUTPUT = None
     _PYTESSERACT_AVAILABLE = False
 
+from .pdf_analysis_cache import cached_page_payload, get_pdf_analysis_cache
+from .pdf_rasterizer import PdfRasterizer, fallback_pdf_rasterizer, get_pdf_rasterizer
+
+PDF_RENDER_DPI = 150
+# Crops are small, so they can afford a sharper render for OCR.
+PDF_REGION_RENDER_DPI = 300
+# Bump when the output of the matching step changes so old cache entries miss.
+EMBEDDED_LINES_ENGINE = f"pypdf-{_PYPDF_VERSION}/lines-v1"
+OCR_ENGINE = "psm6-v1"
+
 
 def normalize_pdf_text(value: Any) -> str:
     return " ".join(str(value or "").strip().split())
@@ -48,7 +61,7 @@ def safe_pdf_float(value: Any) -> Optional[float]:
 
 
 def pdf_render_available() -> bool:
-    return bool(_PIL_AVAILABLE and shutil.which("pdftoppm"))
+    return bool(_PIL_AVAILABLE and get_pdf_rasterizer() is not None)
 
 
 def pdf_ocr_available() -> bool:
@@ -56,7 +69,7 @@ def pdf_ocr_available() -> bool:
         _PYTESSERACT_AVAILABLE
         and _PIL_AVAILABLE
         and shutil.which("tesseract")
-        and shutil.which("pdftoppm")
+        and get_pdf_rasterizer() is not None
     )
 
 
@@ -144,6 +157,19 @@ def _group_text_fragments(fragments: Sequence[Dict[str, Any]]) -> List[Dict[str,
 
 
 def extract_embedded_text_page_lines(pdf_path: str, *, page_index: int = 0) -> Dict[str, Any]:
+    if not _PYPDF_AVAILABLE or PdfReader is None:
+        return _extract_embedded_text_page_lines_uncached(pdf_path, page_index=page_index)
+    return cached_page_payload(
+        "embedded_lines",
+        pdf_path,
+        compute=lambda: _extract_embedded_text_page_lines_uncached(pdf_path, page_index=page_index),
+        page_index=page_index,
+        engine=EMBEDDED_LINES_ENGINE,
+        should_store=lambda payload: payload.get("source") in {"embedded_text", "embedded_text_out_of_range"},
+    )
+
+
+def _extract_embedded_text_page_lines_uncached(pdf_path: str, *, page_index: int = 0) -> Dict[str, Any]:
     if not _PYPDF_AVAILABLE or PdfReader is None:
         return {
             "page_width": 0.0,
@@ -225,6 +251,118 @@ def extract_embedded_text_page_lines(pdf_path: str, *, page_index: int = 0) -> D
         }
 
 
+def _render_cached(
+    pdf_path: str,
+    *,
+    page_index: int,
+    dpi: int,
+    image_path: str,
+    kind: str,
+    crop: Optional[Dict[str, int]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Render one page (or a pixel crop of it) to ``image_path`` through the cache.
+
+    Returns the image size and rasterizer name, or None when nothing rendered.
+    A backend that raises on the document is retried once with the fallback.
+    """
+    rasterizer = get_pdf_rasterizer()
+    if rasterizer is None:
+        return None
+    try:
+        return _render_cached_with(
+            rasterizer, pdf_path, page_index=page_index, dpi=dpi, image_path=image_path, kind=kind, crop=crop
+        )
+    except Exception:
+        fallback = fallback_pdf_rasterizer(rasterizer)
+    if fallback is None:
+        return None
+    try:
+        return _render_cached_with(
+            fallback, pdf_path, page_index=page_index, dpi=dpi, image_path=image_path, kind=kind, crop=crop
+        )
+    except Exception:
+        return None
+
+
+def _render_cached_with(
+    rasterizer: PdfRasterizer,
+    pdf_path: str,
+    *,
+    page_index: int,
+    dpi: int,
+    image_path: str,
+    kind: str,
+    crop: Optional[Dict[str, int]],
+) -> Optional[Dict[str, Any]]:
+    engine = rasterizer.engine
+    if crop is not None:
+        engine = f"{engine}/crop-{crop['left']},{crop['top']},{crop['width']},{crop['height']}"
+    cache = get_pdf_analysis_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.entry_key(
+                cache.file_digest(pdf_path),
+                kind=kind,
+                page_index=page_index,
+                dpi=dpi,
+                engine=engine,
+            )
+            cached = cache.get_file(cache_key, kind, image_path)
+            if cached is not None:
+                return {
+                    "image_width": int(cached.get("image_width") or 0),
+                    "image_height": int(cached.get("image_height") or 0),
+                    "source": rasterizer.name,
+                }
+        except (OSError, ValueError, sqlite3.Error):
+            cache_key = None
+
+    rendered = rasterizer.render_to_file(
+        pdf_path,
+        page_index=page_index,
+        dpi=dpi,
+        output_path=image_path,
+        crop=crop,
+    )
+    if not rendered or not os.path.isfile(image_path) or not _PIL_AVAILABLE or Image is None:
+        return None
+    with Image.open(image_path) as image:
+        width, height = image.size
+    if cache is not None and cache_key is not None:
+        try:
+            cache.put_file(cache_key, kind, image_path, {"image_width": width, "image_height": height})
+        except (OSError, sqlite3.Error):
+            pass
+    return {"image_width": width, "image_height": height, "source": rasterizer.name}
+
+
+def render_pdf_page_image(
+    pdf_path: str,
+    *,
+    page_index: int,
+    dpi: int = PDF_RENDER_DPI,
+    crop: Optional[Dict[str, int]] = None,
+) -> Optional[Any]:
+    """Render a page straight to an in-memory RGB image, skipping the PNG cache.
+
+    For callers that only read pixels once (for example to OCR them).
+    """
+    rasterizer = get_pdf_rasterizer()
+    if rasterizer is None:
+        return None
+    try:
+        return rasterizer.render(pdf_path, page_index=page_index, dpi=dpi, crop=crop)
+    except Exception:
+        fallback = fallback_pdf_rasterizer(rasterizer)
+    if fallback is None:
+        return None
+    try:
+        return fallback.render(pdf_path, page_index=page_index, dpi=dpi, crop=crop)
+    except Exception:
+        return None
+
+
 def render_pdf_page_to_png(
     pdf_path: str,
     *,
@@ -239,40 +377,74 @@ def render_pdf_page_to_png(
             "image_height": 0,
             "source": "render_unavailable",
         }
-    output_prefix = os.path.join(output_dir, prefix)
-    page_number = page_index + 1
-    subprocess.run(
-        [
-            shutil.which("pdftoppm") or "pdftoppm",
-            "-f",
-            str(page_number),
-            "-l",
-            str(page_number),
-            "-singlefile",
-            "-png",
-            pdf_path,
-            output_prefix,
-        ],
-        capture_output=True,
-        check=False,
-        text=True,
+    image_path = os.path.join(output_dir, f"{prefix}.png")
+    rendered = _render_cached(
+        pdf_path,
+        page_index=page_index,
+        dpi=PDF_RENDER_DPI,
+        image_path=image_path,
+        kind="page_render",
     )
-    image_path = f"{output_prefix}.png"
-    if not os.path.isfile(image_path) or not _PIL_AVAILABLE or Image is None:
+    if rendered is None:
         return {
             "path": "",
             "image_width": 0,
             "image_height": 0,
             "source": "render_failed",
         }
-    with Image.open(image_path) as image:
-        width, height = image.size
-    return {
-        "path": image_path,
-        "image_width": width,
-        "image_height": height,
-        "source": "pdftoppm",
+    return {"path": image_path, **rendered}
+
+
+def render_pdf_region_to_png(
+    pdf_path: str,
+    *,
+    page_index: int,
+    region: Dict[str, float],
+    page_height: float,
+    output_dir: str,
+    prefix: str = "region",
+    dpi: int = PDF_REGION_RENDER_DPI,
+) -> Dict[str, Any]:
+    """Render only ``region`` (PDF points, bottom-left origin) of a page.
+
+    ``crop`` is the pixel rectangle at ``dpi`` that the rasterizer was asked for;
+    the image can be smaller where the region runs off the page edge.
+    """
+    if not pdf_render_available():
+        return {
+            "path": "",
+            "image_width": 0,
+            "image_height": 0,
+            "source": "render_unavailable",
+        }
+    scale = dpi / 72.0
+    x = safe_pdf_float(region.get("x")) or 0.0
+    y = safe_pdf_float(region.get("y")) or 0.0
+    width = safe_pdf_float(region.get("width")) or 0.0
+    height = safe_pdf_float(region.get("height")) or 0.0
+    crop = {
+        "left": max(0, int(math.floor(x * scale))),
+        "top": max(0, int(math.floor((page_height - (y + height)) * scale))),
+        "width": max(1, int(math.ceil(width * scale))),
+        "height": max(1, int(math.ceil(height * scale))),
     }
+    image_path = os.path.join(output_dir, f"{prefix}.png")
+    rendered = _render_cached(
+        pdf_path,
+        page_index=page_index,
+        dpi=dpi,
+        image_path=image_path,
+        kind="region_render",
+        crop=crop,
+    )
+    if rendered is None:
+        return {
+            "path": "",
+            "image_width": 0,
+            "image_height": 0,
+            "source": "render_failed",
+        }
+    return {"path": image_path, **rendered, "crop": crop, "dpi": dpi}
 
 
 def pixel_bounds_to_pdf_bounds(
@@ -331,6 +503,31 @@ def pdf_bounds_to_pixel_bounds(
     }
 
 
+@lru_cache(maxsize=1)
+def _tesseract_version() -> str:
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return "unknown"
+
+
+def _ocr_word_data(image_path: str) -> Dict[str, Any]:
+    # Word-level Tesseract output for a rendered page. OCR entries are keyed
+    # by the image bytes, which already reflect the PDF, page, DPI and renderer.
+    with Image.open(image_path) as image:
+        image_width, image_height = image.size
+        raw_data = pytesseract.image_to_data(
+            image,
+            output_type=_TESSERACT_OUTPUT.DICT,
+            config="--psm 6",
+        )
+    return {
+        "image_width": image_width,
+        "image_height": image_height,
+        "data": raw_data if isinstance(raw_data, dict) else None,
+    }
+
+
 def extract_ocr_page_lines_from_image(
     image_path: str,
     *,
@@ -342,14 +539,16 @@ def extract_ocr_page_lines_from_image(
     if not os.path.isfile(image_path) or not _PYTESSERACT_AVAILABLE or pytesseract is None:
         return {"lines": [], "source": "ocr_unavailable"}
 
-    with Image.open(image_path) as image:
-        image_width, image_height = image.size
-        raw_data = pytesseract.image_to_data(
-            image,
-            output_type=_TESSERACT_OUTPUT.DICT,
-            config="--psm 6",
-        )
-
+    words = cached_page_payload(
+        "ocr_words",
+        image_path,
+        compute=lambda: _ocr_word_data(image_path),
+        engine=f"tesseract-{_tesseract_version()}/{OCR_ENGINE}",
+        should_store=lambda payload: isinstance(payload.get("data"), dict),
+    )
+    image_width = int(words.get("image_width") or 0)
+    image_height = int(words.get("image_height") or 0)
+    raw_data = words.get("data")
     if not isinstance(raw_data, dict):
         return {"lines": [], "source": "ocr"}
 
@@ -425,3 +624,69 @@ def extract_ocr_page_lines_from_image(
         "image_width": image_width,
         "image_height": image_height,
     }
+
+
+def extract_ocr_region_lines(
+    pdf_path: str,
+    *,
+    page_index: int,
+    page_height: float,
+    regions: Sequence[Dict[str, float]],
+    output_dir: str,
+    dpi: int = PDF_REGION_RENDER_DPI,
+) -> Dict[str, Any]:
+    """OCR only ``regions`` of a page, with line bounds mapped back to page points.
+
+    Lines carry no ``pixel_bounds`` because they were read from crops, not
+    from a full-page render.
+    """
+    if not pdf_ocr_available():
+        return {"lines": [], "source": "ocr_unavailable", "region_count": 0}
+    scale = dpi / 72.0
+    lines: List[Dict[str, Any]] = []
+    rendered_count = 0
+    for region_index, region in enumerate(regions):
+        rendered = render_pdf_region_to_png(
+            pdf_path,
+            page_index=page_index,
+            region=region,
+            page_height=page_height,
+            output_dir=output_dir,
+            prefix=f"region-{region_index}",
+            dpi=dpi,
+        )
+        image_path = str(rendered.get("path") or "")
+        crop = rendered.get("crop")
+        if not image_path or not isinstance(crop, dict):
+            continue
+        rendered_count += 1
+        crop_width = int(rendered.get("image_width") or 0) / scale
+        crop_height = int(rendered.get("image_height") or 0) / scale
+        # OCR the crop as if it were a page of its own, then shift its bounds
+        # by the crop's offset on the real page.
+        offset_x = crop["left"] / scale
+        offset_y = page_height - (crop["top"] / scale) - crop_height
+        payload = extract_ocr_page_lines_from_image(
+            image_path,
+            page_width=crop_width,
+            page_height=crop_height,
+        )
+        for line in payload.get("lines") or []:
+            bounds = line.get("bounds")
+            if not isinstance(bounds, dict):
+                continue
+            page_bounds = {
+                "x": float(bounds["x"]) + offset_x,
+                "y": float(bounds["y"]) + offset_y,
+                "width": float(bounds["width"]),
+                "height": float(bounds["height"]),
+            }
+            lines.append(
+                {
+                    **{key: value for key, value in line.items() if key != "pixel_bounds"},
+                    "x": page_bounds["x"],
+                    "y": page_bounds["y"],
+                    "bounds": page_bounds,
+                }
+            )
+    return {"lines": lines, "source": "ocr", "region_count": rendered_count}
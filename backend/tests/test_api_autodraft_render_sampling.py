@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from backend.benchmarks.autodraft_color_sampling_benchmark import generate_page
+from backend.route_groups import api_autodraft
+from backend.route_groups.api_autodraft import _sample_rendered_line_color, _sample_rendered_line_colors
+
+
+def _per_line(image, pixel_bounds_list):  # type: ignore[no-untyped-def]
+    return [_sample_rendered_line_color(image, pixel_bounds) for pixel_bounds in pixel_bounds_list]
+
+
+class TestBatchedRenderSampling(unittest.TestCase):
+    def test_matches_per_line_sampling_on_generated_pages(self) -> None:
+        for seed in (1, 7, 42):
+            image, pixel_bounds = generate_page(120, seed=seed, width=900, height=600)
+            self.assertEqual(_sample_rendered_line_colors(image, pixel_bounds), _per_line(image, pixel_bounds))
+
+    def test_edge_boxes_match_per_line_sampling(self) -> None:
+        image, _ = generate_page(60, seed=3, width=400, height=300)
+        pixel_bounds = [
+            None,
+            {},
+            {"left": 390, "top": 290, "width": 40, "height": 40},
+            {"left": 500, "top": 10, "width": 20, "height": 10},
+            {"left": -20, "top": -5, "width": 30, "height": 15},
+            {"left": 0, "top": 0, "width": 400, "height": 300},
+            {"left": 10, "top": 10, "width": 0, "height": 0},
+        ]
+        expected = _per_line(image, pixel_bounds)
+        self.assertEqual(_sample_rendered_line_colors(image, pixel_bounds), expected)
+        self.assertEqual(expected[0], ("unknown", None, None, "unknown"))
+        self.assertEqual(expected[3], ("unknown", None, None, "unknown"))
+
+    def test_non_rgb_images_are_converted_like_per_line_sampling(self) -> None:
+        image, pixel_bounds = generate_page(40, seed=11, width=500, height=400)
+        for mode in ("RGBA", "L"):
+            converted = image.convert(mode)
+            self.assertEqual(
+                _sample_rendered_line_colors(converted, pixel_bounds),
+                _per_line(converted, pixel_bounds),
+            )
+
+    def test_blank_page_and_missing_image(self) -> None:
+        blank = Image.new("RGB", (200, 100), "white")
+        boxes = [{"left": 10, "top": 10, "width": 50, "height": 20}]
+        self.assertEqual(_sample_rendered_line_colors(blank, boxes), _per_line(blank, boxes))
+        self.assertEqual(_sample_rendered_line_colors(None, boxes), [("unknown", None, None, "unknown")])
+        self.assertEqual(_sample_rendered_line_colors(blank, []), [])
+
+    def test_falls_back_to_per_line_sampling_without_numpy(self) -> None:
+        image, pixel_bounds = generate_page(30, seed=5, width=400, height=300)
+        expected = _per_line(image, pixel_bounds)
+        with mock.patch.object(api_autodraft, "_NUMPY_AVAILABLE", False):
+            self.assertEqual(_sample_rendered_line_colors(image, pixel_bounds), expected)
+
+
+
+class TestMarkupInkRegions(unittest.TestCase):
+    CELL = api_autodraft._MARKUP_INK_CELL_PX
+
+    def _regions(self, image):  # type: ignore[no-untyped-def]
+        with mock.patch.object(
+            api_autodraft, "_merge_overlapping_pixel_boxes", wraps=api_autodraft._merge_overlapping_pixel_boxes
+        ) as merge:
+            regions = api_autodraft._markup_ink_regions(image, page_width=image.width, page_height=image.height)
+        return regions, merge.call_count
+
+    def test_single_cloud_is_cropped(self) -> None:
+        image = Image.new("RGB", (1200, 900), "white")
+        image.paste((235, 40, 40), (300, 300, 420, 360))
+        regions, merges = self._regions(image)
+        self.assertEqual(len(regions), 1)
+        self.assertEqual(merges, 1)
+
+    def test_speckled_page_bails_out_before_merging(self) -> None:
+        image = Image.new("RGB", (2400, 1800), "white")
+        spacing = self.CELL * 4
+        for left in range(0, image.width - self.CELL, spacing):
+            for top in range(0, image.height - self.CELL, spacing):
+                image.paste((40, 40, 235), (left + 5, top + 5, left + 20, top + 20))
+        regions, merges = self._regions(image)
+        self.assertEqual(regions, [])
+        self.assertEqual(merges, 0)
+
+    def test_heavily_inked_page_bails_out_before_clustering(self) -> None:
+        image = Image.new("RGB", (1200, 900), "white")
+        image.paste((235, 40, 40), (0, 0, 1200, 450))
+        # One large cluster: it would merge fine, but covers half the page.
+        regions, merges = self._regions(image)
+        self.assertEqual(regions, [])
+        self.assertEqual(merges, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
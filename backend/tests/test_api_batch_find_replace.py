@@ -2,12 +2,21 @@ from __future__ import annotations
 
 import io
 import json
+import threading
+import time
 import unittest
+from unittest import mock
 
 from flask import Flask
 from flask_limiter import Limiter
+from openpyxl import load_workbook
 
 from backend.route_groups.api_batch_find_replace import create_batch_find_replace_blueprint
+from backend.route_groups.api_batch_find_replace_jobs import (
+    DrawingJobRunner,
+    JobCapacityError,
+    drawing_concurrency_from_env,
+)
 
 
 class TestApiBatchFindReplace(unittest.TestCase):
@@ -16,7 +25,7 @@ class TestApiBatchFindReplace(unittest.TestCase):
         self.acade_actions: list[str] = []
         self.client = self._build_client()
 
-    def _build_client(self, *, send_autocad_dotnet_command=None, send_autocad_acade_command=None):
+    def _build_client(self, *, send_autocad_dotnet_command=None, send_autocad_acade_command=None, get_manager=None):
         app = Flask(__name__)
         app.config["TESTING"] = True
 
@@ -44,6 +53,7 @@ class TestApiBatchFindReplace(unittest.TestCase):
                 or self._send_autocad_dotnet_command,
                 send_autocad_acade_command=send_autocad_acade_command
                 or self._send_autocad_acade_command,
+                get_manager=get_manager,
             )
         )
         return app.test_client()
@@ -385,6 +395,37 @@ class TestApiBatchFindReplace(unittest.TestCase):
         self.assertFalse(payload.get("success", True))
         self.assertIn("not valid JSON", str(payload.get("message")))
 
+    def test_preview_applies_rules_in_order_across_files(self) -> None:
+        response = self.client.post(
+            "/api/batch-find-replace/preview",
+            headers={"X-API-Key": "valid-key"},
+            data={
+                "rules": json.dumps(
+                    [
+                        {"id": "rename", "find": "PNL-A", "replace": "PNL-B"},
+                        {"id": "expand", "find": r"PNL-(\w)", "replace": r"PANEL \1", "useRegex": True},
+                    ]
+                ),
+                "files": [
+                    (io.BytesIO(b"feeds PNL-A\r\nunchanged\r\n"), "one.txt"),
+                    (io.BytesIO(b"nothing to see"), "two.txt"),
+                ],
+            },
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json() or {}
+        self.assertEqual(payload.get("files_processed"), 2)
+        self.assertEqual(payload.get("files_changed"), 1)
+        self.assertEqual(payload.get("replacements"), 2)
+        self.assertEqual(
+            [(row["ruleId"], row["before"], row["after"]) for row in payload.get("matches") or []],
+            [("rename", "feeds PNL-A", "feeds PNL-B"), ("expand", "feeds PNL-B", "feeds PANEL B")],
+        )
+        self.assertFalse(payload.get("truncated"))
+        self.assertEqual([row["file"] for row in payload.get("file_timings") or []], ["one.txt", "two.txt"])
+        self.assertEqual([row["replacements"] for row in payload.get("file_timings") or []], [2, 0])
+
     def test_preview_rejects_invalid_regex_rule(self) -> None:
         response = self.client.post(
             "/api/batch-find-replace/preview",
@@ -457,7 +498,16 @@ class TestApiBatchFindReplace(unittest.TestCase):
         )
         self.assertIn("suite_batch_find_replace_apply", self.acade_actions)
         self.assertNotIn("suite_batch_find_replace_apply", self.bridge_actions)
+        workbook = load_workbook(io.BytesIO(response.get_data()))
         response.close()
+        changes = workbook["Changes"]
+        self.assertEqual(changes["A1"].value, "Batch Find & Replace Change Report")
+        self.assertEqual([cell.value for cell in changes[2]], ["File", "Line", "Rule ID", "Before", "After"])
+        self.assertEqual(changes.max_row, 3)
+        self.assertEqual(changes["C3"].value, "rule-1")
+        summary = workbook["Summary"]
+        self.assertEqual([summary["A3"].value, summary["B3"].value], ["Total changes", 1])
+        self.assertEqual(summary["A7"].value, "By File")
 
     def test_drawing_cleanup_preview_routes_to_acade_host(self) -> None:
         response = self.client.post(
@@ -603,5 +653,221 @@ class TestApiBatchFindReplace(unittest.TestCase):
         download.close()
 
 
+class FakeProgressManager:
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+
+    def publish_progress(self, **event) -> None:
+        self.events.append(event)
+
+
+class TestApiBatchFindReplaceProjectJobs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bridge_actions: list[str] = []
+        self.acade_actions: list[str] = []
+        self.calls: list[tuple[str, list[str]]] = []
+        self.failing_drawings: set[str] = set()
+        self.gate: threading.Event | None = None
+        self.manager = FakeProgressManager()
+        self.client = self._build_client(
+            send_autocad_acade_command=self._send_acade_command,
+            get_manager=lambda: self.manager,
+        )
+
+    _build_client = TestApiBatchFindReplace._build_client
+    _send_autocad_dotnet_command = TestApiBatchFindReplace._send_autocad_dotnet_command
+    _send_autocad_acade_command = TestApiBatchFindReplace._send_autocad_acade_command
+
+    def _send_acade_command(self, action: str, payload: dict):
+        drawings = [item["path"] for item in payload.get("drawings") or []] or [
+            str(match.get("drawingPath")) for match in payload.get("matches") or []
+        ]
+        self.calls.append((action, drawings))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if drawings[0] in self.failing_drawings:
+            return {"ok": True, "result": {"success": False, "code": "HOST_BUSY", "message": "Drawing is locked."}}
+        if action == "suite_batch_find_replace_project_preview":
+            data = {
+                "matches": [
+                    {"file": path.rsplit("/", 1)[-1], "ruleId": "rule-1", "before": "OLD", "after": "NEW", "drawingPath": path}
+                    for path in drawings
+                ]
+            }
+        else:
+            data = {
+                "updated": len(payload.get("matches") or []),
+                "changedDrawingCount": 1,
+                "changes": [
+                    {"file": str(match.get("file")), "ruleId": "rule-1", "before": "OLD", "after": "NEW"}
+                    for match in payload.get("matches") or []
+                ],
+            }
+        return {"ok": True, "result": {"success": True, "data": data, "warnings": [], "meta": {}}}
+
+    def _start_preview_job(self, paths: list[str]) -> str:
+        response = self.client.post(
+            "/api/batch-find-replace/cad/project-preview",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "rules": [{"id": "rule-1", "find": "OLD", "replace": "NEW"}],
+                "selectedDrawingPaths": paths,
+                "drawingRootPath": "/projects/demo",
+                "async": True,
+                "concurrency": 1,
+            },
+        )
+        self.assertEqual(response.status_code, 202)
+        payload = response.get_json() or {}
+        self.assertEqual(payload.get("totalDrawings"), len(paths))
+        return str(payload.get("jobId"))
+
+    def _wait_for_job(self, job_id: str, statuses: set[str]) -> dict:
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            job = self.client.get(
+                f"/api/batch-find-replace/cad/project-jobs/{job_id}",
+                headers={"X-API-Key": "valid-key"},
+            ).get_json() or {}
+            if job.get("status") in statuses:
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} did not reach {statuses}")
+
+    def test_preview_job_processes_each_drawing_and_streams_progress(self) -> None:
+        job_id = self._start_preview_job(["A-100.dwg", "A-101.dwg"])
+        job = self._wait_for_job(job_id, {"completed"})
+
+        self.assertEqual([len(drawings) for _, drawings in self.calls], [1, 1])
+        self.assertEqual(job["progress"], 100)
+        self.assertEqual(job["result"]["matchCount"], 2)
+        self.assertEqual([item["status"] for item in job["drawings"]], ["completed", "completed"])
+        self.assertTrue(all(event["run_id"] == job_id for event in self.manager.events))
+        self.assertEqual(self.manager.events[-1]["stage"], "completed")
+        self.assertIn("A-101.dwg", [event["current_item"] for event in self.manager.events])
+
+    def test_failed_job_resumes_without_redoing_completed_drawings(self) -> None:
+        self.failing_drawings = {"/projects/demo/A-101.dwg"}
+        job_id = self._start_preview_job(["A-100.dwg", "A-101.dwg", "A-102.dwg"])
+        failed = self._wait_for_job(job_id, {"failed"})
+        self.assertEqual(
+            [item["status"] for item in failed["drawings"]],
+            ["completed", "failed", "pending"],
+        )
+        self.assertEqual(failed["drawings"][1]["error"], "Drawing is locked.")
+        self.assertEqual(self.manager.events[-1]["stage"], "failed")
+
+        self.failing_drawings.clear()
+        resumed = self.client.post(
+            f"/api/batch-find-replace/cad/project-jobs/{job_id}/resume",
+            headers={"X-API-Key": "valid-key"},
+        )
+        self.assertEqual(resumed.status_code, 202)
+        job = self._wait_for_job(job_id, {"completed"})
+
+        processed = [drawings[0] for _, drawings in self.calls]
+        self.assertEqual(processed.count("/projects/demo/A-100.dwg"), 1)
+        self.assertEqual(processed.count("/projects/demo/A-101.dwg"), 2)
+        self.assertEqual(job["attempts"], 2)
+        self.assertEqual(job["result"]["matchCount"], 3)
+
+    def test_cancel_skips_remaining_drawings_and_apply_job_builds_report(self) -> None:
+        self.gate = threading.Event()
+        job_id = self._start_preview_job(["A-100.dwg", "A-101.dwg"])
+        cancel = self.client.post(
+            f"/api/batch-find-replace/cad/project-jobs/{job_id}/cancel",
+            headers={"X-API-Key": "valid-key"},
+        )
+        self.assertEqual(cancel.status_code, 200)
+        self.gate.set()
+        cancelled = self._wait_for_job(job_id, {"cancelled"})
+        self.assertIn("pending", [item["status"] for item in cancelled["drawings"]])
+
+        self.gate = None
+        response = self.client.post(
+            "/api/batch-find-replace/cad/project-apply",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "async": True,
+                "matches": [
+                    {"file": "A-100.dwg", "drawingPath": "/projects/demo/A-100.dwg", "ruleId": "rule-1"},
+                    {"file": "A-100.dwg", "drawingPath": "/projects/demo/A-100.dwg", "ruleId": "rule-1"},
+                    {"file": "A-101.dwg", "drawingPath": "/projects/demo/A-101.dwg", "ruleId": "rule-1"},
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, 202)
+        apply_job = self._wait_for_job(str((response.get_json() or {}).get("jobId")), {"completed"})
+        self.assertEqual(apply_job["totalDrawings"], 2)
+        self.assertEqual(apply_job["result"]["updated"], 3)
+        self.assertEqual(apply_job["result"]["changedDrawingCount"], 2)
+        self.assertTrue(apply_job["result"]["downloadUrl"].startswith("/api/batch-find-replace/reports/"))
+
+    def test_host_calls_never_overlap_even_with_higher_concurrency(self) -> None:
+        active = []
+        busy_errors = []
+
+        def single_instance_host(action: str, payload: dict):
+            # Mirrors the ACADE pipe host: a second client gets "pipe busy".
+            if active:
+                busy_errors.append(action)
+                raise RuntimeError("Named pipe is busy.")
+            active.append(action)
+            try:
+                time.sleep(0.02)
+                return self._send_acade_command(action, payload)
+            finally:
+                active.pop()
+
+        client = self._build_client(send_autocad_acade_command=single_instance_host)
+        response = client.post(
+            "/api/batch-find-replace/cad/project-preview",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "rules": [{"id": "rule-1", "find": "OLD", "replace": "NEW"}],
+                "selectedDrawingPaths": ["A-100.dwg", "A-101.dwg", "A-102.dwg", "A-103.dwg"],
+                "drawingRootPath": "/projects/demo",
+                "async": True,
+                "concurrency": 4,
+            },
+        )
+        self.assertEqual(response.status_code, 202)
+        self.client = client
+        job = self._wait_for_job(str((response.get_json() or {}).get("jobId")), {"completed", "failed"})
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(busy_errors, [])
+        self.assertEqual(len(self.calls), 4)
+
+    def test_default_concurrency_is_one_drawing_at_a_time(self) -> None:
+        with mock.patch.dict("os.environ", {"BATCH_FIND_REPLACE_PROJECT_CONCURRENCY": ""}):
+            self.assertEqual(drawing_concurrency_from_env(), 1)
+
+    def test_job_capacity_is_reported_as_429(self) -> None:
+        with mock.patch.object(
+            DrawingJobRunner,
+            "submit",
+            side_effect=JobCapacityError("Too many batch find/replace jobs are active."),
+        ):
+            response = self.client.post(
+                "/api/batch-find-replace/cad/project-preview",
+                headers={"X-API-Key": "valid-key"},
+                json={
+                    "rules": [{"id": "rule-1", "find": "OLD", "replace": "NEW"}],
+                    "selectedDrawingPaths": ["A-100.dwg"],
+                    "drawingRootPath": "/projects/demo",
+                    "async": True,
+                },
+            )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Too many batch find/replace jobs are active.", response.get_data(as_text=True))
+
+    def test_unknown_job_returns_404(self) -> None:
+        response = self.client.get(
+            "/api/batch-find-replace/cad/project-jobs/missing",
+            headers={"X-API-Key": "valid-key"},
+        )
+        self.assertEqual(response.status_code, 404)
+
 if __name__ == "__main__":
     unittest.main()
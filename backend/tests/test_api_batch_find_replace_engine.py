@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+import unittest
+from unittest import mock
+
+from backend.route_groups import api_batch_find_replace_engine as engine
+from backend.route_groups.api_batch_find_replace_engine import CompiledRuleSet, run_batch_files
+
+
+def make_rule(rule_id: str, find: str, replace: str, *, use_regex: bool = False, match_case: bool = False) -> dict:
+    return {"id": rule_id, "find": find, "replace": replace, "use_regex": use_regex, "match_case": match_case}
+
+
+def sequential_reference(raw_bytes: bytes, rules: list[dict], file_name: str, match_limit: int) -> dict:
+    # Whole-file decode followed by one full line pass per rule.
+    content = None
+    for encoding in ("utf-8", "utf-16", "latin-1"):
+        try:
+            content = raw_bytes.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    line_break = "\r\n" if "\r\n" in content else "\n"
+    lines = content.splitlines()
+    matches: list[dict] = []
+    replacements = 0
+    for rule in rules:
+        flags = 0 if rule["match_case"] else re.IGNORECASE
+        source = rule["find"] if rule["use_regex"] else re.escape(rule["find"])
+        pattern = re.compile(source, flags)
+        next_lines = []
+        for line_number, line in enumerate(lines, start=1):
+            updated, count = pattern.subn(rule["replace"], line)
+            if count:
+                replacements += count
+                if len(matches) < match_limit:
+                    matches.append(
+                        {
+                            "file": file_name,
+                            "line": line_number,
+                            "before": line[:500],
+                            "after": updated[:500],
+                            "ruleId": rule["id"],
+                        }
+                    )
+            next_lines.append(updated)
+        lines = next_lines
+    return {"matches": matches, "replacements": replacements, "content": line_break.join(lines)}
+
+
+class TestCompiledRuleSet(unittest.TestCase):
+    def assert_matches_reference(self, raw_bytes: bytes, rules: list[dict], *, match_limit: int = 500) -> None:
+        rule_set = CompiledRuleSet(rules)
+        expected = sequential_reference(raw_bytes, rules, "demo.txt", match_limit)
+        for chunk_size in (1, 3, 7, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                result = rule_set.process_stream(
+                    io.BytesIO(raw_bytes),
+                    file_name="demo.txt",
+                    keep_content=True,
+                    match_limit=match_limit,
+                    chunk_size=chunk_size,
+                )
+                self.assertEqual(result, expected)
+
+    def test_chained_rules_keep_sequential_semantics(self) -> None:
+        rules = [
+            make_rule("r1", "PNL-A", "PNL-B"),
+            make_rule("r2", "pnl-b", "PNL-C", match_case=True),
+            make_rule("r3", "PNL-B", "PANEL B"),
+            make_rule("r4", r"CKT-(\d+)", r"CIRCUIT \1", use_regex=True),
+            make_rule("r5", "CIRCUIT", "CCT", match_case=True),
+            make_rule("r6", "panel", "PNL"),
+        ]
+        raw = "PNL-A feeds CKT-12\r\nno change here\r\npnl-a and pnl-b\r\n\r\nCKT-7 panel\r\n".encode("utf-8")
+        self.assert_matches_reference(raw, rules)
+
+    def test_overlapping_literals_and_unusual_line_breaks(self) -> None:
+        rules = [
+            make_rule("r1", "abc", "x"),
+            make_rule("r2", "bcd", "y"),
+            make_rule("r3", "ab", "z", match_case=True),
+            make_rule("r4", "^x", "start", use_regex=True),
+            make_rule("r5", "(?x) b c d  # verbose", "Q", use_regex=True, match_case=True),
+        ]
+        text = "abcd\rab abcd\x0cbcd\n\nABCD\r\n\x85tail-abc"
+        self.assert_matches_reference(text.encode("utf-8"), rules)
+
+    def test_falls_back_to_utf16_and_latin1_like_a_whole_file_decode(self) -> None:
+        rules = [make_rule("r1", "caf", "CAF"), make_rule("r2", "é", "e")]
+        self.assert_matches_reference("café\nplain café\n".encode("latin-1"), rules)
+        self.assert_matches_reference("éé".encode("latin-1") + b"caf", rules)
+
+    def test_match_rows_stay_rule_major_and_respect_the_limit(self) -> None:
+        rules = [make_rule("r1", "a", "b"), make_rule("r2", "b", "c")]
+        raw = ("a\n" * 20).encode("utf-8")
+        self.assert_matches_reference(raw, rules, match_limit=25)
+        result = CompiledRuleSet(rules).process_stream(
+            io.BytesIO(raw), file_name="demo.txt", keep_content=False, match_limit=25
+        )
+        self.assertEqual([row["ruleId"] for row in result["matches"]], ["r1"] * 20 + ["r2"] * 5)
+        self.assertEqual(result["replacements"], 40)
+        self.assertIsNone(result["content"])
+
+    def test_rejects_binary_and_invalid_regex(self) -> None:
+        rule_set = CompiledRuleSet([make_rule("r1", "a", "b")])
+        with self.assertRaisesRegex(ValueError, "Binary files are not supported"):
+            rule_set.process_stream(
+                io.BytesIO(b"text\n" * 10 + b"\x00"), file_name="x.bin", keep_content=False, match_limit=10, chunk_size=4
+            )
+        with self.assertRaisesRegex(ValueError, "Invalid regex for rule 'bad'"):
+            CompiledRuleSet([make_rule("bad", "(", "x", use_regex=True)])
+
+
+class TestRunBatchFiles(unittest.TestCase):
+    rules = [make_rule("r1", "PNL-1", "PNL-2"), make_rule("r2", r"CKT-(\d)\b", r"CKT-0\1", use_regex=True)]
+
+    def _files(self) -> list[tuple[str, io.BytesIO]]:
+        return [
+            (f"file-{index}.txt", io.BytesIO(f"PNL-1 CKT-{index % 10}\nspare\n".encode("utf-8") * (index + 1)))
+            for index in range(6)
+        ]
+
+    def _strip_timings(self, run: dict) -> dict:
+        return {**run, "files": [{k: v for k, v in item.items() if k != "durationMs"} for item in run["files"]]}
+
+    def test_parallel_run_matches_sequential_order_and_output(self) -> None:
+        rule_set = CompiledRuleSet(self.rules)
+        sequential = run_batch_files(
+            rule_set, self._files(), keep_content=True, match_limit=15, stop_at_match_limit=False, parallel=False
+        )
+        with mock.patch.dict("os.environ", {"BATCH_FIND_REPLACE_MAX_WORKERS": "2"}), mock.patch.object(
+            engine, "MIN_PARALLEL_BATCH_BYTES", 0
+        ):
+            parallel = run_batch_files(
+                rule_set, self._files(), keep_content=True, match_limit=15, stop_at_match_limit=False
+            )
+
+        self.assertFalse(sequential["parallel"])
+        self.assertTrue(parallel["parallel"])
+        self.assertEqual(parallel["workers"], 2)
+        self.assertEqual(len(parallel["matches"]), 15)
+        self.assertEqual(
+            {**self._strip_timings(parallel), "parallel": False, "workers": 1},
+            self._strip_timings(sequential),
+        )
+        self.assertTrue(all(item["durationMs"] >= 0 for item in parallel["files"]))
+
+    def test_preview_stops_after_the_file_that_fills_the_match_limit(self) -> None:
+        run = run_batch_files(
+            CompiledRuleSet(self.rules),
+            self._files(),
+            keep_content=False,
+            match_limit=5,
+            stop_at_match_limit=True,
+            parallel=False,
+        )
+
+        self.assertTrue(run["truncated"])
+        self.assertEqual([item["file"] for item in run["files"]], ["file-0.txt", "file-1.txt"])
+        self.assertEqual(len(run["matches"]), 5)
+
+    def test_large_uploads_are_spooled_to_workers_instead_of_read_into_memory(self) -> None:
+        rule_set = CompiledRuleSet(self.rules)
+        sequential = run_batch_files(
+            rule_set, self._files(), keep_content=True, match_limit=50, stop_at_match_limit=False, parallel=False
+        )
+        submitted_sources = []
+        real_get_pool = engine._BATCH_POOL.get
+
+        def recording_pool(max_workers):
+            pool = real_get_pool(max_workers)
+            real_submit = pool.submit
+
+            def submit(fn, *args):
+                submitted_sources.append(args[2])
+                return real_submit(fn, *args)
+
+            return mock.Mock(submit=submit)
+
+        with mock.patch.dict("os.environ", {"BATCH_FIND_REPLACE_MAX_WORKERS": "2"}), mock.patch.object(
+            engine, "MIN_PARALLEL_BATCH_BYTES", 0
+        ), mock.patch.object(engine, "MAX_INLINE_WORKER_BYTES", 40), mock.patch.object(
+            engine._BATCH_POOL, "get", side_effect=recording_pool
+        ):
+            parallel = run_batch_files(
+                rule_set, self._files(), keep_content=True, match_limit=50, stop_at_match_limit=False
+            )
+
+        self.assertTrue(parallel["parallel"])
+        self.assertIsInstance(submitted_sources[0], bytes)
+        self.assertTrue(all(isinstance(source, str) for source in submitted_sources[2:]))
+        self.assertFalse(any(os.path.exists(source) for source in submitted_sources if isinstance(source, str)))
+        self.assertEqual(
+            {**self._strip_timings(parallel), "parallel": False, "workers": 1},
+            self._strip_timings(sequential),
+        )
+
+if __name__ == "__main__":
+    unittest.main()
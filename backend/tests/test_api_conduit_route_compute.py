@@ -1,11 +1,39 @@
 from __future__ import annotations
 
 import unittest
+from unittest import mock
 
-from backend.route_groups.api_conduit_route_compute import compute_conduit_route
+from backend.route_groups import api_conduit_route_compute as route_compute
+from backend.route_groups.api_conduit_route_compute import (
+    compute_conduit_route,
+    compute_conduit_route_batch,
+)
+
+
+def _mixed_obstacle_payload() -> dict:
+    return {
+        "start": {"x": 36, "y": 40},
+        "end": {"x": 930, "y": 500},
+        "mode": "plan_view",
+        "clearance": 14,
+        "canvasWidth": 980,
+        "canvasHeight": 560,
+        "gridStep": 7.5,
+        "obstacles": [
+            {"id": "FNDN-1", "type": "foundation", "x": 180, "y": 60, "w": 120, "h": 260},
+            {"id": "TR-1", "type": "trench", "x": 60, "y": 400, "w": 820, "h": 24},
+            {"id": "PAD-1", "type": "equipment_pad", "x": 480, "y": 220, "w": 90, "h": 300},
+            {"id": "FENCE-1", "type": "fence", "x": 0, "y": 0, "w": 980, "h": 4},
+            {"id": "BLDG-1", "type": "building", "x": 640, "y": 20, "w": 160, "h": 140},
+            {"id": "TR-2", "type": "trench", "x": 600, "y": 180, "w": 20, "h": 300},
+        ],
+    }
 
 
 class TestApiConduitRouteCompute(unittest.TestCase):
+    def setUp(self) -> None:
+        route_compute.clear_cost_grid_cache()
+
     def test_compute_route_success(self) -> None:
         payload = {
             "start": {"x": 52, "y": 82},
@@ -93,6 +121,483 @@ class TestApiConduitRouteCompute(unittest.TestCase):
         self.assertFalse(result["meta"]["routeValid"])
         self.assertFalse(result["meta"]["fallbackUsed"])
 
+    def test_compute_route_rejects_unknown_engine(self) -> None:
+        payload = _mixed_obstacle_payload()
+        payload["engine"] = "gpu"
+
+        result = compute_conduit_route(payload)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "INVALID_REQUEST")
+
+    @unittest.skipUnless(route_compute._NUMPY_AVAILABLE, "numpy is not installed")
+    def test_numpy_cost_grid_matches_list_grid(self) -> None:
+        for mode in ("plan_view", "schematic"):
+            kwargs = {
+                "obstacles": route_compute._parse_obstacles(_mixed_obstacle_payload()["obstacles"], []),
+                "clearance": 14.0,
+                "mode": mode,
+                "canvas_width": 980.0,
+                "canvas_height": 560.0,
+                "grid_step": 7.5,
+            }
+            grid, cols, rows = route_compute._build_cost_grid(**kwargs)
+            numpy_grid, numpy_cols, numpy_rows = route_compute._build_cost_grid_numpy(**kwargs)
+
+            self.assertEqual((cols, rows), (numpy_cols, numpy_rows))
+            self.assertEqual(numpy_grid.tolist(), grid)
+
+    @unittest.skipUnless(route_compute._NUMPY_AVAILABLE, "numpy is not installed")
+    def test_numpy_engine_returns_same_route_payload(self) -> None:
+        for mode in ("plan_view", "cable_tag", "schematic"):
+            payload = _mixed_obstacle_payload()
+            payload["mode"] = mode
+            payload["tagText"] = "AC-001"
+
+            python_result = compute_conduit_route(dict(payload, engine="python"))
+            numpy_result = compute_conduit_route(dict(payload, engine="numpy"))
+
+            self.assertTrue(numpy_result["success"])
+            self.assertEqual(numpy_result["meta"]["engine"], "numpy")
+            self.assertEqual(python_result["meta"]["engine"], "python")
+            self.assertEqual(numpy_result["data"], python_result["data"])
+            for key in ("iterations", "visitedNodes", "gridCols", "gridRows"):
+                self.assertEqual(numpy_result["meta"][key], python_result["meta"][key])
+
+    @unittest.skipUnless(route_compute._NUMPY_AVAILABLE, "numpy is not installed")
+    def test_numpy_engine_reports_blocked_grid(self) -> None:
+        payload = {
+            "start": {"x": 20, "y": 20},
+            "end": {"x": 940, "y": 520},
+            "clearance": 0,
+            "engine": "numpy",
+            "obstacles": [{"id": "BLOCK-ALL", "type": "foundation", "x": 0, "y": 0, "w": 980, "h": 560}],
+        }
+
+        result = compute_conduit_route(payload)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "ROUTE_BLOCKED")
+        self.assertEqual(result["meta"]["engine"], "numpy")
+
+    def test_numpy_engine_falls_back_when_numpy_missing(self) -> None:
+        payload = _mixed_obstacle_payload()
+        payload["engine"] = "numpy"
+
+        with mock.patch.object(route_compute, "_NUMPY_AVAILABLE", False):
+            result = compute_conduit_route(payload)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["meta"]["engine"], "python")
+        self.assertEqual(result["meta"]["engineRequested"], "numpy")
+        self.assertTrue(any("numpy" in warning for warning in result["warnings"]))
+
+    def test_compute_route_rejects_unknown_search_mode(self) -> None:
+        payload = _mixed_obstacle_payload()
+        payload["search"] = "jps"
+
+        result = compute_conduit_route(payload)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "INVALID_REQUEST")
+        self.assertIn("search", result["message"])
+
+    def test_bidirectional_search_returns_route_clear_of_hard_obstacles(self) -> None:
+        for engine in ("python", "numpy"):
+            payload = _mixed_obstacle_payload()
+            payload["engine"] = engine
+            payload["search"] = "bidirectional"
+
+            result = compute_conduit_route(payload)
+            astar = compute_conduit_route(dict(payload, search="astar"))
+
+            self.assertTrue(result["success"])
+            self.assertEqual(result["meta"]["searchMode"], "bidirectional")
+            self.assertEqual(astar["meta"]["searchMode"], "astar")
+            path = result["data"]["path"]
+            self.assertEqual(path[0], payload["start"])
+            self.assertEqual(path[-1], payload["end"])
+            for a, b in zip(path[1:-2], path[2:-1]):
+                self.assertTrue(a["x"] == b["x"] or a["y"] == b["y"])
+            self.assertLessEqual(result["data"]["length"], astar["data"]["length"] * 1.25)
+
+            grid, cols, rows = route_compute._build_cost_grid(
+                obstacles=route_compute._parse_obstacles(payload["obstacles"], []),
+                clearance=14.0,
+                mode="plan_view",
+                canvas_width=980.0,
+                canvas_height=560.0,
+                grid_step=7.5,
+            )
+            cells = route_compute._path_cells(path, grid_step=7.5, cols=cols, rows=rows)
+            self.assertTrue(all(grid[y][x] < 999 for x, y in cells))
+
+    def test_bidirectional_search_visits_fewer_cells_on_long_open_route(self) -> None:
+        payload = {
+            "start": {"x": 20, "y": 20},
+            "end": {"x": 2380, "y": 2380},
+            "canvasWidth": 2400,
+            "canvasHeight": 2400,
+            "gridStep": 8,
+            "obstacles": [{"id": "PAD-1", "type": "equipment_pad", "x": 900, "y": 900, "w": 300, "h": 300}],
+        }
+
+        astar = compute_conduit_route(dict(payload, search="astar"))
+        bidirectional = compute_conduit_route(dict(payload, search="bidirectional"))
+
+        self.assertTrue(astar["success"])
+        self.assertTrue(bidirectional["success"])
+        self.assertLess(bidirectional["meta"]["visitedNodes"] * 10, astar["meta"]["visitedNodes"])
+        self.assertLessEqual(bidirectional["data"]["bendCount"], astar["data"]["bendCount"])
+
+    def test_bidirectional_search_reports_blocked_grid(self) -> None:
+        payload = {
+            "start": {"x": 20, "y": 20},
+            "end": {"x": 940, "y": 520},
+            "clearance": 0,
+            "search": "bidirectional",
+            "obstacles": [{"id": "WALL-1", "type": "building", "x": 400, "y": -20, "w": 40, "h": 620}],
+        }
+
+        result = compute_conduit_route(payload)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "ROUTE_BLOCKED")
+        self.assertEqual(result["meta"]["searchMode"], "bidirectional")
+
+    def test_hierarchical_search_refines_inside_coarse_corridor(self) -> None:
+        for engine in ("python", "numpy"):
+            payload = _mixed_obstacle_payload()
+            payload["engine"] = engine
+            payload["search"] = "hierarchical"
+
+            result = compute_conduit_route(payload)
+            astar = compute_conduit_route(dict(payload, search="astar"))
+
+            self.assertTrue(result["success"])
+            self.assertEqual(result["meta"]["searchMode"], "hierarchical")
+            hierarchical = result["meta"]["hierarchical"]
+            self.assertFalse(hierarchical["fullGridFallback"])
+            self.assertTrue(hierarchical["coarseRouteValid"])
+            self.assertEqual(hierarchical["coarseFactor"], 2)
+            self.assertGreater(hierarchical["corridorCells"], 0)
+            self.assertLessEqual(result["data"]["length"], astar["data"]["length"] * 1.25)
+            self.assertIsNone(astar["meta"]["hierarchical"])
+
+    def test_hierarchical_search_falls_back_to_full_grid_when_corridor_fails(self) -> None:
+        # A one-cell wall stays open on the pooled grid, so the coarse route
+        # runs straight through it and the corridor cannot reach the gap below.
+        payload = {
+            "start": {"x": 20, "y": 40},
+            "end": {"x": 940, "y": 40},
+            "clearance": 0,
+            "gridStep": 8,
+            "search": "hierarchical",
+            "obstacles": [{"id": "WALL-1", "type": "building", "x": 480, "y": -20, "w": 1, "h": 520}],
+        }
+
+        result = compute_conduit_route(payload)
+
+        self.assertTrue(result["success"])
+        self.assertTrue(result["meta"]["hierarchical"]["fullGridFallback"])
+        self.assertTrue(any("full grid" in warning for warning in result["warnings"]))
+        self.assertGreater(max(point["y"] for point in result["data"]["path"]), 500)
+
+    def test_hierarchical_search_reports_blocked_grid(self) -> None:
+        payload = {
+            "start": {"x": 20, "y": 20},
+            "end": {"x": 940, "y": 520},
+            "clearance": 0,
+            "search": "hierarchical",
+            "obstacles": [{"id": "WALL-1", "type": "building", "x": 400, "y": -20, "w": 40, "h": 620}],
+        }
+
+        result = compute_conduit_route(payload)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "ROUTE_BLOCKED")
+        self.assertFalse(result["meta"]["hierarchical"]["coarseRouteValid"])
+        self.assertTrue(result["meta"]["hierarchical"]["fullGridFallback"])
+
+    @unittest.skipUnless(route_compute._NUMPY_AVAILABLE, "numpy is not installed")
+    def test_pooled_grid_matches_between_engines(self) -> None:
+        kwargs = {
+            "obstacles": route_compute._parse_obstacles(_mixed_obstacle_payload()["obstacles"], []),
+            "clearance": 14.0,
+            "mode": "plan_view",
+            "canvas_width": 980.0,
+            "canvas_height": 560.0,
+            "grid_step": 7.5,
+        }
+        grid, cols, rows = route_compute._build_cost_grid(**kwargs)
+        numpy_grid, _, _ = route_compute._build_cost_grid_numpy(**kwargs)
+
+        for factor in (2, 3, 4):
+            pooled = route_compute._pool_cost_grid(grid, cols, rows, factor)
+            self.assertEqual(route_compute._pool_cost_grid(numpy_grid, cols, rows, factor), pooled)
+            self.assertEqual(len(pooled[0]), pooled[2])
+            self.assertEqual(len(pooled[0][0]), pooled[1])
+
+    def test_search_window_culls_obstacles_and_matches_full_canvas_route(self) -> None:
+        obstacles = [
+            {"id": f"FAR-{index}", "type": "foundation", "x": 2400 + index * 60, "y": 2400, "w": 30, "h": 30}
+            for index in range(20)
+        ]
+        obstacles.append({"id": "NEAR-1", "type": "building", "x": 300, "y": 140, "w": 80, "h": 200})
+        obstacles.append({"id": "TR-1", "type": "trench", "x": 180, "y": 380, "w": 300, "h": 20})
+        payload = {
+            "start": {"x": 200, "y": 200},
+            "end": {"x": 520, "y": 300},
+            "canvasWidth": 4000,
+            "canvasHeight": 4000,
+            "gridStep": 8,
+            "obstacles": obstacles,
+        }
+
+        full = compute_conduit_route(payload)
+        windowed = compute_conduit_route(dict(payload, searchMargin=200))
+
+        self.assertTrue(windowed["success"])
+        self.assertIsNone(full["meta"]["searchWindow"])
+        window = windowed["meta"]["searchWindow"]
+        self.assertEqual(window["obstacleCount"], 2)
+        self.assertEqual(window["culledObstacleCount"], 20)
+        self.assertFalse(window["fullCanvasFallback"])
+        self.assertEqual(window["x"] % 8, 0)
+        self.assertLess(windowed["meta"]["gridCols"] * windowed["meta"]["gridRows"], 100 * 100)
+        self.assertEqual(windowed["data"], full["data"])
+
+    def test_search_window_falls_back_to_full_canvas_when_route_leaves_window(self) -> None:
+        payload = {
+            "start": {"x": 200, "y": 300},
+            "end": {"x": 600, "y": 300},
+            "canvasWidth": 2000,
+            "canvasHeight": 2000,
+            "gridStep": 8,
+            "clearance": 0,
+            "searchMargin": 100,
+            "obstacles": [{"id": "WALL-1", "type": "building", "x": 400, "y": 0, "w": 16, "h": 900}],
+        }
+
+        result = compute_conduit_route(payload)
+
+        self.assertTrue(result["success"])
+        self.assertTrue(result["meta"]["searchWindow"]["fullCanvasFallback"])
+        self.assertTrue(any("search window" in warning for warning in result["warnings"]))
+        self.assertGreater(max(point["y"] for point in result["data"]["path"]), 900)
+
+    def test_second_route_on_same_obstacles_skips_grid_build(self) -> None:
+        first = _mixed_obstacle_payload()
+        second = _mixed_obstacle_payload()
+        second["start"] = {"x": 900, "y": 40}
+        second["end"] = {"x": 40, "y": 520}
+        # Ids and labels do not change the grid, so they must not change the key.
+        second["obstacles"][0]["id"] = "FNDN-RENAMED"
+
+        first_result = compute_conduit_route(first)
+        with mock.patch.object(
+            route_compute,
+            "_build_cost_grid",
+            side_effect=AssertionError("grid should come from cache"),
+        ):
+            second_result = compute_conduit_route(second)
+
+        self.assertFalse(first_result["meta"]["gridCache"]["hit"])
+        self.assertTrue(second_result["success"])
+        self.assertTrue(second_result["meta"]["gridCache"]["hit"])
+        self.assertEqual(second_result["meta"]["gridCache"]["hits"], 1)
+        self.assertEqual(second_result["meta"]["gridCache"]["misses"], 1)
+
+    def test_grid_cache_key_tracks_grid_inputs(self) -> None:
+        payload = _mixed_obstacle_payload()
+        compute_conduit_route(payload)
+
+        for field, value in (("clearance", 20), ("mode", "schematic"), ("gridStep", 8), ("canvasWidth", 1200)):
+            changed = _mixed_obstacle_payload()
+            changed[field] = value
+            result = compute_conduit_route(changed)
+            self.assertFalse(result["meta"]["gridCache"]["hit"], field)
+
+        moved = _mixed_obstacle_payload()
+        moved["obstacles"][1]["y"] = 402
+        self.assertFalse(compute_conduit_route(moved)["meta"]["gridCache"]["hit"])
+
+    def test_grid_cache_can_be_bypassed_per_request(self) -> None:
+        payload = _mixed_obstacle_payload()
+        compute_conduit_route(payload)
+        payload["gridCache"] = False
+
+        result = compute_conduit_route(payload)
+
+        self.assertEqual(result["meta"]["gridCache"], {"enabled": False, "hit": False})
+
+    def test_grid_cache_evicts_least_recently_used_by_size(self) -> None:
+        cache = route_compute._CostGridCache(max_bytes=2 * (56 + 4 * 8) * 4)
+        small_grid = [[0.0] * 4 for _ in range(4)]
+        cache.put("a", small_grid, 4, 4)
+        cache.put("b", small_grid, 4, 4)
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", small_grid, 4, 4)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], stats["maxBytes"])
+
+        cache.put("huge", [[0.0] * 64 for _ in range(64)], 64, 64)
+        self.assertIsNone(cache.get("huge"))
+
+    def _batch_payload(self, **overrides) -> dict:
+        payload = _mixed_obstacle_payload()
+        payload.pop("start")
+        payload.pop("end")
+        payload["mode"] = "cable_tag"
+        payload["routes"] = [
+            {"id": f"DC-00{index}", "start": {"x": 36, "y": 40 + index * 8}, "end": {"x": 930, "y": 500}, "tagText": f"DC-00{index}"}
+            for index in range(1, 6)
+        ]
+        payload.update(overrides)
+        return payload
+
+    def test_batch_matches_single_route_results_in_request_order(self) -> None:
+        payload = self._batch_payload(parallel=False)
+
+        result = compute_conduit_route_batch(payload)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["code"], "")
+        self.assertEqual(result["data"]["routedCount"], 5)
+        self.assertEqual([route["id"] for route in result["data"]["routes"]], [f"DC-00{index}" for index in range(1, 6)])
+        self.assertEqual(result["meta"]["gridCache"]["misses"], 1)
+        for route, request in zip(result["data"]["routes"], payload["routes"]):
+            single = compute_conduit_route(
+                {**_mixed_obstacle_payload(), "mode": "cable_tag", **request}
+            )
+            self.assertEqual(route["data"], single["data"])
+            self.assertEqual(route["meta"]["iterations"], single["meta"]["iterations"])
+
+    def test_batch_parallel_solve_matches_sequential(self) -> None:
+        sequential = compute_conduit_route_batch(self._batch_payload(parallel=False))
+        with mock.patch.dict("os.environ", {"CONDUIT_ROUTE_BATCH_MAX_WORKERS": "2"}):
+            parallel = compute_conduit_route_batch(self._batch_payload())
+
+        self.assertTrue(parallel["meta"]["parallel"] or parallel["warnings"])
+        self.assertEqual(
+            [route["data"] for route in parallel["data"]["routes"]],
+            [route["data"] for route in sequential["data"]["routes"]],
+        )
+
+    def test_batch_parallel_solve_shares_the_grid_for_both_engines(self) -> None:
+        published = []
+        real_publish = route_compute._publish_grid
+
+        def recording_publish(grid, cols, rows):
+            handle = real_publish(grid, cols, rows)
+            published.append(handle)
+            return handle
+
+        for engine in ("python", "numpy"):
+            with self.subTest(engine=engine):
+                sequential = compute_conduit_route_batch(self._batch_payload(parallel=False, engine=engine))
+                with mock.patch.dict("os.environ", {"CONDUIT_ROUTE_BATCH_MAX_WORKERS": "2"}), mock.patch.object(
+                    route_compute, "_publish_grid", side_effect=recording_publish
+                ):
+                    parallel = compute_conduit_route_batch(self._batch_payload(engine=engine))
+
+                self.assertTrue(parallel["meta"]["parallel"], parallel.get("warnings"))
+                self.assertEqual(
+                    [route["data"] for route in parallel["data"]["routes"]],
+                    [route["data"] for route in sequential["data"]["routes"]],
+                )
+        self.assertEqual(len(published), 2)
+
+    def test_published_grid_is_unlinked_after_the_batch(self) -> None:
+        grid = [[0.0, 1.5, 999.0], [2.0, -0.55, 0.0]]
+        with route_compute._publish_grid(grid, 3, 2) as shared:
+            self.assertFalse(shared.as_array)
+            block = route_compute._attach_shared_grid(shared.name)
+            try:
+                cells = block.buf.cast("d")
+                self.assertEqual(cells[:6].tolist(), [0.0, 1.5, 999.0, 2.0, -0.55, 0.0])
+                cells.release()
+            finally:
+                block.close()
+        with self.assertRaises(FileNotFoundError):
+            route_compute._attach_shared_grid(shared.name)
+
+    def test_batch_uses_requested_search_mode(self) -> None:
+        payload = self._batch_payload(parallel=False)
+        payload["search"] = "bidirectional"
+
+        result = compute_conduit_route_batch(payload)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["meta"]["searchMode"], "bidirectional")
+        self.assertEqual(result["data"]["routedCount"], 5)
+
+    def test_batch_falls_back_to_sequential_when_pool_unavailable(self) -> None:
+        with mock.patch.dict("os.environ", {"CONDUIT_ROUTE_BATCH_MAX_WORKERS": "2"}), mock.patch.object(
+            route_compute._BATCH_POOL,
+            "get",
+            side_effect=OSError("process pool unavailable"),
+        ):
+            result = compute_conduit_route_batch(self._batch_payload())
+
+        self.assertTrue(result["success"])
+        self.assertFalse(result["meta"]["parallel"])
+        self.assertEqual(result["data"]["routedCount"], 5)
+        self.assertTrue(any("sequentially" in warning for warning in result["warnings"]))
+
+    def test_batch_congestion_spreads_parallel_routes(self) -> None:
+        routes = [
+            {"id": f"C{index}", "start": {"x": 40, "y": 280}, "end": {"x": 940, "y": 280}}
+            for index in range(3)
+        ]
+        base = {"routes": routes, "obstacles": [], "parallel": False}
+
+        stacked = compute_conduit_route_batch(base)
+        spread = compute_conduit_route_batch({**base, "congestion": True})
+
+        stacked_paths = [route["data"]["path"] for route in stacked["data"]["routes"]]
+        spread_paths = [route["data"]["path"] for route in spread["data"]["routes"]]
+        self.assertEqual(stacked_paths[0], stacked_paths[1])
+        self.assertEqual(spread_paths[0], stacked_paths[0])
+        self.assertNotEqual(spread_paths[1], spread_paths[0])
+        self.assertTrue(spread["meta"]["congestion"])
+        # Congestion writes must not leak into the shared cached grid.
+        again = compute_conduit_route_batch(base)
+        self.assertEqual([route["data"]["path"] for route in again["data"]["routes"]], stacked_paths)
+
+    def test_batch_reports_partial_blocked_routes(self) -> None:
+        payload = {
+            "routes": [
+                {"id": "OPEN", "start": {"x": 20, "y": 20}, "end": {"x": 200, "y": 20}},
+                {"id": "BOXED", "start": {"x": 20, "y": 20}, "end": {"x": 600, "y": 300}},
+            ],
+            "clearance": 0,
+            "obstacles": [{"id": "KEEPOUT", "type": "foundation", "x": 500, "y": 200, "w": 200, "h": 200}],
+            "parallel": False,
+        }
+
+        result = compute_conduit_route_batch(payload)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["code"], "PARTIAL_ROUTE_BLOCKED")
+        self.assertEqual(result["data"]["failedCount"], 1)
+        self.assertEqual(result["data"]["routes"][1]["code"], "ROUTE_BLOCKED")
+
+    def test_batch_rejects_invalid_routes(self) -> None:
+        result = compute_conduit_route_batch({"routes": [{"start": {"x": 1, "y": 1}}]})
+        self.assertFalse(result["success"])
+        self.assertEqual(result["code"], "INVALID_REQUEST")
+        self.assertIn("routes[0].end", result["message"])
+
+        empty = compute_conduit_route_batch({"routes": []})
+        self.assertEqual(empty["code"], "INVALID_REQUEST")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import unittest
 from backend.route_groups.api_conduit_route_obstacle_scan import (
     scan_conduit_obstacles,
 )
+from backend.route_groups.api_conduit_route_spatial_index import obstacle_index_for
 
 
 class _BBoxEntity:
@@ -90,6 +91,13 @@ class TestApiConduitRouteObstacleScan(unittest.TestCase):
         types = {item["type"] for item in result["data"]["obstacles"]}
         self.assertEqual(types, {"foundation", "trench", "road"})
 
+        spatial_index = result["meta"]["spatialIndex"]
+        self.assertEqual(spatial_index["obstacleCount"], 3)
+        index, key, hit = obstacle_index_for(result["data"]["obstacles"])
+        self.assertTrue(hit)
+        self.assertEqual(key, spatial_index["key"])
+        self.assertEqual(len(index), 3)
+
     def test_obstacle_scan_selection_only_uses_selection_set(self) -> None:
         selected = [
             _BBoxEntity(
@@ -151,6 +159,7 @@ class TestApiConduitRouteObstacleScan(unittest.TestCase):
         self.assertFalse(result["success"])
         self.assertEqual(result["code"], "NO_OBSTACLES_FOUND")
         self.assertEqual(result["meta"]["totalObstacles"], 0)
+        self.assertIsNone(result["meta"]["spatialIndex"])
         self.assertGreaterEqual(result["meta"]["scannedLayerCount"], 1)
         self.assertGreaterEqual(result["meta"]["skippedUnclassifiedLayerEntities"], 1)
         top_scanned = result["meta"]["topScannedLayers"]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from backend.route_groups import api_conduit_route_spatial_index as spatial_index
+from backend.route_groups.api_conduit_route_spatial_index import (
+    ObstacleSpatialIndex,
+    clear_obstacle_indexes,
+    obstacle_index_for,
+    query_obstacles_near_point,
+)
+
+
+def _random_obstacles(count: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"OBS-{index + 1}",
+            "type": "foundation",
+            "x": rng.uniform(0.0, 4000.0),
+            "y": rng.uniform(0.0, 3000.0),
+            "w": rng.uniform(4.0, 90.0),
+            "h": rng.uniform(4.0, 90.0),
+        }
+        for index in range(count)
+    ]
+
+
+def _brute_force_rect(obstacles: list[dict], min_x: float, min_y: float, max_x: float, max_y: float) -> list[int]:
+    return [
+        index
+        for index, item in enumerate(obstacles)
+        if item["x"] <= max_x
+        and item["x"] + item["w"] >= min_x
+        and item["y"] <= max_y
+        and item["y"] + item["h"] >= min_y
+    ]
+
+
+class TestApiConduitRouteSpatialIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_obstacle_indexes()
+
+    def test_query_rect_matches_brute_force_in_sequence_order(self) -> None:
+        obstacles = _random_obstacles(2000)
+        obstacles.append({"id": "SITE", "type": "road", "x": -50.0, "y": -50.0, "w": 9000.0, "h": 9000.0})
+        index = ObstacleSpatialIndex(obstacles, cell_size=8.0)
+        self.assertEqual(index.stats()["oversizedCount"], 1)
+
+        rng = random.Random(5)
+        for _ in range(50):
+            x = rng.uniform(-100.0, 4000.0)
+            y = rng.uniform(-100.0, 3000.0)
+            rect = (x, y, x + rng.uniform(1.0, 600.0), y + rng.uniform(1.0, 600.0))
+            self.assertEqual(index.query_rect(*rect), _brute_force_rect(obstacles, *rect))
+
+    def test_query_near_point_orders_by_distance(self) -> None:
+        obstacles = [
+            {"id": "FAR", "type": "foundation", "x": 100.0, "y": 0.0, "w": 10.0, "h": 10.0},
+            {"id": "NEAR", "type": "trench", "x": 20.0, "y": 0.0, "w": 10.0, "h": 10.0},
+            {"id": "INSIDE", "type": "building", "x": -5.0, "y": -5.0, "w": 10.0, "h": 10.0},
+            {"id": "OUT", "type": "road", "x": 500.0, "y": 500.0, "w": 10.0, "h": 10.0},
+        ]
+        index = ObstacleSpatialIndex(obstacles)
+
+        matches = index.query_near_point(0.0, 0.0, radius=120.0, limit=10)
+
+        self.assertEqual([obstacles[position]["id"] for position, _ in matches], ["INSIDE", "NEAR", "FAR"])
+        self.assertEqual([distance for _, distance in matches], [0.0, 20.0, 100.0])
+        self.assertEqual(len(index.query_near_point(0.0, 0.0, radius=120.0, limit=1)), 1)
+
+    def test_registry_reuses_index_for_same_geometry(self) -> None:
+        obstacles = _random_obstacles(50)
+        relabelled = [{**item, "id": f"X-{position}", "label": "other"} for position, item in enumerate(obstacles)]
+
+        first, key, first_hit = obstacle_index_for(obstacles)
+        second, second_key, second_hit = obstacle_index_for(relabelled)
+
+        self.assertFalse(first_hit)
+        self.assertTrue(second_hit)
+        self.assertIs(first, second)
+        self.assertEqual(key, second_key)
+        self.assertIs(spatial_index.get_obstacle_index(key), first)
+
+    def test_registry_evicts_oldest_index(self) -> None:
+        keys = []
+        for seed in range(spatial_index.MAX_REGISTERED_INDEXES + 1):
+            _, key, _ = obstacle_index_for(_random_obstacles(3, seed=seed))
+            keys.append(key)
+
+        self.assertIsNone(spatial_index.get_obstacle_index(keys[0]))
+        self.assertIsNotNone(spatial_index.get_obstacle_index(keys[-1]))
+
+    def test_near_point_query_uses_registered_index(self) -> None:
+        obstacles = [
+            {"id": "PAD-1", "type": "equipment_pad", "x": 100.0, "y": 100.0, "w": 40.0, "h": 40.0, "label": "PAD"},
+        ]
+        _, key, _ = obstacle_index_for(obstacles)
+
+        result = query_obstacles_near_point({"indexKey": key, "x": 90, "y": 120, "radius": 15})
+
+        self.assertTrue(result["success"])
+        self.assertTrue(result["meta"]["indexHit"])
+        self.assertEqual(result["data"]["obstacles"], [{**obstacles[0], "distance": 10.0}])
+
+    def test_near_point_query_builds_index_from_obstacles(self) -> None:
+        result = query_obstacles_near_point(
+            {
+                "indexKey": "expired",
+                "x": 0,
+                "y": 0,
+                "obstacles": [{"id": "A", "type": "trench", "x": 5, "y": 0, "w": 5, "h": 5}],
+            }
+        )
+
+        self.assertTrue(result["success"])
+        self.assertFalse(result["meta"]["indexHit"])
+        self.assertEqual(len(result["data"]["obstacles"]), 1)
+
+    def test_near_point_query_validation(self) -> None:
+        missing = query_obstacles_near_point({"indexKey": "unknown", "x": 1, "y": 2})
+        self.assertEqual(missing["code"], "INDEX_NOT_FOUND")
+
+        invalid = query_obstacles_near_point({"x": "a", "y": 2, "obstacles": []})
+        self.assertEqual(invalid["code"], "INVALID_REQUEST")
+
+        no_source = query_obstacles_near_point({"x": 1, "y": 2})
+        self.assertEqual(no_source["code"], "INVALID_REQUEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from openpyxl import load_workbook
+
+from backend.route_groups.api_excel_report_writer import ExcelReportWriter
+
+
+class TestExcelReportWriter(unittest.TestCase):
+    def _write(self, build) -> object:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "report.xlsx")
+        writer = ExcelReportWriter()
+        build(writer)
+        writer.save(path)
+        return load_workbook(path)
+
+    def test_bands_headers_and_striped_rows_use_named_styles(self) -> None:
+        def build(writer: ExcelReportWriter) -> None:
+            sheet = writer.add_sheet("Data", column_widths=[30, 12], freeze_panes="A3")
+            sheet.title_row("Report")
+            sheet.header_row(["Name", "Value"])
+            sheet.data_rows([("a", 1.5), ("b", 2)], kinds=("key", "value"))
+            sheet.blank_rows(2)
+            sheet.section_row("Section")
+            sheet.data_row(["c", 3.25], kinds=("label", "value"), stripe=1, number_formats={1: "0.00"})
+            self.assertEqual(sheet.rows_written, 8)
+
+        ws = self._write(build)["Data"]
+
+        self.assertEqual([str(item) for item in ws.merged_cells.ranges], ["A1:B1", "A7:B7"])
+        self.assertEqual(ws.freeze_panes, "A3")
+        self.assertEqual(ws.column_dimensions["A"].width, 30)
+        self.assertEqual(ws.row_dimensions[1].height, 28)
+        self.assertEqual(ws.row_dimensions[7].height, 24)
+        self.assertEqual(ws["A1"].style, "Report Title")
+        self.assertEqual(ws["A2"].style, "Report Header")
+        self.assertEqual(ws["A3"].style, "Report Data Key Even")
+        self.assertTrue(ws["A3"].font.b)
+        self.assertEqual(ws["B4"].style, "Report Data Value Odd")
+        self.assertNotEqual(ws["A3"].fill.fgColor.rgb, ws["A4"].fill.fgColor.rgb)
+        self.assertEqual([ws["A5"].value, ws["A6"].value], [None, None])
+        self.assertEqual(ws["A7"].style, "Report Section")
+        self.assertEqual(ws["B8"].number_format, "0.00")
+        self.assertEqual(ws["B8"].alignment.horizontal, "right")
+
+    def test_large_reports_only_store_a_handful_of_cell_formats(self) -> None:
+        def build(writer: ExcelReportWriter) -> None:
+            sheet = writer.add_sheet("Changes", column_widths=[20, 10, 40])
+            sheet.header_row(["File", "Line", "Text"], first_left=True)
+            for index in range(2000):
+                sheet.data_row([f"f{index}.txt", index, "x" * 20], kinds=("text", "number", "text"), stripe=index)
+
+        workbook = self._write(build)
+
+        self.assertEqual(workbook["Changes"].max_row, 2001)
+        self.assertEqual(workbook["Changes"]["A1"].style, "Report Header Left")
+        self.assertLess(len(workbook._cell_styles), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from backend.route_groups.api_process_pool import PersistentProcessPool
+
+
+class TestPersistentProcessPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = PersistentProcessPool("TEST_PROCESS_POOL_WORKERS", default_cap=3, max_workers_cap=8)
+        self.addCleanup(self.pool.discard)
+
+    def test_worker_count_comes_from_env_and_is_clamped(self) -> None:
+        for raw, expected in (("5", 5), ("99", 8), ("0", 1)):
+            with mock.patch.dict("os.environ", {"TEST_PROCESS_POOL_WORKERS": raw}):
+                self.assertEqual(self.pool.max_workers(), expected)
+        with mock.patch.dict("os.environ", {"TEST_PROCESS_POOL_WORKERS": "many"}), mock.patch(
+            "os.cpu_count", return_value=16
+        ):
+            self.assertEqual(self.pool.max_workers(), 3)
+
+    def test_pool_is_reused_until_the_size_changes_or_it_is_discarded(self) -> None:
+        first = self.pool.get(2)
+        self.assertIs(self.pool.get(2), first)
+        resized = self.pool.get(3)
+        self.assertIsNot(resized, first)
+        self.pool.discard()
+        self.assertIsNot(self.pool.get(3), resized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -335,7 +335,9 @@ class TestApiRouteGroups(unittest.TestCase):
             "/api/conduit-route/bridge/terminal-labels/sync": ["POST"],
             "/api/conduit-route/terminal-labels/sync": ["POST"],
             "/api/conduit-route/obstacles/scan": ["POST"],
+            "/api/conduit-route/obstacles/near": ["POST"],
             "/api/conduit-route/route/compute": ["POST"],
+            "/api/conduit-route/route/compute-batch": ["POST"],
             "/api/conduit-route/backcheck": ["POST"],
             "/api/autodraft/backcheck": ["POST"],
             "/api/autodraft/compare/prepare": ["POST"],
@@ -1820,9 +1822,91 @@ class TestApiRouteGroups(unittest.TestCase):
         self.assertTrue(text_extraction.get("used"))
         self.assertEqual(text_extraction.get("source"), "ocr")
         self.assertEqual(text_extraction.get("selected_line_count"), 1)
+        self.assertEqual(text_extraction.get("ocr_pass"), "full_page")
         warnings = payload.get("warnings") or []
         self.assertTrue(any("OCR fallback recovered text-only markup candidates" in item for item in warnings))
 
+    def test_autodraft_compare_prepare_ocrs_markup_ink_regions_before_full_page(self) -> None:
+        from PIL import Image as PILImage
+
+        class _FakePage(dict):
+            def __init__(self):
+                super().__init__()
+
+                class _Box:
+                    width = 400
+                    height = 200
+
+                self.mediabox = _Box()
+
+        class _FakeReader:
+            def __init__(self, _stream):
+                self.pages = [_FakePage()]
+                self.metadata = {"/Producer": "Bluebeam Revu x64"}
+
+        def _fake_render(pdf_path, *, page_index, output_dir, prefix="page"):
+            image_path = Path(output_dir) / f"{prefix}.png"
+            image = PILImage.new("RGB", (400, 200), "white")
+            for x_value in range(40, 241):
+                for y_value in range(20, 56):
+                    image.putpixel((x_value, y_value), (235, 40, 40))
+            for x_value in range(300, 380):
+                for y_value in range(150, 190):
+                    image.putpixel((x_value, y_value), (30, 30, 30))
+            image.save(image_path)
+            return {"path": str(image_path), "image_width": 400, "image_height": 200, "source": "pdftoppm"}
+
+        with (
+            patch("backend.route_groups.api_autodraft._PYPDF_AVAILABLE", True),
+            patch("backend.route_groups.api_autodraft._PdfReader", _FakeReader),
+            patch("backend.route_groups.api_autodraft.pdf_render_available", return_value=True),
+            patch("backend.route_groups.api_autodraft.pdf_ocr_available", return_value=True),
+            patch(
+                "backend.route_groups.api_autodraft.extract_embedded_text_page_lines",
+                return_value={"page_width": 400.0, "page_height": 200.0, "lines": [], "source": "embedded_text"},
+            ),
+            patch("backend.route_groups.api_autodraft.render_pdf_page_to_png", side_effect=_fake_render),
+            patch(
+                "backend.route_groups.api_autodraft.extract_ocr_region_lines",
+                return_value={
+                    "source": "ocr",
+                    "region_count": 1,
+                    "lines": [
+                        {
+                            "text": "Install new panel",
+                            "x": 40.0,
+                            "y": 145.0,
+                            "bounds": {"x": 40.0, "y": 145.0, "width": 201.0, "height": 36.0},
+                            "ocr_confidence": 93.2,
+                        }
+                    ],
+                },
+            ) as region_ocr,
+            patch(
+                "backend.route_groups.api_autodraft.extract_ocr_page_lines_from_image",
+                side_effect=AssertionError("full page OCR should not run"),
+            ),
+        ):
+            response = self.client.post(
+                "/api/autodraft/compare/prepare",
+                headers={"X-API-Key": "valid-key"},
+                data={"page_index": "0", "pdf": (io.BytesIO(b"%PDF-1.7"), "flattened.pdf")},
+                content_type="multipart/form-data",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json() or {}
+        markups = payload.get("markups") or []
+        self.assertEqual([(entry.get("text"), entry.get("color")) for entry in markups], [("Install new panel", "red")])
+        # Only the padded box around the red ink is OCR'd; the black block is not.
+        self.assertEqual(
+            region_ocr.call_args.kwargs["regions"],
+            [{"x": 0.0, "y": 110.0, "width": 300.0, "height": 90.0}],
+        )
+        text_extraction = (((payload.get("pdf_metadata") or {}).get("page") or {}).get("text_extraction") or {})
+        self.assertEqual(text_extraction.get("ocr_pass"), "markup_regions")
+        self.assertEqual(text_extraction.get("ocr_region_count"), 1)
+
     def test_autodraft_compare_prepare_fallback_filters_title_block_metadata_lines(self) -> None:
         from PIL import Image as PILImage
 
@@ -1933,6 +2017,95 @@ class TestApiRouteGroups(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 401)
 
+    def test_conduit_route_compute_batch_endpoint_requires_auth(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/route/compute-batch",
+            json={"routes": [{"start": {"x": 10, "y": 10}, "end": {"x": 100, "y": 100}}]},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_conduit_route_compute_batch_payload_shape(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/route/compute-batch",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "obstacleSource": "client",
+                "mode": "cable_tag",
+                "parallel": False,
+                "obstacles": [{"id": "OBS-A", "type": "foundation", "x": 300, "y": 100, "w": 80, "h": 200}],
+                "routes": [
+                    {"id": "route_1", "start": {"x": 20, "y": 40}, "end": {"x": 800, "y": 400}, "tagText": "DC-001"},
+                    {"id": "route_2", "start": {"x": 20, "y": 60}, "end": {"x": 800, "y": 420}, "tagText": "DC-002"},
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json() or {}
+        self.assertTrue(payload.get("success"))
+        data = payload.get("data") or {}
+        self.assertEqual(data.get("routedCount"), 2)
+        self.assertEqual([route.get("id") for route in data.get("routes") or []], ["route_1", "route_2"])
+        self.assertEqual(((data.get("routes") or [{}])[1].get("data") or {}).get("tag", {}).get("text"), "DC-002")
+        meta = payload.get("meta") or {}
+        self.assertEqual(meta.get("routeCount"), 2)
+        self.assertEqual(meta.get("obstacleSource"), "client")
+        self.assertIn("solveMs", meta)
+        self.assertTrue(str(meta.get("requestId", "")).startswith("req-"))
+
+    def test_conduit_route_compute_batch_rejects_bad_obstacle_source(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/route/compute-batch",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "obstacleSource": "dxf",
+                "routes": [{"start": {"x": 10, "y": 10}, "end": {"x": 100, "y": 100}}],
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        payload = response.get_json() or {}
+        self.assertEqual(payload.get("code"), "INVALID_REQUEST")
+        self.assertEqual((payload.get("meta") or {}).get("stage"), "route_compute_batch.validation")
+
+    def test_conduit_route_obstacles_near_endpoint_requires_auth(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/obstacles/near",
+            json={"x": 10, "y": 10, "obstacles": []},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_conduit_route_obstacles_near_payload_shape(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/obstacles/near",
+            headers={"X-API-Key": "valid-key"},
+            json={
+                "x": 290,
+                "y": 120,
+                "radius": 25,
+                "obstacles": [
+                    {"id": "OBS-A", "type": "foundation", "x": 300, "y": 100, "w": 80, "h": 200},
+                    {"id": "OBS-B", "type": "trench", "x": 900, "y": 100, "w": 20, "h": 20},
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json() or {}
+        self.assertTrue(payload.get("success"))
+        obstacles = (payload.get("data") or {}).get("obstacles") or []
+        self.assertEqual([item.get("id") for item in obstacles], ["OBS-A"])
+        self.assertEqual(obstacles[0].get("distance"), 10.0)
+        self.assertTrue(str((payload.get("meta") or {}).get("requestId", "")).startswith("req-"))
+
+    def test_conduit_route_obstacles_near_unknown_index(self) -> None:
+        response = self.client.post(
+            "/api/conduit-route/obstacles/near",
+            headers={"X-API-Key": "valid-key"},
+            json={"x": 10, "y": 10, "indexKey": "does-not-exist"},
+        )
+        self.assertEqual(response.status_code, 404)
+        payload = response.get_json() or {}
+        self.assertEqual(payload.get("code"), "INDEX_NOT_FOUND")
+        self.assertEqual((payload.get("meta") or {}).get("stage"), "obstacle_near.validation")
+
     def test_conduit_route_backcheck_endpoint_requires_auth(self) -> None:
         response = self.client.post(
             "/api/conduit-route/backcheck",
@@ -109,6 +109,56 @@ class TestApiTransmittal(unittest.TestCase):
         self.assertEqual(documents[0]["revision"], "3")
         self.assertFalse(documents[0]["needs_review"])
 
+    def test_analyze_pdfs_reports_timing_and_source_in_upload_order(self) -> None:
+        def analyze(pdf_path: str) -> dict:
+            with open(pdf_path, "rb") as handle:
+                body = handle.read()
+            if b"broken" in body:
+                raise RuntimeError("bad xref")
+            return {"drawing_number": body.decode("utf-8").split()[-1], "source": "ocr"}
+
+        with patch("backend.route_groups.api_transmittal.analyze_pdf_title_block", side_effect=analyze):
+            response = self.client.post(
+                "/api/transmittal/analyze-pdfs",
+                headers={"X-API-Key": "valid-key"},
+                data={
+                    "documents": [
+                        (io.BytesIO(b"%PDF-1.7 E-300"), "sheet-03.pdf"),
+                        (io.BytesIO(b"%PDF-1.7 broken"), "sheet-01.pdf"),
+                        (io.BytesIO(b"%PDF-1.7 E-200"), "sheet-02.pdf"),
+                    ],
+                    "parallel": "false",
+                },
+                content_type="multipart/form-data",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.get_json() or {}
+        documents = payload.get("documents") or []
+        self.assertEqual([doc["file_name"] for doc in documents], ["sheet-03.pdf", "sheet-01.pdf", "sheet-02.pdf"])
+        self.assertEqual([doc["drawing_number"] for doc in documents], ["E-300", "", "E-200"])
+        self.assertEqual(documents[0]["extraction_source"], "ocr")
+        self.assertEqual(documents[1]["source"], "analysis_failed")
+        self.assertTrue(all(doc["duration_ms"] >= 0 for doc in documents))
+        self.assertEqual(payload["analysis"]["parallel"], False)
+        self.assertGreaterEqual(payload["analysis"]["duration_ms"], 0)
+
+    def test_analyze_pdfs_survives_temp_files_that_cannot_be_deleted_yet(self) -> None:
+        # Windows raises PermissionError when a timed-out worker still has the file open.
+        with patch(
+            "backend.route_groups.api_transmittal.analyze_pdf_title_block",
+            return_value={"drawing_number": "E-100", "source": "embedded_text"},
+        ), patch.object(Path, "unlink", side_effect=PermissionError("file in use")):
+            response = self.client.post(
+                "/api/transmittal/analyze-pdfs",
+                headers={"X-API-Key": "valid-key"},
+                data={"documents": (io.BytesIO(b"%PDF-1.7"), "drawing.pdf"), "parallel": "false"},
+                content_type="multipart/form-data",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.get_json() or {})["documents"][0]["drawing_number"], "E-100")
+
     def test_analyze_pdfs_skips_non_pdf_uploads(self) -> None:
         response = self.client.post(
             "/api/transmittal/analyze-pdfs",
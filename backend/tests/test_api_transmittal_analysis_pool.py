@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from backend.route_groups import api_transmittal_analysis_pool as pool
+from backend.route_groups.api_transmittal_analysis_pool import analyze_title_blocks
+
+_ACTIVE = 0
+_PEAK = 0
+_COUNTER_LOCK = threading.Lock()
+
+
+def fake_analyze(pdf_path: str) -> dict:
+    name = os.path.basename(pdf_path)
+    if "slow" in name:
+        time.sleep(1.5)
+    if "medium" in name:
+        time.sleep(0.8)
+    if "boom" in name:
+        raise RuntimeError("cannot read page")
+    return {"drawing_number": name.split(".")[0], "source": "embedded_text", "pid": os.getpid()}
+
+
+def counting_analyze(pdf_path: str) -> dict:
+    global _ACTIVE, _PEAK
+    with _COUNTER_LOCK:
+        _ACTIVE += 1
+        _PEAK = max(_PEAK, _ACTIVE)
+    time.sleep(0.05)
+    with _COUNTER_LOCK:
+        _ACTIVE -= 1
+    return {"drawing_number": os.path.basename(pdf_path)}
+
+
+class TestAnalyzeTitleBlocks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(pool._ANALYSIS_POOL.discard)
+
+    def _paths(self, *names: str) -> list[str]:
+        paths = []
+        for name in names:
+            path = os.path.join(self.temp_dir.name, name)
+            with open(path, "wb") as handle:
+                handle.write(b"%PDF-1.7")
+            paths.append(path)
+        return paths
+
+    def test_pool_keeps_input_order_and_reports_failures(self) -> None:
+        paths = self._paths("E-101.pdf", "boom.pdf", "E-102.pdf", "E-103.pdf")
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            run = analyze_title_blocks(paths, analyze=fake_analyze, timeout_seconds=30)
+
+        self.assertTrue(run["parallel"])
+        self.assertEqual(run["workers"], 2)
+        outcomes = run["outcomes"]
+        self.assertEqual(
+            [outcome["analysis"]["drawing_number"] if outcome["analysis"] else None for outcome in outcomes],
+            ["E-101", None, "E-102", "E-103"],
+        )
+        self.assertEqual(outcomes[1]["error"], "failed")
+        self.assertNotEqual(outcomes[0]["analysis"]["pid"], os.getpid())
+        self.assertTrue(all(outcome["durationMs"] >= 0 for outcome in outcomes))
+
+    def test_slow_document_times_out_without_holding_up_the_rest(self) -> None:
+        paths = self._paths("slow.pdf", "E-201.pdf", "E-202.pdf")
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            started_at = time.perf_counter()
+            run = analyze_title_blocks(paths, analyze=fake_analyze, timeout_seconds=0.5)
+            elapsed = time.perf_counter() - started_at
+
+        self.assertLess(elapsed, 1.4)
+        self.assertEqual(run["outcomes"][0]["error"], "timeout")
+        self.assertGreaterEqual(run["outcomes"][0]["durationMs"], 400)
+        self.assertEqual(
+            [outcome["analysis"]["drawing_number"] for outcome in run["outcomes"][1:]],
+            ["E-201", "E-202"],
+        )
+
+    def test_time_queued_for_a_slot_is_not_charged_to_the_document(self) -> None:
+        paths = self._paths("slow-1.pdf", "slow-2.pdf", "medium.pdf")
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            run = analyze_title_blocks(paths, analyze=fake_analyze, timeout_seconds=2.0)
+
+        # medium.pdf waits ~1.5 s for a slot, then needs 0.8 s of its own.
+        self.assertEqual(run["outcomes"][2]["analysis"]["drawing_number"], "medium")
+
+    def test_in_process_timeout_is_enforced_and_cleanup_waits_for_the_document(self) -> None:
+        paths = self._paths("slow.pdf")
+        cleaned: list[str] = []
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            started_at = time.perf_counter()
+            run = analyze_title_blocks(paths, analyze=fake_analyze, timeout_seconds=0.3, cleanup=cleaned.append)
+            elapsed = time.perf_counter() - started_at
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(run["outcomes"][0]["error"], "timeout")
+        self.assertEqual(cleaned, [])
+        deadline = time.time() + 5
+        while not cleaned and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(cleaned, paths)
+
+    def test_single_document_or_parallel_off_runs_in_process(self) -> None:
+        paths = self._paths("E-301.pdf", "E-302.pdf")
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            single = analyze_title_blocks(paths[:1], analyze=fake_analyze)
+            sequential = analyze_title_blocks(paths, analyze=fake_analyze, parallel=False)
+
+        for run in (single, sequential):
+            self.assertFalse(run["parallel"])
+            self.assertTrue(all(outcome["analysis"]["pid"] == os.getpid() for outcome in run["outcomes"]))
+
+    def test_in_process_runs_share_the_worker_cap_across_requests(self) -> None:
+        global _PEAK
+        _PEAK = 0
+        paths = self._paths("a.pdf", "b.pdf", "c.pdf")
+        with mock.patch.dict("os.environ", {"TRANSMITTAL_ANALYSIS_MAX_WORKERS": "2"}):
+            requests = [
+                threading.Thread(target=analyze_title_blocks, args=(paths,), kwargs={"analyze": counting_analyze, "parallel": False})
+                for _ in range(4)
+            ]
+            for thread in requests:
+                thread.start()
+            for thread in requests:
+                thread.join()
+
+        self.assertEqual(_PEAK, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from unittest.mock import patch
 
+from backend.route_groups.pdf_rasterizer import PdftoppmRasterizer
+
 
 class TestBuildTemporaryIndexWorkbook(unittest.TestCase):
     def test_creates_xlsx_with_document_rows(self) -> None:
@@ -283,5 +285,131 @@ class TestAnalyzePdfTitleBlock(unittest.TestCase):
         self.assertEqual(result["source"], "embedded_text")
 
 
+
+class TestTitleBlockZoneOcr(unittest.TestCase):
+    _MODULE = "backend.route_groups.api_transmittal_pdf_analysis"
+
+    def _zone_payload(self, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"lines": lines, "source": "ocr", "region_count": 2}
+
+    def _patched_zone_ocr(self, *zone_payloads: Dict[str, Any], full_page: Any = None):
+        full_page_patch = (
+            {"side_effect": AssertionError("full page OCR should not run")} if full_page is None else {"return_value": full_page}
+        )
+        return (
+            patch(f"{self._MODULE}._ocr_available", return_value=True),
+            patch(f"{self._MODULE}.get_pdf_rasterizer", return_value=PdftoppmRasterizer()),
+            patch(
+                f"{self._MODULE}.cached_page_payload",
+                side_effect=lambda _kind, _path, *, compute, **_kwargs: compute(),
+            ),
+            patch(f"{self._MODULE}.extract_ocr_region_lines", side_effect=list(zone_payloads)),
+            patch(f"{self._MODULE}._ocr_first_page_lines_uncached", **full_page_patch),
+        )
+
+    @staticmethod
+    def _region_box(call: Any) -> List[tuple]:
+        return [
+            (round(region["x"], 3), round(region["width"], 3), round(region["height"], 3))
+            for region in call.kwargs["regions"]
+        ]
+
+    def test_zone_pass_ocrs_only_the_right_corner_when_it_reads_as_a_title_block(self) -> None:
+        from backend.route_groups.api_transmittal_pdf_analysis import _ocr_first_page_lines
+
+        zone_lines = [
+            {"text": "DRAWING NO: E1-100", "x": 480.0, "y": 40.0, "bounds": {}},
+            {"text": "TITLE: ONE-LINE DIAGRAM", "x": 480.0, "y": 30.0, "bounds": {}},
+            {"text": "REV 3", "x": 480.0, "y": 20.0, "bounds": {}},
+        ]
+        available, rasterizer, cached, region_patch, full_patch = self._patched_zone_ocr(self._zone_payload(zone_lines))
+        with available, rasterizer, cached, region_patch as region_ocr, full_patch:
+            payload = _ocr_first_page_lines("/fake/drawing.pdf", page_width=600.0, page_height=400.0)
+
+        self.assertEqual(payload["ocr_pass"], "title_block_zone")
+        self.assertEqual(payload["ocr_zones"], ["bottom_right"])
+        self.assertEqual(payload["lines"][0], {"text": "DRAWING NO: E1-100", "x": 480.0, "y": 40.0, "font_size": 0.0})
+        region_ocr.assert_called_once()
+        self.assertEqual(self._region_box(region_ocr.call_args), [(330.0, 270.0, 112.0)])
+        self.assertEqual(region_ocr.call_args.kwargs["dpi"], 200)
+
+    def test_zone_pass_reads_the_left_corner_only_when_the_right_is_sparse(self) -> None:
+        from backend.route_groups.api_transmittal_pdf_analysis import _ocr_first_page_lines
+
+        left_lines = [{"text": "DRAWING NO: E1-100", "x": 40.0, "y": 40.0, "bounds": {}}]
+        available, rasterizer, cached, region_patch, full_patch = self._patched_zone_ocr(
+            self._zone_payload([]), self._zone_payload(left_lines)
+        )
+        with available, rasterizer, cached, region_patch as region_ocr, full_patch:
+            payload = _ocr_first_page_lines("/fake/drawing.pdf", page_width=600.0, page_height=400.0)
+
+        self.assertEqual(payload["ocr_zones"], ["bottom_right", "bottom_left"])
+        self.assertEqual(payload["lines"], [{"text": "DRAWING NO: E1-100", "x": 40.0, "y": 40.0, "font_size": 0.0}])
+        self.assertEqual(
+            [self._region_box(call) for call in region_ocr.call_args_list],
+            [[(330.0, 270.0, 112.0)], [(0.0, 270.0, 112.0)]],
+        )
+
+    def test_full_page_pass_runs_only_when_zones_are_empty(self) -> None:
+        from backend.route_groups.api_transmittal_pdf_analysis import _ocr_first_page_lines
+
+        full_page = {"lines": [{"text": "E1-100", "x": 0.0, "y": 0.0, "font_size": 0.0}], "source": "ocr"}
+        available, rasterizer, cached, region_patch, full_patch = self._patched_zone_ocr(
+            self._zone_payload([]), self._zone_payload([]), full_page=full_page
+        )
+        with available, rasterizer, cached, region_patch as region_ocr, full_patch as full_page_ocr:
+            payload = _ocr_first_page_lines("/fake/scan.pdf", page_width=600.0, page_height=400.0)
+
+        self.assertEqual(region_ocr.call_count, 2)
+        full_page_ocr.assert_called_once_with("/fake/scan.pdf")
+        self.assertEqual(payload["ocr_pass"], "full_page")
+        self.assertEqual(payload["lines"], full_page["lines"])
+
+    def test_full_page_pass_ocrs_an_in_memory_render(self) -> None:
+        from PIL import Image
+
+        from backend.route_groups.api_transmittal_pdf_analysis import _ocr_first_page_lines_uncached
+
+        page = Image.new("RGB", (40, 20), "white")
+        with patch(f"{self._MODULE}.render_pdf_page_image", return_value=page) as render, patch(
+            f"{self._MODULE}.pytesseract"
+        ) as tesseract:
+            tesseract.image_to_string.return_value = "E1-100"
+            payload = _ocr_first_page_lines_uncached("/fake/scan.pdf")
+
+        render.assert_called_once_with("/fake/scan.pdf", page_index=0, dpi=150)
+        tesseract.image_to_string.assert_called_once_with(page)
+        self.assertEqual(payload, {"lines": [{"text": "E1-100", "x": 0.0, "y": 0.0, "font_size": 0.0}], "source": "ocr"})
+
+    def test_scanned_sheet_reports_ocr_pass_in_reason_codes(self) -> None:
+        from backend.route_groups.api_transmittal_pdf_analysis import analyze_pdf_title_block
+
+        with patch(
+            f"{self._MODULE}._extract_embedded_text_lines",
+            return_value={"lines": [], "source": "embedded_text", "page_width": 612.0, "page_height": 792.0},
+        ), patch(
+            f"{self._MODULE}._ocr_first_page_lines",
+            return_value={
+                "lines": [
+                    {"text": "DRAWING NO: E1-100", "x": 400.0, "y": 60.0, "font_size": 0.0},
+                    {"text": "ONE-LINE DIAGRAM", "x": 400.0, "y": 45.0, "font_size": 0.0},
+                    {"text": "REV: 3", "x": 400.0, "y": 30.0, "font_size": 0.0},
+                ],
+                "source": "ocr",
+                "ocr_pass": "title_block_zone",
+            },
+        ) as ocr, patch(
+            f"{self._MODULE}._apply_titleblock_model_hints",
+            side_effect=lambda **kwargs: kwargs["current"],
+        ):
+            result = analyze_pdf_title_block("/fake/scan.pdf")
+
+        ocr.assert_called_once_with("/fake/scan.pdf", page_width=612.0, page_height=792.0)
+        self.assertEqual(result["drawing_number"], "E1-100")
+        self.assertEqual(result["source"], "ocr")
+        self.assertIn("ocr_pass:title_block_zone", result["recognition"]["reason_codes"])
+        self.assertIn("zone:bottom_right", result["recognition"]["reason_codes"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import gzip
+import json
 import unittest
 from unittest.mock import patch
 
 from flask import Flask, g
 from flask_limiter import Limiter
 
+from backend.route_groups import api_watchdog
 from backend.route_groups.api_watchdog import create_watchdog_blueprint
 
 
@@ -136,6 +139,49 @@ class TestApiWatchdogSecurity(unittest.TestCase):
         self.assertNotIn("rows", payload)
         self.assertNotIn("secret", str(payload))
 
+    def test_collector_events_accepts_gzip_encoded_json(self) -> None:
+        body = gzip.compress(json.dumps({"collectorId": "collector-a", "events": [{"eventType": "added"}]}).encode())
+        with patch(
+            "backend.route_groups.api_watchdog.WatchdogMonitorService.ingest_collector_events",
+            return_value={"accepted": 1, "duplicates": 0},
+        ) as ingest:
+            response = self.client.post(
+                "/api/watchdog/collectors/events",
+                data=body,
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.get_json() or {}).get("accepted"), 1)
+        self.assertEqual(ingest.call_args.args[1]["collectorId"], "collector-a")
+
+    def test_collector_events_rejects_oversized_or_corrupt_gzip(self) -> None:
+        oversized = gzip.compress(b" " * 2048 + b"{}")
+        with patch.object(api_watchdog, "MAX_COLLECTOR_EVENTS_DECOMPRESSED_BYTES", 1024), patch(
+            "backend.route_groups.api_watchdog.WatchdogMonitorService.ingest_collector_events",
+        ) as ingest:
+            too_large = self.client.post(
+                "/api/watchdog/collectors/events",
+                data=oversized,
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+            corrupt = self.client.post(
+                "/api/watchdog/collectors/events",
+                data=b"not gzip",
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+            unsupported = self.client.post(
+                "/api/watchdog/collectors/events",
+                data=b"{}",
+                headers={"Content-Type": "application/json", "Content-Encoding": "br"},
+            )
+
+        self.assertEqual(too_large.status_code, 400)
+        self.assertEqual(corrupt.status_code, 400)
+        self.assertEqual((corrupt.get_json() or {}).get("code"), "WATCHDOG_COLLECTOR_EVENTS_INVALID")
+        self.assertEqual(unsupported.status_code, 415)
+        ingest.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
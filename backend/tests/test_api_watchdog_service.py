@@ -994,6 +994,10 @@ class TestWatchdogMonitorService(unittest.TestCase):
                 },
             )
 
+            overview = service.overview("user:demo")
+            self.assertGreaterEqual(int(overview["ledger"]["writes"]), 1)
+            self.assertGreaterEqual(int(overview["ledger"]["reads"]), 1)
+
             rollups = service._ledger.list_rollups(
                 "user:demo",
                 since_ms=now_ms - (2 * 60 * 60 * 1000),
@@ -1004,6 +1008,162 @@ class TestWatchdogMonitorService(unittest.TestCase):
             self.assertEqual(by_type.get("file_modified"), 1)
             self.assertEqual(by_type.get("drawing_opened"), 1)
 
+    def test_status_reports_retention_and_prune_stats(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = WatchdogMonitorService(
+                ledger_path=os.path.join(temp_dir, "watchdog.sqlite3"),
+                max_collector_event_age_days=7,
+            )
+            service.register_collector(
+                "user:demo",
+                {
+                    "collectorId": "collector-a",
+                    "name": "Desktop Collector",
+                    "collectorType": "filesystem",
+                    "workstationId": "DEV-HOME",
+                },
+            )
+            service.ingest_collector_events(
+                "user:demo",
+                {
+                    "collectorId": "collector-a",
+                    "events": [{"eventKey": "evt-1", "eventType": "file_modified", "timestamp": int(time.time() * 1000)}],
+                },
+            )
+
+            retention = service.status("user:demo")["retention"]
+            self.assertEqual(retention["maxEvents"], 10000)
+            self.assertEqual(retention["maxAgeMs"], 7 * 24 * 60 * 60 * 1000)
+            self.assertEqual(retention["pruning"]["passes"], 1)
+            self.assertGreater(retention["pruning"]["lastPrunedAt"], 0)
+
+    def test_sessions_materialize_incrementally_and_rebuild_from_events(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            now_ms = int(time.time() * 1000)
+            service = make_service(temp_dir)
+            service.register_collector(
+                "user:demo",
+                {
+                    "collectorId": "collector-cad",
+                    "name": "AutoCAD Collector",
+                    "collectorType": "autocad_state",
+                    "workstationId": "DEV-HOME",
+                },
+            )
+            drawing_path = r"C:\\Projects\\Alpha\\Drawing1.dwg"
+            for offset, event_type in ((6000, "drawing_opened"), (4000, "command_executed")):
+                service.ingest_collector_events(
+                    "user:demo",
+                    {
+                        "collectorId": "collector-cad",
+                        "events": [
+                            {
+                                "eventType": event_type,
+                                "projectId": "project-1",
+                                "drawingPath": drawing_path,
+                                "timestamp": now_ms - offset,
+                            }
+                        ],
+                    },
+                )
+            service.ingest_collector_events(
+                "user:demo",
+                {
+                    "collectorId": "collector-cad",
+                    "events": [
+                        {
+                            "eventType": "drawing_closed",
+                            "projectId": "project-1",
+                            "drawingPath": drawing_path,
+                            "timestamp": now_ms - 1000,
+                            "metadata": {"trackedMs": 4200},
+                        }
+                    ],
+                },
+            )
+
+            stored = service.ledger.list_sessions("user:demo", since_ms=now_ms - 60_000)
+            self.assertEqual(len(stored), 1)
+            self.assertEqual(int(stored[0].get("eventCount") or 0), 3)
+            self.assertEqual(int(stored[0].get("commandCount") or 0), 1)
+            self.assertEqual(int(stored[0].get("endedAt") or 0), now_ms - 1000)
+
+            before = service.list_sessions("user:demo", time_window_ms=60 * 60 * 1000)
+            rebuilt = service.rebuild_sessions()
+            self.assertEqual(rebuilt["eventsFolded"], 3)
+            after = service.list_sessions("user:demo", time_window_ms=60 * 60 * 1000)
+            self.assertEqual(before["sessions"], after["sessions"])
+            self.assertEqual(int(after["sessions"][0].get("durationMs") or 0), 4200)
+
+            # Reads never materialize; the next ingest catches up on older events.
+            service.ledger.reset_sessions("user:demo")
+            restarted = make_service(temp_dir)
+            self.assertEqual(restarted.list_sessions("user:demo")["sessions"], [])
+            restarted.ingest_collector_events(
+                "user:demo",
+                {
+                    "collectorId": "collector-cad",
+                    "events": [{"eventType": "file_modified", "timestamp": now_ms}],
+                },
+            )
+            self.assertEqual(restarted.list_sessions("user:demo")["sessions"], after["sessions"])
+
+    def test_pruning_drops_sessions_and_trackers_whose_events_are_gone(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            now_ms = int(time.time() * 1000)
+            service = make_service(temp_dir)
+            service.register_collector(
+                "user:demo",
+                {"collectorId": "collector-cad", "collectorType": "autocad_state", "workstationId": "DEV-HOME"},
+            )
+
+            def ingest(drawing: str, event_type: str, timestamp: int) -> None:
+                service.ingest_collector_events(
+                    "user:demo",
+                    {
+                        "collectorId": "collector-cad",
+                        "events": [
+                            {
+                                "eventType": event_type,
+                                "projectId": "project-1",
+                                "drawingPath": rf"C:\\Projects\\Alpha\\{drawing}.dwg",
+                                "timestamp": timestamp,
+                            }
+                        ],
+                    },
+                )
+
+            ingest("Old", "drawing_opened", now_ms - 10 * 24 * 60 * 60 * 1000)
+            ingest("New", "drawing_opened", now_ms - 1000)
+            ledger = service.ledger
+            with ledger._read() as connection:
+                self.assertEqual(
+                    connection.execute("SELECT COUNT(*) FROM watchdog_session_trackers").fetchone()[0], 2
+                )
+
+            stats = ledger.prune_events(
+                "user:demo",
+                max_events_retained=10000,
+                max_event_age_ms=7 * 24 * 60 * 60 * 1000,
+                now_ms=now_ms,
+            )
+            self.assertEqual(stats["lastSessionsDeleted"], 1)
+            sessions = ledger.list_sessions("user:demo", since_ms=0)
+            self.assertEqual([session["drawingPath"].rsplit("\\", 1)[-1] for session in sessions], ["New.dwg"])
+            with ledger._read() as connection:
+                self.assertEqual(
+                    connection.execute("SELECT COUNT(*) FROM watchdog_session_trackers").fetchone()[0], 1
+                )
+
+            # The count cap removes the older session the same way.
+            ingest("Newer", "drawing_opened", now_ms - 500)
+            ledger.prune_events("user:demo", max_events_retained=1, now_ms=now_ms)
+            sessions = ledger.list_sessions("user:demo", since_ms=0)
+            self.assertEqual([session["drawingPath"].rsplit("\\", 1)[-1] for session in sessions], ["Newer.dwg"])
+            rebuilt = service.rebuild_sessions("user:demo")
+            self.assertEqual(rebuilt["eventsFolded"], 1)
+            self.assertEqual(len(ledger.list_sessions("user:demo", since_ms=0)), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.benchmarks import autodraft_color_sampling_benchmark as bench
+
+
+class TestAutoDraftColorSamplingBenchmarkHarness(unittest.TestCase):
+    def test_generated_page_is_deterministic(self) -> None:
+        first_image, first_bounds = bench.generate_page(20, seed=4, width=300, height=200)
+        second_image, second_bounds = bench.generate_page(20, seed=4, width=300, height=200)
+        self.assertEqual(first_bounds, second_bounds)
+        self.assertEqual(first_image.tobytes(), second_image.tobytes())
+        self.assertEqual(len(first_bounds), 20)
+
+    def test_report_compares_samplers(self) -> None:
+        report = bench.run_autodraft_color_sampling_benchmark(lines=25, iterations=2, seed=1)
+        self.assertEqual(report["name"], "autodraft_color_sampling.lines_25")
+        self.assertTrue(report["resultsMatch"])
+        self.assertEqual(sum(report["colors"].values()), 25)
+        for key in ("perLine", "batched", "prepareFallbackPerLine", "prepareFallbackBatched"):
+            self.assertGreaterEqual(report[key]["meanMs"], 0.0)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--lines", "10", "--iterations", "1", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["lineCount"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.benchmarks import batch_find_replace_benchmark as bench
+
+
+class TestBatchFindReplaceBenchmarkHarness(unittest.TestCase):
+    def test_generators_are_deterministic(self) -> None:
+        self.assertEqual(bench.generate_files(5, 20, seed=3), bench.generate_files(5, 20, seed=3))
+        rules = bench.generate_rules(30, seed=4)
+        self.assertEqual(rules, bench.generate_rules(30, seed=4))
+        self.assertTrue(any(rule["use_regex"] for rule in rules))
+        self.assertTrue(any(not rule["use_regex"] for rule in rules))
+
+    def test_compiled_engine_matches_sequential_pass(self) -> None:
+        report = bench.run_batch_find_replace_benchmark(
+            file_count=20,
+            rule_count=15,
+            lines_per_file=30,
+            iterations=1,
+            seed=9,
+            match_limit=50,
+        )
+        self.assertEqual(report["name"], "batch_find_replace.files_20.rules_15")
+        self.assertTrue(report["resultsMatch"])
+        self.assertGreater(report["replacements"], 0)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(
+                ["--files", "4", "--rules", "5", "--lines", "10", "--iterations", "1", "--output", str(output)]
+            )
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["fileCount"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,59 @@ class TestConduitRouteBenchmarkHarness(unittest.TestCase):
         with self.assertRaises(ValueError):
             bench.parse_entity_counts("100,zero,500")
 
+    def test_parse_route_engines(self) -> None:
+        self.assertEqual(bench.parse_route_engines("python, numpy,python"), ["python", "numpy"])
+        with self.assertRaises(ValueError):
+            bench.parse_route_engines("python,gpu")
+
+    def test_run_synthetic_suite_compares_route_engines(self) -> None:
+        report = bench.run_synthetic_suite(
+            entity_counts=[200],
+            iterations=1,
+            seed=7,
+            scenario="route_compute",
+            route_engines=["python", "numpy"],
+        )
+        names = [str(result.get("name")) for result in report.get("results") or []]
+        self.assertEqual(
+            names,
+            [
+                "synthetic.route_compute.entities_200",
+                "synthetic.route_compute_numpy.entities_200",
+            ],
+        )
+        self.assertEqual(report.get("routeEngines"), ["python", "numpy"])
+        for result in report.get("results") or []:
+            grid_cache = result["sampleMeta"]["gridCache"]
+            self.assertTrue(grid_cache["hit"])
+            self.assertEqual(grid_cache["misses"], 1)
+        self.assertIn("hits", report.get("gridCache") or {})
+
+    def test_run_synthetic_suite_compares_search_modes(self) -> None:
+        report = bench.run_synthetic_suite(
+            entity_counts=[200],
+            iterations=1,
+            seed=7,
+            scenario="route_search",
+            route_engines=["numpy"],
+        )
+        results = report.get("results") or []
+        self.assertEqual(
+            [str(result.get("name")) for result in results],
+            [
+                "synthetic.route_search_astar_numpy.entities_200",
+                "synthetic.route_search_bidirectional_numpy.entities_200",
+                "synthetic.route_search_hierarchical_numpy.entities_200",
+            ],
+        )
+        astar, bidirectional, hierarchical = results
+        self.assertEqual(bidirectional["sampleMeta"]["searchMode"], "bidirectional")
+        self.assertLess(bidirectional["sampleMeta"]["visitedNodes"], astar["sampleMeta"]["visitedNodes"])
+        self.assertIn("fullGridFallback", hierarchical["sampleMeta"]["hierarchical"])
+        for result in results:
+            self.assertIsInstance(result["peakMemoryBytes"], int)
+        self.assertLess(hierarchical["peakMemoryBytes"], astar["peakMemoryBytes"])
+
     def test_run_synthetic_suite_small(self) -> None:
         report = bench.run_synthetic_suite(
             entity_counts=[200],
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.benchmarks import excel_report_benchmark as bench
+
+
+class TestExcelReportBenchmarkHarness(unittest.TestCase):
+    def test_generator_is_deterministic(self) -> None:
+        self.assertEqual(bench.generate_changes(20, seed=3), bench.generate_changes(20, seed=3))
+
+    def test_streaming_writer_matches_in_memory_workbook(self) -> None:
+        report = bench.run_excel_report_benchmark(rows=300, iterations=1, seed=9)
+        self.assertEqual(report["name"], "excel_report.rows_300")
+        self.assertTrue(report["resultsMatch"])
+        self.assertLess(report["streaming"]["peakBytes"], report["inMemory"]["peakBytes"])
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--rows", "25", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["rowCount"], 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from backend.route_groups import pdf_analysis_cache, pdf_rasterizer, pdf_text_extraction
+from backend.route_groups.pdf_analysis_cache import PdfAnalysisCache, get_pdf_analysis_cache
+
+
+def make_text_pdf(text: str) -> bytes:
+    content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        env = mock.patch.dict("os.environ", {"SUITE_PDF_ANALYSIS_CACHE_DIR": str(self.root / "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def write_pdf(self, name: str, text: str) -> str:
+        path = self.root / name
+        path.write_bytes(make_text_pdf(text))
+        return str(path)
+
+
+class TestPdfAnalysisCache(CacheTestCase):
+    def test_embedded_lines_hit_after_first_extraction_and_miss_after_edit(self) -> None:
+        pdf_path = self.write_pdf("E-100.pdf", "PANEL SCHEDULE E-100")
+
+        first = pdf_text_extraction.extract_embedded_text_page_lines(pdf_path)
+        with mock.patch.object(pdf_text_extraction, "PdfReader", side_effect=AssertionError("not cached")):
+            second = pdf_text_extraction.extract_embedded_text_page_lines(pdf_path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["lines"][0]["text"], "PANEL SCHEDULE E-100")
+        stats = get_pdf_analysis_cache().stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["byKind"]["embedded_lines"]["entries"], 1)
+
+        Path(pdf_path).write_bytes(make_text_pdf("PANEL SCHEDULE E-100 REV 2"))
+        edited = pdf_text_extraction.extract_embedded_text_page_lines(pdf_path)
+        self.assertEqual(edited["lines"][0]["text"], "PANEL SCHEDULE E-100 REV 2")
+        self.assertEqual(get_pdf_analysis_cache().stats()["misses"], 2)
+
+    def test_page_render_is_copied_from_cache(self) -> None:
+        pdf_path = self.write_pdf("E-200.pdf", "E-200")
+        calls = []
+
+        def fake_pdftoppm(args, **_kwargs):
+            calls.append(args)
+            Image.new("RGB", (40, 30), "white").save(f"{args[-1]}.png")
+
+        with mock.patch.object(
+            pdf_text_extraction, "get_pdf_rasterizer", return_value=pdf_rasterizer.PdftoppmRasterizer()
+        ), mock.patch.object(pdf_rasterizer.subprocess, "run", side_effect=fake_pdftoppm):
+            first = pdf_text_extraction.render_pdf_page_to_png(pdf_path, page_index=0, output_dir=str(self.root))
+            other_dir = self.root / "second"
+            other_dir.mkdir()
+            second = pdf_text_extraction.render_pdf_page_to_png(pdf_path, page_index=0, output_dir=str(other_dir))
+
+        self.assertEqual(len(calls), 1)
+        self.assertIn(str(pdf_text_extraction.PDF_RENDER_DPI), calls[0])
+        self.assertEqual((second["image_width"], second["image_height"]), (40, 30))
+        self.assertEqual(second["path"], str(other_dir / "page.png"))
+        self.assertTrue(os.path.isfile(second["path"]))
+        self.assertEqual(first["source"], second["source"])
+
+    def test_ocr_word_data_is_reused_for_identical_images(self) -> None:
+        image_path = self.root / "page.png"
+        Image.new("RGB", (200, 100), "white").save(image_path)
+        word_data = {
+            "text": ["E-300", "REV"],
+            "left": [10, 80],
+            "top": [20, 20],
+            "width": [50, 30],
+            "height": [10, 10],
+            "conf": [95, 90],
+            "page_num": [1, 1],
+            "block_num": [1, 1],
+            "par_num": [1, 1],
+            "line_num": [1, 1],
+        }
+        with mock.patch.object(pdf_text_extraction, "pdf_ocr_available", return_value=True), mock.patch.object(
+            pdf_text_extraction.pytesseract, "image_to_data", return_value=word_data
+        ) as image_to_data:
+            first = pdf_text_extraction.extract_ocr_page_lines_from_image(str(image_path), page_width=612, page_height=306)
+            second = pdf_text_extraction.extract_ocr_page_lines_from_image(str(image_path), page_width=612, page_height=306)
+
+        self.assertEqual(image_to_data.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first["lines"][0]["text"], "E-300 REV")
+
+    def test_lru_eviction_keeps_recently_used_entries_within_budget(self) -> None:
+        cache = PdfAnalysisCache(self.root / "small", max_bytes=300)
+        payload = {"lines": ["x" * 80]}
+        keys = [cache.entry_key(f"digest-{index}", kind="embedded_lines") for index in range(4)]
+        for key in keys[:3]:
+            cache.put_json(key, "embedded_lines", payload)
+        self.assertIsNotNone(cache.get_json(keys[0], "embedded_lines"))
+        cache.put_json(keys[3], "embedded_lines", payload)
+
+        self.assertIsNone(cache.get_json(keys[1], "embedded_lines"))
+        for key in (keys[0], keys[2], keys[3]):
+            self.assertIsNotNone(cache.get_json(key, "embedded_lines"))
+        self.assertLessEqual(cache.stats()["bytes"], 300)
+
+    def test_hit_bookkeeping_is_batched_on_one_wal_connection(self) -> None:
+        cache = PdfAnalysisCache(self.root / "batched")
+        self.addCleanup(cache.close)
+        key = cache.entry_key("digest", kind="embedded_lines")
+        cache.put_json(key, "embedded_lines", {"lines": []})
+        connection = cache._conn
+
+        def stored_hits() -> int:
+            with closing(sqlite3.connect(str(cache.index_path))) as reader:
+                row = reader.execute("SELECT hits FROM counters WHERE kind = 'embedded_lines'").fetchone()
+            return int(row[0]) if row else 0
+
+        for _ in range(pdf_analysis_cache.USAGE_FLUSH_LOOKUPS - 1):
+            self.assertIsNotNone(cache.get_json(key, "embedded_lines"))
+        self.assertEqual(stored_hits(), 0)
+        self.assertIsNotNone(cache.get_json(key, "embedded_lines"))
+        self.assertEqual(stored_hits(), pdf_analysis_cache.USAGE_FLUSH_LOOKUPS)
+
+        self.assertIsNotNone(cache.get_json(key, "embedded_lines"))
+        self.assertEqual(cache.stats()["hits"], pdf_analysis_cache.USAGE_FLUSH_LOOKUPS + 1)
+        self.assertIs(cache._conn, connection)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_disabled_cache_still_extracts(self) -> None:
+        pdf_path = self.write_pdf("E-400.pdf", "E-400")
+        with mock.patch.dict("os.environ", {"SUITE_PDF_ANALYSIS_CACHE": "off"}):
+            self.assertIsNone(get_pdf_analysis_cache())
+            payload = pdf_text_extraction.extract_embedded_text_page_lines(pdf_path)
+        self.assertEqual(payload["lines"][0]["text"], "E-400")
+        self.assertFalse((self.root / "cache").exists())
+
+    def test_warm_cli_fills_cache_for_project_folder(self) -> None:
+        project = self.root / "project" / "issued"
+        project.mkdir(parents=True)
+        for name in ("E-501.pdf", "E-502.pdf"):
+            (project / name).write_bytes(make_text_pdf(name[:-4]))
+        (project / "notes.txt").write_text("skip me", encoding="utf-8")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = pdf_analysis_cache.main(["warm", str(self.root / "project"), "--pages", "2"])
+
+        self.assertEqual(exit_code, 0)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["documents"], 2)
+        self.assertEqual(report["failures"], 0)
+        self.assertEqual(report["cache"]["byKind"]["embedded_lines"]["entries"], 4)
+
+        pdf_text_extraction.extract_embedded_text_page_lines(str(project / "E-501.pdf"))
+        self.assertEqual(get_pdf_analysis_cache().stats()["hits"], 1)
+
+
+
+class TestRegionOcr(CacheTestCase):
+    def test_region_is_cropped_by_pdftoppm_and_mapped_back_to_page_points(self) -> None:
+        pdf_path = self.write_pdf("E-600.pdf", "E-600")
+        calls = []
+
+        def fake_pdftoppm(args, **_kwargs):
+            calls.append(args)
+            Image.new("RGB", (int(args[args.index("-W") + 1]), int(args[args.index("-H") + 1])), "white").save(
+                f"{args[-1]}.png"
+            )
+
+        word_data = {
+            "text": ["E-600"],
+            "left": [20],
+            "top": [10],
+            "width": [40],
+            "height": [20],
+            "conf": [91],
+            "page_num": [1],
+            "block_num": [1],
+            "par_num": [1],
+            "line_num": [1],
+        }
+        with mock.patch.object(pdf_text_extraction, "pdf_ocr_available", return_value=True), mock.patch.object(
+            pdf_text_extraction, "get_pdf_rasterizer", return_value=pdf_rasterizer.PdftoppmRasterizer()
+        ), mock.patch.object(pdf_rasterizer.subprocess, "run", side_effect=fake_pdftoppm), mock.patch.object(
+            pdf_text_extraction.pytesseract, "image_to_data", return_value=word_data
+        ):
+            payload = pdf_text_extraction.extract_ocr_region_lines(
+                pdf_path,
+                page_index=0,
+                page_height=792.0,
+                regions=[{"x": 360.0, "y": 72.0, "width": 72.0, "height": 36.0}],
+                output_dir=str(self.root),
+                dpi=144,
+            )
+            again = pdf_text_extraction.extract_ocr_region_lines(
+                pdf_path,
+                page_index=0,
+                page_height=792.0,
+                regions=[{"x": 360.0, "y": 72.0, "width": 72.0, "height": 36.0}],
+                output_dir=str(self.root),
+                dpi=144,
+            )
+
+        self.assertEqual(len(calls), 1)
+        args = calls[0]
+        self.assertEqual(
+            [args[args.index(flag) + 1] for flag in ("-r", "-x", "-y", "-W", "-H")],
+            ["144", "720", "1368", "144", "72"],
+        )
+        self.assertEqual(payload["region_count"], 1)
+        line = payload["lines"][0]
+        self.assertEqual(line["text"], "E-600")
+        self.assertEqual(line["bounds"], {"x": 370.0, "y": 93.0, "width": 20.0, "height": 10.0})
+        self.assertEqual((line["x"], line["y"]), (370.0, 93.0))
+        self.assertNotIn("pixel_bounds", line)
+        self.assertEqual(payload, again)
+        self.assertEqual(get_pdf_analysis_cache().stats()["byKind"]["region_render"]["entries"], 1)
+
+    def test_region_ocr_reports_unavailable_without_tesseract(self) -> None:
+        with mock.patch.object(pdf_text_extraction, "pdf_ocr_available", return_value=False):
+            payload = pdf_text_extraction.extract_ocr_region_lines(
+                "missing.pdf",
+                page_index=0,
+                page_height=792.0,
+                regions=[{"x": 0.0, "y": 0.0, "width": 10.0, "height": 10.0}],
+                output_dir=str(self.root),
+            )
+        self.assertEqual(payload, {"lines": [], "source": "ocr_unavailable", "region_count": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image, ImageChops, ImageStat
+
+from backend.benchmarks.pdf_rasterizer_benchmark import build_fixture_pdf
+from backend.route_groups import pdf_rasterizer, pdf_text_extraction
+from backend.route_groups.pdf_rasterizer import PdfiumRasterizer, PdftoppmRasterizer, get_pdf_rasterizer
+
+
+class TestPdfRasterizerSelection(unittest.TestCase):
+    def _availability(self, *, pdfium: bool, pdftoppm: bool):
+        return (
+            mock.patch.object(PdfiumRasterizer, "available", return_value=pdfium),
+            mock.patch.object(PdftoppmRasterizer, "available", return_value=pdftoppm),
+        )
+
+    def test_auto_prefers_in_process_backend(self) -> None:
+        pdfium, pdftoppm = self._availability(pdfium=True, pdftoppm=True)
+        with pdfium, pdftoppm, mock.patch.dict("os.environ", {pdf_rasterizer.RASTERIZER_ENV: ""}):
+            self.assertEqual(get_pdf_rasterizer().name, "pdfium")
+
+    def test_env_selects_pdftoppm_and_falls_back_when_named_backend_is_missing(self) -> None:
+        pdfium, pdftoppm = self._availability(pdfium=True, pdftoppm=True)
+        with pdfium, pdftoppm, mock.patch.dict("os.environ", {pdf_rasterizer.RASTERIZER_ENV: "pdftoppm"}):
+            self.assertEqual(get_pdf_rasterizer().name, "pdftoppm")
+
+        pdfium, pdftoppm = self._availability(pdfium=False, pdftoppm=True)
+        with pdfium, pdftoppm, mock.patch.dict("os.environ", {pdf_rasterizer.RASTERIZER_ENV: "pdfium"}):
+            self.assertEqual(get_pdf_rasterizer().name, "pdftoppm")
+
+    def test_no_backend_means_rendering_is_unavailable(self) -> None:
+        pdfium, pdftoppm = self._availability(pdfium=False, pdftoppm=False)
+        with pdfium, pdftoppm:
+            self.assertIsNone(get_pdf_rasterizer())
+
+
+class TestPdftoppmRasterizer(unittest.TestCase):
+    def test_crop_is_passed_to_pdftoppm_and_written_to_destination(self) -> None:
+        calls = []
+
+        def fake_pdftoppm(args, **_kwargs):
+            calls.append(args)
+            Image.new("RGB", (30, 20), "white").save(f"{args[-1]}.png")
+
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            pdf_rasterizer.subprocess, "run", side_effect=fake_pdftoppm
+        ):
+            output_path = str(Path(temp_dir) / "crop.png")
+            written = PdftoppmRasterizer().render_to_file(
+                "sheet.pdf",
+                page_index=1,
+                dpi=300,
+                output_path=output_path,
+                crop={"left": 10, "top": 20, "width": 30, "height": 40},
+            )
+            image = PdftoppmRasterizer().render("sheet.pdf", page_index=0, dpi=150)
+
+            self.assertTrue(written)
+            self.assertTrue(Path(output_path).is_file())
+        args = calls[0]
+        self.assertEqual(args[1:9], ["-f", "2", "-l", "2", "-r", "300", "-x", "10"])
+        self.assertEqual(args[-1], str(Path(temp_dir) / "crop"))
+        self.assertEqual((image.mode, image.size), ("RGB", (30, 20)))
+
+
+class _BrokenRasterizer(pdf_rasterizer.PdfRasterizer):
+    name = "broken"
+    engine = "broken-v1"
+
+    def available(self) -> bool:
+        return True
+
+    def render(self, pdf_path, *, page_index, dpi, crop=None):  # type: ignore[no-untyped-def]
+        raise RuntimeError("Failed to load document (PDFium: Data format error).")
+
+
+class _WhiteRasterizer(_BrokenRasterizer):
+    name = "white"
+    engine = "white-v1"
+
+    def render(self, pdf_path, *, page_index, dpi, crop=None):  # type: ignore[no-untyped-def]
+        return Image.new("RGB", (40, 30), "white")
+
+
+class TestRasterizerFallback(unittest.TestCase):
+    def test_rasterizers_must_implement_render(self) -> None:
+        class Incomplete(pdf_rasterizer.PdfRasterizer):
+            def available(self) -> bool:
+                return True
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_document_that_breaks_one_backend_is_rendered_by_the_other(self) -> None:
+        broken, white = _BrokenRasterizer(), _WhiteRasterizer()
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            pdf_text_extraction, "get_pdf_rasterizer", return_value=broken
+        ), mock.patch.object(
+            pdf_rasterizer, "available_pdf_rasterizers", return_value=[broken, white]
+        ), mock.patch.object(pdf_text_extraction, "get_pdf_analysis_cache", return_value=None):
+            rendered = pdf_text_extraction.render_pdf_page_to_png(
+                "malformed.pdf", page_index=0, output_dir=temp_dir
+            )
+            image = pdf_text_extraction.render_pdf_page_image("malformed.pdf", page_index=0)
+
+        self.assertEqual((rendered["source"], rendered["image_width"]), ("white", 40))
+        self.assertEqual(image.size, (40, 30))
+
+    def test_render_fails_when_no_other_backend_is_installed(self) -> None:
+        broken = _BrokenRasterizer()
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            pdf_text_extraction, "get_pdf_rasterizer", return_value=broken
+        ), mock.patch.object(
+            pdf_rasterizer, "available_pdf_rasterizers", return_value=[broken]
+        ), mock.patch.object(pdf_text_extraction, "get_pdf_analysis_cache", return_value=None):
+            rendered = pdf_text_extraction.render_pdf_page_to_png(
+                "malformed.pdf", page_index=0, output_dir=temp_dir
+            )
+
+        self.assertEqual(rendered["source"], "render_failed")
+
+
+@unittest.skipUnless(PdfiumRasterizer().available(), "pypdfium2 is not installed")
+class TestPdfiumRasterizer(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.pdf_path = Path(temp_dir.name) / "E1-100.pdf"
+        self.pdf_path.write_bytes(build_fixture_pdf(seed=5))
+
+    def test_full_page_matches_pdftoppm_page_size(self) -> None:
+        image = PdfiumRasterizer().render(str(self.pdf_path), page_index=0, dpi=150)
+        # 17 x 11 in. at 150 DPI.
+        self.assertEqual((image.mode, image.size), ("RGB", (2550, 1650)))
+        self.assertIsNone(PdfiumRasterizer().render(str(self.pdf_path), page_index=2, dpi=150))
+
+    def test_crop_matches_the_same_pixels_of_a_full_render(self) -> None:
+        rasterizer = PdfiumRasterizer()
+        full = rasterizer.render(str(self.pdf_path), page_index=0, dpi=150)
+        for crop in (
+            {"left": 1700, "top": 1200, "width": 600, "height": 300},
+            {"left": 2400, "top": 1600, "width": 600, "height": 300},
+        ):
+            cropped = rasterizer.render(str(self.pdf_path), page_index=0, dpi=150, crop=crop)
+            expected = full.crop(
+                (
+                    crop["left"],
+                    crop["top"],
+                    min(full.width, crop["left"] + crop["width"]),
+                    min(full.height, crop["top"] + crop["height"]),
+                )
+            )
+            self.assertEqual(cropped.size, expected.size)
+            # Sub-pixel anti-aliasing can differ slightly at the crop offset.
+            difference = ImageStat.Stat(ImageChops.difference(cropped, expected)).mean
+            self.assertLess(max(difference), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from backend.benchmarks import pdf_rasterizer_benchmark as bench
+from backend.route_groups.pdf_rasterizer import PdfRasterizer
+
+
+class _BlankRasterizer(PdfRasterizer):
+    name = "blank"
+    engine = "blank-v1"
+
+    def available(self) -> bool:
+        return True
+
+    def render(self, pdf_path, *, page_index, dpi, crop=None):  # type: ignore[no-untyped-def]
+        return Image.new("RGB", (round(17 * dpi), round(11 * dpi)), "white")
+
+
+class TestPdfRasterizerBenchmarkHarness(unittest.TestCase):
+    def test_fixture_pdfs_are_deterministic(self) -> None:
+        self.assertEqual(bench.build_fixture_pdf(seed=4), bench.build_fixture_pdf(seed=4))
+        self.assertTrue(bench.build_fixture_pdf(seed=4).startswith(b"%PDF-1.4"))
+
+    def test_report_times_each_rasterizer(self) -> None:
+        report = bench.run_pdf_rasterizer_benchmark(
+            documents=3,
+            iterations=2,
+            dpi=10,
+            seed=1,
+            rasterizers=[_BlankRasterizer()],
+        )
+        self.assertEqual(report["name"], "pdf_rasterizer.documents_3")
+        self.assertTrue(report["sizesMatch"])
+        result = report["rasterizers"]["blank"]
+        self.assertEqual((result["engine"], result["failures"]), ("blank-v1", 0))
+        self.assertGreaterEqual(result["stats"]["meanMs"], 0.0)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            bench, "available_pdf_rasterizers", return_value=[_BlankRasterizer()]
+        ):
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--documents", "2", "--iterations", "1", "--dpi", "10", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["documentCount"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from backend.benchmarks import transmittal_ocr_zone_benchmark as bench
+from backend.route_groups.pdf_rasterizer import PdfRasterizer
+
+
+class _BlankRasterizer(PdfRasterizer):
+    name = "blank"
+    engine = "blank-v1"
+
+    def available(self) -> bool:
+        return True
+
+    def render(self, pdf_path, *, page_index, dpi, crop=None):  # type: ignore[no-untyped-def]
+        if crop is not None:
+            return Image.new("RGB", (crop["width"], crop["height"]), "white")
+        return Image.new("RGB", (round(17 * dpi), round(11 * dpi)), "white")
+
+
+class TestTransmittalOcrZoneBenchmarkHarness(unittest.TestCase):
+    def test_report_compares_pixels_of_each_pass(self) -> None:
+        report = bench.run_transmittal_ocr_zone_benchmark(
+            documents=2,
+            iterations=1,
+            seed=1,
+            rasterizers=[_BlankRasterizer()],
+        )
+        self.assertEqual(report["name"], "transmittal_ocr_zone.documents_2")
+        passes = report["rasterizers"]["blank"]
+        self.assertEqual(passes["full_page"]["pixelRatio"], 1.0)
+        self.assertAlmostEqual(passes["legacy_both_corners"]["pixelRatio"], 1.008, places=2)
+        self.assertAlmostEqual(passes["right_corner"]["pixelRatio"], 0.224, places=2)
+        self.assertEqual(passes["both_corners"]["renders"], 2)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(
+            bench, "available_pdf_rasterizers", return_value=[_BlankRasterizer()]
+        ):
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--documents", "1", "--iterations", "1", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["documentCount"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
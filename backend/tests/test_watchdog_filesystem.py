@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.watchdog.filesystem import (
+    GlobMatcher,
+    compile_globs,
+    is_included,
+    matches_any,
+    scan_snapshot,
+    scan_snapshot_incremental,
+)
+
+
+def fnmatch_any(patterns: list[str], rel_path: str, name: str) -> bool:
+    return any(
+        fnmatch.fnmatchcase(candidate.lower(), pattern.replace("\\", "/").lower())
+        for pattern in patterns
+        for candidate in (rel_path, name)
+    )
+
+
+class TestGlobMatcher(unittest.TestCase):
+    def test_matches_like_fnmatch_for_suffix_literal_and_wildcard_patterns(self) -> None:
+        patterns = ["*.DWG", "plot.log", "**/node_modules/**", "E-???-*.pdf", "Sheets\\*.xlsx", "[ab]*.txt"]
+        cases = [
+            ("proj/Sheets/E-101.dwg", "E-101.dwg"),
+            ("root.dwg", "root.dwg"),
+            ("proj/logs/PLOT.LOG", "PLOT.LOG"),
+            ("proj/node_modules/pkg/index.js", "index.js"),
+            ("node_modules/pkg/index.js", "index.js"),
+            ("proj/E-101-power.pdf", "E-101-power.pdf"),
+            ("proj/E-1010-power.pdf", "E-1010-power.pdf"),
+            ("sheets/index.xlsx", "index.xlsx"),
+            ("proj/sheets/index.xlsx", "index.xlsx"),
+            ("proj/alpha.txt", "alpha.txt"),
+            ("proj/gamma.txt", "gamma.txt"),
+        ]
+        matcher = GlobMatcher(patterns)
+        for rel_path, name in cases:
+            with self.subTest(rel_path=rel_path):
+                self.assertEqual(matcher.matches(rel_path, name), fnmatch_any(patterns, rel_path, name))
+
+    def test_empty_matcher_is_falsy_and_matches_nothing(self) -> None:
+        matcher = GlobMatcher([])
+        self.assertFalse(matcher)
+        self.assertFalse(matcher.matches("a/b.dwg", "b.dwg"))
+
+    def test_compile_globs_reuses_matcher_for_same_patterns(self) -> None:
+        self.assertIs(compile_globs(["*.dwg", "*.pdf"]), compile_globs(("*.dwg", "*.pdf")))
+
+    def test_is_included_accepts_lists_and_compiled_matchers(self) -> None:
+        include = ["*.dwg"]
+        exclude = ["**/archive/**"]
+        for include_globs, exclude_globs in (
+            (include, exclude),
+            (compile_globs(include), compile_globs(exclude)),
+        ):
+            self.assertTrue(
+                is_included(
+                    rel_path="proj/a.dwg",
+                    name="a.dwg",
+                    include_globs=include_globs,
+                    exclude_globs=exclude_globs,
+                )
+            )
+            self.assertFalse(
+                is_included(
+                    rel_path="proj/archive/a.dwg",
+                    name="a.dwg",
+                    include_globs=include_globs,
+                    exclude_globs=exclude_globs,
+                )
+            )
+        self.assertTrue(matches_any(["*.PDF"], "x/y.pdf", "y.pdf"))
+
+
+def build_tree(base: Path, name: str, *, folders: int, files_per_folder: int) -> Path:
+    root = base / name
+    for folder_index in range(folders):
+        folder = root / f"area-{folder_index}" / "sheets"
+        folder.mkdir(parents=True)
+        for file_index in range(files_per_folder):
+            (folder / f"E-{file_index:03d}.dwg").write_text("x" * file_index, encoding="utf-8")
+        (folder / "notes.txt").write_text("skip", encoding="utf-8")
+    for directory in [root, *[path for path in root.rglob("*") if path.is_dir()]]:
+        os.utime(directory, (1_700_000_000, 1_700_000_000))
+    return root
+
+
+class TestScanSnapshot(unittest.TestCase):
+    def test_parallel_scan_matches_sequential_scan_across_roots(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            roots = [
+                str(build_tree(Path(temp_dir), "alpha", folders=6, files_per_folder=5)),
+                str(build_tree(Path(temp_dir), "beta", folders=3, files_per_folder=4)),
+            ]
+            options = {"roots": roots, "include_globs": ["*.dwg"], "exclude_globs": []}
+
+            sequential, sequential_meta = scan_snapshot(**options)
+            parallel, parallel_meta = scan_snapshot(**options, max_workers=4)
+            capped, capped_meta = scan_snapshot(**options, max_workers=4, max_open_directories=1)
+
+            self.assertEqual(len(sequential), 42)
+            self.assertEqual(parallel, sequential)
+            self.assertEqual(capped, sequential)
+            self.assertEqual(parallel_meta["foldersScanned"], sequential_meta["foldersScanned"])
+            self.assertEqual(parallel_meta["filesScanned"], sequential_meta["filesScanned"])
+            self.assertEqual(parallel_meta["scanWorkers"], 4)
+            self.assertEqual(capped_meta["scanWorkers"], 4)
+            timings = {timing["root"]: timing for timing in parallel_meta["rootTimings"]}
+            self.assertEqual(set(timings), set(roots))
+            self.assertEqual(timings[roots[0]]["foldersScanned"], 13)
+            self.assertEqual(timings[roots[1]]["filesScanned"], 15)
+
+    def test_parallel_incremental_scan_skips_unchanged_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = str(build_tree(Path(temp_dir), "alpha", folders=4, files_per_folder=2))
+            options = {"roots": [root], "include_globs": [], "exclude_globs": [], "max_workers": 3}
+
+            snapshot, full_meta, cache = scan_snapshot_incremental(
+                **options, previous_snapshot={}, directory_cache=None, full_sweep=True
+            )
+            again, meta, _ = scan_snapshot_incremental(
+                **options, previous_snapshot=snapshot, directory_cache=cache
+            )
+
+            self.assertEqual(full_meta["directoriesRead"], 9)
+            self.assertEqual(meta["directoriesSkipped"], 9)
+            self.assertEqual(meta["directoriesRead"], 0)
+            self.assertEqual(again, snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import gzip
 import json
+import os
+import shutil
+import sys
 import tempfile
+import threading
 import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+from backend.watchdog.change_watch import WatchBatch, create_change_watcher
+
 from backend.watchdog.filesystem_collector import (
     FilesystemCollector,
     FilesystemCollectorConfig,
+    FilesystemCollectorStateStore,
+    WatchdogCollectorApiClient,
     load_collector_config,
 )
 
@@ -47,17 +57,100 @@ class FakeCollectorApiClient:
         return {"ok": True, "accepted": len(events), "duplicates": 0}
 
 
-def make_config(temp_dir: str, root: Path) -> FilesystemCollectorConfig:
-    return FilesystemCollectorConfig(
-        backend_url="http://127.0.0.1:5000",
-        api_key="valid-key",
-        collector_id="collector-a",
-        workstation_id="DEV-HOME",
-        roots=[str(root)],
-        buffer_dir=Path(temp_dir) / "collector-state",
-        scan_interval_ms=1_000,
-        heartbeat_ms=5_000,
-    )
+class FakeChangeWatcher:
+    def __init__(self) -> None:
+        self.batches: list[WatchBatch] = []
+        self.closed = False
+
+    def push(self, *paths: Path, overflowed: bool = False) -> None:
+        self.batches.append(WatchBatch(paths={str(path) for path in paths}, overflowed=overflowed))
+
+    def poll(self, timeout_seconds: float = 0.0) -> WatchBatch:
+        return self.batches.pop(0) if self.batches else WatchBatch()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+
+class RecordingCollectorBackend:
+    """Keep-alive HTTP server that records collector requests."""
+
+    def __init__(
+        self,
+        *,
+        reject_gzip: bool = False,
+        gzip_reject_status: int = 415,
+        gzip_reject_error: str = "unsupported encoding",
+    ) -> None:
+        self.requests: list[dict] = []
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                encoding = self.headers.get("Content-Encoding") or ""
+                backend.requests.append(
+                    {"path": self.path, "encoding": encoding, "client": self.client_address, "size": len(body)}
+                )
+                if encoding == "gzip" and reject_gzip:
+                    self._reply(gzip_reject_status, {"ok": False, "error": gzip_reject_error})
+                    return
+                payload = json.loads(gzip.decompress(body) if encoding == "gzip" else body)
+                events = payload.get("events") or []
+                self._reply(200, {"ok": True, "accepted": len(events), "duplicates": 0})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "RecordingCollectorBackend":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_config(temp_dir: str, root: Path, **overrides) -> FilesystemCollectorConfig:
+    settings = {
+        "backend_url": "http://127.0.0.1:5000",
+        "api_key": "valid-key",
+        "collector_id": "collector-a",
+        "workstation_id": "DEV-HOME",
+        "roots": [str(root)],
+        "buffer_dir": Path(temp_dir) / "collector-state",
+        "scan_interval_ms": 1_000,
+        "heartbeat_ms": 5_000,
+        **overrides,
+    }
+    return FilesystemCollectorConfig(**settings)
+
+
+def backdate_directories(root: Path, *, settled_at: float = 1_700_000_000.0) -> None:
+    for directory in [root, *[path for path in root.rglob("*") if path.is_dir()]]:
+        os.utime(directory, (settled_at, settled_at))
 
 
 class TestFilesystemCollector(unittest.TestCase):
@@ -209,6 +302,359 @@ class TestFilesystemCollector(unittest.TestCase):
             self.assertEqual(len(pending_events), 1)
             self.assertEqual(str(pending_events[0].get("eventType") or ""), "file_added")
 
+    def test_incremental_scan_rereads_only_directories_with_changed_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            (root / "alpha").mkdir(parents=True)
+            (root / "beta").mkdir()
+            (root / "alpha" / "a.txt").write_text("a", encoding="utf-8")
+            (root / "beta" / "b.txt").write_text("b", encoding="utf-8")
+            backdate_directories(root)
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, incremental_scan=True),
+                api_client=FakeCollectorApiClient(),
+            )
+
+            baseline = collector.scan_once()
+            unchanged = collector.scan_once()
+            (root / "alpha" / "added.txt").write_text("new", encoding="utf-8")
+            changed = collector.scan_once()
+
+            self.assertTrue(baseline["baseline"])
+            self.assertEqual(baseline["scanMode"], "full")
+            self.assertEqual(baseline["directoriesRead"], 3)
+            self.assertEqual(unchanged["scanMode"], "incremental")
+            self.assertEqual(unchanged["directoriesSkipped"], 3)
+            self.assertEqual(unchanged["directoriesRead"], 0)
+            self.assertEqual(unchanged["queued"], 0)
+            self.assertEqual(changed["directoriesRead"], 1)
+            self.assertEqual(changed["directoriesSkipped"], 2)
+            self.assertEqual(changed["queued"], 1)
+            pending_events = list(collector.state_store.load().get("pendingEvents") or [])
+            self.assertEqual(str(pending_events[0].get("eventType") or ""), "file_added")
+            self.assertEqual(len(collector.state_store.load().get("snapshot") or {}), 3)
+
+    def test_incremental_scan_full_sweep_catches_in_place_edits(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            root.mkdir()
+            tracked_file = root / "tracked.txt"
+            tracked_file.write_text("one", encoding="utf-8")
+            backdate_directories(root)
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, incremental_scan=True),
+                api_client=FakeCollectorApiClient(),
+            )
+            collector.scan_once()
+
+            tracked_file.write_text("one-two", encoding="utf-8")
+            backdate_directories(root)
+            skipped = collector.scan_once()
+
+            state = collector.state_store.load()
+            state["lastFullScanAt"] = 0
+            collector.state_store.save(state)
+            swept = collector.scan_once()
+
+            self.assertEqual(skipped["queued"], 0)
+            self.assertEqual(skipped["directoriesSkipped"], 1)
+            self.assertEqual(swept["scanMode"], "full")
+            self.assertEqual(swept["queued"], 1)
+            pending_events = list(collector.state_store.load().get("pendingEvents") or [])
+            self.assertEqual(str(pending_events[0].get("eventType") or ""), "file_modified")
+
+    def test_watch_mode_turns_notifications_into_snapshot_events(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            (root / "sheets").mkdir(parents=True)
+            tracked_file = root / "sheets" / "E-101.dwg"
+            tracked_file.write_text("one", encoding="utf-8")
+            watcher = FakeChangeWatcher()
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, watch_changes=True, watch_debounce_ms=0),
+                api_client=FakeCollectorApiClient(),
+                watcher_factory=lambda roots: watcher,
+            )
+
+            baseline = collector.capture_changes_once()
+            tracked_file.write_text("one-two", encoding="utf-8")
+            (root / "sheets" / "E-102.dwg").write_text("new", encoding="utf-8")
+            (root / "xrefs").mkdir()
+            (root / "xrefs" / "base.dwg").write_text("x", encoding="utf-8")
+            watcher.push(tracked_file, root / "sheets" / "E-102.dwg", root / "xrefs")
+            result = collector.capture_changes_once()
+
+            self.assertEqual(baseline["captureMode"], "reconcile")
+            self.assertEqual(baseline["reconcileReason"], "baseline")
+            self.assertEqual(result["captureMode"], "watch")
+            self.assertEqual(result["queued"], 3)
+            pending_events = list(collector.state_store.load().get("pendingEvents") or [])
+            self.assertEqual(
+                sorted(str(event.get("eventType")) for event in pending_events),
+                ["file_added", "file_added", "file_modified"],
+            )
+            self.assertEqual({event["metadata"]["syncMode"] for event in pending_events}, {"watch"})
+            self.assertEqual(len(collector.state_store.load().get("snapshot") or {}), 3)
+
+            shutil.rmtree(root / "xrefs")
+            watcher.push(root / "xrefs")
+            removed = collector.capture_changes_once()
+            self.assertEqual(removed["queued"], 1)
+            self.assertEqual(len(collector.state_store.load().get("snapshot") or {}), 2)
+
+    def test_watch_mode_debounces_save_storms_and_reconciles_on_overflow(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            root.mkdir()
+            drawing = root / "E-101.dwg"
+            drawing.write_text("v0", encoding="utf-8")
+            watcher = FakeChangeWatcher()
+            clock = FakeClock()
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, watch_changes=True, watch_debounce_ms=2_000),
+                api_client=FakeCollectorApiClient(),
+                time_module=clock,
+                watcher_factory=lambda roots: watcher,
+            )
+            collector.capture_changes_once()
+
+            results = []
+            for revision in range(1, 4):
+                drawing.write_text("v" * (revision + 1), encoding="utf-8")
+                watcher.push(drawing)
+                clock.now += 0.5
+                results.append(collector.capture_changes_once())
+            clock.now += 2.5
+            settled = collector.capture_changes_once()
+
+            self.assertEqual([result["queued"] for result in results], [0, 0, 0])
+            self.assertEqual(results[-1]["pendingPaths"], 1)
+            self.assertEqual(settled["queued"], 1)
+            self.assertEqual(settled["pendingPaths"], 0)
+
+            (root / "missed.dwg").write_text("x", encoding="utf-8")
+            watcher.push(overflowed=True)
+            overflow = collector.capture_changes_once()
+            self.assertEqual(overflow["captureMode"], "reconcile")
+            self.assertEqual(overflow["reconcileReason"], "overflow")
+            self.assertEqual(overflow["queued"], 1)
+
+    def test_watch_mode_falls_back_to_scans_without_a_watcher(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            root.mkdir()
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, watch_changes=True),
+                api_client=FakeCollectorApiClient(),
+                watcher_factory=lambda roots: None,
+            )
+
+            result = collector.run_once()
+
+            self.assertEqual(result["scan"]["captureMode"], "scan")
+            self.assertTrue(result["scan"]["watchUnavailable"])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher_reports_new_files_in_new_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watcher = create_change_watcher([temp_dir])
+            if watcher is None:
+                self.skipTest("inotify unavailable")
+            try:
+                nested = Path(temp_dir) / "nested"
+                nested.mkdir()
+                first = watcher.poll(1.0)
+                (nested / "a.dwg").write_text("x", encoding="utf-8")
+                second = watcher.poll(1.0)
+            finally:
+                watcher.close()
+
+            self.assertIn(str(nested), first.paths)
+            self.assertIn(str(nested / "a.dwg"), second.paths)
+            self.assertFalse(second.overflowed)
+
+
+    def test_flush_grows_batches_to_drain_a_backlog_in_one_call(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "root"
+            root.mkdir()
+            (root / "seed.txt").write_text("seed", encoding="utf-8")
+            api_client = FakeCollectorApiClient()
+            collector = FilesystemCollector(
+                make_config(temp_dir, root, batch_size=2),
+                api_client=api_client,
+            )
+            collector.run_once()
+            api_client.send_calls.clear()
+
+            for index in range(40):
+                (root / f"sheet-{index:02d}.dwg").write_text("x", encoding="utf-8")
+            collector.scan_once()
+            result = collector.flush_pending_events()
+
+            self.assertEqual(result["accepted"], 40)
+            self.assertEqual(result["pending"], 0)
+            self.assertEqual([len(batch) for batch in api_client.send_calls], [2, 4, 8, 16, 10])
+            self.assertEqual(result["batchSize"], 32)
+            self.assertEqual(collector.state_store.load().get("pendingEvents"), [])
+
+class TestFilesystemCollectorStateStore(unittest.TestCase):
+    def test_legacy_json_state_migrates_on_first_load(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = Path(temp_dir) / "state.json"
+            json_path.write_text(
+                json.dumps(
+                    {
+                        "version": 1,
+                        "nextSequence": 7,
+                        "lastStatus": "online",
+                        "snapshot": {"c:/a.dwg": {"path": "C:/a.dwg", "sizeBytes": 1, "mtimeMs": 2}},
+                        "pendingEvents": [{"sequence": 5, "eventKey": "k5"}, {"sequence": 6, "eventKey": "k6"}],
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            state = FilesystemCollectorStateStore(json_path).load()
+
+            self.assertEqual(state["nextSequence"], 7)
+            self.assertEqual(list(state["snapshot"]), ["c:/a.dwg"])
+            self.assertEqual([event["sequence"] for event in state["pendingEvents"]], [5, 6])
+            self.assertFalse(json_path.exists())
+            self.assertTrue((Path(temp_dir) / "state.json.migrated").is_file())
+            self.assertTrue((Path(temp_dir) / "state.sqlite3").is_file())
+            reopened = FilesystemCollectorStateStore(json_path).load()
+            self.assertEqual(reopened["lastStatus"], "online")
+            self.assertEqual(len(reopened["pendingEvents"]), 2)
+
+    def test_save_writes_only_changed_entries_and_acks_by_sequence(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FilesystemCollectorStateStore(Path(temp_dir) / "state.json")
+            state = store.load()
+            state["snapshot"] = {f"file-{index}": {"sizeBytes": index} for index in range(100)}
+            state["pendingEvents"] = [{"sequence": sequence} for sequence in (1, 2, 3)]
+            store.save(state)
+            self.assertEqual(store.last_save["entriesUpserted"], 100)
+            self.assertEqual(store.last_save["eventsQueued"], 3)
+
+            state = store.load()
+            state["snapshot"] = dict(state["snapshot"])
+            state["snapshot"]["file-1"] = {"sizeBytes": 999}
+            del state["snapshot"]["file-2"]
+            state["pendingEvents"] = state["pendingEvents"][2:] + [{"sequence": 4}]
+            store.save(state)
+
+            self.assertEqual(store.last_save["entriesUpserted"], 1)
+            self.assertEqual(store.last_save["entriesDeleted"], 1)
+            self.assertEqual(store.last_save["eventsQueued"], 1)
+            self.assertEqual(store.last_save["eventsAcked"], 2)
+            reloaded = FilesystemCollectorStateStore(store.state_path).load()
+            self.assertEqual(len(reloaded["snapshot"]), 99)
+            self.assertEqual(reloaded["snapshot"]["file-1"], {"sizeBytes": 999})
+            self.assertEqual([event["sequence"] for event in reloaded["pendingEvents"]], [3, 4])
+
+    def test_status_file_mirrors_values_pending_count_and_requested_sections(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FilesystemCollectorStateStore(
+                Path(temp_dir) / "state.json",
+                status_sections=("snapshot",),
+            )
+            state = store.load()
+            state["snapshot"] = {"sourceAvailable": True, "lastCheckedAt": 1234}
+            state["pendingEvents"] = [{"sequence": 1}, {"sequence": 2}]
+            state["lastStatus"] = "online"
+            store.save(state)
+
+            status = json.loads(store.status_path.read_text(encoding="utf-8"))
+
+            self.assertEqual(status["pendingCount"], 2)
+            self.assertEqual(status["lastStatus"], "online")
+            self.assertEqual(status["snapshot"], {"sourceAvailable": True, "lastCheckedAt": 1234})
+            self.assertNotIn("directoryCache", status)
+
+    def test_store_keeps_one_connection_until_closed(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = FilesystemCollectorStateStore(Path(temp_dir) / "state.json")
+            try:
+                state = store.load()
+                connection = store._connection
+                for sequence in range(1, 4):
+                    state["pendingEvents"] = [{"sequence": sequence}]
+                    store.save(state)
+                    state = store.load()
+                self.assertIs(store._connection, connection)
+
+                store.close()
+                self.assertIsNone(store._connection)
+                self.assertEqual([event["sequence"] for event in store.load()["pendingEvents"]], [3])
+            finally:
+                store.close()
+
+
+class TestWatchdogCollectorApiClient(unittest.TestCase):
+    def _events(self, count: int) -> list[dict]:
+        return [
+            {"eventKey": f"evt-{index}", "eventType": "file_added", "path": f"C:/Projects/PROJ-00001/sheet-{index}.dwg"}
+            for index in range(count)
+        ]
+
+    def test_requests_share_one_connection_and_gzip_event_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, RecordingCollectorBackend() as backend:
+            client = WatchdogCollectorApiClient(
+                make_config(temp_dir, Path(temp_dir), backend_url=backend.url),
+            )
+            try:
+                client.register()
+                result = client.send_events(self._events(50))
+                client.send_events(self._events(1))
+                client.heartbeat(status="online", sequence=1, metadata={})
+            finally:
+                client.close()
+
+        self.assertEqual(result["accepted"], 50)
+        self.assertEqual(len({entry["client"] for entry in backend.requests}), 1)
+        self.assertEqual(client.transport_stats["connectionsOpened"], 1)
+        self.assertEqual([entry["encoding"] for entry in backend.requests], ["", "gzip", "", ""])
+        self.assertLess(client.transport_stats["bytesSent"], client.transport_stats["bytesBeforeCompression"])
+
+    def test_gzip_rejection_falls_back_to_plain_json(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir, RecordingCollectorBackend(reject_gzip=True) as backend:
+            client = WatchdogCollectorApiClient(
+                make_config(temp_dir, Path(temp_dir), backend_url=backend.url),
+            )
+            try:
+                first = client.send_events(self._events(50))
+                second = client.send_events(self._events(50))
+            finally:
+                client.close()
+
+        self.assertEqual(first["accepted"], 50)
+        self.assertEqual(second["accepted"], 50)
+        self.assertFalse(client.gzip_enabled)
+        self.assertEqual([entry["encoding"] for entry in backend.requests], ["gzip", "", ""])
+
+    def test_only_encoding_errors_disable_gzip(self) -> None:
+        cases = [
+            ("Content-Encoding gzip is not supported", False),
+            ("events must be a list", True),
+        ]
+        for error, stays_enabled in cases:
+            with self.subTest(error=error), tempfile.TemporaryDirectory() as temp_dir, RecordingCollectorBackend(
+                reject_gzip=True, gzip_reject_status=400, gzip_reject_error=error
+            ) as backend:
+                client = WatchdogCollectorApiClient(
+                    make_config(temp_dir, Path(temp_dir), backend_url=backend.url),
+                )
+                try:
+                    if stays_enabled:
+                        with self.assertRaisesRegex(RuntimeError, "events must be a list"):
+                            client.send_events(self._events(50))
+                    else:
+                        self.assertEqual(client.send_events(self._events(50))["accepted"], 50)
+                finally:
+                    client.close()
+                self.assertEqual(client.gzip_enabled, stays_enabled)
+
 
 if __name__ == "__main__":
     unittest.main()
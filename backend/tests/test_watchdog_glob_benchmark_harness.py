@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.benchmarks import watchdog_glob_benchmark as bench
+
+
+class TestWatchdogGlobBenchmarkHarness(unittest.TestCase):
+    def test_generate_paths_is_deterministic(self) -> None:
+        first = bench.generate_paths(300, seed=5)
+        second = bench.generate_paths(300, seed=5)
+        self.assertEqual(first, second)
+        self.assertTrue(all(rel_path.endswith(name) for rel_path, name in first))
+
+    def test_run_glob_benchmark_compiled_matches_fnmatch(self) -> None:
+        report = bench.run_glob_benchmark(path_count=5000, iterations=1, seed=11)
+        self.assertEqual(report["name"], "watchdog.glob_match.paths_5000")
+        self.assertTrue(report["resultsMatch"])
+        self.assertGreater(report["compiled"]["included"], 0)
+        self.assertLess(report["compiled"]["included"], 5000)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--paths", "200", "--iterations", "1", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["pathCount"], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.benchmarks import watchdog_ingest_benchmark as bench
+
+
+class TestWatchdogIngestBenchmarkHarness(unittest.TestCase):
+    def test_generate_events_repeats_keys_for_duplicates(self) -> None:
+        events = bench.generate_events(500, duplicate_ratio=0.2, seed=3)
+        keys = [event["eventKey"] for event in events]
+        self.assertEqual(len(events), 500)
+        self.assertLess(len(set(keys)), len(keys))
+
+    def test_run_ingest_benchmark_reports_inserted_and_duplicates(self) -> None:
+        report = bench.run_ingest_benchmark(
+            event_count=10000,
+            batch_size=2500,
+            duplicate_ratio=0.1,
+            iterations=1,
+            seed=11,
+            max_events_retained=20000,
+        )
+        keys = {event["eventKey"] for event in bench.generate_events(10000, duplicate_ratio=0.1, seed=11)}
+        self.assertEqual(report["name"], "watchdog.insert_events.events_10000.batch_2500")
+        self.assertEqual(report["sampleMeta"]["inserted"], len(keys))
+        self.assertEqual(report["sampleMeta"]["duplicates"], 10000 - len(keys))
+        self.assertGreater(report["stats"]["meanMs"], 0.0)
+
+    def test_main_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = Path(temp_dir) / "report.json"
+            exit_code = bench.main(["--events", "200", "--iterations", "1", "--output", str(output)])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(output.read_text(encoding="utf-8"))
+            self.assertEqual(payload["eventCount"], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+
+from backend.watchdog.store import EVENT_KEY_LOOKUP_CHUNK, WatchdogLedger
+
+HOUR_MS = 60 * 60 * 1000
+BASE_MS = 1_700_000_000_000 - (1_700_000_000_000 % HOUR_MS)
+
+
+def make_ledger(temp_dir: str) -> WatchdogLedger:
+    return WatchdogLedger(db_path=os.path.join(temp_dir, "watchdog.sqlite3"))
+
+
+class TestWatchdogLedgerInsertEvents(unittest.TestCase):
+    def test_batch_deduplicates_repeated_keys_within_and_across_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            first = ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=[
+                    {"eventKey": "evt-1", "eventType": "file_added", "timestamp": BASE_MS + 1},
+                    {"eventKey": "evt-2", "eventType": "file_added", "timestamp": BASE_MS + 2},
+                    {"eventKey": "evt-1", "eventType": "file_added", "timestamp": BASE_MS + 3},
+                    {"eventType": "file_added", "timestamp": BASE_MS + 4},
+                ],
+                max_events_retained=1000,
+            )
+            self.assertEqual([event["eventId"] for event in first["events"]], [1, 2, 3])
+            self.assertEqual(first["duplicates"], 1)
+            self.assertEqual(first["nextEventId"], 4)
+
+            second = ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=[
+                    {"eventKey": "evt-2", "eventType": "file_added", "timestamp": BASE_MS + 5},
+                    {"eventKey": "evt-3", "eventType": "file_added", "timestamp": BASE_MS + 6},
+                ],
+                max_events_retained=1000,
+            )
+            self.assertEqual([event["eventKey"] for event in second["events"]], ["evt-3"])
+            self.assertEqual(second["duplicates"], 1)
+
+            other_collector = ledger.insert_events(
+                "user:demo",
+                collector_id="collector-b",
+                events=[{"eventKey": "evt-1", "eventType": "file_added", "timestamp": BASE_MS + 7}],
+                max_events_retained=1000,
+            )
+            self.assertEqual(len(other_collector["events"]), 1)
+
+    def test_key_lookup_spans_multiple_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            count = (EVENT_KEY_LOOKUP_CHUNK * 2) + 7
+            events = [
+                {"eventKey": f"evt-{index}", "eventType": "file_added", "timestamp": BASE_MS + index}
+                for index in range(count)
+            ]
+            first = ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=events,
+                max_events_retained=count * 2,
+            )
+            self.assertEqual(len(first["events"]), count)
+
+            replay = ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=events,
+                max_events_retained=count * 2,
+            )
+            self.assertEqual(replay["events"], [])
+            self.assertEqual(replay["duplicates"], count)
+
+    def test_rollups_aggregate_per_bucket(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=[
+                    {"eventType": "file_modified", "projectId": "PROJ-00001", "timestamp": BASE_MS + 10},
+                    {"eventType": "file_modified", "projectId": "PROJ-00001", "timestamp": BASE_MS + 30},
+                    {"eventType": "file_modified", "projectId": "PROJ-00001", "timestamp": BASE_MS + 20},
+                    {"eventType": "file_modified", "projectId": "PROJ-00001", "timestamp": BASE_MS + HOUR_MS},
+                ],
+                max_events_retained=1000,
+            )
+            ledger.insert_events(
+                "user:demo",
+                collector_id="collector-a",
+                events=[
+                    {"eventType": "file_modified", "projectId": "PROJ-00001", "timestamp": BASE_MS + 5},
+                ],
+                max_events_retained=1000,
+            )
+
+            rollups = ledger.list_rollups("user:demo", since_ms=BASE_MS, project_id="PROJ-00001")
+            self.assertEqual(
+                [(row["bucketStartMs"], row["eventCount"], row["latestEventAt"]) for row in rollups],
+                [(BASE_MS, 4, BASE_MS + 30), (BASE_MS + HOUR_MS, 1, BASE_MS + HOUR_MS)],
+            )
+
+
+class TestWatchdogLedgerRetention(unittest.TestCase):
+    @staticmethod
+    def _events(start: int, count: int, *, timestamp_ms: int = BASE_MS) -> list:
+        return [
+            {"eventKey": f"evt-{index}", "eventType": "file_added", "timestamp": timestamp_ms + index}
+            for index in range(start, start + count)
+        ]
+
+    def test_count_retention_prunes_oldest_in_chunks_when_due(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = WatchdogLedger(
+                db_path=os.path.join(temp_dir, "watchdog.sqlite3"),
+                prune_every_events=50,
+                prune_interval_ms=10**12,
+                prune_chunk_size=7,
+            )
+            ledger.insert_events("user:demo", collector_id="c", events=self._events(0, 10), max_events_retained=20)
+            ledger.insert_events("user:demo", collector_id="c", events=self._events(10, 30), max_events_retained=20)
+            # Below the insert threshold the overflow is left for the next pass.
+            self.assertEqual(ledger.list_events("user:demo", limit=1000, after_event_id=0)["count"], 40)
+
+            ledger.insert_events("user:demo", collector_id="c", events=self._events(40, 20), max_events_retained=20)
+            listed = ledger.list_events("user:demo", limit=1000, after_event_id=0)
+            self.assertEqual([event["eventId"] for event in listed["events"]], list(range(41, 61)))
+
+            stats = ledger.prune_stats("user:demo")
+            self.assertEqual(stats["lastDeletedByCount"], 40)
+            self.assertEqual(stats["lastChunks"], 6)
+            self.assertEqual(stats["pendingInserts"], 0)
+
+            # Pruned keys no longer count as duplicates.
+            replay = ledger.insert_events("user:demo", collector_id="c", events=self._events(0, 1), max_events_retained=20)
+            self.assertEqual(len(replay["events"]), 1)
+
+    def test_age_retention_removes_expired_events(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            ledger.insert_events(
+                "user:demo",
+                collector_id="c",
+                events=self._events(0, 5, timestamp_ms=BASE_MS) + self._events(5, 3, timestamp_ms=BASE_MS + HOUR_MS),
+                max_events_retained=1000,
+            )
+            stats = ledger.prune_events(
+                "user:demo",
+                max_events_retained=1000,
+                max_event_age_ms=HOUR_MS,
+                now_ms=BASE_MS + (2 * HOUR_MS) - 1,
+            )
+            self.assertEqual(stats["lastDeletedByAge"], 5)
+            self.assertEqual(stats["lastDeletedByCount"], 0)
+            listed = ledger.list_events("user:demo", limit=1000, after_event_id=0)
+            self.assertEqual([event["eventKey"] for event in listed["events"]], ["evt-5", "evt-6", "evt-7"])
+
+    def test_count_threshold_comes_from_the_newest_event_id(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            ledger.insert_events("user:demo", collector_id="c", events=self._events(0, 30), max_events_retained=1000)
+            stats = ledger.prune_events("user:demo", max_events_retained=12)
+            self.assertEqual(stats["lastDeletedByCount"], 18)
+            listed = ledger.list_events("user:demo", limit=1000, after_event_id=0)
+            self.assertEqual([event["eventId"] for event in listed["events"]], list(range(19, 31)))
+
+            with ledger._read() as connection:
+                plans = [
+                    " ".join(row["detail"] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", ("user:demo",)))
+                    for sql in (
+                        "SELECT MAX(event_id) AS event_id FROM watchdog_events WHERE user_key = ?",
+                        "SELECT MIN(event_id) AS event_id FROM watchdog_events WHERE user_key = ?",
+                    )
+                ]
+            for plan in plans:
+                self.assertNotIn("SCAN", plan)
+
+
+class TestWatchdogLedgerConnectionPool(unittest.TestCase):
+    def test_calls_reuse_pooled_connections_across_threads(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            try:
+                ledger.list_collectors("user:demo")
+                ledger.list_project_rules("user:demo")
+                ledger.list_rollups("user:demo", since_ms=0)
+                metrics = ledger.pool_metrics()
+                self.assertEqual(metrics["connectionsOpened"], 1)
+                self.assertEqual(metrics["connectionReuses"], 3)
+                self.assertEqual(metrics["reads"], 3)
+                self.assertEqual(metrics["openConnections"], 1)
+
+                # A thread per request, as the threaded dev server does.
+                for _ in range(20):
+                    request_thread = threading.Thread(target=ledger.list_collectors, args=("user:demo",))
+                    request_thread.start()
+                    request_thread.join()
+                metrics = ledger.pool_metrics()
+                self.assertEqual(metrics["connectionsOpened"], 1)
+                self.assertEqual(metrics["connectionReuses"], 23)
+            finally:
+                ledger.close()
+
+    def test_concurrent_callers_get_their_own_connection(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            try:
+                inside = threading.Barrier(2, timeout=5)
+                seen: list = []
+
+                def hold_read() -> None:
+                    with ledger._read() as connection:
+                        seen.append(connection)
+                        inside.wait()
+
+                threads = [threading.Thread(target=hold_read) for _ in range(2)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertIsNot(seen[0], seen[1])
+                self.assertEqual(ledger.pool_metrics()["openConnections"], 2)
+            finally:
+                ledger.close()
+
+    def test_reads_do_not_wait_for_the_write_lock(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            try:
+                ledger.insert_events(
+                    "user:demo",
+                    collector_id="c",
+                    events=[{"eventKey": "evt-1", "eventType": "file_added", "timestamp": BASE_MS}],
+                    max_events_retained=100,
+                )
+                results: list = []
+                with ledger._write():
+                    reader = threading.Thread(
+                        target=lambda: results.append(ledger.count_events("user:demo")),
+                    )
+                    reader.start()
+                    reader.join(timeout=5)
+                    self.assertFalse(reader.is_alive())
+                self.assertEqual(results, [1])
+            finally:
+                ledger.close()
+
+    def test_listing_events_for_a_new_user_writes_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            try:
+                listed = ledger.list_events("user:new", limit=10, after_event_id=0)
+                self.assertEqual((listed["events"], listed["nextEventId"]), ([], 1))
+                with ledger._read() as connection:
+                    stored = connection.execute("SELECT COUNT(*) FROM watchdog_user_state").fetchone()[0]
+                self.assertEqual(stored, 0)
+            finally:
+                ledger.close()
+
+    def test_close_reopens_on_next_call(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ledger = make_ledger(temp_dir)
+            ledger.list_collectors("user:demo")
+            ledger.close()
+            self.assertEqual(ledger.pool_metrics()["openConnections"], 0)
+            self.assertEqual(ledger.list_collectors("user:demo"), [])
+            ledger.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
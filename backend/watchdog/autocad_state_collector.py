@@ -10,7 +10,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, Mapping
 
-from .filesystem_collector import FilesystemCollectorStateStore, WatchdogCollectorApiClient
+from .filesystem_collector import (
+    FilesystemCollectorStateStore,
+    WatchdogCollectorApiClient,
+    drain_pending_events,
+)
 
 
 def _default_state_json_path() -> Path:
@@ -47,6 +51,19 @@ def _split_string_list(raw_value: Any) -> list[str]:
     return [str(raw_value).strip()] if str(raw_value).strip() else []
 
 
+def _parse_bool(raw_value: Any, *, default: bool = False) -> bool:
+    if raw_value is None or raw_value == "":
+        return default
+    if isinstance(raw_value, bool):
+        return raw_value
+    text = str(raw_value).strip().lower()
+    if text in {"true", "1", "yes", "y", "on"}:
+        return True
+    if text in {"false", "0", "no", "n", "off"}:
+        return False
+    return default
+
+
 def _optional_text(value: Any) -> str | None:
     if value is None:
         return None
@@ -207,6 +224,8 @@ class AutoCadStateCollectorConfig:
     heartbeat_ms: int = 15_000
     poll_interval_ms: int = 5_000
     batch_size: int = 100
+    gzip_requests: bool = True
+    flush_budget_ms: int = 2_000
     buffer_dir: Path | str | None = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -223,6 +242,8 @@ class AutoCadStateCollectorConfig:
         self.heartbeat_ms = max(1_000, int(self.heartbeat_ms))
         self.poll_interval_ms = max(1_000, int(self.poll_interval_ms))
         self.batch_size = max(1, min(500, int(self.batch_size)))
+        self.gzip_requests = _parse_bool(self.gzip_requests, default=True)
+        self.flush_budget_ms = max(0, int(self.flush_budget_ms))
         self.collector_name = (
             str(self.collector_name).strip()
             if self.collector_name
@@ -264,6 +285,8 @@ class AutoCadStateCollectorConfig:
             heartbeat_ms=int(payload.get("heartbeatMs") or 15_000),
             poll_interval_ms=int(payload.get("pollIntervalMs") or 5_000),
             batch_size=int(payload.get("batchSize") or 100),
+            gzip_requests=_parse_bool(payload.get("gzipRequests"), default=True),
+            flush_budget_ms=int(payload.get("flushBudgetMs") or 2_000),
             buffer_dir=payload.get("bufferDir"),
             capabilities=tuple(
                 _split_string_list(payload.get("capabilities"))
@@ -299,6 +322,8 @@ def load_autocad_state_collector_config(
         "heartbeatMs": source_env.get("WATCHDOG_AUTOCAD_HEARTBEAT_MS"),
         "pollIntervalMs": source_env.get("WATCHDOG_AUTOCAD_POLL_INTERVAL_MS"),
         "batchSize": source_env.get("WATCHDOG_AUTOCAD_BATCH_SIZE"),
+        "gzipRequests": source_env.get("WATCHDOG_AUTOCAD_GZIP_REQUESTS"),
+        "flushBudgetMs": source_env.get("WATCHDOG_AUTOCAD_FLUSH_BUDGET_MS"),
         "bufferDir": source_env.get("WATCHDOG_AUTOCAD_BUFFER_DIR"),
     }
     metadata_raw = source_env.get("WATCHDOG_AUTOCAD_METADATA")
@@ -324,9 +349,13 @@ class AutoCadStateCollector:
     ) -> None:
         self.config = config
         self.api_client = api_client or WatchdogCollectorApiClient(config)
-        self.state_store = state_store or FilesystemCollectorStateStore(config.state_path)
+        self.state_store = state_store or FilesystemCollectorStateStore(
+            config.state_path,
+            status_sections=("snapshot",),
+        )
         self.time = time_module
         self._registration_verified = False
+        self._flush_batch_size = config.batch_size
         self._autocad_process_checker = (
             autocad_process_checker or self._default_autocad_process_checker
         )
@@ -779,28 +808,16 @@ class AutoCadStateCollector:
         }
 
     def flush_pending_events(self) -> Dict[str, Any]:
-        state = self.state_store.load()
-        pending = list(state.get("pendingEvents") or [])
-        if not pending:
-            return {"accepted": 0, "duplicates": 0, "pending": 0}
-
-        batch = pending[: self.config.batch_size]
-        result = self.api_client.send_events(batch)
-        ack_count = max(
-            0,
-            min(
-                len(batch),
-                int(result.get("accepted") or 0) + int(result.get("duplicates") or 0),
-            ),
+        result = drain_pending_events(
+            state_store=self.state_store,
+            api_client=self.api_client,
+            batch_size=self._flush_batch_size,
+            min_batch_size=self.config.batch_size,
+            time_budget_ms=self.config.flush_budget_ms,
+            time_module=self.time,
         )
-        if ack_count > 0:
-            state["pendingEvents"] = pending[ack_count:]
-            self.state_store.save(state)
-        return {
-            "accepted": int(result.get("accepted") or 0),
-            "duplicates": int(result.get("duplicates") or 0),
-            "pending": len(state.get("pendingEvents") or []),
-        }
+        self._flush_batch_size = int(result["batchSize"])
+        return result
 
     def register(self) -> Dict[str, Any]:
         return self.api_client.register()
@@ -906,6 +923,13 @@ class AutoCadStateCollector:
             self.heartbeat(status="offline")
         except Exception:
             return
+        finally:
+            close_client = getattr(self.api_client, "close", None)
+            if callable(close_client):
+                close_client()
+            close_store = getattr(self.state_store, "close", None)
+            if callable(close_store):
+                close_store()
 
     def run_forever(self) -> None:
         next_poll_at = 0
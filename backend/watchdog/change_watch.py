@@ -0,0 +1,169 @@
+"""Kernel change notifications for the filesystem collector.
+
+Watchers only report which paths were touched; the collector re-reads those
+paths against its snapshot to decide what was added, modified or removed.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Protocol
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_DONT_FOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_DONT_FOLLOW
+    | _IN_EXCL_UNLINK
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(slots=True)
+class WatchBatch:
+    paths: set[str] = field(default_factory=set)
+    overflowed: bool = False
+
+
+class ChangeWatcher(Protocol):
+    def poll(self, timeout_seconds: float = 0.0) -> WatchBatch: ...
+
+    def close(self) -> None: ...
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over a set of roots (Linux only).
+
+    A queue overflow, or running out of watch descriptors, is reported once
+    as ``overflowed`` so the caller can fall back to a reconciliation scan.
+    """
+
+    def __init__(self, roots: list[str]) -> None:
+        library = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_init1 failed: {os.strerror(code)}")
+        self._fd = fd
+        self._paths_by_wd: Dict[int, str] = {}
+        self._overflowed = False
+        for root in roots:
+            self._watch_tree(root)
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._paths_by_wd)
+
+    def _watch_tree(self, top: str) -> None:
+        for current_dir, _, _ in os.walk(top, followlinks=False):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(current_dir), _WATCH_MASK)
+            if wd >= 0:
+                self._paths_by_wd[wd] = current_dir
+                continue
+            code = ctypes.get_errno()
+            if code == errno.ENOSPC:
+                # fs.inotify.max_user_watches exhausted; scans have to cover the rest.
+                self._overflowed = True
+                return
+
+    def _unwatch_tree(self, top: str) -> None:
+        prefix = top.rstrip(os.sep) + os.sep
+        for wd, path_value in list(self._paths_by_wd.items()):
+            if path_value == top or path_value.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._paths_by_wd.pop(wd, None)
+
+    def _read_events(self, batch: WatchBatch) -> None:
+        while True:
+            try:
+                buffer = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            if not buffer:
+                return
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, _cookie, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + name_length].rstrip(b"\0")
+                offset += name_length
+                if mask & _IN_Q_OVERFLOW:
+                    batch.overflowed = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._paths_by_wd.pop(wd, None)
+                    continue
+                directory = self._paths_by_wd.get(wd)
+                if directory is None:
+                    continue
+                path_value = os.path.join(directory, os.fsdecode(raw_name)) if raw_name else directory
+                batch.paths.add(path_value)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._watch_tree(path_value)
+                    elif mask & _IN_MOVED_FROM:
+                        self._unwatch_tree(path_value)
+
+    def poll(self, timeout_seconds: float = 0.0) -> WatchBatch:
+        batch = WatchBatch()
+        if self._fd < 0:
+            return batch
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, float(timeout_seconds)))
+        if ready:
+            self._read_events(batch)
+        if self._overflowed:
+            batch.overflowed = True
+            self._overflowed = False
+        if batch.overflowed:
+            batch.paths.clear()
+        return batch
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._paths_by_wd.clear()
+
+
+WatcherFactory = Callable[[list[str]], ChangeWatcher | None]
+
+
+def create_change_watcher(roots: list[str]) -> ChangeWatcher | None:
+    """Kernel watcher for ``roots``, or ``None`` where none is available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher(roots)
+    except (OSError, AttributeError):
+        return None
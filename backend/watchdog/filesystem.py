@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import os
+import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, Mapping, Tuple
+from stat import S_ISREG
+from typing import Any, Dict, Mapping, Sequence, Tuple
 
 from backend.runtime_paths import (
     is_absolute_path_value,
@@ -25,24 +30,73 @@ def relative_posix(path_value: str, root_value: str) -> str:
     return rel.replace("\\", "/")
 
 
-def matches_any(patterns: list[str], rel_path: str, name: str) -> bool:
-    rel = rel_path.lower()
-    filename = name.lower()
-    for pattern in patterns:
-        normalized = pattern.replace("\\", "/").lower()
-        if fnmatch.fnmatch(rel, normalized):
+_GLOB_MAGIC_CHARS = frozenset("*?[")
+
+
+class GlobMatcher:
+    """Case-insensitive include/exclude glob set compiled once.
+
+    A pattern matches when it matches either the relative path or the bare
+    file name, as with ``fnmatch``. Plain ``*<literal>`` patterns become a
+    suffix check, literal patterns a set lookup, and everything else is
+    folded into one alternation regex.
+    """
+
+    __slots__ = ("patterns", "_literals", "_suffixes", "_regex")
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = tuple(str(pattern).replace("\\", "/").lower() for pattern in patterns)
+        literals: set[str] = set()
+        suffixes: list[str] = []
+        translated: list[str] = []
+        for pattern in self.patterns:
+            tail = pattern[1:]
+            if pattern.startswith("*") and not _GLOB_MAGIC_CHARS.intersection(tail):
+                # `*` also matches `/`, so the relative path decides on its own.
+                suffixes.append(tail)
+            elif not _GLOB_MAGIC_CHARS.intersection(pattern):
+                literals.add(pattern)
+            else:
+                translated.append(fnmatch.translate(pattern))
+        self._literals = frozenset(literals)
+        self._suffixes = tuple(suffixes)
+        self._regex = re.compile("|".join(translated)) if translated else None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, rel_path: str, name: str) -> bool:
+        rel = rel_path.lower()
+        if self._suffixes and rel.endswith(self._suffixes):
             return True
-        if fnmatch.fnmatch(filename, normalized):
+        filename = name.lower()
+        if self._literals and (rel in self._literals or filename in self._literals):
             return True
-    return False
+        if self._regex is not None:
+            return self._regex.match(rel) is not None or self._regex.match(filename) is not None
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob_tuple(patterns: Tuple[str, ...]) -> GlobMatcher:
+    return GlobMatcher(patterns)
+
+
+def compile_globs(patterns: Sequence[str] | None) -> GlobMatcher:
+    return _compile_glob_tuple(tuple(str(pattern) for pattern in (patterns or ())))
+
+
+def matches_any(patterns: Sequence[str] | GlobMatcher, rel_path: str, name: str) -> bool:
+    matcher = patterns if isinstance(patterns, GlobMatcher) else compile_globs(patterns)
+    return matcher.matches(rel_path, name)
 
 
 def is_included(
     *,
     rel_path: str,
     name: str,
-    include_globs: list[str],
-    exclude_globs: list[str],
+    include_globs: Sequence[str] | GlobMatcher,
+    exclude_globs: Sequence[str] | GlobMatcher,
 ) -> bool:
     if include_globs and not matches_any(include_globs, rel_path, name):
         return False
@@ -51,78 +105,221 @@ def is_included(
     return True
 
 
-def scan_snapshot(
+# Directory mtimes this close to the scan start are not trusted on the next
+# pass: a child written in the same mtime tick would otherwise be missed.
+_DIRECTORY_MTIME_SETTLE_NS = 2_000_000_000
+MAX_SCAN_WORKERS = 32
+
+
+def _scan_directory(
+    current_dir: str,
+    *,
+    root: str,
+    include_matcher: GlobMatcher,
+    exclude_matcher: GlobMatcher,
+    exclude_keys: set[str],
+    track_mtimes: bool,
+    cached: Any,
+    previous_records: Mapping[str, Dict[str, Any]],
+    settled_before_ns: int,
+    open_slots: threading.BoundedSemaphore | None,
+) -> Dict[str, Any]:
+    warnings: list[str] = []
+    mtime_ns: int | None = None
+    if track_mtimes:
+        try:
+            mtime_ns = int(os.stat(current_dir).st_mtime_ns)
+        except Exception as exc:
+            warnings.append(f"Failed to stat directory '{current_dir}': {exc}")
+
+    if mtime_ns is not None and isinstance(cached, Mapping) and cached.get("mtimeNs") == mtime_ns:
+        cached_keys = [str(key) for key in cached.get("files") or []]
+        if all(key in previous_records for key in cached_keys):
+            cached_dirs = [str(path) for path in cached.get("dirs") or []]
+            return {
+                "skipped": True,
+                "records": {key: dict(previous_records[key]) for key in cached_keys},
+                "dirs": cached_dirs,
+                "cacheEntry": {"mtimeNs": mtime_ns, "dirs": cached_dirs, "files": cached_keys},
+                "filesScanned": 0,
+                "warnings": warnings,
+            }
+
+    records: Dict[str, Dict[str, Any]] = {}
+    child_dirs: list[str] = []
+    files_scanned = 0
+    read_ok = True
+    if open_slots is not None:
+        open_slots.acquire()
+    try:
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        child_dirs.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+
+                    absolute_path = str(Path(entry.path).expanduser().resolve(strict=False))
+                    normalized_key = normalize_path(absolute_path)
+                    if normalized_key in exclude_keys:
+                        continue
+
+                    files_scanned += 1
+
+                    rel_path = relative_posix(absolute_path, root)
+                    if not is_included(
+                        rel_path=rel_path,
+                        name=entry.name,
+                        include_globs=include_matcher,
+                        exclude_globs=exclude_matcher,
+                    ):
+                        continue
+
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except Exception as exc:
+                        read_ok = False
+                        warnings.append(f"Failed to stat file '{entry.path}': {exc}")
+                        continue
+
+                    records[normalized_key] = {
+                        "root": root,
+                        "path": absolute_path,
+                        "relativePath": rel_path,
+                        "sizeBytes": int(stat.st_size),
+                        "mtimeMs": int(stat.st_mtime * 1000),
+                    }
+                except Exception as exc:
+                    read_ok = False
+                    warnings.append(f"Failed to inspect entry in '{current_dir}': {exc}")
+    except Exception as exc:
+        read_ok = False
+        warnings.append(f"Failed to scan directory '{current_dir}': {exc}")
+    finally:
+        if open_slots is not None:
+            open_slots.release()
+
+    cache_entry = None
+    if mtime_ns is not None:
+        cache_entry = {
+            # Partial reads and freshly touched directories are re-read next pass.
+            "mtimeNs": mtime_ns if read_ok and mtime_ns < settled_before_ns else None,
+            "dirs": child_dirs,
+            "files": list(records.keys()),
+        }
+    return {
+        "skipped": False,
+        "records": records,
+        "dirs": child_dirs,
+        "cacheEntry": cache_entry,
+        "filesScanned": files_scanned,
+        "warnings": warnings,
+    }
+
+
+def _walk_roots(
     *,
     roots: list[str],
     include_globs: list[str],
     exclude_globs: list[str],
-    exclude_paths: set[str] | None = None,
-    time_module: Any = time,
-) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    exclude_paths: set[str] | None,
+    time_module: Any,
+    directory_cache: Mapping[str, Mapping[str, Any]] | None,
+    previous_snapshot: Mapping[str, Dict[str, Any]] | None,
+    max_workers: int = 1,
+    max_open_directories: int | None = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any], Dict[str, Dict[str, Any]]]:
     perf_counter = getattr(time_module, "perf_counter", time.perf_counter)
     started = perf_counter()
+    settled_before_ns = int(time_module.time() * 1_000_000_000) - _DIRECTORY_MTIME_SETTLE_NS
     warnings: list[str] = []
     files_scanned = 0
     folders_scanned = 0
+    directories_read = 0
+    directories_skipped = 0
     snapshot: Dict[str, Dict[str, Any]] = {}
-    normalized_exclude_paths = {
+    next_cache: Dict[str, Dict[str, Any]] = {}
+    root_timings: Dict[str, Dict[str, Any]] = {}
+    cached_directories = directory_cache or {}
+    previous_records = previous_snapshot or {}
+    workers = max(1, min(MAX_SCAN_WORKERS, int(max_workers)))
+    open_limit = max(1, int(max_open_directories or workers))
+    # Each worker holds at most one listing open, so the semaphore only bites below the pool size.
+    open_slots = threading.BoundedSemaphore(open_limit) if open_limit < workers else None
+    exclude_keys = {
         normalize_path(path_value)
         for path_value in (exclude_paths or set())
         if str(path_value or "").strip()
     }
+    scan_options: Dict[str, Any] = {
+        "include_matcher": compile_globs(include_globs),
+        "exclude_matcher": compile_globs(exclude_globs),
+        "exclude_keys": exclude_keys,
+        "track_mtimes": directory_cache is not None,
+        "previous_records": previous_records,
+        "settled_before_ns": settled_before_ns,
+        "open_slots": open_slots,
+    }
 
+    def scan(current_dir: str, root: str) -> Dict[str, Any]:
+        return _scan_directory(
+            current_dir,
+            root=root,
+            cached=cached_directories.get(current_dir),
+            **scan_options,
+        )
+
+    def merge(current_dir: str, root: str, result: Dict[str, Any]) -> None:
+        nonlocal files_scanned, folders_scanned, directories_read, directories_skipped
+        folders_scanned += 1
+        files_scanned += int(result["filesScanned"])
+        if result["skipped"]:
+            directories_skipped += 1
+        else:
+            directories_read += 1
+        snapshot.update(result["records"])
+        warnings.extend(result["warnings"])
+        if result["cacheEntry"] is not None:
+            next_cache[current_dir] = result["cacheEntry"]
+        timing = root_timings[root]
+        timing["foldersScanned"] += 1
+        timing["filesScanned"] += int(result["filesScanned"])
+        timing["finishedAt"] = perf_counter()
+
+    available_roots: list[str] = []
     for root in roots:
         if not os.path.isdir(root):
             warnings.append(f"Root unavailable during scan: {root}")
             continue
+        available_roots.append(root)
 
-        stack = [root]
-        while stack:
-            current_dir = stack.pop()
-            folders_scanned += 1
-            try:
-                with os.scandir(current_dir) as entries:
-                    for entry in entries:
-                        try:
-                            if entry.is_dir(follow_symlinks=False):
-                                stack.append(entry.path)
-                                continue
-                            if not entry.is_file(follow_symlinks=False):
-                                continue
-
-                            absolute_path = str(Path(entry.path).expanduser().resolve(strict=False))
-                            normalized_key = normalize_path(absolute_path)
-                            if normalized_key in normalized_exclude_paths:
-                                continue
-
-                            files_scanned += 1
-
-                            rel_path = relative_posix(absolute_path, root)
-                            if not is_included(
-                                rel_path=rel_path,
-                                name=entry.name,
-                                include_globs=include_globs,
-                                exclude_globs=exclude_globs,
-                            ):
-                                continue
-
-                            try:
-                                stat = entry.stat(follow_symlinks=False)
-                            except Exception as exc:
-                                warnings.append(f"Failed to stat file '{entry.path}': {exc}")
-                                continue
-
-                            snapshot[normalized_key] = {
-                                "root": root,
-                                "path": absolute_path,
-                                "relativePath": rel_path,
-                                "sizeBytes": int(stat.st_size),
-                                "mtimeMs": int(stat.st_mtime * 1000),
-                            }
-                        except Exception as exc:
-                            warnings.append(f"Failed to inspect entry in '{current_dir}': {exc}")
-            except Exception as exc:
-                warnings.append(f"Failed to scan directory '{current_dir}': {exc}")
+    if workers <= 1:
+        for root in available_roots:
+            root_timings[root] = {"startedAt": perf_counter(), "foldersScanned": 0, "filesScanned": 0}
+            stack = [root]
+            while stack:
+                current_dir = stack.pop()
+                result = scan(current_dir, root)
+                merge(current_dir, root, result)
+                stack.extend(result["dirs"])
+    elif available_roots:
+        # Every directory is its own task, so large subtrees spread across the
+        # pool and results are merged on this thread only.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watchdog-scan") as pool:
+            in_flight: Dict[Future[Dict[str, Any]], Tuple[str, str]] = {}
+            for root in available_roots:
+                root_timings[root] = {"startedAt": perf_counter(), "foldersScanned": 0, "filesScanned": 0}
+                in_flight[pool.submit(scan, root, root)] = (root, root)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current_dir, root = in_flight.pop(future)
+                    result = future.result()
+                    merge(current_dir, root, result)
+                    for child_dir in result["dirs"]:
+                        in_flight[pool.submit(scan, child_dir, root)] = (child_dir, root)
 
     scan_ms = int((perf_counter() - started) * 1000)
     scan_meta = {
@@ -132,10 +329,166 @@ def scan_snapshot(
         "truncated": False,
         "warnings": warnings,
         "lastHeartbeatAt": int(time_module.time() * 1000),
+        "scanWorkers": workers,
+        "rootTimings": [
+            {
+                "root": root,
+                "scanMs": max(0, int((timing.get("finishedAt", timing["startedAt"]) - timing["startedAt"]) * 1000)),
+                "foldersScanned": timing["foldersScanned"],
+                "filesScanned": timing["filesScanned"],
+            }
+            for root, timing in root_timings.items()
+        ],
     }
+    if directory_cache is not None:
+        scan_meta["directoriesRead"] = directories_read
+        scan_meta["directoriesSkipped"] = directories_skipped
+    return snapshot, scan_meta, next_cache
+
+
+def scan_snapshot(
+    *,
+    roots: list[str],
+    include_globs: list[str],
+    exclude_globs: list[str],
+    exclude_paths: set[str] | None = None,
+    time_module: Any = time,
+    max_workers: int = 1,
+    max_open_directories: int | None = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    snapshot, scan_meta, _ = _walk_roots(
+        roots=roots,
+        include_globs=include_globs,
+        exclude_globs=exclude_globs,
+        exclude_paths=exclude_paths,
+        time_module=time_module,
+        directory_cache=None,
+        previous_snapshot=None,
+        max_workers=max_workers,
+        max_open_directories=max_open_directories,
+    )
     return snapshot, scan_meta
 
 
+def scan_snapshot_incremental(
+    *,
+    roots: list[str],
+    include_globs: list[str],
+    exclude_globs: list[str],
+    previous_snapshot: Mapping[str, Dict[str, Any]],
+    directory_cache: Mapping[str, Mapping[str, Any]] | None,
+    full_sweep: bool = False,
+    exclude_paths: set[str] | None = None,
+    time_module: Any = time,
+    max_workers: int = 1,
+    max_open_directories: int | None = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Scan roots, re-listing only directories whose mtime changed.
+
+    ``directory_cache`` maps each directory path to its last seen mtime, child
+    directories and included file keys. Unchanged directories reuse their
+    records from ``previous_snapshot`` without a listing or per-file stat, so
+    in-place edits inside them are only picked up by a ``full_sweep``, which
+    re-reads every directory and rebuilds the cache.
+    """
+    snapshot, scan_meta, next_cache = _walk_roots(
+        roots=roots,
+        include_globs=include_globs,
+        exclude_globs=exclude_globs,
+        exclude_paths=exclude_paths,
+        time_module=time_module,
+        directory_cache={} if full_sweep else dict(directory_cache or {}),
+        previous_snapshot=previous_snapshot,
+        max_workers=max_workers,
+        max_open_directories=max_open_directories,
+    )
+    scan_meta["scanMode"] = "full" if full_sweep else "incremental"
+    return snapshot, scan_meta, next_cache
+
+
+def scan_subtree(
+    *,
+    root: str,
+    path_value: str,
+    include_globs: Sequence[str] | GlobMatcher,
+    exclude_globs: Sequence[str] | GlobMatcher,
+    exclude_paths: set[str] | None = None,
+) -> Tuple[Dict[str, Dict[str, Any]], list[str]]:
+    """Records for one path under ``root``: a file, a whole directory, or none if gone."""
+    include_matcher = include_globs if isinstance(include_globs, GlobMatcher) else compile_globs(include_globs)
+    exclude_matcher = exclude_globs if isinstance(exclude_globs, GlobMatcher) else compile_globs(exclude_globs)
+    exclude_keys = {
+        normalize_path(item)
+        for item in (exclude_paths or set())
+        if str(item or "").strip()
+    }
+    records: Dict[str, Dict[str, Any]] = {}
+    warnings: list[str] = []
+
+    if os.path.isdir(path_value) and not os.path.islink(path_value):
+        stack = [path_value]
+        while stack:
+            result = _scan_directory(
+                stack.pop(),
+                root=root,
+                include_matcher=include_matcher,
+                exclude_matcher=exclude_matcher,
+                exclude_keys=exclude_keys,
+                track_mtimes=False,
+                cached=None,
+                previous_records={},
+                settled_before_ns=0,
+                open_slots=None,
+            )
+            records.update(result["records"])
+            warnings.extend(result["warnings"])
+            stack.extend(result["dirs"])
+        return records, warnings
+
+    try:
+        stat = os.lstat(path_value)
+    except FileNotFoundError:
+        return records, warnings
+    except Exception as exc:
+        warnings.append(f"Failed to stat file '{path_value}': {exc}")
+        return records, warnings
+    if not S_ISREG(stat.st_mode):
+        return records, warnings
+
+    absolute_path = str(Path(path_value).expanduser().resolve(strict=False))
+    normalized_key = normalize_path(absolute_path)
+    if normalized_key in exclude_keys:
+        return records, warnings
+    rel_path = relative_posix(absolute_path, root)
+    if not is_included(
+        rel_path=rel_path,
+        name=os.path.basename(absolute_path),
+        include_globs=include_matcher,
+        exclude_globs=exclude_matcher,
+    ):
+        return records, warnings
+    records[normalized_key] = {
+        "root": root,
+        "path": absolute_path,
+        "relativePath": rel_path,
+        "sizeBytes": int(stat.st_size),
+        "mtimeMs": int(stat.st_mtime * 1000),
+    }
+    return records, warnings
+
+
+def snapshot_entries_under(
+    snapshot: Mapping[str, Dict[str, Any]],
+    path_value: str,
+) -> Dict[str, Dict[str, Any]]:
+    """Snapshot entries for ``path_value`` itself or anything below it."""
+    path_key = normalize_path(path_value)
+    if path_key in snapshot:
+        return {path_key: snapshot[path_key]}
+    prefix = path_key.rstrip("/\\") + os.sep
+    return {key: record for key, record in snapshot.items() if key.startswith(prefix)}
+
+
 def build_snapshot_events(
     *,
     old_snapshot: Mapping[str, Dict[str, Any]],
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import http.client
 import json
 import os
 import socket
+import sqlite3
 import time
-import urllib.error
-import urllib.request
+import urllib.parse
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Mapping
 
-from .filesystem import build_snapshot_events, ensure_absolute_roots, scan_snapshot
+from .change_watch import ChangeWatcher, WatcherFactory, create_change_watcher
+from .filesystem import (
+    MAX_SCAN_WORKERS,
+    build_snapshot_events,
+    ensure_absolute_roots,
+    normalize_path,
+    scan_snapshot,
+    scan_snapshot_incremental,
+    scan_subtree,
+    snapshot_entries_under,
+)
+
+# Watch mode drains notifications on this cadence instead of scan_interval_ms.
+WATCH_POLL_MS = 500
+# Adaptive flush batches grow while a request stays under FLUSH_TARGET_MS.
+FLUSH_TARGET_MS = 500
+MAX_FLUSH_BATCH_SIZE = 2_000
 
 
 def _split_string_list(raw_value: Any) -> list[str]:
@@ -29,6 +48,19 @@ def _split_string_list(raw_value: Any) -> list[str]:
     return [str(raw_value).strip()] if str(raw_value).strip() else []
 
 
+def _parse_bool(raw_value: Any, *, default: bool = False) -> bool:
+    if raw_value is None or raw_value == "":
+        return default
+    if isinstance(raw_value, bool):
+        return raw_value
+    text = str(raw_value).strip().lower()
+    if text in {"true", "1", "yes", "y", "on"}:
+        return True
+    if text in {"false", "0", "no", "n", "off"}:
+        return False
+    return default
+
+
 def _default_buffer_dir(collector_id: str) -> Path:
     local_appdata = os.environ.get("LOCALAPPDATA")
     if local_appdata:
@@ -45,6 +77,9 @@ def _state_template() -> Dict[str, Any]:
         "lastStatus": "offline",
         "snapshot": {},
         "pendingEvents": [],
+        "directoryCache": {},
+        "directoryCacheKey": "",
+        "lastFullScanAt": 0,
     }
 
 
@@ -64,6 +99,14 @@ class FilesystemCollectorConfig:
     heartbeat_ms: int = 15_000
     scan_interval_ms: int = 5_000
     batch_size: int = 100
+    incremental_scan: bool = False
+    full_scan_interval_ms: int = 900_000
+    scan_workers: int = 1
+    max_open_directories: int = 0
+    watch_changes: bool = False
+    watch_debounce_ms: int = 2_000
+    gzip_requests: bool = True
+    flush_budget_ms: int = 2_000
     buffer_dir: Path | None = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -83,6 +126,15 @@ class FilesystemCollectorConfig:
         self.heartbeat_ms = max(1_000, int(self.heartbeat_ms))
         self.scan_interval_ms = max(1_000, int(self.scan_interval_ms))
         self.batch_size = max(1, min(500, int(self.batch_size)))
+        self.incremental_scan = _parse_bool(self.incremental_scan)
+        self.full_scan_interval_ms = max(self.scan_interval_ms, int(self.full_scan_interval_ms))
+        self.scan_workers = max(1, min(MAX_SCAN_WORKERS, int(self.scan_workers)))
+        # 0 leaves the open-directory cap at the worker count.
+        self.max_open_directories = max(0, int(self.max_open_directories))
+        self.watch_changes = _parse_bool(self.watch_changes)
+        self.watch_debounce_ms = max(0, int(self.watch_debounce_ms))
+        self.gzip_requests = _parse_bool(self.gzip_requests, default=True)
+        self.flush_budget_ms = max(0, int(self.flush_budget_ms))
         self.collector_name = (
             str(self.collector_name).strip()
             if self.collector_name
@@ -115,6 +167,14 @@ class FilesystemCollectorConfig:
             heartbeat_ms=int(payload.get("heartbeatMs") or 15_000),
             scan_interval_ms=int(payload.get("scanIntervalMs") or 5_000),
             batch_size=int(payload.get("batchSize") or 100),
+            incremental_scan=_parse_bool(payload.get("incrementalScan")),
+            full_scan_interval_ms=int(payload.get("fullScanIntervalMs") or 900_000),
+            scan_workers=int(payload.get("scanWorkers") or 1),
+            max_open_directories=int(payload.get("maxOpenDirectories") or 0),
+            watch_changes=_parse_bool(payload.get("watchChanges")),
+            watch_debounce_ms=int(payload.get("watchDebounceMs") or 2_000),
+            gzip_requests=_parse_bool(payload.get("gzipRequests"), default=True),
+            flush_budget_ms=int(payload.get("flushBudgetMs") or 2_000),
             buffer_dir=payload.get("bufferDir"),
             capabilities=tuple(_split_string_list(payload.get("capabilities")) or ["filesystem"]),
             metadata=dict(payload.get("metadata") or {}),
@@ -149,6 +209,14 @@ def load_collector_config(
         "heartbeatMs": source_env.get("WATCHDOG_COLLECTOR_HEARTBEAT_MS"),
         "scanIntervalMs": source_env.get("WATCHDOG_COLLECTOR_SCAN_INTERVAL_MS"),
         "batchSize": source_env.get("WATCHDOG_COLLECTOR_BATCH_SIZE"),
+        "incrementalScan": source_env.get("WATCHDOG_COLLECTOR_INCREMENTAL_SCAN"),
+        "fullScanIntervalMs": source_env.get("WATCHDOG_COLLECTOR_FULL_SCAN_INTERVAL_MS"),
+        "scanWorkers": source_env.get("WATCHDOG_COLLECTOR_SCAN_WORKERS"),
+        "maxOpenDirectories": source_env.get("WATCHDOG_COLLECTOR_MAX_OPEN_DIRECTORIES"),
+        "watchChanges": source_env.get("WATCHDOG_COLLECTOR_WATCH_CHANGES"),
+        "watchDebounceMs": source_env.get("WATCHDOG_COLLECTOR_WATCH_DEBOUNCE_MS"),
+        "gzipRequests": source_env.get("WATCHDOG_COLLECTOR_GZIP_REQUESTS"),
+        "flushBudgetMs": source_env.get("WATCHDOG_COLLECTOR_FLUSH_BUDGET_MS"),
         "bufferDir": source_env.get("WATCHDOG_COLLECTOR_BUFFER_DIR"),
     }
     metadata_raw = source_env.get("WATCHDOG_COLLECTOR_METADATA")
@@ -162,72 +230,401 @@ def load_collector_config(
     return FilesystemCollectorConfig.from_mapping(merged)
 
 
+def _normalize_state(payload: Any) -> Dict[str, Any]:
+    state = _state_template()
+    state.update(payload if isinstance(payload, dict) else {})
+    if not isinstance(state.get("pendingEvents"), list):
+        state["pendingEvents"] = []
+    if not isinstance(state.get("snapshot"), dict):
+        state["snapshot"] = {}
+    if not isinstance(state.get("directoryCache"), dict):
+        state["directoryCache"] = {}
+    state["lastFullScanAt"] = max(0, int(state.get("lastFullScanAt") or 0))
+    state["nextSequence"] = max(1, int(state.get("nextSequence") or 1))
+    state["lastStatus"] = str(state.get("lastStatus") or "offline")
+    return state
+
+
+def _state_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=True, sort_keys=True)
+
+
 class FilesystemCollectorStateStore:
-    def __init__(self, state_path: Path) -> None:
-        self.state_path = Path(state_path).expanduser().resolve()
+    """Collector state in a local SQLite file, written as diffs.
 
-    def load(self) -> Dict[str, Any]:
-        if not self.state_path.is_file():
-            return _state_template()
+    ``load``/``save`` keep the whole-state dict contract, but ``save`` only
+    writes what changed since the last load or save: snapshot and directory
+    cache entries are upserted or deleted per key, pending events live in a
+    queue keyed by ``sequence`` (acked events are deleted), and other fields
+    are stored as single values. Callers must replace entries rather than
+    mutate them in place, as both collectors already do.
+
+    A ``state.json`` left by older collectors is imported on first load and
+    renamed to ``state.json.migrated``. Each save also refreshes a small
+    ``state.status.json`` (plain values, ``pendingCount`` and any
+    ``status_sections``) for readiness scripts that cannot open SQLite.
+    """
+
+    ENTRY_SECTIONS = ("snapshot", "directoryCache")
+
+    def __init__(self, state_path: Path, *, status_sections: tuple[str, ...] = ()) -> None:
+        resolved = Path(state_path).expanduser().resolve()
+        if resolved.suffix == ".json":
+            self.legacy_json_path = resolved
+            self.state_path = resolved.with_suffix(".sqlite3")
+        else:
+            self.state_path = resolved
+            self.legacy_json_path = resolved.with_suffix(".json")
+        self.status_path = self.state_path.with_suffix(".status.json")
+        self.status_sections = tuple(status_sections)
+        self._cache: Dict[str, Any] | None = None
+        self._connection: sqlite3.Connection | None = None
+        self.last_save: Dict[str, int] = {}
+
+    @property
+    def file_paths(self) -> list[Path]:
+        """Every file the store may create, for scan exclusion."""
+        return [
+            self.state_path,
+            self.state_path.with_name(f"{self.state_path.name}-wal"),
+            self.state_path.with_name(f"{self.state_path.name}-shm"),
+            self.state_path.with_name(f"{self.state_path.name}-journal"),
+            self.legacy_json_path,
+            self.legacy_json_path.with_suffix(".tmp"),
+            self.legacy_json_path.with_name(f"{self.legacy_json_path.name}.migrated"),
+            self.status_path,
+            self.status_path.with_suffix(".tmp"),
+        ]
+
+    def _connect(self) -> sqlite3.Connection:
+        # Watch mode loads and saves every poll, so the connection and schema
+        # are set up once per store and reused until ``close``.
+        if self._connection is not None:
+            return self._connection
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.state_path), timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL;")
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS collector_state_values (
+                name TEXT PRIMARY KEY,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS collector_state_entries (
+                section TEXT NOT NULL,
+                entry_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (section, entry_key)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS collector_pending_events (
+                sequence INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL
+            );
+            """
+        )
+        self._connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the store's connection; the next load or save reopens it."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _read_revision(connection: sqlite3.Connection) -> int | None:
+        row = connection.execute(
+            "SELECT payload FROM collector_state_values WHERE name = '_revision'"
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def _read_legacy_json(self) -> Dict[str, Any] | None:
+        if not self.legacy_json_path.is_file():
+            return None
         try:
-            raw = self.state_path.read_text(encoding="utf-8")
-            payload = json.loads(raw)
+            payload = json.loads(self.legacy_json_path.read_text(encoding="utf-8"))
         except Exception:
-            return _state_template()
-        state = _state_template()
-        state.update(payload if isinstance(payload, dict) else {})
-        if not isinstance(state.get("pendingEvents"), list):
-            state["pendingEvents"] = []
-        if not isinstance(state.get("snapshot"), dict):
-            state["snapshot"] = {}
-        state["nextSequence"] = max(1, int(state.get("nextSequence") or 1))
-        state["lastStatus"] = str(state.get("lastStatus") or "offline")
-        return state
+            return None
+        return _normalize_state(payload)
+
+    def _read_cache(self, connection: sqlite3.Connection, revision: int) -> Dict[str, Any]:
+        values = {
+            str(name): json.loads(payload)
+            for name, payload in connection.execute(
+                "SELECT name, payload FROM collector_state_values WHERE name <> '_revision'"
+            )
+        }
+        sections: Dict[str, Dict[str, Any]] = {name: {} for name in self.ENTRY_SECTIONS}
+        for section, entry_key, payload in connection.execute(
+            "SELECT section, entry_key, payload FROM collector_state_entries"
+        ):
+            sections.setdefault(str(section), {})[str(entry_key)] = json.loads(payload)
+        pending = {
+            int(sequence): json.loads(payload)
+            for sequence, payload in connection.execute(
+                "SELECT sequence, payload FROM collector_pending_events ORDER BY sequence"
+            )
+        }
+        return {"revision": revision, "values": values, "sections": sections, "pending": pending}
+
+    def load(self) -> Dict[str, Any]:
+        connection = self._connect()
+        revision = self._read_revision(connection)
+        if revision is None:
+            legacy_state = self._read_legacy_json()
+            self._cache = {
+                "revision": 0,
+                "values": {},
+                "sections": {name: {} for name in self.ENTRY_SECTIONS},
+                "pending": {},
+            }
+            if legacy_state is None:
+                return _state_template()
+            self._write(connection, legacy_state)
+            os.replace(
+                self.legacy_json_path,
+                self.legacy_json_path.with_name(f"{self.legacy_json_path.name}.migrated"),
+            )
+        elif self._cache is None or self._cache["revision"] != revision:
+            self._cache = self._read_cache(connection, revision)
+
+        cache = self._cache
+        payload: Dict[str, Any] = dict(cache["values"])
+        for name, entries in cache["sections"].items():
+            payload[name] = dict(entries)
+        payload["pendingEvents"] = list(cache["pending"].values())
+        return _normalize_state(payload)
 
     def save(self, state: Mapping[str, Any]) -> None:
-        self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.state_path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
-        os.replace(tmp_path, self.state_path)
+        connection = self._connect()
+        revision = self._read_revision(connection)
+        if self._cache is None or self._cache["revision"] != (revision or 0):
+            self._cache = (
+                self._read_cache(connection, revision)
+                if revision is not None
+                else {
+                    "revision": 0,
+                    "values": {},
+                    "sections": {name: {} for name in self.ENTRY_SECTIONS},
+                    "pending": {},
+                }
+            )
+        self._write(connection, state)
+
+    def _write(self, connection: sqlite3.Connection, state: Mapping[str, Any]) -> None:
+        cache = self._cache
+        assert cache is not None
+        value_rows: list[tuple[str, str]] = []
+        entry_upserts: list[tuple[str, str, str]] = []
+        entry_deletes: list[tuple[str, str]] = []
+        next_values: Dict[str, Any] = {}
+        next_sections: Dict[str, Dict[str, Any]] = {}
+
+        for name, value in state.items():
+            if name == "pendingEvents":
+                continue
+            if name in self.ENTRY_SECTIONS:
+                entries = dict(value) if isinstance(value, Mapping) else {}
+                previous = cache["sections"].get(name) or {}
+                for entry_key, entry in entries.items():
+                    if entry_key not in previous or previous[entry_key] != entry:
+                        entry_upserts.append((name, str(entry_key), _state_json(entry)))
+                entry_deletes.extend(
+                    (name, str(entry_key)) for entry_key in previous.keys() - entries.keys()
+                )
+                next_sections[name] = entries
+                continue
+            if name not in cache["values"] or cache["values"][name] != value:
+                value_rows.append((str(name), _state_json(value)))
+            next_values[str(name)] = value
+        for name in self.ENTRY_SECTIONS:
+            if name not in next_sections:
+                entry_deletes.extend((name, str(entry_key)) for entry_key in cache["sections"].get(name) or {})
+                next_sections[name] = {}
+
+        pending: Dict[int, Any] = {}
+        for event in list(state.get("pendingEvents") or []):
+            pending[int(event.get("sequence") or 0)] = event
+        previous_pending = cache["pending"]
+        queued = [
+            (sequence, _state_json(event))
+            for sequence, event in pending.items()
+            if sequence not in previous_pending or previous_pending[sequence] != event
+        ]
+        acked = [(sequence,) for sequence in previous_pending.keys() - pending.keys()]
+
+        revision = int(cache["revision"]) + 1
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO collector_state_values (name, payload) VALUES (?, ?)",
+                [*value_rows, ("_revision", str(revision))],
+            )
+            stale_values = [(name,) for name in cache["values"].keys() - next_values.keys()]
+            connection.executemany("DELETE FROM collector_state_values WHERE name = ?", stale_values)
+            connection.executemany(
+                "INSERT OR REPLACE INTO collector_state_entries (section, entry_key, payload) VALUES (?, ?, ?)",
+                entry_upserts,
+            )
+            connection.executemany(
+                "DELETE FROM collector_state_entries WHERE section = ? AND entry_key = ?",
+                entry_deletes,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO collector_pending_events (sequence, payload) VALUES (?, ?)",
+                queued,
+            )
+            connection.executemany("DELETE FROM collector_pending_events WHERE sequence = ?", acked)
+
+        self._cache = {
+            "revision": revision,
+            "values": next_values,
+            "sections": next_sections,
+            "pending": dict(sorted(pending.items())),
+        }
+        self._write_status()
+        self.last_save = {
+            "valuesWritten": len(value_rows),
+            "entriesUpserted": len(entry_upserts),
+            "entriesDeleted": len(entry_deletes),
+            "eventsQueued": len(queued),
+            "eventsAcked": len(acked),
+        }
+
+    def _write_status(self) -> None:
+        cache = self._cache
+        assert cache is not None
+        status = {
+            name: value for name, value in cache["values"].items() if name not in self.ENTRY_SECTIONS
+        }
+        status["pendingCount"] = len(cache["pending"])
+        for name in self.status_sections:
+            status[name] = cache["sections"].get(name) or {}
+        tmp_path = self.status_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(status, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.status_path)
 
 
 class WatchdogCollectorApiClient:
+    """Collector HTTP client shared by the filesystem and AutoCAD collectors.
+
+    Requests reuse one HTTP/1.1 keep-alive connection, reconnecting once when
+    a reused connection turns out to be stale. Event batches above
+    ``GZIP_MIN_BYTES`` are sent gzip-compressed; if the backend rejects
+    that with 400/415, compression is switched off for this client and the
+    batch is resent as plain JSON.
+    """
+
+    GZIP_MIN_BYTES = 1024
+
     def __init__(self, config: FilesystemCollectorConfig, *, timeout_seconds: int = 15) -> None:
         self.config = config
         self.timeout_seconds = timeout_seconds
+        parts = urllib.parse.urlsplit(str(config.backend_url))
+        self._scheme = parts.scheme or "http"
+        self._netloc = parts.netloc
+        self._base_path = parts.path.rstrip("/")
+        self._connection: http.client.HTTPConnection | None = None
+        self.gzip_enabled = bool(getattr(config, "gzip_requests", True))
+        self.transport_stats: Dict[str, int] = {
+            "connectionsOpened": 0,
+            "requests": 0,
+            "reconnects": 0,
+            "bytesSent": 0,
+            "bytesBeforeCompression": 0,
+        }
+
+    def _open_connection(self) -> http.client.HTTPConnection:
+        connection_class = (
+            http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        )
+        self._connection = connection_class(self._netloc, timeout=self.timeout_seconds)
+        self.transport_stats["connectionsOpened"] += 1
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
 
-    def _request(self, method: str, path: str, payload: Mapping[str, Any]) -> Dict[str, Any]:
+    def _headers(self, *, gzip_body: bool) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            **({"Content-Encoding": "gzip"} if gzip_body else {}),
+            **(
+                {"X-API-Key": self.config.api_key}
+                if self.config.api_key
+                else {}
+            ),
+            **(
+                {"Authorization": f"Bearer {self.config.bearer_token}"}
+                if self.config.bearer_token
+                else {}
+            ),
+        }
+
+    def _send(self, method: str, path: str, body: bytes, headers: Mapping[str, str]) -> tuple[int, bytes]:
+        for attempt in range(2):
+            reused = self._connection is not None
+            connection = self._connection or self._open_connection()
+            try:
+                connection.request(method, f"{self._base_path}{path}", body=body, headers=dict(headers))
+                response = connection.getresponse()
+                raw = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                self.close()
+                if reused and attempt == 0:
+                    # The server may have dropped an idle keep-alive connection.
+                    self.transport_stats["reconnects"] += 1
+                    continue
+                reason = getattr(exc, "reason", None) or exc
+                raise RuntimeError(f"Collector request failed: {reason}") from exc
+            if response.will_close:
+                self.close()
+            self.transport_stats["requests"] += 1
+            self.transport_stats["bytesSent"] += len(body)
+            return response.status, raw
+        raise RuntimeError("Collector request failed: connection unavailable")
+
+    @staticmethod
+    def _rejects_gzip(status: int, raw: bytes) -> bool:
+        # Only an answer about the encoding turns gzip off for good; any
+        # other 400 is a bad payload and is reported like one.
+        if status == 415:
+            return True
+        if status != 400:
+            return False
+        details = raw.decode("utf-8", errors="replace").lower()
+        return "gzip" in details or "encoding" in details
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Mapping[str, Any],
+        *,
+        compress: bool = False,
+    ) -> Dict[str, Any]:
         body = json.dumps(payload).encode("utf-8")
-        request = urllib.request.Request(
-            url=f"{self.config.backend_url}{path}",
-            data=body,
-            method=method,
-            headers={
-                "Content-Type": "application/json",
-                **(
-                    {"X-API-Key": self.config.api_key}
-                    if self.config.api_key
-                    else {}
-                ),
-                **(
-                    {"Authorization": f"Bearer {self.config.bearer_token}"}
-                    if self.config.bearer_token
-                    else {}
-                ),
-            },
+        self.transport_stats["bytesBeforeCompression"] += len(body)
+        gzip_body = compress and self.gzip_enabled and len(body) >= self.GZIP_MIN_BYTES
+        status, raw = self._send(
+            method,
+            path,
+            gzip.compress(body, compresslevel=6) if gzip_body else body,
+            self._headers(gzip_body=gzip_body),
         )
-        try:
-            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
-                raw = response.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            details = exc.read().decode("utf-8", errors="replace")
-            raise RuntimeError(f"Collector request failed ({exc.code}): {details}") from exc
-        except urllib.error.URLError as exc:
-            raise RuntimeError(f"Collector request failed: {exc.reason}") from exc
+        if gzip_body and self._rejects_gzip(status, raw):
+            self.gzip_enabled = False
+            status, raw = self._send(method, path, body, self._headers(gzip_body=False))
+        if status >= 400:
+            details = raw.decode("utf-8", errors="replace")
+            raise RuntimeError(f"Collector request failed ({status}): {details}")
 
         try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError as exc:
+            parsed = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
             raise RuntimeError("Collector response was not valid JSON") from exc
         if not isinstance(parsed, dict):
             raise RuntimeError("Collector response payload was not an object")
@@ -269,7 +666,79 @@ class WatchdogCollectorApiClient:
                 "collectorId": self.config.collector_id,
                 "events": events,
             },
+            compress=True,
+        )
+
+
+def drain_pending_events(
+    *,
+    state_store: FilesystemCollectorStateStore,
+    api_client: WatchdogCollectorApiClient,
+    batch_size: int,
+    min_batch_size: int,
+    time_budget_ms: int,
+    time_module: Any = time,
+) -> Dict[str, Any]:
+    """Send pending events until the queue is empty or ``time_budget_ms`` is spent.
+
+    The batch size doubles (up to ``MAX_FLUSH_BATCH_SIZE``) while full batches
+    come back within ``FLUSH_TARGET_MS`` and halves when a batch takes more
+    than twice that. The returned ``batchSize`` is meant to seed the next call.
+    A failure on the first batch raises; a later one ends the drain and is
+    reported in ``error``.
+    """
+    perf_counter = getattr(time_module, "perf_counter", time.perf_counter)
+    started = perf_counter()
+    state = state_store.load()
+    pending = list(state.get("pendingEvents") or [])
+    size = max(min_batch_size, min(MAX_FLUSH_BATCH_SIZE, int(batch_size)))
+    accepted = 0
+    duplicates = 0
+    batches = 0
+    error: str | None = None
+
+    while pending:
+        batch = pending[:size]
+        batch_started = perf_counter()
+        try:
+            result = api_client.send_events(batch)
+        except Exception as exc:
+            if batches == 0:
+                raise
+            error = str(exc)
+            break
+        elapsed_ms = (perf_counter() - batch_started) * 1000.0
+        batches += 1
+        accepted += int(result.get("accepted") or 0)
+        duplicates += int(result.get("duplicates") or 0)
+        ack_count = max(
+            0,
+            min(
+                len(batch),
+                int(result.get("accepted") or 0) + int(result.get("duplicates") or 0),
+            ),
         )
+        if ack_count > 0:
+            pending = pending[ack_count:]
+            state["pendingEvents"] = pending
+            state_store.save(state)
+        if ack_count < len(batch):
+            break
+        if elapsed_ms <= FLUSH_TARGET_MS and len(batch) == size:
+            size = min(MAX_FLUSH_BATCH_SIZE, size * 2)
+        elif elapsed_ms > FLUSH_TARGET_MS * 2:
+            size = max(min_batch_size, size // 2)
+        if (perf_counter() - started) * 1000.0 >= time_budget_ms:
+            break
+
+    return {
+        "accepted": accepted,
+        "duplicates": duplicates,
+        "pending": len(pending),
+        "batches": batches,
+        "batchSize": size,
+        **({"error": error} if error else {}),
+    }
 
 
 class FilesystemCollector:
@@ -280,17 +749,25 @@ class FilesystemCollector:
         api_client: WatchdogCollectorApiClient | None = None,
         state_store: FilesystemCollectorStateStore | None = None,
         time_module: Any = time,
+        watcher_factory: WatcherFactory | None = None,
     ) -> None:
         self.config = config
         self.api_client = api_client or WatchdogCollectorApiClient(config)
         self.state_store = state_store or FilesystemCollectorStateStore(config.state_path)
         self.time = time_module
         self._registration_verified = False
+        self._watcher_factory = watcher_factory or create_change_watcher
+        self._watcher: ChangeWatcher | None = None
+        self._watcher_unavailable = False
+        self._dirty_paths: Dict[str, int] = {}
+        self._last_reconcile_at: int | None = None
+        self._flush_batch_size = config.batch_size
 
     def _exclude_paths(self) -> set[str]:
         return {
             str(self.config.state_path),
             str(self.config.state_path.with_suffix(".tmp")),
+            *(str(path) for path in getattr(self.state_store, "file_paths", [])),
         }
 
     def _next_sequence(self, state: Dict[str, Any]) -> int:
@@ -309,7 +786,13 @@ class FilesystemCollector:
             ]
         )
 
-    def _normalize_snapshot_event(self, state: Dict[str, Any], raw_event: Mapping[str, Any]) -> Dict[str, Any]:
+    def _normalize_snapshot_event(
+        self,
+        state: Dict[str, Any],
+        raw_event: Mapping[str, Any],
+        *,
+        sync_mode: str = "hybrid-scan",
+    ) -> Dict[str, Any]:
         event_type = {
             "added": "file_added",
             "modified": "file_modified",
@@ -333,7 +816,7 @@ class FilesystemCollector:
             "metadata": {
                 "root": raw_event.get("root"),
                 "relativePath": raw_event.get("relativePath"),
-                "syncMode": "hybrid-scan",
+                "syncMode": sync_mode,
             },
         }
 
@@ -397,15 +880,67 @@ class FilesystemCollector:
                 self._registration_verified = False
             return {"ok": False, "status": status, "error": str(exc)}
 
-    def scan_once(self) -> Dict[str, Any]:
-        state = self.state_store.load()
-        snapshot, scan_meta = scan_snapshot(
+    def _directory_cache_key(self) -> str:
+        # Cached listings only hold included files, so a rule change invalidates them.
+        payload = json.dumps(
+            {
+                "roots": self.config.roots,
+                "includeGlobs": self.config.include_globs,
+                "excludeGlobs": self.config.exclude_globs,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _scan_incremental(self, state: Dict[str, Any]) -> tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        now_ms = int(self.time.time() * 1000)
+        cache_key = self._directory_cache_key()
+        previous_snapshot = dict(state.get("snapshot") or {})
+        directory_cache = (
+            dict(state.get("directoryCache") or {})
+            if str(state.get("directoryCacheKey") or "") == cache_key
+            else {}
+        )
+        full_sweep = (
+            not previous_snapshot
+            or not directory_cache
+            or now_ms - int(state.get("lastFullScanAt") or 0) >= self.config.full_scan_interval_ms
+        )
+        snapshot, scan_meta, next_cache = scan_snapshot_incremental(
             roots=self.config.roots,
             include_globs=self.config.include_globs,
             exclude_globs=self.config.exclude_globs,
+            previous_snapshot=previous_snapshot,
+            directory_cache=directory_cache,
+            full_sweep=full_sweep,
             exclude_paths=self._exclude_paths(),
             time_module=self.time,
+            max_workers=self.config.scan_workers,
+            max_open_directories=self.config.max_open_directories or None,
         )
+        state["directoryCache"] = next_cache
+        state["directoryCacheKey"] = cache_key
+        if full_sweep:
+            state["lastFullScanAt"] = now_ms
+        return snapshot, scan_meta
+
+    def scan_once(self) -> Dict[str, Any]:
+        self._last_reconcile_at = int(self.time.time() * 1000)
+        state = self.state_store.load()
+        if self.config.incremental_scan:
+            snapshot, scan_meta = self._scan_incremental(state)
+        else:
+            snapshot, scan_meta = scan_snapshot(
+                roots=self.config.roots,
+                include_globs=self.config.include_globs,
+                exclude_globs=self.config.exclude_globs,
+                exclude_paths=self._exclude_paths(),
+                time_module=self.time,
+                max_workers=self.config.scan_workers,
+                max_open_directories=self.config.max_open_directories or None,
+            )
+            state["directoryCache"] = {}
+            state["directoryCacheKey"] = ""
         previous_snapshot = dict(state.get("snapshot") or {})
         if not previous_snapshot:
             state["snapshot"] = snapshot
@@ -433,30 +968,142 @@ class FilesystemCollector:
             **scan_meta,
         }
 
-    def flush_pending_events(self) -> Dict[str, Any]:
+    def _ensure_watcher(self) -> ChangeWatcher | None:
+        if self._watcher is None and not self._watcher_unavailable:
+            self._watcher = self._watcher_factory(list(self.config.roots))
+            self._watcher_unavailable = self._watcher is None
+        return self._watcher
+
+    def _close_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self._dirty_paths.clear()
+
+    def _root_for_path(self, path_value: str) -> str | None:
+        path_key = normalize_path(path_value)
+        best_root: str | None = None
+        for root in self.config.roots:
+            root_key = normalize_path(root)
+            if path_key != root_key and not path_key.startswith(root_key.rstrip("/\\") + os.sep):
+                continue
+            if best_root is None or len(root_key) > len(normalize_path(best_root)):
+                best_root = root
+        return best_root
+
+    def _reconcile(self, reason: str) -> Dict[str, Any]:
+        self._dirty_paths.clear()
+        return {**self.scan_once(), "captureMode": "reconcile", "reconcileReason": reason}
+
+    def _apply_watched_paths(self, paths: list[str]) -> Dict[str, Any]:
         state = self.state_store.load()
-        pending = list(state.get("pendingEvents") or [])
-        if not pending:
-            return {"accepted": 0, "duplicates": 0, "pending": 0}
+        snapshot = dict(state.get("snapshot") or {})
+        if not snapshot:
+            return self._reconcile("baseline")
 
-        batch = pending[: self.config.batch_size]
-        result = self.api_client.send_events(batch)
-        ack_count = max(
-            0,
-            min(
-                len(batch),
-                int(result.get("accepted") or 0) + int(result.get("duplicates") or 0),
-            ),
+        old_entries: Dict[str, Dict[str, Any]] = {}
+        new_entries: Dict[str, Dict[str, Any]] = {}
+        warnings: list[str] = []
+        for path_value in paths:
+            root = self._root_for_path(path_value)
+            if root is None:
+                continue
+            old_entries.update(snapshot_entries_under(snapshot, path_value))
+            records, path_warnings = scan_subtree(
+                root=root,
+                path_value=path_value,
+                include_globs=self.config.include_globs,
+                exclude_globs=self.config.exclude_globs,
+                exclude_paths=self._exclude_paths(),
+            )
+            new_entries.update(records)
+            warnings.extend(path_warnings)
+
+        timestamp_ms = int(self.time.time() * 1000)
+        raw_events = build_snapshot_events(
+            old_snapshot=old_entries,
+            new_snapshot=new_entries,
+            timestamp_ms=timestamp_ms,
         )
-        if ack_count > 0:
-            state["pendingEvents"] = pending[ack_count:]
+        if raw_events:
+            for path_key in old_entries:
+                snapshot.pop(path_key, None)
+            snapshot.update(new_entries)
+            pending = list(state.get("pendingEvents") or [])
+            for raw_event in raw_events:
+                pending.append(self._normalize_snapshot_event(state, raw_event, sync_mode="watch"))
+            state["pendingEvents"] = pending
+            state["snapshot"] = snapshot
             self.state_store.save(state)
         return {
-            "accepted": int(result.get("accepted") or 0),
-            "duplicates": int(result.get("duplicates") or 0),
-            "pending": len(state.get("pendingEvents") or []),
+            "baseline": False,
+            "queued": len(raw_events),
+            "captureMode": "watch",
+            "pathsApplied": len(paths),
+            "pendingPaths": len(self._dirty_paths),
+            "warnings": warnings,
+            "lastHeartbeatAt": timestamp_ms,
         }
 
+    def capture_changes_once(self) -> Dict[str, Any]:
+        """Apply settled change notifications, or scan when the watcher cannot be trusted.
+
+        Paths are held until no notification has arrived for them for
+        ``watch_debounce_ms``, so an autosave burst yields one event. Queue
+        overflow, the first pass and every ``full_scan_interval_ms`` run a
+        reconciliation scan instead.
+        """
+        watcher = self._ensure_watcher()
+        if watcher is None:
+            return {**self.scan_once(), "captureMode": "scan", "watchUnavailable": True}
+
+        batch = watcher.poll(0.0)
+        now_ms = int(self.time.time() * 1000)
+        if batch.overflowed:
+            return self._reconcile("overflow")
+        if self._last_reconcile_at is None:
+            return self._reconcile("baseline")
+        if now_ms - self._last_reconcile_at >= self.config.full_scan_interval_ms:
+            return self._reconcile("interval")
+
+        for path_value in batch.paths:
+            self._dirty_paths[path_value] = now_ms
+        settled = sorted(
+            path_value
+            for path_value, seen_at in self._dirty_paths.items()
+            if now_ms - seen_at >= self.config.watch_debounce_ms
+        )
+        for path_value in settled:
+            self._dirty_paths.pop(path_value, None)
+        if not settled:
+            return {
+                "baseline": False,
+                "queued": 0,
+                "captureMode": "watch",
+                "pathsApplied": 0,
+                "pendingPaths": len(self._dirty_paths),
+                "warnings": [],
+                "lastHeartbeatAt": now_ms,
+            }
+        return self._apply_watched_paths(settled)
+
+    def _capture_once(self) -> Dict[str, Any]:
+        if self.config.watch_changes:
+            return self.capture_changes_once()
+        return self.scan_once()
+
+    def flush_pending_events(self) -> Dict[str, Any]:
+        result = drain_pending_events(
+            state_store=self.state_store,
+            api_client=self.api_client,
+            batch_size=self._flush_batch_size,
+            min_batch_size=self.config.batch_size,
+            time_budget_ms=self.config.flush_budget_ms,
+            time_module=self.time,
+        )
+        self._flush_batch_size = int(result["batchSize"])
+        return result
+
     def heartbeat(self, *, status: str = "online") -> Dict[str, Any]:
         state = self.state_store.load()
         sequence = max(0, int(state.get("nextSequence") or 1) - 1)
@@ -468,6 +1115,9 @@ class FilesystemCollector:
                 "pendingCount": len(pending),
                 "rootCount": len(self.config.roots),
                 "scanIntervalMs": self.config.scan_interval_ms,
+                "incrementalScan": self.config.incremental_scan,
+                "scanWorkers": self.config.scan_workers,
+                "watchChanges": self.config.watch_changes and self._watcher is not None,
             },
         )
         state["lastStatus"] = status
@@ -480,7 +1130,7 @@ class FilesystemCollector:
             self._append_lifecycle_event(state, "collector_online")
             state["lastStatus"] = "online"
             self.state_store.save(state)
-        scan_result = self.scan_once()
+        scan_result = self._capture_once()
         register_result = self._attempt_register()
         flush_result = self._attempt_flush_pending_events()
         heartbeat_result = self._attempt_heartbeat(status="online")
@@ -492,6 +1142,7 @@ class FilesystemCollector:
         }
 
     def shutdown(self) -> None:
+        self._close_watcher()
         state = self.state_store.load()
         if str(state.get("lastStatus") or "offline") == "offline":
             return
@@ -503,6 +1154,13 @@ class FilesystemCollector:
             self.heartbeat(status="offline")
         except Exception:
             return
+        finally:
+            close_client = getattr(self.api_client, "close", None)
+            if callable(close_client):
+                close_client()
+            close_store = getattr(self.state_store, "close", None)
+            if callable(close_store):
+                close_store()
 
     def run_forever(self) -> None:
         next_scan_at = 0
@@ -517,8 +1175,12 @@ class FilesystemCollector:
                         self._append_lifecycle_event(state, "collector_online")
                         state["lastStatus"] = "online"
                         self.state_store.save(state)
-                    self.scan_once()
-                    next_scan_at = now_ms + self.config.scan_interval_ms
+                    self._capture_once()
+                    next_scan_at = now_ms + (
+                        WATCH_POLL_MS
+                        if self.config.watch_changes and self._watcher is not None
+                        else self.config.scan_interval_ms
+                    )
                     self._attempt_register()
                     self._attempt_flush_pending_events()
                 if now_ms >= next_heartbeat_at:
@@ -12,8 +12,8 @@ from typing import Any, Dict, Mapping, Optional
 
 from .filesystem import (
     build_snapshot_events,
+    compile_globs,
     ensure_absolute_roots,
-    matches_any,
     normalize_path,
     relative_posix,
     scan_snapshot,
@@ -33,12 +33,26 @@ class WatchdogMonitorService:
         time_module: Any = time,
         max_events_per_tick: int = 2000,
         max_collector_events_retained: int = 10000,
+        max_collector_event_age_days: float | None = None,
         ledger_path: str | os.PathLike[str] | None = None,
         ledger: WatchdogLedger | None = None,
     ) -> None:
         self.time = time_module
         self.max_events_per_tick = max(100, int(max_events_per_tick))
         self.max_collector_events_retained = max(500, int(max_collector_events_retained))
+        if max_collector_event_age_days is None:
+            try:
+                max_collector_event_age_days = float(
+                    os.environ.get("SUITE_WATCHDOG_EVENT_MAX_AGE_DAYS") or 0
+                )
+            except ValueError:
+                max_collector_event_age_days = 0
+        # 0 disables time-based retention; the count cap always applies.
+        self.max_collector_event_age_ms = (
+            int(float(max_collector_event_age_days) * 24 * 60 * 60 * 1000)
+            if float(max_collector_event_age_days) > 0
+            else None
+        )
         self.ledger = ledger or WatchdogLedger(db_path=ledger_path)
         self._ledger = self.ledger
 
@@ -267,6 +281,13 @@ class WatchdogMonitorService:
             "nextEventId": next_event_id,
         }
 
+    def _retention_status(self, user_key: str) -> Dict[str, Any]:
+        return {
+            "maxEvents": self.max_collector_events_retained,
+            "maxAgeMs": self.max_collector_event_age_ms,
+            "pruning": self.ledger.prune_stats(user_key),
+        }
+
     def status(self, user_key: str) -> Dict[str, Any]:
         state = self.ledger.load_legacy_state(user_key)
         if state is None:
@@ -276,6 +297,7 @@ class WatchdogMonitorService:
                 "lastScan": None,
                 "nextEventId": 1,
                 "healthy": True,
+                "retention": self._retention_status(user_key),
             }
         return {
             "configured": True,
@@ -283,6 +305,7 @@ class WatchdogMonitorService:
             "lastScan": dict(state.get("last_scan") or {}),
             "nextEventId": int(state.get("next_event_id") or 1),
             "healthy": True,
+            "retention": self._retention_status(user_key),
         }
 
     def heartbeat(self, user_key: str) -> Dict[str, Any]:
@@ -673,9 +696,10 @@ class WatchdogMonitorService:
         normalized_target = normalize_path(target_path)
         filename = os.path.basename(normalized_target)
         roots = [normalize_path(str(item)) for item in (rule.get("roots") or []) if str(item).strip()]
-        include_globs = list(rule.get("includeGlobs") or [])
-        exclude_globs = list(rule.get("excludeGlobs") or [])
-        drawing_patterns = list(rule.get("drawingPatterns") or [])
+        # Compiled matchers are cached per pattern list, so each rule set parses once.
+        include_globs = compile_globs(rule.get("includeGlobs") or [])
+        exclude_globs = compile_globs(rule.get("excludeGlobs") or [])
+        drawing_patterns = compile_globs(rule.get("drawingPatterns") or [])
 
         matched_rel_paths: list[str] = []
         longest_root = 0
@@ -697,11 +721,11 @@ class WatchdogMonitorService:
 
         candidate_paths = matched_rel_paths or [normalized_target.replace("\\", "/")]
         for rel_path in candidate_paths:
-            if include_globs and not matches_any(include_globs, rel_path, filename):
+            if include_globs and not include_globs.matches(rel_path, filename):
                 continue
-            if exclude_globs and matches_any(exclude_globs, rel_path, filename):
+            if exclude_globs and exclude_globs.matches(rel_path, filename):
                 continue
-            if use_drawing_patterns and drawing_patterns and not matches_any(drawing_patterns, rel_path, filename):
+            if use_drawing_patterns and drawing_patterns and not drawing_patterns.matches(rel_path, filename):
                 continue
             return True, longest_root
 
@@ -871,8 +895,11 @@ class WatchdogMonitorService:
             collector_id=collector_id,
             events=normalized_events,
             max_events_retained=self.max_collector_events_retained,
+            max_event_age_ms=self.max_collector_event_age_ms,
         )
         accepted_events = list(insert_result.get("events") or [])
+        if accepted_events:
+            self.materialize_sessions(user_key)
         now_ms = int(self.time.time() * 1000)
         collector["eventCount"] = int(collector.get("eventCount") or 0) + len(accepted_events)
         collector["updatedAt"] = now_ms
@@ -1006,6 +1033,123 @@ class WatchdogMonitorService:
             return max(0, int(idle_ms))
         return None
 
+    def _fold_session_event(
+        self,
+        event: Mapping[str, Any],
+        session_map: Dict[str, Dict[str, Any]],
+        active_sessions: dict[tuple[str, str, str], str],
+    ) -> None:
+        """Apply one ledger event to the session it belongs to, in event_id order."""
+        if not self._is_autocad_session_event(event):
+            return
+
+        session_id = self._resolve_session_id(event, active_sessions=active_sessions)
+        if not session_id:
+            return
+
+        event_type = str(event.get("eventType") or "unknown")
+        timestamp = int(event.get("timestamp") or 0)
+        drawing_path = self._optional_text(event.get("drawingPath")) or self._optional_text(event.get("path"))
+        event_metadata = dict(event.get("metadata") or {})
+        event_started_at = (
+            self._timestamp_ms_from_value(event_metadata.get("segmentStartedAt"))
+            or self._timestamp_ms_from_value(event_metadata.get("startedAt"))
+            or timestamp
+        )
+        session = session_map.get(session_id)
+        if session is None:
+            session = {
+                "sessionId": session_id,
+                "collectorId": str(event.get("collectorId") or ""),
+                "collectorType": str(event.get("collectorType") or ""),
+                "workstationId": str(event.get("workstationId") or ""),
+                "projectId": self._optional_text(event.get("projectId")),
+                "drawingPath": drawing_path,
+                "status": "completed",
+                "active": False,
+                "startedAt": event_started_at,
+                "endedAt": None,
+                "latestEventAt": timestamp,
+                "lastActivityAt": None,
+                "lastEventType": event_type,
+                "eventCount": 0,
+                "commandCount": 0,
+                "idleCount": 0,
+                "activationCount": 0,
+                "durationMs": 0,
+                "idleDurationMs": 0,
+                "durationSource": None,
+                "sourceAvailable": False,
+                "pendingCount": 0,
+                "trackerUpdatedAt": None,
+            }
+            session_map[session_id] = session
+
+        session["startedAt"] = min(int(session.get("startedAt") or event_started_at), event_started_at)
+        session["latestEventAt"] = max(int(session.get("latestEventAt") or 0), timestamp)
+        # Retention pruning drops a session once its newest event is gone.
+        session["latestEventId"] = max(int(session.get("latestEventId") or 0), int(event.get("eventId") or 0))
+        session["lastEventType"] = event_type
+        session["eventCount"] = int(session.get("eventCount") or 0) + 1
+        if drawing_path:
+            session["drawingPath"] = drawing_path
+        if event.get("projectId"):
+            session["projectId"] = self._optional_text(event.get("projectId"))
+
+        if event_type == "command_executed":
+            session["commandCount"] = int(session.get("commandCount") or 0) + 1
+            session["lastActivityAt"] = timestamp
+        elif event_type in {"drawing_opened", "drawing_activated", "idle_resumed"}:
+            session["activationCount"] = int(session.get("activationCount") or 0) + 1
+            session["lastActivityAt"] = timestamp
+        elif event_type == "idle_started":
+            session["idleCount"] = int(session.get("idleCount") or 0) + 1
+        elif event_type == "drawing_closed":
+            session["endedAt"] = timestamp
+            session["lastActivityAt"] = timestamp
+            tracked_duration_ms = self._event_tracked_duration_ms(event)
+            if tracked_duration_ms is not None:
+                session["durationMs"] = max(
+                    int(session.get("durationMs") or 0),
+                    int(tracked_duration_ms),
+                )
+                session["durationSource"] = "tracker_closed"
+            idle_duration_ms = self._event_idle_duration_ms(event)
+            if idle_duration_ms is not None:
+                session["idleDurationMs"] = max(
+                    int(session.get("idleDurationMs") or 0),
+                    int(idle_duration_ms),
+                )
+            closed_command_count = self._metadata_int(event_metadata, "commandCount")
+            if closed_command_count is not None:
+                session["commandCount"] = max(
+                    int(session.get("commandCount") or 0),
+                    int(closed_command_count),
+                )
+
+        if event_type == "drawing_closed":
+            tracking_key = self._session_tracking_key(event)
+            active_session_id = active_sessions.get(tracking_key)
+            if active_session_id == session_id:
+                active_sessions.pop(tracking_key, None)
+
+    def materialize_sessions(self, user_key: str) -> Dict[str, Any]:
+        """Fold events ingested since the last pass into the sessions table."""
+        return self.ledger.materialize_sessions(user_key, fold=self._fold_session_event)
+
+    def rebuild_sessions(self, user_key: str | None = None) -> Dict[str, Any]:
+        """Drop materialized sessions and back-fill them from retained events."""
+        user_keys = [user_key] if user_key else self.ledger.list_event_user_keys()
+        results = []
+        for key in user_keys:
+            self.ledger.reset_sessions(key)
+            folded = self.materialize_sessions(key)
+            results.append({"userKey": key, **folded})
+        return {
+            "users": results,
+            "eventsFolded": sum(int(item.get("eventsFolded") or 0) for item in results),
+        }
+
     def list_sessions(
         self,
         user_key: str,
@@ -1026,107 +1170,17 @@ class WatchdogMonitorService:
         collectors = self.ledger.list_collectors(user_key)
         rules = self.ledger.list_project_rules(user_key)
 
-        raw_events = self.ledger.list_window_events(
-            user_key,
-            since_ms=start_ms,
-            project_id=normalized_project_id,
-        )
-        session_map: Dict[str, Dict[str, Any]] = {}
-        active_sessions: dict[tuple[str, str, str], str] = {}
-
-        for event in raw_events:
-            if normalized_collector_id and str(event.get("collectorId") or "") != normalized_collector_id:
-                continue
-            if not self._is_autocad_session_event(event):
-                continue
-
-            session_id = self._resolve_session_id(event, active_sessions=active_sessions)
-            if not session_id:
-                continue
-
-            event_type = str(event.get("eventType") or "unknown")
-            timestamp = int(event.get("timestamp") or 0)
-            drawing_path = self._optional_text(event.get("drawingPath")) or self._optional_text(event.get("path"))
-            event_metadata = dict(event.get("metadata") or {})
-            event_started_at = (
-                self._timestamp_ms_from_value(event_metadata.get("segmentStartedAt"))
-                or self._timestamp_ms_from_value(event_metadata.get("startedAt"))
-                or timestamp
+        # Read-only: sessions are materialized on ingest (and by
+        # scripts/rebuild-watchdog-sessions.py), never on this GET path.
+        session_map: Dict[str, Dict[str, Any]] = {
+            str(session.get("sessionId") or ""): session
+            for session in self.ledger.list_sessions(
+                user_key,
+                since_ms=start_ms,
+                project_id=normalized_project_id,
+                collector_id=normalized_collector_id,
             )
-            session = session_map.get(session_id)
-            if session is None:
-                session = {
-                    "sessionId": session_id,
-                    "collectorId": str(event.get("collectorId") or ""),
-                    "collectorType": str(event.get("collectorType") or ""),
-                    "workstationId": str(event.get("workstationId") or ""),
-                    "projectId": self._optional_text(event.get("projectId")),
-                    "drawingPath": drawing_path,
-                    "status": "completed",
-                    "active": False,
-                    "startedAt": event_started_at,
-                    "endedAt": None,
-                    "latestEventAt": timestamp,
-                    "lastActivityAt": None,
-                    "lastEventType": event_type,
-                    "eventCount": 0,
-                    "commandCount": 0,
-                    "idleCount": 0,
-                    "activationCount": 0,
-                    "durationMs": 0,
-                    "idleDurationMs": 0,
-                    "durationSource": None,
-                    "sourceAvailable": False,
-                    "pendingCount": 0,
-                    "trackerUpdatedAt": None,
-                }
-                session_map[session_id] = session
-
-            session["startedAt"] = min(int(session.get("startedAt") or event_started_at), event_started_at)
-            session["latestEventAt"] = max(int(session.get("latestEventAt") or 0), timestamp)
-            session["lastEventType"] = event_type
-            session["eventCount"] = int(session.get("eventCount") or 0) + 1
-            if drawing_path:
-                session["drawingPath"] = drawing_path
-            if event.get("projectId"):
-                session["projectId"] = self._optional_text(event.get("projectId"))
-
-            if event_type == "command_executed":
-                session["commandCount"] = int(session.get("commandCount") or 0) + 1
-                session["lastActivityAt"] = timestamp
-            elif event_type in {"drawing_opened", "drawing_activated", "idle_resumed"}:
-                session["activationCount"] = int(session.get("activationCount") or 0) + 1
-                session["lastActivityAt"] = timestamp
-            elif event_type == "idle_started":
-                session["idleCount"] = int(session.get("idleCount") or 0) + 1
-            elif event_type == "drawing_closed":
-                session["endedAt"] = timestamp
-                session["lastActivityAt"] = timestamp
-                tracked_duration_ms = self._event_tracked_duration_ms(event)
-                if tracked_duration_ms is not None:
-                    session["durationMs"] = max(
-                        int(session.get("durationMs") or 0),
-                        int(tracked_duration_ms),
-                    )
-                    session["durationSource"] = "tracker_closed"
-                idle_duration_ms = self._event_idle_duration_ms(event)
-                if idle_duration_ms is not None:
-                    session["idleDurationMs"] = max(
-                        int(session.get("idleDurationMs") or 0),
-                        int(idle_duration_ms),
-                    )
-                closed_command_count = self._metadata_int(event_metadata, "commandCount")
-                if closed_command_count is not None:
-                    session["commandCount"] = max(
-                        int(session.get("commandCount") or 0),
-                        int(closed_command_count),
-                    )
-
-            if event_type == "drawing_closed":
-                tracking_key = self._session_tracking_key(event)
-                active_session_id = active_sessions.get(tracking_key)
-                if active_session_id == session_id:
-                    active_sessions.pop(tracking_key, None)
+        }
 
         for collector in collectors:
             collector_key = str(collector.get("collectorId") or "")
@@ -1368,6 +1422,7 @@ class WatchdogMonitorService:
                 ]
             },
             "trendBuckets": trend_buckets,
+            "ledger": self.ledger.pool_metrics(),
         }
 
     def dashboard_snapshot(
@@ -2,12 +2,32 @@ from __future__ import annotations
 
 import json
 import os
+import queue
 import sqlite3
 import threading
 import time
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+EVENT_KEY_LOOKUP_CHUNK = 500
+# Retention runs every PRUNE_EVERY_EVENTS inserts or PRUNE_INTERVAL_MS,
+# whichever comes first, deleting at most PRUNE_CHUNK_SIZE rows per transaction.
+PRUNE_EVERY_EVENTS = 1000
+PRUNE_INTERVAL_MS = 60_000
+PRUNE_CHUNK_SIZE = 500
+STATEMENT_CACHE_SIZE = 256
+# Idle connections kept for reuse; more can be open at once under load, and
+# those are closed when returned to a full pool.
+CONNECTION_POOL_SIZE = 8
+SESSION_CURSOR_NAME = "watchdog_sessions"
+SESSION_MATERIALIZE_BATCH = 1000
+
+SessionFold = Callable[
+    [Dict[str, Any], Dict[str, Dict[str, Any]], Dict[Tuple[str, str, str], str]],
+    None,
+]
 
 
 def _safe_json_dumps(value: Any) -> str:
@@ -33,8 +53,19 @@ def _optional_text(value: Any) -> Optional[str]:
     return text or None
 
 
+class _PooledConnection(sqlite3.Connection):
+    """Weak-referenceable connection so the ledger can count open handles."""
+
+
 class WatchdogLedger:
-    def __init__(self, *, db_path: Path | str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        db_path: Path | str | None = None,
+        prune_every_events: int = PRUNE_EVERY_EVENTS,
+        prune_interval_ms: int = PRUNE_INTERVAL_MS,
+        prune_chunk_size: int = PRUNE_CHUNK_SIZE,
+    ) -> None:
         resolved_path = (
             db_path
             or os.environ.get("SUITE_WATCHDOG_LEDGER_PATH")
@@ -50,29 +81,154 @@ class WatchdogLedger:
                 self.db_path = (
                     Path.home() / "AppData" / "Local" / "Suite" / "watchdog" / "watchdog.sqlite3"
                 ).resolve()
+        self.prune_every_events = max(1, int(prune_every_events))
+        self.prune_interval_ms = max(0, int(prune_interval_ms))
+        self.prune_chunk_size = max(1, int(prune_chunk_size))
+        self._prune_stats: Dict[str, Dict[str, Any]] = {}
+        # Writers serialize on _lock; readers check a WAL connection out of the
+        # shared pool. The pool is not tied to threads, so a server that starts
+        # a thread per request still reuses connections across requests.
         self._lock = threading.RLock()
+        self._local = threading.local()
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)
+        self._connections: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+        self._metrics_lock = threading.Lock()
+        self._pool_generation = 0
+        self._metrics: Dict[str, float] = {
+            "connectionsOpened": 0,
+            "connectionReuses": 0,
+            "reads": 0,
+            "readMs": 0.0,
+            "writes": 0,
+            "writeMs": 0.0,
+            "writeLockWaits": 0,
+            "writeLockWaitMs": 0.0,
+            "maxWriteLockWaitMs": 0.0,
+        }
         self._ensure_schema()
 
-    @contextmanager
-    def _connect(self) -> Iterable[sqlite3.Connection]:
+    def _checkout(self) -> Tuple[_PooledConnection, int]:
+        with self._metrics_lock:
+            generation = self._pool_generation
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self._record_metric("connectionReuses", 1)
+            return connection, generation
         connection = sqlite3.connect(
             str(self.db_path),
             timeout=30,
             check_same_thread=False,
+            factory=_PooledConnection,
+            cached_statements=STATEMENT_CACHE_SIZE,
         )
         connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        with self._metrics_lock:
+            self._connections.add(connection)
+            self._metrics["connectionsOpened"] += 1
+        return connection, generation
+
+    def _checkin(self, connection: _PooledConnection, generation: int) -> None:
+        with self._metrics_lock:
+            current = generation == self._pool_generation
+        if current:
+            try:
+                self._idle.put_nowait(connection)
+                return
+            except queue.Full:
+                pass
+        connection.close()
+
+    @contextmanager
+    def _connect(self) -> Iterable[sqlite3.Connection]:
+        # Nested use on the same thread joins the outer transaction; only the
+        # outermost call checks a connection out of the pool and back in.
+        outer = getattr(self._local, "checkout", None)
+        if outer is not None:
+            yield outer
+            return
+        connection, generation = self._checkout()
+        self._local.checkout = connection
         try:
             yield connection
             connection.commit()
-        except Exception:
+        except BaseException:
             connection.rollback()
             raise
         finally:
+            self._local.checkout = None
+            self._checkin(connection, generation)
+
+    @contextmanager
+    def _read(self) -> Iterable[sqlite3.Connection]:
+        """WAL reader on a pooled connection; does not wait for writers."""
+        started_at = time.perf_counter()
+        try:
+            with self._connect() as connection:
+                yield connection
+        finally:
+            self._record_query("read", started_at)
+
+    @contextmanager
+    def _write(self) -> Iterable[sqlite3.Connection]:
+        """Serialized write transaction on a pooled connection."""
+        wait_started_at = time.perf_counter()
+        with self._lock:
+            wait_ms = (time.perf_counter() - wait_started_at) * 1000.0
+            with self._metrics_lock:
+                self._metrics["writeLockWaitMs"] += wait_ms
+                if wait_ms >= 1.0:
+                    self._metrics["writeLockWaits"] += 1
+                if wait_ms > self._metrics["maxWriteLockWaitMs"]:
+                    self._metrics["maxWriteLockWaitMs"] = wait_ms
+            started_at = time.perf_counter()
+            try:
+                with self._connect() as connection:
+                    yield connection
+            finally:
+                self._record_query("write", started_at)
+
+    def _record_metric(self, name: str, amount: float) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += amount
+
+    def _record_query(self, kind: str, started_at: float) -> None:
+        elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+        with self._metrics_lock:
+            self._metrics[f"{kind}s"] += 1
+            self._metrics[f"{kind}Ms"] += elapsed_ms
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics["openConnections"] = len(self._connections)
+        for name in ("readMs", "writeMs", "writeLockWaitMs", "maxWriteLockWaitMs"):
+            metrics[name] = round(float(metrics[name]), 3)
+        return metrics
+
+    def close(self) -> None:
+        """Close every pooled connection; the next call opens a fresh one.
+
+        Meant for shutdown and tests, when no other thread is mid-query.
+        """
+        with self._metrics_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._pool_generation += 1
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for connection in connections:
             connection.close()
 
     def _ensure_schema(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._connect() as connection:
+        with self._write() as connection:
             connection.execute("PRAGMA journal_mode=WAL;")
             connection.execute("PRAGMA synchronous=NORMAL;")
             connection.executescript(
@@ -153,6 +309,9 @@ class WatchdogLedger:
                     PRIMARY KEY (user_key, collector_id, event_key)
                 );
 
+                CREATE INDEX IF NOT EXISTS idx_watchdog_event_keys_user_event
+                ON watchdog_event_keys (user_key, event_id);
+
                 CREATE TABLE IF NOT EXISTS watchdog_hourly_rollups (
                     user_key TEXT NOT NULL,
                     bucket_start_ms INTEGER NOT NULL,
@@ -187,11 +346,57 @@ class WatchdogLedger:
                     updated_at_ms INTEGER NOT NULL,
                     PRIMARY KEY (user_key, sync_name)
                 );
+
+                CREATE TABLE IF NOT EXISTS watchdog_sessions (
+                    user_key TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    collector_id TEXT NOT NULL,
+                    project_id TEXT NOT NULL DEFAULT '',
+                    started_at_ms INTEGER NOT NULL,
+                    latest_event_at_ms INTEGER NOT NULL,
+                    latest_event_id INTEGER NOT NULL DEFAULT 0,
+                    session_json TEXT NOT NULL DEFAULT '{}',
+                    updated_at_ms INTEGER NOT NULL,
+                    PRIMARY KEY (user_key, session_id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_watchdog_sessions_user_latest
+                ON watchdog_sessions (user_key, latest_event_at_ms DESC);
+
+                CREATE INDEX IF NOT EXISTS idx_watchdog_sessions_user_project
+                ON watchdog_sessions (user_key, project_id, latest_event_at_ms DESC);
+
+                CREATE TABLE IF NOT EXISTS watchdog_session_trackers (
+                    user_key TEXT NOT NULL,
+                    collector_id TEXT NOT NULL,
+                    project_id TEXT NOT NULL,
+                    drawing_path TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    PRIMARY KEY (user_key, collector_id, project_id, drawing_path)
+                );
+                """
+            )
+            session_columns = {
+                str(row["name"]) for row in connection.execute("PRAGMA table_info(watchdog_sessions)").fetchall()
+            }
+            if "latest_event_id" not in session_columns:
+                # Older tables cannot say which sessions retention should
+                # drop; start them over so the next ingest refolds them.
+                connection.execute(
+                    "ALTER TABLE watchdog_sessions ADD COLUMN latest_event_id INTEGER NOT NULL DEFAULT 0"
+                )
+                connection.execute("DELETE FROM watchdog_sessions")
+                connection.execute("DELETE FROM watchdog_session_trackers")
+                connection.execute("DELETE FROM watchdog_sync_cursors WHERE sync_name = ?", (SESSION_CURSOR_NAME,))
+            connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_watchdog_sessions_user_event
+                ON watchdog_sessions (user_key, latest_event_id)
                 """
             )
 
     def load_legacy_state(self, user_key: str) -> Optional[Dict[str, Any]]:
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             row = connection.execute(
                 """
                 SELECT config_json, snapshot_json, last_scan_json, next_event_id
@@ -219,7 +424,7 @@ class WatchdogLedger:
         next_event_id: int,
     ) -> None:
         now_ms = int(time.time() * 1000)
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             connection.execute(
                 """
                 INSERT INTO watchdog_legacy_states (
@@ -273,23 +478,26 @@ class WatchdogLedger:
             return 1
         return int(row["next_event_id"] or 1)
 
-    def next_event_id(self, user_key: str) -> int:
-        with self._lock, self._connect() as connection:
-            row = connection.execute(
-                """
-                SELECT next_event_id
-                FROM watchdog_user_state
-                WHERE user_key = ?
-                """,
-                (user_key,),
-            ).fetchone()
+    def _stored_next_event_id(self, connection: sqlite3.Connection, user_key: str) -> int:
+        row = connection.execute(
+            """
+            SELECT next_event_id
+            FROM watchdog_user_state
+            WHERE user_key = ?
+            """,
+            (user_key,),
+        ).fetchone()
         if row is None:
             return 1
         return int(row["next_event_id"] or 1)
 
+    def next_event_id(self, user_key: str) -> int:
+        with self._read() as connection:
+            return self._stored_next_event_id(connection, user_key)
+
     def save_collector(self, user_key: str, collector: Dict[str, Any]) -> Dict[str, Any]:
         payload = dict(collector)
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             connection.execute(
                 """
                 INSERT INTO watchdog_collectors (
@@ -342,7 +550,7 @@ class WatchdogLedger:
         return payload
 
     def get_collector(self, user_key: str, collector_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             row = connection.execute(
                 """
                 SELECT *
@@ -354,7 +562,7 @@ class WatchdogLedger:
         return self._serialize_collector_row(row) if row is not None else None
 
     def list_collectors(self, user_key: str) -> List[Dict[str, Any]]:
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 """
                 SELECT *
@@ -368,7 +576,7 @@ class WatchdogLedger:
 
     def save_project_rule(self, user_key: str, rule: Dict[str, Any]) -> Dict[str, Any]:
         payload = dict(rule)
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             connection.execute(
                 """
                 INSERT INTO watchdog_project_rules (
@@ -403,7 +611,7 @@ class WatchdogLedger:
         return payload
 
     def get_project_rule(self, user_key: str, project_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             row = connection.execute(
                 """
                 SELECT *
@@ -415,7 +623,7 @@ class WatchdogLedger:
         return self._serialize_project_rule_row(row) if row is not None else None
 
     def list_project_rules(self, user_key: str) -> List[Dict[str, Any]]:
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 """
                 SELECT *
@@ -436,7 +644,7 @@ class WatchdogLedger:
             ("SELECT user_key FROM watchdog_legacy_states ORDER BY updated_at_ms DESC LIMIT 1", ()),
             ("SELECT user_key FROM watchdog_events ORDER BY created_at_ms DESC LIMIT 1", ()),
         ]
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             for query, params in query_plan:
                 row = connection.execute(query, params).fetchone()
                 if row is None:
@@ -450,7 +658,7 @@ class WatchdogLedger:
         normalized_project_id = _optional_text(project_id)
         if not normalized_project_id:
             return False
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             cursor = connection.execute(
                 """
                 DELETE FROM watchdog_project_rules
@@ -462,7 +670,7 @@ class WatchdogLedger:
 
     def get_sync_cursor(self, user_key: str, sync_name: str) -> Dict[str, Any]:
         normalized_sync_name = _optional_text(sync_name) or ""
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             row = connection.execute(
                 """
                 SELECT last_event_id, metadata_json, updated_at_ms
@@ -495,7 +703,7 @@ class WatchdogLedger:
     ) -> Dict[str, Any]:
         normalized_sync_name = _optional_text(sync_name) or ""
         now_ms = int(time.time() * 1000)
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             connection.execute(
                 """
                 INSERT INTO watchdog_sync_cursors (
@@ -534,7 +742,7 @@ class WatchdogLedger:
     ) -> List[Dict[str, Any]]:
         safe_after = max(0, int(after_event_id))
         safe_limit = max(1, min(500, int(limit)))
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 """
                 SELECT *
@@ -557,59 +765,45 @@ class WatchdogLedger:
         collector_id: str,
         events: Iterable[Dict[str, Any]],
         max_events_retained: int,
+        max_event_age_ms: int | None = None,
     ) -> Dict[str, Any]:
         now_ms = int(time.time() * 1000)
+        pending_events = [dict(raw_event) for raw_event in events]
         inserted_events: List[Dict[str, Any]] = []
+        event_rows: List[tuple] = []
+        event_key_rows: List[tuple] = []
+        rollup_increments: Dict[tuple, List[int]] = {}
         duplicate_count = 0
 
-        with self._lock, self._connect() as connection:
+        with self._write() as connection:
             next_event_id = self._ensure_user_state(
                 connection,
                 user_key=user_key,
                 now_ms=now_ms,
             )
-            for raw_event in events:
-                event = dict(raw_event)
+            # Keys already stored, plus keys claimed earlier in this batch.
+            seen_event_keys = self._existing_event_keys(
+                connection,
+                user_key=user_key,
+                collector_id=collector_id,
+                event_keys={
+                    event_key
+                    for event_key in (_optional_text(event.get("eventKey")) for event in pending_events)
+                    if event_key
+                },
+            )
+            for event in pending_events:
                 event_key = _optional_text(event.get("eventKey"))
                 if event_key:
-                    existing = connection.execute(
-                        """
-                        SELECT event_id
-                        FROM watchdog_event_keys
-                        WHERE user_key = ? AND collector_id = ? AND event_key = ?
-                        """,
-                        (user_key, collector_id, event_key),
-                    ).fetchone()
-                    if existing is not None:
+                    if event_key in seen_event_keys:
                         duplicate_count += 1
                         continue
+                    seen_event_keys.add(event_key)
 
                 event["eventId"] = next_event_id
                 next_event_id += 1
                 created_at_ms = now_ms
-                connection.execute(
-                    """
-                    INSERT INTO watchdog_events (
-                        user_key,
-                        event_id,
-                        collector_id,
-                        collector_type,
-                        workstation_id,
-                        event_type,
-                        source_type,
-                        timestamp_ms,
-                        project_id,
-                        session_id,
-                        path,
-                        drawing_path,
-                        event_key,
-                        size_bytes,
-                        mtime_ms,
-                        duration_ms,
-                        metadata_json,
-                        created_at_ms
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                event_rows.append(
                     (
                         user_key,
                         int(event["eventId"]),
@@ -631,30 +825,66 @@ class WatchdogLedger:
                         else None,
                         _safe_json_dumps(event.get("metadata") or {}),
                         created_at_ms,
-                    ),
+                    )
                 )
                 if event_key:
-                    connection.execute(
-                        """
-                        INSERT INTO watchdog_event_keys (
-                            user_key,
-                            collector_id,
-                            event_key,
-                            event_id,
-                            created_at_ms
-                        ) VALUES (?, ?, ?, ?, ?)
-                        """,
+                    event_key_rows.append(
                         (
                             user_key,
                             collector_id,
                             event_key,
                             int(event["eventId"]),
                             created_at_ms,
-                        ),
+                        )
                     )
-                self._increment_rollup(connection, user_key=user_key, event=event)
+                self._accumulate_rollup(rollup_increments, event=event)
                 inserted_events.append(event)
 
+            if event_rows:
+                connection.executemany(
+                    """
+                    INSERT INTO watchdog_events (
+                        user_key,
+                        event_id,
+                        collector_id,
+                        collector_type,
+                        workstation_id,
+                        event_type,
+                        source_type,
+                        timestamp_ms,
+                        project_id,
+                        session_id,
+                        path,
+                        drawing_path,
+                        event_key,
+                        size_bytes,
+                        mtime_ms,
+                        duration_ms,
+                        metadata_json,
+                        created_at_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    event_rows,
+                )
+            if event_key_rows:
+                connection.executemany(
+                    """
+                    INSERT INTO watchdog_event_keys (
+                        user_key,
+                        collector_id,
+                        event_key,
+                        event_id,
+                        created_at_ms
+                    ) VALUES (?, ?, ?, ?, ?)
+                    """,
+                    event_key_rows,
+                )
+            self._apply_rollup_increments(
+                connection,
+                user_key=user_key,
+                increments=rollup_increments,
+            )
+
             connection.execute(
                 """
                 INSERT INTO watchdog_user_state (user_key, next_event_id, updated_at_ms)
@@ -666,34 +896,13 @@ class WatchdogLedger:
                 (user_key, int(next_event_id), now_ms),
             )
 
-            overflow_rows = connection.execute(
-                """
-                SELECT event_id
-                FROM watchdog_events
-                WHERE user_key = ?
-                ORDER BY event_id DESC
-                LIMIT -1 OFFSET ?
-                """,
-                (user_key, max(1, int(max_events_retained))),
-            ).fetchall()
-            overflow_event_ids = [int(row["event_id"]) for row in overflow_rows]
-            if overflow_event_ids:
-                placeholders = ",".join("?" for _ in overflow_event_ids)
-                params = [user_key, *overflow_event_ids]
-                connection.execute(
-                    f"""
-                    DELETE FROM watchdog_event_keys
-                    WHERE user_key = ? AND event_id IN ({placeholders})
-                    """,
-                    params,
-                )
-                connection.execute(
-                    f"""
-                    DELETE FROM watchdog_events
-                    WHERE user_key = ? AND event_id IN ({placeholders})
-                    """,
-                    params,
-                )
+        if self._prune_due(user_key, inserted_count=len(inserted_events), now_ms=now_ms):
+            self.prune_events(
+                user_key,
+                max_events_retained=max_events_retained,
+                max_event_age_ms=max_event_age_ms,
+                now_ms=now_ms,
+            )
 
         return {
             "events": inserted_events,
@@ -701,6 +910,206 @@ class WatchdogLedger:
             "nextEventId": next_event_id,
         }
 
+    def _prune_stats_for(self, user_key: str) -> Dict[str, Any]:
+        stats = self._prune_stats.get(user_key)
+        if stats is None:
+            stats = {
+                "pendingInserts": 0,
+                "passes": 0,
+                "totalDeleted": 0,
+                "lastPrunedAt": 0,
+                "lastDeleted": 0,
+                "lastDeletedByCount": 0,
+                "lastDeletedByAge": 0,
+                "lastChunks": 0,
+                "lastSessionsDeleted": 0,
+                "lastDurationMs": 0.0,
+            }
+            self._prune_stats[user_key] = stats
+        return stats
+
+    def _prune_due(self, user_key: str, *, inserted_count: int, now_ms: int) -> bool:
+        with self._metrics_lock:
+            stats = self._prune_stats_for(user_key)
+            stats["pendingInserts"] += max(0, int(inserted_count))
+            if stats["pendingInserts"] <= 0:
+                return False
+            if (
+                stats["pendingInserts"] < self.prune_every_events
+                and now_ms - int(stats["lastPrunedAt"] or 0) < self.prune_interval_ms
+            ):
+                return False
+            # Claim the pass so concurrent ingests do not start another one.
+            stats["pendingInserts"] = 0
+            stats["lastPrunedAt"] = now_ms
+            return True
+
+    def prune_events(
+        self,
+        user_key: str,
+        *,
+        max_events_retained: int,
+        max_event_age_ms: int | None = None,
+        now_ms: int | None = None,
+    ) -> Dict[str, Any]:
+        """Delete events past the count or age cutoff in bounded chunks.
+
+        Each chunk commits on its own so readers and ingest calls from other
+        threads are not held behind one long delete.
+        """
+        started_at = time.perf_counter()
+        now_ms = int(now_ms if now_ms is not None else time.time() * 1000)
+        chunk_size = self.prune_chunk_size
+        deleted_by_count = 0
+        deleted_by_age = 0
+        chunks = 0
+
+        with self._read() as connection:
+            # Event ids are assigned densely per user, so the count cap is an
+            # id window below the newest event. MIN and MAX stay in separate
+            # statements: SQLite only turns a lone min()/max() into one index
+            # seek. Gaps left by age pruning only make the window hold fewer.
+            newest_row = connection.execute(
+                "SELECT MAX(event_id) AS event_id FROM watchdog_events WHERE user_key = ?",
+                (user_key,),
+            ).fetchone()
+            oldest_row = connection.execute(
+                "SELECT MIN(event_id) AS event_id FROM watchdog_events WHERE user_key = ?",
+                (user_key,),
+            ).fetchone()
+        threshold_event_id: int | None = None
+        lower_event_id: int | None = None
+        if newest_row["event_id"] is not None and oldest_row["event_id"] is not None:
+            threshold_event_id = int(newest_row["event_id"]) - max(1, int(max_events_retained)) + 1
+            lower_event_id = int(oldest_row["event_id"])
+
+        if threshold_event_id is not None and lower_event_id is not None:
+            while lower_event_id < threshold_event_id:
+                upper_event_id = min(threshold_event_id, lower_event_id + chunk_size)
+                with self._write() as connection:
+                    connection.execute(
+                        """
+                        DELETE FROM watchdog_event_keys
+                        WHERE user_key = ? AND event_id >= ? AND event_id < ?
+                        """,
+                        (user_key, lower_event_id, upper_event_id),
+                    )
+                    cursor = connection.execute(
+                        """
+                        DELETE FROM watchdog_events
+                        WHERE user_key = ? AND event_id >= ? AND event_id < ?
+                        """,
+                        (user_key, lower_event_id, upper_event_id),
+                    )
+                deleted_by_count += max(0, int(cursor.rowcount or 0))
+                chunks += 1
+                lower_event_id = upper_event_id
+
+        cutoff_ms: int | None = None
+        if max_event_age_ms is not None and int(max_event_age_ms) > 0:
+            cutoff_ms = now_ms - int(max_event_age_ms)
+            while True:
+                with self._write() as connection:
+                    rows = connection.execute(
+                        """
+                        SELECT event_id
+                        FROM watchdog_events
+                        WHERE user_key = ? AND timestamp_ms < ?
+                        LIMIT ?
+                        """,
+                        (user_key, cutoff_ms, chunk_size),
+                    ).fetchall()
+                    expired_event_ids = [int(row["event_id"]) for row in rows]
+                    if not expired_event_ids:
+                        break
+                    placeholders = ",".join("?" for _ in expired_event_ids)
+                    params = [user_key, *expired_event_ids]
+                    connection.execute(
+                        f"""
+                        DELETE FROM watchdog_event_keys
+                        WHERE user_key = ? AND event_id IN ({placeholders})
+                        """,
+                        params,
+                    )
+                    connection.execute(
+                        f"""
+                        DELETE FROM watchdog_events
+                        WHERE user_key = ? AND event_id IN ({placeholders})
+                        """,
+                        params,
+                    )
+                deleted_by_age += len(expired_event_ids)
+                chunks += 1
+                if len(expired_event_ids) < chunk_size:
+                    break
+
+        sessions_deleted = 0
+        if deleted_by_count or deleted_by_age:
+            sessions_deleted = self._prune_sessions(
+                user_key,
+                below_event_id=threshold_event_id if deleted_by_count else None,
+                before_ms=cutoff_ms if deleted_by_age else None,
+            )
+
+        with self._metrics_lock:
+            stats = self._prune_stats_for(user_key)
+            stats["passes"] += 1
+            stats["totalDeleted"] += deleted_by_count + deleted_by_age
+            stats["lastPrunedAt"] = now_ms
+            stats["lastDeleted"] = deleted_by_count + deleted_by_age
+            stats["lastDeletedByCount"] = deleted_by_count
+            stats["lastDeletedByAge"] = deleted_by_age
+            stats["lastChunks"] = chunks
+            stats["lastSessionsDeleted"] = sessions_deleted
+            stats["lastDurationMs"] = round((time.perf_counter() - started_at) * 1000.0, 3)
+            return dict(stats)
+
+    def _prune_sessions(
+        self,
+        user_key: str,
+        *,
+        below_event_id: int | None,
+        before_ms: int | None,
+    ) -> int:
+        """Drop materialized sessions whose newest event fell to a cutoff.
+
+        Those sessions have no retained events, so a rebuild would not
+        recreate them. Trackers pointing at them go too. Sessions that kept
+        some of their events keep their folded totals.
+        """
+        clauses: List[str] = []
+        params: List[Any] = [user_key]
+        if below_event_id is not None:
+            clauses.append("latest_event_id < ?")
+            params.append(int(below_event_id))
+        if before_ms is not None:
+            clauses.append("latest_event_at_ms < ?")
+            params.append(int(before_ms))
+        if not clauses:
+            return 0
+        with self._write() as connection:
+            cursor = connection.execute(
+                f"DELETE FROM watchdog_sessions WHERE user_key = ? AND ({' OR '.join(clauses)})",
+                params,
+            )
+            deleted = max(0, int(cursor.rowcount or 0))
+            if deleted:
+                connection.execute(
+                    """
+                    DELETE FROM watchdog_session_trackers
+                    WHERE user_key = ?
+                      AND session_id NOT IN (
+                        SELECT session_id FROM watchdog_sessions WHERE user_key = ?
+                      )
+                    """,
+                    (user_key, user_key),
+                )
+        return deleted
+
+    def prune_stats(self, user_key: str) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return dict(self._prune_stats_for(user_key))
+
     def list_events(
         self,
         user_key: str,
@@ -740,7 +1149,7 @@ class WatchdogLedger:
         where_sql = " AND ".join(where_clauses)
         order_sql = "event_id ASC" if safe_after > 0 else "event_id DESC"
 
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 f"""
                 SELECT *
@@ -751,11 +1160,7 @@ class WatchdogLedger:
                 """,
                 (*params, safe_limit),
             ).fetchall()
-            next_event_id = self._ensure_user_state(
-                connection,
-                user_key=user_key,
-                now_ms=int(time.time() * 1000),
-            )
+            next_event_id = self._stored_next_event_id(connection, user_key)
 
         serialized = [self._serialize_event_row(row) for row in rows]
         if safe_after <= 0:
@@ -776,7 +1181,7 @@ class WatchdogLedger:
             where_clauses.append("project_id = ?")
             params.append(project_id)
         where_sql = " AND ".join(where_clauses)
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             row = connection.execute(
                 f"""
                 SELECT COUNT(*) AS count
@@ -804,7 +1209,7 @@ class WatchdogLedger:
             where_clauses.append("timestamp_ms >= ?")
             params.append(int(since_ms))
         where_sql = " AND ".join(where_clauses)
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 f"""
                 SELECT *
@@ -830,7 +1235,7 @@ class WatchdogLedger:
             where_clauses.append("project_id = ?")
             params.append(project_id)
         where_sql = " AND ".join(where_clauses)
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 f"""
                 SELECT *
@@ -842,6 +1247,240 @@ class WatchdogLedger:
             ).fetchall()
         return [self._serialize_event_row(row) for row in rows]
 
+    def materialize_sessions(
+        self,
+        user_key: str,
+        *,
+        fold: SessionFold,
+        batch_size: int = SESSION_MATERIALIZE_BATCH,
+    ) -> Dict[str, Any]:
+        """Fold events past the session cursor into `watchdog_sessions`.
+
+        `fold(event, sessions, trackers)` mutates the session map and the open
+        drawing trackers; each batch is written back with its cursor in one
+        transaction, so a crash never double-counts events.
+        """
+        started_at = time.perf_counter()
+        safe_batch_size = max(1, int(batch_size))
+        events_folded = 0
+        with self._read() as connection:
+            pending_row = connection.execute(
+                """
+                SELECT MAX(event_id) AS max_event_id
+                FROM watchdog_events
+                WHERE user_key = ?
+                """,
+                (user_key,),
+            ).fetchone()
+        max_event_id = int(pending_row["max_event_id"] or 0) if pending_row is not None else 0
+        if max_event_id <= int(self.get_sync_cursor(user_key, SESSION_CURSOR_NAME)["lastEventId"]):
+            return {"eventsFolded": 0, "durationMs": 0.0}
+
+        while True:
+            with self._write() as connection:
+                cursor_row = connection.execute(
+                    """
+                    SELECT last_event_id
+                    FROM watchdog_sync_cursors
+                    WHERE user_key = ? AND sync_name = ?
+                    """,
+                    (user_key, SESSION_CURSOR_NAME),
+                ).fetchone()
+                after_event_id = int(cursor_row["last_event_id"] or 0) if cursor_row is not None else 0
+                rows = connection.execute(
+                    """
+                    SELECT *
+                    FROM watchdog_events
+                    WHERE user_key = ? AND event_id > ?
+                    ORDER BY event_id ASC
+                    LIMIT ?
+                    """,
+                    (user_key, after_event_id, safe_batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                events = [self._serialize_event_row(row) for row in rows]
+                trackers: Dict[Tuple[str, str, str], str] = {
+                    (str(row["collector_id"]), str(row["project_id"]), str(row["drawing_path"])): str(
+                        row["session_id"]
+                    )
+                    for row in connection.execute(
+                        """
+                        SELECT collector_id, project_id, drawing_path, session_id
+                        FROM watchdog_session_trackers
+                        WHERE user_key = ?
+                        """,
+                        (user_key,),
+                    ).fetchall()
+                }
+                sessions = self._load_sessions_by_id(
+                    connection,
+                    user_key=user_key,
+                    session_ids={
+                        *trackers.values(),
+                        *(str(event["sessionId"]) for event in events if event.get("sessionId")),
+                    },
+                )
+                previous_trackers = dict(trackers)
+                for event in events:
+                    fold(event, sessions, trackers)
+
+                now_ms = int(time.time() * 1000)
+                connection.executemany(
+                    """
+                    INSERT INTO watchdog_sessions (
+                        user_key,
+                        session_id,
+                        collector_id,
+                        project_id,
+                        started_at_ms,
+                        latest_event_at_ms,
+                        latest_event_id,
+                        session_json,
+                        updated_at_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(user_key, session_id) DO UPDATE SET
+                        collector_id = excluded.collector_id,
+                        project_id = excluded.project_id,
+                        started_at_ms = excluded.started_at_ms,
+                        latest_event_at_ms = excluded.latest_event_at_ms,
+                        latest_event_id = excluded.latest_event_id,
+                        session_json = excluded.session_json,
+                        updated_at_ms = excluded.updated_at_ms
+                    """,
+                    [
+                        (
+                            user_key,
+                            session_id,
+                            str(session.get("collectorId") or ""),
+                            str(session.get("projectId") or ""),
+                            int(session.get("startedAt") or 0),
+                            int(session.get("latestEventAt") or 0),
+                            int(session.get("latestEventId") or 0),
+                            _safe_json_dumps(session),
+                            now_ms,
+                        )
+                        for session_id, session in sessions.items()
+                    ],
+                )
+                # Only trackers the batch opened, moved or closed are written.
+                connection.executemany(
+                    """
+                    DELETE FROM watchdog_session_trackers
+                    WHERE user_key = ? AND collector_id = ? AND project_id = ? AND drawing_path = ?
+                    """,
+                    [(user_key, *tracking_key) for tracking_key in previous_trackers if tracking_key not in trackers],
+                )
+                connection.executemany(
+                    """
+                    INSERT INTO watchdog_session_trackers (
+                        user_key,
+                        collector_id,
+                        project_id,
+                        drawing_path,
+                        session_id
+                    ) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(user_key, collector_id, project_id, drawing_path) DO UPDATE SET
+                        session_id = excluded.session_id
+                    """,
+                    [
+                        (user_key, collector_id, project_id, drawing_path, session_id)
+                        for (collector_id, project_id, drawing_path), session_id in trackers.items()
+                        if previous_trackers.get((collector_id, project_id, drawing_path)) != session_id
+                    ],
+                )
+                connection.execute(
+                    """
+                    INSERT INTO watchdog_sync_cursors (
+                        user_key,
+                        sync_name,
+                        last_event_id,
+                        metadata_json,
+                        updated_at_ms
+                    ) VALUES (?, ?, ?, '{}', ?)
+                    ON CONFLICT(user_key, sync_name) DO UPDATE SET
+                        last_event_id = excluded.last_event_id,
+                        updated_at_ms = excluded.updated_at_ms
+                    """,
+                    (user_key, SESSION_CURSOR_NAME, int(events[-1]["eventId"]), now_ms),
+                )
+            events_folded += len(events)
+            if len(rows) < safe_batch_size:
+                break
+        return {
+            "eventsFolded": events_folded,
+            "durationMs": round((time.perf_counter() - started_at) * 1000.0, 3),
+        }
+
+    @staticmethod
+    def _load_sessions_by_id(
+        connection: sqlite3.Connection,
+        *,
+        user_key: str,
+        session_ids: set[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        sessions: Dict[str, Dict[str, Any]] = {}
+        ordered_ids = sorted(session_ids)
+        for offset in range(0, len(ordered_ids), EVENT_KEY_LOOKUP_CHUNK):
+            chunk = ordered_ids[offset : offset + EVENT_KEY_LOOKUP_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = connection.execute(
+                f"""
+                SELECT session_id, session_json
+                FROM watchdog_sessions
+                WHERE user_key = ? AND session_id IN ({placeholders})
+                """,
+                (user_key, *chunk),
+            ).fetchall()
+            for row in rows:
+                sessions[str(row["session_id"])] = _safe_json_loads(row["session_json"], {})
+        return sessions
+
+    def list_sessions(
+        self,
+        user_key: str,
+        *,
+        since_ms: int,
+        project_id: str | None = None,
+        collector_id: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        where_clauses = ["user_key = ?", "latest_event_at_ms >= ?"]
+        params: List[Any] = [user_key, int(since_ms)]
+        if project_id:
+            where_clauses.append("project_id = ?")
+            params.append(project_id)
+        if collector_id:
+            where_clauses.append("collector_id = ?")
+            params.append(collector_id)
+        where_sql = " AND ".join(where_clauses)
+        with self._read() as connection:
+            rows = connection.execute(
+                f"""
+                SELECT session_json
+                FROM watchdog_sessions
+                WHERE {where_sql}
+                ORDER BY latest_event_at_ms DESC
+                """,
+                params,
+            ).fetchall()
+        return [_safe_json_loads(row["session_json"], {}) for row in rows]
+
+    def reset_sessions(self, user_key: str) -> None:
+        with self._write() as connection:
+            connection.execute("DELETE FROM watchdog_sessions WHERE user_key = ?", (user_key,))
+            connection.execute("DELETE FROM watchdog_session_trackers WHERE user_key = ?", (user_key,))
+            connection.execute(
+                "DELETE FROM watchdog_sync_cursors WHERE user_key = ? AND sync_name = ?",
+                (user_key, SESSION_CURSOR_NAME),
+            )
+
+    def list_event_user_keys(self) -> List[str]:
+        with self._read() as connection:
+            rows = connection.execute(
+                "SELECT DISTINCT user_key FROM watchdog_events ORDER BY user_key ASC"
+            ).fetchall()
+        return [str(row["user_key"]) for row in rows]
+
     def list_rollups(
         self,
         user_key: str,
@@ -855,7 +1494,7 @@ class WatchdogLedger:
             where_clauses.append("project_id = ?")
             params.append(project_id)
         where_sql = " AND ".join(where_clauses)
-        with self._lock, self._connect() as connection:
+        with self._read() as connection:
             rows = connection.execute(
                 f"""
                 SELECT
@@ -883,19 +1522,59 @@ class WatchdogLedger:
             for row in rows
         ]
 
-    def _increment_rollup(
-        self,
+    @staticmethod
+    def _existing_event_keys(
         connection: sqlite3.Connection,
         *,
         user_key: str,
-        event: Dict[str, Any],
-    ) -> None:
+        collector_id: str,
+        event_keys: set[str],
+    ) -> set[str]:
+        found: set[str] = set()
+        ordered_keys = sorted(event_keys)
+        # Stay well under SQLite's bound-parameter limit.
+        for offset in range(0, len(ordered_keys), EVENT_KEY_LOOKUP_CHUNK):
+            chunk = ordered_keys[offset : offset + EVENT_KEY_LOOKUP_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = connection.execute(
+                f"""
+                SELECT event_key
+                FROM watchdog_event_keys
+                WHERE user_key = ? AND collector_id = ? AND event_key IN ({placeholders})
+                """,
+                (user_key, collector_id, *chunk),
+            ).fetchall()
+            found.update(str(row["event_key"]) for row in rows)
+        return found
+
+    @staticmethod
+    def _accumulate_rollup(increments: Dict[tuple, List[int]], *, event: Dict[str, Any]) -> None:
         timestamp_ms = int(event.get("timestamp") or 0)
         bucket_start_ms = timestamp_ms - (timestamp_ms % (60 * 60 * 1000))
-        project_id = str(event.get("projectId") or "")
-        event_type = str(event.get("eventType") or "unknown")
-        source_type = str(event.get("sourceType") or "unknown")
-        connection.execute(
+        key = (
+            int(bucket_start_ms),
+            str(event.get("projectId") or ""),
+            str(event.get("eventType") or "unknown"),
+            str(event.get("sourceType") or "unknown"),
+        )
+        bucket = increments.get(key)
+        if bucket is None:
+            increments[key] = [1, timestamp_ms]
+            return
+        bucket[0] += 1
+        if timestamp_ms > bucket[1]:
+            bucket[1] = timestamp_ms
+
+    @staticmethod
+    def _apply_rollup_increments(
+        connection: sqlite3.Connection,
+        *,
+        user_key: str,
+        increments: Dict[tuple, List[int]],
+    ) -> None:
+        if not increments:
+            return
+        connection.executemany(
             """
             INSERT INTO watchdog_hourly_rollups (
                 user_key,
@@ -905,24 +1584,20 @@ class WatchdogLedger:
                 source_type,
                 event_count,
                 latest_event_at_ms
-            ) VALUES (?, ?, ?, ?, ?, 1, ?)
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(user_key, bucket_start_ms, project_id, event_type, source_type)
             DO UPDATE SET
-                event_count = watchdog_hourly_rollups.event_count + 1,
+                event_count = watchdog_hourly_rollups.event_count + excluded.event_count,
                 latest_event_at_ms = CASE
                     WHEN excluded.latest_event_at_ms > watchdog_hourly_rollups.latest_event_at_ms
                     THEN excluded.latest_event_at_ms
                     ELSE watchdog_hourly_rollups.latest_event_at_ms
                 END
             """,
-            (
-                user_key,
-                int(bucket_start_ms),
-                project_id,
-                event_type,
-                source_type,
-                int(timestamp_ms),
-            ),
+            [
+                (user_key, bucket_start_ms, project_id, event_type, source_type, count, latest_ms)
+                for (bucket_start_ms, project_id, event_type, source_type), (count, latest_ms) in increments.items()
+            ],
         )
 
     @staticmethod
@@ -320,7 +320,13 @@ function Get-CollectorStateSummary {
         }
     }
 
-    $statePath = Join-Path (Resolve-AbsolutePath -PathValue $bufferDir) "state.json"
+    # The collector keeps its state in state.sqlite3 and mirrors a summary to
+    # state.status.json; state.json only exists before the first migration.
+    $resolvedBufferDir = Resolve-AbsolutePath -PathValue $bufferDir
+    $statePath = Join-Path $resolvedBufferDir "state.status.json"
+    if (-not (Test-Path $statePath)) {
+        $statePath = Join-Path $resolvedBufferDir "state.json"
+    }
     if (-not (Test-Path $statePath)) {
         return [ordered]@{
             exists = $false
@@ -328,7 +334,7 @@ function Get-CollectorStateSummary {
             path = $statePath
             configPath = $resolvedConfigPath
             bufferDir = $bufferDir
-            reason = "Collector local state.json was not found."
+            reason = "Collector local state was not found."
         }
     }
 
@@ -343,7 +349,7 @@ function Get-CollectorStateSummary {
             path = $statePath
             configPath = $resolvedConfigPath
             bufferDir = $bufferDir
-            reason = "Collector local state.json could not be parsed: $($_.Exception.Message)"
+            reason = "Collector local state could not be parsed: $($_.Exception.Message)"
         }
     }
 
@@ -362,8 +368,17 @@ function Get-CollectorStateSummary {
         }
     }
 
+    $pendingCountValue = Get-OptionalObjectPropertyValue -InputObject $state -PropertyName "pendingCount"
     $pendingEvents = Get-OptionalObjectPropertyValue -InputObject $state -PropertyName "pendingEvents"
-    $pendingCount = if ($null -eq $pendingEvents) { 0 } else { @($pendingEvents).Count }
+    $pendingCount = if ($null -ne $pendingCountValue) {
+        [int]$pendingCountValue
+    }
+    elseif ($null -eq $pendingEvents) {
+        0
+    }
+    else {
+        @($pendingEvents).Count
+    }
     $nextSequence = 1
     $nextSequenceValue = Get-OptionalObjectPropertyValue -InputObject $state -PropertyName "nextSequence"
     if ($null -ne $nextSequenceValue) {
@@ -408,7 +423,7 @@ function Get-CollectorStateSummary {
     }
     $collectorReason = $null
     if (-not $snapshot) {
-        $collectorReason = "Collector local state.json is missing snapshot metadata."
+        $collectorReason = "Collector local state is missing snapshot metadata."
     }
     elseif (-not $sourceAvailable) {
         $collectorReason = "Collector is waiting for a live tracker source from AutoCAD."
@@ -419,7 +434,7 @@ function Get-CollectorStateSummary {
     elseif ($lastCheckedAgeMs -gt $FreshnessMs) {
         $collectorAgeMinutes = [Math]::Round(($lastCheckedAgeMs / 60000.0), 1)
         $collectorThresholdMinutes = [Math]::Round(($FreshnessMs / 60000.0), 1)
-        $collectorReason = "Collector local state.json is stale ($collectorAgeMinutes min old; threshold $collectorThresholdMinutes min)."
+        $collectorReason = "Collector local state is stale ($collectorAgeMinutes min old; threshold $collectorThresholdMinutes min)."
     }
 
     return [ordered]@{
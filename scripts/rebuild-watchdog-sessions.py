@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.watchdog.service import WatchdogMonitorService
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the materialized Watchdog sessions table from retained ledger events.",
+    )
+    parser.add_argument(
+        "--ledger",
+        help="Path to the Watchdog ledger SQLite file. Defaults to SUITE_WATCHDOG_LEDGER_PATH or the local app data ledger.",
+    )
+    parser.add_argument(
+        "--user-key",
+        help="Rebuild sessions for one user key only. Defaults to every user with retained events.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    service = WatchdogMonitorService(ledger_path=args.ledger)
+    try:
+        result = service.rebuild_sessions(args.user_key)
+    finally:
+        service.ledger.close()
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,8 +10,12 @@ import { supabase } from "@/supabase/client";
 import type {
 	ConduitRouteBackcheckRequest,
 	ConduitRouteBackcheckResponse,
+	ConduitObstacleNearRequest,
+	ConduitObstacleNearResponse,
 	ConduitObstacleScanRequest,
 	ConduitObstacleScanResponse,
+	ConduitRouteBatchRequest,
+	ConduitRouteBatchResponse,
 	ConduitRouteComputeRequest,
 	ConduitRouteComputeResponse,
 } from "./conduitRouteTypes";
@@ -114,6 +118,9 @@ class ConduitRouteService {
 						canvasHeight: request.canvasHeight,
 						gridStep: request.gridStep,
 						tagText: request.tagText,
+						engine: request.engine,
+						search: request.search,
+						searchMargin: request.searchMargin,
 					}),
 					timeoutMs: 60_000,
 					requestName: "Conduit route compute request",
@@ -159,6 +166,85 @@ class ConduitRouteService {
 		}
 	}
 
+	async computeRouteBatch(
+		request: ConduitRouteBatchRequest,
+	): Promise<ConduitRouteBatchResponse> {
+		try {
+			const requestId = this.createRequestId();
+			const headers = await this.getHeaders(requestId);
+			const response = await fetchWithTimeout(
+				`${this.baseUrl}/api/conduit-route/route/compute-batch`,
+				{
+					method: "POST",
+					headers,
+					body: JSON.stringify({
+						routes: request.routes,
+						mode: request.mode,
+						clearance: request.clearance,
+						obstacles: request.obstacles ?? [],
+						obstacleSource: request.obstacleSource ?? "client",
+						obstacleScan: request.obstacleScan,
+						canvasWidth: request.canvasWidth,
+						canvasHeight: request.canvasHeight,
+						gridStep: request.gridStep,
+						engine: request.engine,
+						search: request.search,
+						congestion: request.congestion,
+						congestionCost: request.congestionCost,
+						parallel: request.parallel,
+					}),
+					timeoutMs: 120_000,
+					requestName: "Conduit route batch compute request",
+				},
+			);
+
+			const payload = (await response
+				.clone()
+				.json()
+				.catch(() => null)) as ConduitRouteBatchResponse | null;
+
+			if (!response.ok) {
+				return {
+					success: false,
+					code: payload?.code || "REQUEST_FAILED",
+					message:
+						payload?.message ||
+						(await this.parseErrorMessage(
+							response,
+							`Route batch compute failed (${response.status})`,
+						)),
+					data: payload?.data,
+					meta: payload?.meta,
+					warnings: payload?.warnings,
+				};
+			}
+
+			if (payload && typeof payload.success === "boolean") {
+				return payload;
+			}
+
+			return {
+				success: false,
+				code: "INVALID_RESPONSE",
+				message: "Route batch compute returned an unexpected payload.",
+			};
+		} catch (err) {
+			logger.error(
+				"Route batch compute request failed",
+				"ConduitRouteService",
+				err,
+			);
+			return {
+				success: false,
+				code: mapFetchErrorCode(err, "NETWORK_ERROR"),
+				message: mapFetchErrorMessage(
+					err,
+					"Route batch compute request failed",
+				),
+			};
+		}
+	}
+
 	async listLayers(): Promise<string[]> {
 		try {
 			const requestId = this.createRequestId();
@@ -258,6 +344,68 @@ class ConduitRouteService {
 		}
 	}
 
+	async queryObstaclesNear(
+		request: ConduitObstacleNearRequest,
+	): Promise<ConduitObstacleNearResponse> {
+		try {
+			const requestId = this.createRequestId();
+			const headers = await this.getHeaders(requestId);
+			const response = await fetchWithTimeout(
+				`${this.baseUrl}/api/conduit-route/obstacles/near`,
+				{
+					method: "POST",
+					headers,
+					body: JSON.stringify(request),
+					timeoutMs: 10_000,
+					requestName: "Conduit obstacle near-point request",
+				},
+			);
+
+			const payload = (await response
+				.clone()
+				.json()
+				.catch(() => null)) as ConduitObstacleNearResponse | null;
+
+			if (!response.ok) {
+				return {
+					success: false,
+					code: payload?.code || "REQUEST_FAILED",
+					message:
+						payload?.message ||
+						(await this.parseErrorMessage(
+							response,
+							`Obstacle near-point query failed (${response.status})`,
+						)),
+					meta: payload?.meta,
+				};
+			}
+
+			if (payload && typeof payload.success === "boolean") {
+				return payload;
+			}
+
+			return {
+				success: false,
+				code: "INVALID_RESPONSE",
+				message: "Obstacle near-point query returned an unexpected payload.",
+			};
+		} catch (err) {
+			logger.error(
+				"Obstacle near-point request failed",
+				"ConduitRouteService",
+				err,
+			);
+			return {
+				success: false,
+				code: mapFetchErrorCode(err, "NETWORK_ERROR"),
+				message: mapFetchErrorMessage(
+					err,
+					"Obstacle near-point request failed",
+				),
+			};
+		}
+	}
+
 	async backcheckRoutes(
 		request: ConduitRouteBackcheckRequest,
 	): Promise<ConduitRouteBackcheckResponse> {
@@ -1,4 +1,6 @@
 export type RoutingMode = "plan_view" | "cable_tag" | "schematic";
+export type ConduitRouteEngine = "python" | "numpy";
+export type ConduitRouteSearchMode = "astar" | "bidirectional" | "hierarchical";
 
 export type ConduitRouteTab = "routes" | "schedule" | "nec" | "sections";
 
@@ -92,6 +94,9 @@ export interface ConduitRouteComputeRequest {
 	canvasHeight?: number;
 	gridStep?: number;
 	tagText?: string;
+	engine?: ConduitRouteEngine;
+	search?: ConduitRouteSearchMode;
+	searchMargin?: number;
 }
 
 export interface ConduitRouteComputeData {
@@ -104,6 +109,40 @@ export interface ConduitRouteComputeData {
 	obstacleViewport?: ConduitObstacleViewport;
 }
 
+export interface ConduitRouteGridCacheMeta {
+	enabled: boolean;
+	hit: boolean;
+	key?: string;
+	hits?: number;
+	misses?: number;
+	evictions?: number;
+	entries?: number;
+	bytes?: number;
+	maxBytes?: number;
+}
+
+export interface ConduitRouteHierarchicalMeta {
+	coarseFactor: number;
+	coarseCols: number;
+	coarseRows: number;
+	coarseIterations: number;
+	coarseRouteValid: boolean;
+	corridorCells: number;
+	fullGridFallback: boolean;
+}
+
+export interface ConduitRouteSearchWindowMeta {
+	x: number;
+	y: number;
+	cols: number;
+	rows: number;
+	obstacleCount: number;
+	culledObstacleCount: number;
+	indexKey: string;
+	indexHit: boolean;
+	fullCanvasFallback: boolean;
+}
+
 export interface ConduitRouteComputeMeta {
 	computeMs?: number;
 	requestMs?: number;
@@ -121,6 +160,13 @@ export interface ConduitRouteComputeMeta {
 	obstacleCount?: number;
 	mode?: RoutingMode;
 	clearance?: number;
+	engine?: ConduitRouteEngine;
+	engineRequested?: ConduitRouteEngine;
+	searchMode?: ConduitRouteSearchMode;
+	hierarchical?: ConduitRouteHierarchicalMeta | null;
+	searchWindow?: ConduitRouteSearchWindowMeta | null;
+	gridMs?: number;
+	gridCache?: ConduitRouteGridCacheMeta;
 	source?: string;
 }
 
@@ -133,6 +179,64 @@ export interface ConduitRouteComputeResponse {
 	warnings?: string[];
 }
 
+export interface ConduitRouteBatchItem {
+	id?: string;
+	start: Point2D;
+	end: Point2D;
+	tagText?: string;
+}
+
+export interface ConduitRouteBatchRequest
+	extends Omit<
+		ConduitRouteComputeRequest,
+		"start" | "end" | "tagText" | "searchMargin"
+	> {
+	routes: ConduitRouteBatchItem[];
+	congestion?: boolean;
+	congestionCost?: number;
+	parallel?: boolean;
+}
+
+export interface ConduitRouteBatchResult {
+	id: string;
+	success: boolean;
+	code: string;
+	message: string;
+	data?: ConduitRouteComputeData;
+	meta: {
+		computeMs: number;
+		iterations: number;
+		visitedNodes: number;
+		fallbackUsed: boolean;
+		routeValid: boolean;
+		hierarchical?: ConduitRouteHierarchicalMeta;
+	};
+}
+
+export interface ConduitRouteBatchMeta extends ConduitRouteComputeMeta {
+	solveMs?: number;
+	routeCount?: number;
+	parallel?: boolean;
+	workers?: number;
+	congestion?: boolean;
+	congestionCost?: number;
+}
+
+export interface ConduitRouteBatchResponse {
+	success: boolean;
+	code?: string;
+	message?: string;
+	data?: {
+		routes: ConduitRouteBatchResult[];
+		routedCount: number;
+		failedCount: number;
+		resolvedObstacles?: Obstacle[];
+		obstacleViewport?: ConduitObstacleViewport;
+	};
+	meta?: ConduitRouteBatchMeta;
+	warnings?: string[];
+}
+
 export interface ConduitObstacleScanRequest {
 	selectionOnly?: boolean;
 	includeModelspace?: boolean;
@@ -144,6 +248,15 @@ export interface ConduitObstacleScanRequest {
 	layerPreset?: string;
 }
 
+export interface ConduitObstacleSpatialIndexMeta {
+	key: string;
+	obstacleCount: number;
+	cellSize: number;
+	bucketCount: number;
+	oversizedCount: number;
+	buildMs: number;
+}
+
 export interface ConduitObstacleScanMeta {
 	scanMs?: number;
 	source?: string;
@@ -152,6 +265,7 @@ export interface ConduitObstacleScanMeta {
 	matchedLayerEntities?: number;
 	dedupedEntities?: number;
 	totalObstacles?: number;
+	spatialIndex?: ConduitObstacleSpatialIndexMeta | null;
 }
 
 export interface ConduitObstacleScanData {
@@ -172,6 +286,32 @@ export interface ConduitObstacleScanResponse {
 	warnings?: string[];
 }
 
+export interface ConduitObstacleNearRequest {
+	x: number;
+	y: number;
+	radius?: number;
+	limit?: number;
+	indexKey?: string;
+	obstacles?: Obstacle[];
+}
+
+export interface ConduitObstacleNearResponse {
+	success: boolean;
+	code?: string;
+	message?: string;
+	data?: {
+		point: Point2D;
+		radius: number;
+		obstacles: Array<Obstacle & { distance: number }>;
+	};
+	meta?: Partial<ConduitObstacleSpatialIndexMeta> & {
+		indexKey?: string;
+		indexHit?: boolean;
+		queryMs?: number;
+		requestId?: string;
+	};
+}
+
 export interface ConduitRouteBackcheckIssue {
 	code: string;
 	severity: "pass" | "warn" | "fail";
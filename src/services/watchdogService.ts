@@ -42,6 +42,24 @@ export interface HeartbeatResponse {
 	lastHeartbeatAt: number;
 }
 
+export interface WatchdogPruneStats {
+	pendingInserts: number;
+	passes: number;
+	totalDeleted: number;
+	lastPrunedAt: number;
+	lastDeleted: number;
+	lastDeletedByCount: number;
+	lastDeletedByAge: number;
+	lastChunks: number;
+	lastDurationMs: number;
+}
+
+export interface WatchdogRetentionStatus {
+	maxEvents: number;
+	maxAgeMs: number | null;
+	pruning: WatchdogPruneStats;
+}
+
 export interface WatchdogStatusResponse {
 	ok: boolean;
 	configured: boolean;
@@ -49,6 +67,7 @@ export interface WatchdogStatusResponse {
 	lastScan: Omit<HeartbeatResponse, "ok" | "events"> | null;
 	nextEventId: number;
 	healthy: boolean;
+	retention?: WatchdogRetentionStatus;
 }
 
 export interface WatchdogConfigResponse {
@@ -213,6 +232,20 @@ export interface WatchdogOverviewResponse {
 		top: WatchdogOverviewProjectCount[];
 	};
 	trendBuckets: WatchdogTrendBucket[];
+	ledger?: WatchdogLedgerPoolMetrics;
+}
+
+export interface WatchdogLedgerPoolMetrics {
+	connectionsOpened: number;
+	connectionReuses: number;
+	openConnections: number;
+	reads: number;
+	readMs: number;
+	writes: number;
+	writeMs: number;
+	writeLockWaits: number;
+	writeLockWaitMs: number;
+	maxWriteLockWaitMs: number;
 }
 
 export interface WatchdogSessionSummary {